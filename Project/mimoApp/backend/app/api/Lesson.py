@@ -1,21 +1,28 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Literal, Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
 from sqlalchemy.orm import Session
 from db.database import db_instance  # Ahora se usa db_instance con get_session
-from schemas.Lesson import LessonCreate
-from services.Lesson_services import add_lesson, list_lesson, update_lesson, delete_lesson
+from db.unit_of_work import UnitOfWorkRoute
+from schemas.Lesson import LessonCreate, LessonBatchResponse
+from services.Lesson_services import add_lesson, list_lesson, update_lesson_details, remove_lesson as discard_lesson, get_lessons_batch, get_lesson as find_lesson, get_lesson_by_title
+from services.render_service import render_lesson
+from core.batch import batch_ids
+from core.query_budget import query_budget
+from core.etag import etag_matches
 
 
-router = APIRouter(prefix="/lessons", tags=["Lessons"])
+router = APIRouter(prefix="/lessons", tags=["Lessons"], route_class=UnitOfWorkRoute)
 
 # Create a new lesson
 @router.post("/", status_code=status.HTTP_201_CREATED)
+@query_budget(10)
 def create_lesson(lesson: LessonCreate, db: Session = Depends(db_instance.get_session)):  # Se usa get_session
     """
     Creates a new lesson in the system.
 
     This endpoint allows you to create a new lesson by providing the necessary 
     lesson data in the request body. Before creation, it checks if a lesson with 
-    the same name already exists.
+    the same title already exists.
 
     Parameters:
         - lesson (LessonCreate): The lesson data to be created.
@@ -26,10 +33,10 @@ def create_lesson(lesson: LessonCreate, db: Session = Depends(db_instance.get_se
 
     Raises:
         - HTTPException (400): If the lesson already exists.
+        - HTTPException (404): If the course is not found.
     """
     # Check if the lesson already exists
-    existing_lesson = list_lesson(db)
-    if any(l.name == lesson.name for l in existing_lesson):  # Verifica el nombre
+    if get_lesson_by_title(db, lesson.title) is not None:  # Verifica el título
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Lesson already exists")
     
     # Calls the service to add the lesson to the database
@@ -37,12 +44,12 @@ def create_lesson(lesson: LessonCreate, db: Session = Depends(db_instance.get_se
 
 # Get all lessons
 @router.get("/", status_code=status.HTTP_200_OK)
-def get_all_lessons(db: Session = Depends(db_instance.get_session)):  # Se usa get_session
+@query_budget(1)
+def get_all_lessons(db: Session = Depends(db_instance.get_session)):
     """
     Retrieves the list of all lessons.
 
     This endpoint returns a list of all lessons present in the system. 
-    The lessons are retrieved from the database.
 
     Parameters:
         - db (Session): Database session provided by `get_session`.
@@ -59,36 +66,82 @@ def get_all_lessons(db: Session = Depends(db_instance.get_session)):  # Se usa g
     # Calls the service to list all lessons from the database
     return list_lesson(db)
 
+# Get several lessons by their IDs
+@router.get("/batch", response_model=LessonBatchResponse, status_code=status.HTTP_200_OK)
+@query_budget(1)
+def get_lessons(ids: list[int] = Depends(batch_ids), db: Session = Depends(db_instance.get_session)):
+    """
+    Retrieves several lessons by their IDs in a single request.
+
+    All the requested ids are resolved with one database query and the lessons are
+    returned in request order, together with the ids that were not found.
+
+    Parameters:
+        - ids (str): Comma separated lesson ids, e.g. `?ids=1,2,3` (at most `MAX_BATCH_SIZE`).
+        - db (Session): Database session provided by `get_session`.
+
+    Returns:
+        - LessonBatchResponse: The lessons found and the missing ids.
+
+    Raises:
+        - HTTPException (400): If no ids are given, an id is not an integer or the batch is too large.
+
+    Example response:
+        {"items": [{"id": 1, "title": "Lesson 1", "content": "...", "course_id": 1}], "missing": [9]}
+    """
+    return get_lessons_batch(db, ids)
+
 # Get a specific lesson by ID
 @router.get("/{id}", status_code=status.HTTP_200_OK)
-def get_lesson(id: int, db: Session = Depends(db_instance.get_session)):  # Se usa get_session
+@query_budget(3)
+def get_lesson(
+    id: int,
+    format: Literal["json", "html"] = Query("json", description="'html' returns the rendered content"),
+    if_none_match: Optional[str] = Header(None),
+    db: Session = Depends(db_instance.get_session),  # Se usa get_session
+):
     """
     Retrieves a specific lesson by its ID.
 
     This endpoint returns the details of a specific lesson identified by 
     its ID. If no lesson is found, an error is raised.
 
+    With `format=html` the content is returned as sanitized HTML. It is rendered once
+    when the lesson is written and stored by content hash, so this is a primary key
+    lookup; the response carries an ETag and answers `If-None-Match` with 304.
+
     Parameters:
         - id (int): The ID of the lesson to retrieve.
+        - format (str): 'json' (default) or 'html'.
+        - if_none_match (str): The ETags of the HTML the client already has.
         - db (Session): Database session provided by `get_session`.
 
     Returns:
         - dict: The details of the lesson identified by the provided ID.
+        - text/html: The rendered content, with `format=html`.
 
     Raises:
         - HTTPException (404): If the lesson is not found.
 
     Example response:
-        {"id": 1, "name": "Lesson 1", "description": "Description of Lesson 1"}
+        {"id": 1, "title": "Lesson 1", "content": "Content of Lesson 1", "course_id": 1}
     """
     # Retrieve the lesson by ID
-    lesson = list_lesson(db, id)
+    lesson = find_lesson(db, id)
     if lesson is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Lesson not found")
-    return lesson
+    if format == "json":
+        return lesson
+
+    html, etag = render_lesson(db, lesson)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}  # Revalidate: the lesson may be edited
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=html, media_type="text/html", headers=headers)
 
 # Update a lesson by ID
 @router.put("/{id}", status_code=status.HTTP_200_OK)
+@query_budget(9)
 def modify_lesson(id: int, lesson: LessonCreate, db: Session = Depends(db_instance.get_session)):  # Se usa get_session
     """
     Modifies the details of an existing lesson.
@@ -105,13 +158,13 @@ def modify_lesson(id: int, lesson: LessonCreate, db: Session = Depends(db_instan
         - dict: The updated details of the lesson.
 
     Raises:
-        - HTTPException (404): If the lesson is not found.
+        - HTTPException (404): If the lesson is not found, or the course it moves to.
 
     Example response:
         {"id": 1, "name": "Updated Lesson 1", "description": "Updated description"}
     """
     # Calls the service to update the lesson with the given ID
-    updated_lesson = update_lesson(db, id, lesson)
+    updated_lesson = update_lesson_details(db, id, lesson)
     if updated_lesson is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Lesson not found")
     return updated_lesson
@@ -138,5 +191,5 @@ def remove_lesson(id: int, db: Session = Depends(db_instance.get_session)):  # S
         {"message": "Lesson deleted successfully"}
     """
     # Calls the service to delete the lesson by ID
-    if not delete_lesson(db, id):
+    if not discard_lesson(db, id):
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Lesson not found")
@@ -0,0 +1,90 @@
+from datetime import datetime
+from typing import Literal, Optional
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from sqlalchemy.orm import Session
+from db.database import db_instance
+from db.unit_of_work import UnitOfWorkRoute
+from models.user import User
+from services.user_service import get_current_admin
+from services.export_service import FORMATS, resolve_export, stream_export
+from services.index_advisor import advise_indexes, render_migration
+
+router = APIRouter(prefix="/admin", tags=["Admin"], route_class=UnitOfWorkRoute)
+
+# Export a dataset
+@router.get("/export/{dataset}")
+def export_dataset(
+    dataset: Literal["users", "enrollments", "lessons"],
+    format: Literal["csv", "ndjson", "parquet"] = Query("csv", description="Output format"),
+    columns: Optional[str] = Query(None, description="Comma separated columns to export (default: all)"),
+    since: Optional[datetime] = Query(None, description="Only rows created/updated at or after this time"),
+    admin: User = Depends(get_current_admin),
+):
+    """
+    Streams a full or incremental export of users, enrollments or lesson metadata.
+
+    Rows are read with a server-side cursor and encoded chunk by chunk, so the export
+    runs in constant memory whatever the size of the table. Soft deleted enrollments
+    and lessons, and those of soft deleted courses, are not exported. The same export
+    is available from the command line with `python -m services.export_service`.
+
+    Parameters:
+        - dataset (str): 'users', 'enrollments' or 'lessons'.
+        - format (str): 'csv', 'ndjson' or 'parquet'.
+        - columns (str, optional): The columns to export.
+        - since (datetime, optional): Lower bound for incremental extracts.
+        - admin (User): The current user, who must be an administrator.
+
+    Returns:
+        - StreamingResponse: The exported file, as an attachment.
+
+    Raises:
+        - HTTPException (400): If a column is unknown.
+        - HTTPException (403): If the current user is not an administrator.
+    """
+    selected = resolve_export(dataset, format, columns.split(",") if columns else None)
+    filename = f"{dataset}-{datetime.utcnow():%Y%m%dT%H%M%S}.{format}"
+    return StreamingResponse(
+        stream_export(dataset, format, selected, since),
+        media_type=FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+# Propose indexes for the observed workload
+@router.get("/index-advice")
+def get_index_advice(
+    source: Literal["app", "pg_stat_statements"] = Query("app", description="Statements captured by this worker, or pg_stat_statements"),
+    limit: int = Query(200, ge=1, le=5000, description="Number of most expensive statements to analyze"),
+    format: Literal["json", "alembic"] = Query("json", description="'alembic' returns a ready to apply migration"),
+    down_revision: Optional[str] = Query(None, description="Revision the generated migration follows"),
+    admin: User = Depends(get_current_admin),
+    db: Session = Depends(db_instance.get_session),
+):
+    """
+    Proposes indexes from the query workload.
+
+    Normalized statements are checked against the indexes declared on the models; when
+    the `hypopg` extension is installed the candidates are costed with hypothetical
+    indexes. The same report is available from the command line with
+    `python -m services.index_advisor`.
+
+    Parameters:
+        - source (str): 'app' (requires `INDEX_ADVISOR_CAPTURE`) or 'pg_stat_statements'.
+        - limit (int): Number of most expensive statements to analyze.
+        - format (str): 'json' or 'alembic'.
+        - down_revision (str, optional): Revision the generated migration follows.
+        - admin (User): The current user, who must be an administrator.
+        - db (Session): Database session provided by `get_session`.
+
+    Returns:
+        - dict: The proposals with their DDL and estimated benefit, or the migration as text.
+
+    Raises:
+        - HTTPException (400): If the source is not available.
+        - HTTPException (403): If the current user is not an administrator.
+    """
+    advice = advise_indexes(db, source, limit)
+    if format == "alembic":
+        return PlainTextResponse(render_migration(advice["proposals"], down_revision))
+    return advice
@@ -0,0 +1,140 @@
+from typing import Optional
+from fastapi import APIRouter, Depends, Header, Query, Request, Response, status
+from fastapi.responses import FileResponse
+from sqlalchemy.orm import Session
+from db.database import db_instance
+from db.unit_of_work import UnitOfWorkRoute
+from core.etag import etag_matches
+from models.user import User
+from schemas.asset import LessonAssetResponse
+from services.user_service import get_current_admin
+from services.asset_service import upload_lesson_asset, list_lesson_assets, remove_lesson_asset, get_asset_file, is_inline_media_type
+
+router = APIRouter(prefix="/assets", tags=["Assets"], route_class=UnitOfWorkRoute)
+
+# Blobs are immutable: their URL changes with their content
+IMMUTABLE = "public, max-age=31536000, immutable"
+
+# Upload a file to a lesson
+@router.put("/lessons/{lesson_id}/{filename}", response_model=LessonAssetResponse, status_code=status.HTTP_201_CREATED)
+async def upload_asset(
+    lesson_id: int,
+    filename: str,
+    request: Request,
+    content_type: Optional[str] = Header(None),
+    admin: User = Depends(get_current_admin),
+    db: Session = Depends(db_instance.get_session),
+):
+    """
+    Attaches a file (image, audio, download...) to a lesson.
+
+    The raw request body is the file: it is streamed to disk chunk by chunk and stored
+    by the SHA-256 of its content, so uploading the same file twice stores it once.
+    A file of the lesson with the same name is replaced.
+
+    Parameters:
+        - lesson_id (int): The ID of the lesson.
+        - filename (str): The name of the file within the lesson.
+        - content_type (str, optional): The media type of the file (`Content-Type` header).
+        - admin (User): The current user, who must be an administrator.
+        - db (Session): Database session provided by `get_session`.
+
+    Returns:
+        - LessonAssetResponse: The attached file and its download URL.
+
+    Raises:
+        - HTTPException (400): If the file name is invalid.
+        - HTTPException (403): If the current user is not an administrator.
+        - HTTPException (404): If the lesson is not found.
+        - HTTPException (413): If the file exceeds `ASSET_MAX_BYTES`.
+
+    Example:
+        curl -X PUT -H "Content-Type: image/png" --data-binary @diagram.png /assets/lessons/3/diagram.png
+    """
+    return await upload_lesson_asset(db, lesson_id, filename, content_type, request.stream())
+
+# List the files of a lesson
+@router.get("/lessons/{lesson_id}", response_model=list[LessonAssetResponse])
+def get_lesson_assets(lesson_id: int, db: Session = Depends(db_instance.get_session)):
+    """
+    Lists the files attached to a lesson, by name.
+
+    Parameters:
+        - lesson_id (int): The ID of the lesson.
+        - db (Session): Database session provided by `get_session`.
+
+    Returns:
+        - list[LessonAssetResponse]: The files and their download URLs.
+
+    Raises:
+        - HTTPException (404): If the lesson is not found.
+    """
+    return list_lesson_assets(db, lesson_id)
+
+# Detach a file from a lesson
+@router.delete("/lessons/{lesson_id}/{filename}", status_code=status.HTTP_204_NO_CONTENT)
+def delete_asset(
+    lesson_id: int,
+    filename: str,
+    admin: User = Depends(get_current_admin),
+    db: Session = Depends(db_instance.get_session),
+):
+    """
+    Detaches a file from a lesson. Its content is deleted later by the orphan collector
+    if no other lesson uses it.
+
+    Parameters:
+        - lesson_id (int): The ID of the lesson.
+        - filename (str): The name of the file within the lesson.
+        - admin (User): The current user, who must be an administrator.
+        - db (Session): Database session provided by `get_session`.
+
+    Raises:
+        - HTTPException (403): If the current user is not an administrator.
+        - HTTPException (404): If the lesson has no such file.
+    """
+    remove_lesson_asset(db, lesson_id, filename)
+
+# Download a file
+@router.get("/{sha256}")
+def download_asset(
+    sha256: str,
+    name: Optional[str] = Query(None, description="Serve as an attachment with this file name"),
+    if_none_match: Optional[str] = Header(None),
+    db: Session = Depends(db_instance.get_session),
+):
+    """
+    Downloads the content of a file by its hash.
+
+    The file is sent from disk (with sendfile where the server supports it) and honours
+    `Range` requests, so audio can be seeked and large downloads resumed. The content of
+    a hash never changes, so it may be cached for a year by browsers and CDNs.
+
+    Only images, videos and audio are displayed inline; any other type (HTML, SVG...)
+    is always served as an attachment, and browsers are told not to sniff the type,
+    so an uploaded file cannot run scripts in the origin of the API.
+
+    Parameters:
+        - sha256 (str): The SHA-256 of the content, from the `url` of the file.
+        - name (str, optional): Serve as an attachment with this file name.
+        - if_none_match (str): The ETag the client already has.
+        - db (Session): Database session provided by `get_session`.
+
+    Returns:
+        - The content, with its media type.
+
+    Raises:
+        - HTTPException (404): If the content is not found.
+    """
+    etag = f'"{sha256}"'
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag, "Cache-Control": IMMUTABLE})
+    path, asset = get_asset_file(db, sha256)
+    inline = name is None and is_inline_media_type(asset.content_type)
+    return FileResponse(
+        path,
+        media_type=asset.content_type,
+        filename=None if inline else name or sha256,
+        content_disposition_type="inline" if inline else "attachment",
+        headers={"ETag": etag, "Cache-Control": IMMUTABLE, "X-Content-Type-Options": "nosniff"},
+    )
@@ -3,12 +3,14 @@ from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 from datetime import timedelta
 from db.database import db_instance  # Se mantiene db_instance, pero se usa su método get_session()
+from db.unit_of_work import UnitOfWorkRoute
 from schemas.user import UserCreate
-from services.user_service import registrer_user, authenticate_user, create_access_token
+from services.user_service import registrer_user, authenticate_user, create_access_token, get_current_token_claims
+from services.revocation_service import revoke_access_token
 from core.config import settings
 
 # Create an instance of a router to handle authentication routes
-router = APIRouter(prefix="/auth", tags=["Authentication"])
+router = APIRouter(prefix="/auth", tags=["Authentication"], route_class=UnitOfWorkRoute)
 
 # Register a new user
 @router.post("/register", status_code=status.HTTP_201_CREATED)
@@ -73,7 +75,31 @@ def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depend
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     
     # Creates an access token using the user's ID
-    access_token = create_access_token(data={"sub": str(user.id)}, expires_delta=access_token_expires)
+    access_token = create_access_token(data={"user_id": user.id}, expires_delta=access_token_expires)
     
     # Returns the access token
     return {"access_token": access_token, "token_type": "bearer"}
+
+# Revoke the current access token
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+def logout(claims: dict = Depends(get_current_token_claims), db: Session = Depends(db_instance.get_session)):
+    """
+    Logs out the current user by revoking the access token used for this request.
+
+    The token ID is stored until the token expires and broadcast to every API worker,
+    which then reject the token without querying the database on each request.
+
+    Parameters:
+        - claims (dict): The claims of the current access token.
+        - db (Session): Database session provided by `get_session`.
+
+    Returns:
+        - None: Returns no content once the token is revoked.
+
+    Raises:
+        - HTTPException (400): If the token has no ID (issued before revocation was supported).
+        - HTTPException (401): If the token is invalid or already revoked.
+    """
+    if "jti" not in claims:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="This token cannot be revoked")
+    revoke_access_token(db, claims)
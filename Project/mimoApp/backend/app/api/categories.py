@@ -0,0 +1,80 @@
+from typing import Optional
+from fastapi import APIRouter, Depends, Query, status
+from sqlalchemy.orm import Session
+from db.database import db_instance
+from db.unit_of_work import UnitOfWorkRoute
+from models.user import User
+from schemas.category import CategoryCreate, CategoryResponse, CategoryCoursesPage
+from services.user_service import get_current_user
+from services.category_service import add_category, list_categories, list_category_courses
+
+router = APIRouter(prefix="/categories", tags=["Categories"], route_class=UnitOfWorkRoute)
+
+# Create a new category
+@router.post("/", response_model=CategoryResponse, status_code=status.HTTP_201_CREATED)
+def create_category(
+    category: CategoryCreate,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(db_instance.get_session),
+):
+    """
+    Creates a new course category, optionally nested under a parent category.
+
+    Parameters:
+        - category (CategoryCreate): The name and optional parent of the category.
+        - current_user (User): The current authenticated user obtained from the token.
+        - db (Session): Database session provided by `get_session`.
+
+    Returns:
+        - CategoryResponse: The created category.
+
+    Raises:
+        - HTTPException (404): If the parent category does not exist.
+        - HTTPException (409): If the name is already taken.
+    """
+    return add_category(db, category)
+
+# Get all categories
+@router.get("/", response_model=list[CategoryResponse])
+def get_categories(db: Session = Depends(db_instance.get_session)):
+    """
+    Retrieves all categories with their course counts.
+
+    Counts come from counters maintained whenever a course is created, moved or
+    deleted, so no courses are counted on this request.
+
+    Parameters:
+        - db (Session): Database session provided by `get_session`.
+
+    Returns:
+        - list[CategoryResponse]: The categories, ordered by name.
+    """
+    return list_categories(db)
+
+# Browse the courses of a category
+@router.get("/{category_id}/courses", response_model=CategoryCoursesPage)
+def get_category_courses(
+    category_id: int,
+    after_id: Optional[int] = Query(None, description="Cursor returned with the previous page"),
+    limit: int = Query(20, ge=1, le=100, description="Number of courses per page"),
+    db: Session = Depends(db_instance.get_session),
+):
+    """
+    Retrieves the courses of a category, one page at a time.
+
+    Uses keyset pagination over the `(category_id, id)` index: pass the returned
+    `next_after_id` as `after_id` to get the following page.
+
+    Parameters:
+        - category_id (int): The ID of the category.
+        - after_id (int, optional): The cursor of the page to read.
+        - limit (int): The page size.
+        - db (Session): Database session provided by `get_session`.
+
+    Returns:
+        - CategoryCoursesPage: The courses and the cursor of the next page.
+
+    Raises:
+        - HTTPException (404): If the category does not exist.
+    """
+    return list_category_courses(db, category_id, after_id, limit)
@@ -1,16 +1,30 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
 from sqlalchemy.orm import Session
 from db.database import db_instance  
-from schemas.course import CourseCreate, CourseUpdate, CourseResponse
+from db.unit_of_work import UnitOfWorkRoute
+from schemas.course import CourseCreate, CourseUpdate, CourseResponse, CourseBatchResponse, CatalogCourse, RecommendedCourse
 from services.course_service import (
     add_course,
-    list_course,
     get_course,
-    update_course,
-    delete_course,
+    get_courses_batch,
+    update_course_details as change_course,
+    remove_course,
 )
+from services.catalog_service import current_catalog_snapshot, list_catalog
+from core.etag import etag_matches
+from core.batch import batch_ids
+from models.user import User
+from schemas.review import ReviewCreate, ReviewResponse, TopRatedCourse
+from services.user_service import get_current_user
+from services.review_service import add_review, list_reviews, list_top_rated_courses
+from services.recommendation_service import list_recommendations
+from schemas.Lesson import LessonOutlineItem, LessonReorder
+from services.Lesson_services import list_lesson_outline, reorder_lessons
+from schemas.enrollment import EnrollmentResponse
+from services.enrollment_service import enroll, unenroll
 
-router = APIRouter(prefix="/courses", tags=["Courses"])
+router = APIRouter(prefix="/courses", tags=["Courses"], route_class=UnitOfWorkRoute)
 
 # Create a new course
 @router.post("/", response_model=CourseResponse, status_code=status.HTTP_201_CREATED)
@@ -28,25 +42,104 @@ def create_course(course: CourseCreate, db: Session = Depends(db_instance.get_se
         
     Returns:
         - CourseResponse: The details of the newly created course.
+
+    Raises:
+        - HTTPException (404): If the category does not exist.
     """
     return add_course(db, course)
 
 # Get all courses
-@router.get("/", response_model=list[CourseResponse])
-def get_all_courses(db: Session = Depends(db_instance.get_session)):  # Se usa get_session
+@router.get("/", response_model=list[CatalogCourse])
+def get_all_courses(
+    accept_encoding: Optional[str] = Header(None),
+    if_none_match: Optional[str] = Header(None),
+    db: Session = Depends(db_instance.get_session),
+):
     """
-    Retrieves the list of all courses.
+    Retrieves the catalog of all courses.
     
-    This endpoint returns a list of all courses present in the system. 
-    The courses will be retrieved from the database.
+    This endpoint returns every course present in the system with the titles of its
+    lessons. The catalog is served from the latest snapshot (see
+    `services.catalog_service`): precompressed JSON mapped in memory, sent gzip or brotli
+    encoded when the client accepts it, with an ETag answering `If-None-Match` with 304.
+    The snapshot is rebuilt a few seconds after courses or lessons change; until then
+    (and until a first snapshot is published, or after a rebuild failed for good) the
+    catalog is read from the database, so a write is visible to the next request.
+    Otherwise the only queries check the state of the rebuild jobs.
     
     Parameters:
+        - accept_encoding (str, optional): The encodings the client accepts.
+        - if_none_match (str, optional): The ETag of the catalog the client already has.
         - db (Session): Database session provided by `get_session`.
         
     Returns:
-        - list[CourseResponse]: A list of all courses in the system.
+        - list[CatalogCourse]: All the courses in the system, with their lessons.
+
+    Example response:
+        [{"id": 1, "title": "Introduction to FastAPI", "description": "...", "category_id": 3,
+          "lessons": [{"id": 4, "title": "Path parameters"}]}]
+    """
+    snapshot = current_catalog_snapshot(db)
+    if snapshot is None:
+        return list_catalog(db)
+
+    encoding, body = snapshot.select(accept_encoding)
+    headers = {"ETag": snapshot.etag(encoding), "Cache-Control": "public, no-cache", "Vary": "Accept-Encoding"}
+    if etag_matches(if_none_match, headers["ETag"]):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    if encoding != "identity":
+        headers["Content-Encoding"] = encoding
+    # The memoryview is a slice of the mapped file: the body is never copied in Python
+    return Response(content=body, media_type="application/json", headers=headers)
+
+# Get several courses by their IDs
+@router.get("/batch", response_model=CourseBatchResponse)
+def get_courses(ids: list[int] = Depends(batch_ids), db: Session = Depends(db_instance.get_session)):
+    """
+    Retrieves several courses by their IDs in a single request.
+
+    All the requested ids are resolved with one database query, instead of one
+    `GET /courses/{course_id}` call per id. Courses are returned in the order of the
+    requested ids, and the ids that do not match any course are reported in `missing`.
+
+    Parameters:
+        - ids (str): Comma separated course ids, e.g. `?ids=1,42` (at most `MAX_BATCH_SIZE`).
+        - db (Session): Database session provided by `get_session`.
+
+    Returns:
+        - CourseBatchResponse: The courses found and the missing ids.
+
+    Raises:
+        - HTTPException (400): If no ids are given, an id is not an integer or the batch is too large.
+
+    Example response:
+        {"items": [{"id": 1, "title": "Introduction to FastAPI", "description": "..."}], "missing": [42]}
+    """
+    return get_courses_batch(db, ids)
+
+# Get the top rated courses
+@router.get("/top-rated", response_model=list[TopRatedCourse])
+def get_top_rated_courses(
+    limit: int = Query(20, ge=1, le=100, description="Number of courses per page"),
+    offset: int = Query(0, ge=0, description="Number of courses to skip"),
+    db: Session = Depends(db_instance.get_session),
+):
+    """
+    Retrieves the courses ranked by rating.
+
+    The ranking uses a Bayesian weighted rating, so courses with only a few reviews are
+    pulled towards `REVIEW_PRIOR_MEAN`. Scores are precomputed whenever a review changes
+    and read in index order, so no aggregation runs on this request.
+
+    Parameters:
+        - limit (int): The page size.
+        - offset (int): The number of courses to skip.
+        - db (Session): Database session provided by `get_session`.
+
+    Returns:
+        - list[TopRatedCourse]: The ranked courses, best first.
     """
-    return list_course(db)
+    return list_top_rated_courses(db, limit, offset)
 
 # Get a specific course by ID
 @router.get("/{course_id}", response_model=CourseResponse)
@@ -86,8 +179,11 @@ def update_course_details(course_id: int, course_data: CourseUpdate, db: Session
         
     Returns:
         - CourseResponse: The updated course details.
+
+    Raises:
+        - HTTPException (404): If the course or the new category does not exist.
     """
-    course = update_course(db, course_id, course_data)
+    course = change_course(db, course_id, course_data)
     if not course:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Course not found")
     return course
@@ -108,5 +204,180 @@ def delete_course_item(course_id: int, db: Session = Depends(db_instance.get_ses
     Returns:
         - None: Returns no content upon successful deletion.
     """
-    if not delete_course(db, course_id):
+    if not remove_course(db, course_id):
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Course not found")
+
+# Review a course
+@router.post("/{course_id}/reviews", response_model=ReviewResponse, status_code=status.HTTP_201_CREATED)
+def create_course_review(
+    course_id: int,
+    review: ReviewCreate,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(db_instance.get_session),
+):
+    """
+    Reviews a course as the current user.
+
+    The course's running rating aggregates and ranking score are updated in the same
+    transaction as the review.
+
+    Parameters:
+        - course_id (int): The ID of the course to review.
+        - review (ReviewCreate): The rating (1 to 5) and an optional comment.
+        - current_user (User): The current authenticated user obtained from the token.
+        - db (Session): Database session provided by `get_session`.
+
+    Returns:
+        - ReviewResponse: The created review.
+
+    Raises:
+        - HTTPException (404): If the course does not exist.
+        - HTTPException (409): If the user already reviewed this course.
+    """
+    return add_review(db, current_user.id, course_id, review)
+
+# Get the reviews of a course
+@router.get("/{course_id}/reviews", response_model=list[ReviewResponse])
+def get_course_reviews(
+    course_id: int,
+    limit: int = Query(20, ge=1, le=100, description="Number of reviews per page"),
+    offset: int = Query(0, ge=0, description="Number of reviews to skip"),
+    db: Session = Depends(db_instance.get_session),
+):
+    """
+    Retrieves the reviews of a course, newest first.
+
+    Parameters:
+        - course_id (int): The ID of the course.
+        - limit (int): The page size.
+        - offset (int): The number of reviews to skip.
+        - db (Session): Database session provided by `get_session`.
+
+    Returns:
+        - list[ReviewResponse]: The reviews of the course.
+    """
+    return list_reviews(db, course_id, limit, offset)
+
+# Get the courses recommended on a course page
+@router.get("/{course_id}/recommendations", response_model=list[RecommendedCourse])
+def get_course_recommendations(
+    course_id: int,
+    limit: int = Query(10, ge=1, le=50, description="Maximum number of recommendations"),
+    db: Session = Depends(db_instance.get_session),
+):
+    """
+    Retrieves the courses taken by the learners of this course ("also took...").
+
+    Recommendations are precomputed by the batch job in `services.recommendation_service`
+    and read here by primary key, so this endpoint costs a single indexed query. Courses
+    not processed yet return an empty list.
+
+    Parameters:
+        - course_id (int): The ID of the course.
+        - limit (int): The maximum number of recommendations.
+        - db (Session): Database session provided by `get_session`.
+
+    Returns:
+        - list[RecommendedCourse]: The recommended courses, most similar first.
+    """
+    return list_recommendations(db, course_id, limit)
+
+# Get the ordered lesson outline of a course
+@router.get("/{course_id}/lessons", response_model=list[LessonOutlineItem])
+def get_course_lessons(course_id: int, db: Session = Depends(db_instance.get_session)):
+    """
+    Retrieves the lessons of a course in course order (id, title and rank only).
+
+    The outline is read from the `(course_id, rank, id)` index, which also carries the
+    title, so the lessons table itself is not touched on PostgreSQL.
+
+    Parameters:
+        - course_id (int): The ID of the course.
+        - db (Session): Database session provided by `get_session`.
+
+    Returns:
+        - list[LessonOutlineItem]: The lessons of the course, in order.
+
+    Raises:
+        - HTTPException (404): If the course is not found.
+
+    Example response:
+        [
+            {"id": 3, "title": "Variables", "rank": "9"},
+            {"id": 7, "title": "Loops", "rank": "i"}
+        ]
+    """
+    return list_lesson_outline(db, course_id)
+
+# Reorder the lessons of a course
+@router.patch("/{course_id}/lessons/order", response_model=list[LessonOutlineItem])
+def reorder_course_lessons(course_id: int, reorder: LessonReorder, db: Session = Depends(db_instance.get_session)):
+    """
+    Moves one or more lessons within their course.
+
+    Each move places `lesson_id` right after `after_id` (or first when `after_id` is null)
+    and is applied in order. Only the moved lessons get a new rank key, and all of them
+    are written with a single statement.
+
+    Parameters:
+        - course_id (int): The ID of the course.
+        - reorder (LessonReorder): The moves to apply.
+        - db (Session): Database session provided by `get_session`.
+
+    Returns:
+        - list[LessonOutlineItem]: The new order of the lessons.
+
+    Raises:
+        - HTTPException (400): If a move refers to a lesson of another course, or there are too many moves.
+        - HTTPException (404): If the course is not found.
+
+    Example request:
+        {"moves": [{"lesson_id": 7, "after_id": null}, {"lesson_id": 12, "after_id": 3}]}
+    """
+    return reorder_lessons(db, course_id, reorder.moves)
+
+# Enroll the current user in a course
+@router.post("/{course_id}/enrollment", response_model=EnrollmentResponse, status_code=status.HTTP_201_CREATED)
+def enroll_in_course(
+    course_id: int,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(db_instance.get_session),
+):
+    """
+    Enrolls the current user in a course. Enrolling again returns the existing enrollment.
+
+    Parameters:
+        - course_id (int): The ID of the course.
+        - current_user (User): The current authenticated user obtained from the token.
+        - db (Session): Database session provided by `get_session`.
+
+    Returns:
+        - EnrollmentResponse: The enrollment.
+
+    Raises:
+        - HTTPException (404): If the course is not found.
+    """
+    return enroll(db, current_user.id, course_id)
+
+# Unenroll the current user from a course
+@router.delete("/{course_id}/enrollment", status_code=status.HTTP_204_NO_CONTENT)
+def leave_course(
+    course_id: int,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(db_instance.get_session),
+):
+    """
+    Removes the current user's enrollment in a course.
+
+    Parameters:
+        - course_id (int): The ID of the course.
+        - current_user (User): The current authenticated user obtained from the token.
+        - db (Session): Database session provided by `get_session`.
+
+    Returns:
+        - None: Returns no content once the enrollment is removed.
+
+    Raises:
+        - HTTPException (404): If the user is not enrolled in the course.
+    """
+    unenroll(db, current_user.id, course_id)
@@ -0,0 +1,84 @@
+from typing import Literal, Optional
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import JSONResponse, PlainTextResponse
+from db.unit_of_work import UnitOfWorkRoute
+from models.user import User
+from services.user_service import get_current_admin
+from services.profile_service import list_profiles, get_profile
+
+router = APIRouter(prefix="/debug", tags=["Debug"], route_class=UnitOfWorkRoute)
+
+# List the recorded request profiles
+@router.get("/profiles")
+def get_profiles(
+    path: Optional[str] = Query(None, description="Only requests whose path starts with this"),
+    limit: int = Query(50, ge=1, le=500, description="Number of profiles to return"),
+    admin: User = Depends(get_current_admin),
+):
+    """
+    Lists the recorded request profiles, newest first.
+
+    Requests are profiled when they send the `X-Profile` header with the configured
+    `PROFILER_TOKEN`, or at random with `PROFILER_SAMPLE_RATE`; their response carries
+    the profile ID in `X-Profile-Id`. Each summary gives the time spent in every
+    repository and service function (`spans`) and in every top level package such as
+    `sqlalchemy`, `pydantic` or `bcrypt` (`packages`). `(waiting)` is the time the
+    request ran nowhere it could be sampled: awaiting I/O or a free thread, or running
+    in the threadpool outside of the endpoint and the dependencies wrapped with
+    `core.profiler.attribute_thread`.
+
+    Parameters:
+        - path (str, optional): Path prefix filter, e.g. `/courses`.
+        - limit (int): Number of profiles to return.
+        - admin (User): The current user, who must be an administrator.
+
+    Returns:
+        - list[dict]: The profile summaries.
+
+    Raises:
+        - HTTPException (403): If the current user is not an administrator.
+
+    Example response:
+        [{"id": "3f1c...", "method": "POST", "path": "/auth/login", "status": 200, "duration_ms": 252.4,
+          "samples": 50, "spans": {"services.user_service:verify_password [service]": 230.0},
+          "packages": {"bcrypt": 230.0, "sqlalchemy": 10.0, "(waiting)": 5.0}}]
+    """
+    return list_profiles(path, limit)
+
+# Get one request profile
+@router.get("/profiles/{profile_id}")
+def get_single_profile(
+    profile_id: str,
+    format: Literal["json", "collapsed", "speedscope"] = Query("json", description="Export format"),
+    admin: User = Depends(get_current_admin),
+):
+    """
+    Retrieves a recorded request profile.
+
+    `collapsed` returns one `frame;frame;frame count` line per stack, the input of
+    flamegraph.pl and inferno. `speedscope` returns a file to open in
+    https://www.speedscope.app to explore the flame graph.
+
+    Parameters:
+        - profile_id (str): The ID of the profile.
+        - format (str): 'json', 'collapsed' or 'speedscope'.
+        - admin (User): The current user, who must be an administrator.
+
+    Returns:
+        - dict: The profile, with its aggregated stacks.
+        - text/plain: The collapsed stacks, with `format=collapsed`.
+        - application/json: A speedscope file, with `format=speedscope`.
+
+    Raises:
+        - HTTPException (403): If the current user is not an administrator.
+        - HTTPException (404): If the profile does not exist.
+    """
+    profile = get_profile(profile_id, format)
+    if format == "collapsed":
+        return PlainTextResponse(profile)
+    if format == "speedscope":
+        return JSONResponse(
+            profile,
+            headers={"Content-Disposition": f'attachment; filename="profile-{profile_id}.speedscope.json"'},
+        )
+    return profile
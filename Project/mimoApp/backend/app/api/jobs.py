@@ -0,0 +1,52 @@
+from fastapi import APIRouter, Depends, status
+from sqlalchemy.orm import Session
+from db.database import db_instance
+from db.unit_of_work import UnitOfWorkRoute
+from models.user import User
+from schemas.job import JobCreate, JobResponse
+from services.user_service import get_current_admin
+from services.job_service import submit_job, get_job_status
+
+router = APIRouter(prefix="/jobs", tags=["Jobs"], route_class=UnitOfWorkRoute)
+
+# Enqueue a background job
+@router.post("/", response_model=JobResponse, status_code=status.HTTP_202_ACCEPTED)
+def create_job(job: JobCreate, admin: User = Depends(get_current_admin), db: Session = Depends(db_instance.get_session)):
+    """
+    Enqueues a background job.
+
+    The job is executed by the job worker (`python worker.py`) in its process pool, so
+    heavy work never runs inside an API worker. Poll `GET /jobs/{job_id}` to follow it.
+
+    Parameters:
+        - job (JobCreate): The job type, its payload, priority and allowed attempts.
+        - admin (User): The current user, who must be an administrator.
+        - db (Session): Database session provided by `get_session`.
+
+    Returns:
+        - JobResponse: The queued job.
+
+    Raises:
+        - HTTPException (400): If the job type is unknown.
+        - HTTPException (403): If the current user is not an administrator.
+    """
+    return submit_job(db, job.kind, job.payload, job.priority, job.max_attempts)
+
+# Get the status of a job
+@router.get("/{job_id}", response_model=JobResponse)
+def read_job(job_id: int, admin: User = Depends(get_current_admin), db: Session = Depends(db_instance.get_session)):
+    """
+    Retrieves the status of a background job.
+
+    Parameters:
+        - job_id (int): The ID of the job.
+        - admin (User): The current user, who must be an administrator.
+        - db (Session): Database session provided by `get_session`.
+
+    Returns:
+        - JobResponse: The job, with its result or last error.
+
+    Raises:
+        - HTTPException (404): If the job does not exist.
+    """
+    return get_job_status(db, job_id)
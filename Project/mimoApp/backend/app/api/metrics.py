@@ -0,0 +1,23 @@
+from fastapi import APIRouter, status
+from db.unit_of_work import UnitOfWorkRoute
+from core.metrics import metrics_snapshot
+
+router = APIRouter(prefix="/metrics", tags=["Metrics"], route_class=UnitOfWorkRoute)
+
+# Get the in-process metrics of the running worker
+@router.get("/", status_code=status.HTTP_200_OK)
+def get_metrics():
+    """
+    Retrieves the in-process metrics of this API worker.
+
+    Every subsystem that publishes counters (for example the request coalescing of the
+    course and lesson services) registers itself in `core.metrics`, and this endpoint
+    returns all of them. Values are per worker process.
+
+    Returns:
+        - dict: The metrics grouped by source name.
+
+    Example response:
+        {"singleflight.courses": {"requests": 120, "executions": 4, "shared": 116, "coalescing_ratio": 0.9667, "in_flight": 0}}
+    """
+    return metrics_snapshot()
@@ -0,0 +1,152 @@
+import asyncio
+import json
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, WebSocket, WebSocketDisconnect, status
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session
+from db.database import db_instance
+from db.unit_of_work import UnitOfWorkRoute
+from models.user import User
+from schemas.notification import NotificationResponse
+from services.user_service import get_current_user
+from services.notification_service import notification_hub, list_notifications, read_notification
+from core.config import settings
+
+router = APIRouter(prefix="/notifications", tags=["Notifications"], route_class=UnitOfWorkRoute)
+
+def _socket_user_id(token: str) -> int:
+    """
+    Resolves the user of a WebSocket token like `get_current_user` does for requests:
+    the token must be valid and not revoked, and its user must still exist.
+    """
+    with db_instance.session_scope() as db:
+        return get_current_user(db, token).id
+
+# List the current user's notifications
+@router.get("/", response_model=list[NotificationResponse], status_code=status.HTTP_200_OK)
+def get_my_notifications(
+    limit: int = Query(50, ge=1, le=200, description="Maximum number of notifications to return"),
+    before_id: Optional[int] = Query(None, description="Only return notifications older than this ID"),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(db_instance.get_session),
+):
+    """
+    Retrieves the persisted notifications of the current user, newest first.
+
+    Clients call this once when they connect, to catch up on what they missed, and
+    then rely on the `/notifications/stream` or `/notifications/ws` push channels.
+
+    Parameters:
+        - limit (int): The page size.
+        - before_id (int, optional): Keyset cursor, the ID of the last notification already shown.
+        - current_user (User): The current authenticated user obtained from the token.
+        - db (Session): Database session provided by `get_session`.
+
+    Returns:
+        - list[NotificationResponse]: The user's notifications.
+    """
+    return list_notifications(db, current_user.id, limit, before_id)
+
+# Mark a notification as read
+@router.post("/{notification_id}/read", response_model=NotificationResponse, status_code=status.HTTP_200_OK)
+def mark_as_read(
+    notification_id: int,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(db_instance.get_session),
+):
+    """
+    Marks one of the current user's notifications as read.
+
+    Parameters:
+        - notification_id (int): The ID of the notification.
+        - current_user (User): The current authenticated user obtained from the token.
+        - db (Session): Database session provided by `get_session`.
+
+    Returns:
+        - NotificationResponse: The updated notification.
+
+    Raises:
+        - HTTPException (404): If the notification does not exist or belongs to another user.
+    """
+    notification = read_notification(db, notification_id, current_user.id)
+    if notification is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Notification not found")
+    return notification
+
+# Push new notifications with Server-Sent Events
+@router.get("/stream")
+async def stream_notifications(current_user: User = Depends(get_current_user)):
+    """
+    Streams the current user's new notifications as Server-Sent Events.
+
+    The connection does not hold a database connection: messages come from the
+    worker's single LISTEN connection and are fanned out in memory. A comment line is
+    sent every `NOTIFICATION_HEARTBEAT_SECONDS` to keep proxies from closing the stream.
+    Clients that fall more than `NOTIFICATION_QUEUE_SIZE` messages behind are dropped
+    and should reconnect (and catch up with `GET /notifications`).
+
+    Parameters:
+        - current_user (User): The current authenticated user obtained from the token.
+
+    Returns:
+        - StreamingResponse: A `text/event-stream` with one `notification` event per message.
+    """
+    user_id = current_user.id
+
+    async def events():
+        subscription = notification_hub.subscribe(user_id)
+        try:
+            while True:
+                try:
+                    message = await asyncio.wait_for(subscription.get(), settings.NOTIFICATION_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                if message is None:
+                    break  # Dropped for being too slow
+                yield f"event: notification\ndata: {json.dumps(message)}\n\n"
+        finally:
+            notification_hub.unsubscribe(subscription)
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+# Push new notifications over a WebSocket
+@router.websocket("/ws")
+async def notifications_socket(websocket: WebSocket, token: str = Query(..., description="JWT access token")):
+    """
+    Pushes the new notifications of the token's user over a WebSocket.
+
+    Browsers cannot set the `Authorization` header on WebSockets, so the access token is
+    passed as the `token` query parameter. The connection is closed with code 1008
+    (policy violation) if the token is invalid or revoked or its user no longer exists.
+    Slow clients are disconnected with code 1013 (try again later).
+
+    Parameters:
+        - websocket (WebSocket): The client connection.
+        - token (str): The JWT access token.
+    """
+    try:
+        # Runs in the threadpool: the user lookup and the revocation check query the database
+        user_id = await run_in_threadpool(_socket_user_id, token)
+    except HTTPException:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    await websocket.accept()
+    subscription = notification_hub.subscribe(user_id)
+    try:
+        while True:
+            try:
+                message = await asyncio.wait_for(subscription.get(), settings.NOTIFICATION_HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                await websocket.send_json({"type": "ping"})
+                continue
+            if message is None:
+                await websocket.close(code=status.WS_1013_TRY_AGAIN_LATER)
+                break
+            await websocket.send_json({"type": "notification", "data": message})
+    except WebSocketDisconnect:
+        pass
+    finally:
+        notification_hub.unsubscribe(subscription)
@@ -0,0 +1,97 @@
+from datetime import datetime
+from typing import Optional
+from fastapi import APIRouter, Depends, Query, status
+from sqlalchemy.orm import Session
+from db.database import db_instance
+from db.unit_of_work import UnitOfWorkRoute
+from models.user import User
+from schemas.progress import ProgressCreate, ProgressResponse, ActivityEventResponse
+from services.user_service import get_current_user
+from services.progress_service import report_progress, list_progress, list_activity
+
+router = APIRouter(prefix="/progress", tags=["Progress"], route_class=UnitOfWorkRoute)
+
+# Report progress on a lesson
+@router.post("/", response_model=ProgressResponse, status_code=status.HTTP_201_CREATED)
+def create_progress(
+    progress: ProgressCreate,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(db_instance.get_session),
+):
+    """
+    Records the current user's progress on a lesson.
+
+    Progress reports are appended (never updated) to a table partitioned by month,
+    together with an entry of the user's activity log.
+
+    Parameters:
+        - progress (ProgressCreate): The lesson and its completion percentage.
+        - current_user (User): The current authenticated user obtained from the token.
+        - db (Session): Database session provided by `get_session`.
+
+    Returns:
+        - ProgressResponse: The recorded progress.
+
+    Raises:
+        - HTTPException (404): If the lesson is not found.
+    """
+    return report_progress(db, current_user.id, progress.lesson_id, progress.completion_percentage)
+
+# List the current user's progress
+@router.get("/", response_model=list[ProgressResponse])
+def get_my_progress(
+    course_id: Optional[int] = Query(None, description="Only the lessons of this course"),
+    since: Optional[datetime] = Query(None, description="Start of the window (default: 30 days ago)"),
+    until: Optional[datetime] = Query(None, description="End of the window (default: now)"),
+    latest: bool = Query(False, description="Only the most recent report of each lesson"),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(db_instance.get_session),
+):
+    """
+    Retrieves the current user's progress reports within a time window.
+
+    The window bounds the partition key, so only the partitions of the months it
+    overlaps are read.
+
+    Parameters:
+        - course_id (int, optional): Restrict to one course.
+        - since (datetime, optional): Start of the window.
+        - until (datetime, optional): End of the window.
+        - latest (bool): Only the most recent report of each lesson.
+        - current_user (User): The current authenticated user obtained from the token.
+        - db (Session): Database session provided by `get_session`.
+
+    Returns:
+        - list[ProgressResponse]: The progress reports, newest first (by lesson when `latest`).
+
+    Raises:
+        - HTTPException (400): If the window is empty or longer than `PROGRESS_MAX_WINDOW_DAYS`.
+    """
+    return list_progress(db, current_user.id, since, until, course_id, latest)
+
+# List the current user's activity
+@router.get("/activity", response_model=list[ActivityEventResponse])
+def get_my_activity(
+    since: Optional[datetime] = Query(None, description="Start of the window (default: 30 days ago)"),
+    until: Optional[datetime] = Query(None, description="End of the window (default: now)"),
+    limit: int = Query(100, ge=1, le=500, description="Maximum number of events"),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(db_instance.get_session),
+):
+    """
+    Retrieves the current user's activity events within a time window, newest first.
+
+    Parameters:
+        - since (datetime, optional): Start of the window.
+        - until (datetime, optional): End of the window.
+        - limit (int): The maximum number of events.
+        - current_user (User): The current authenticated user obtained from the token.
+        - db (Session): Database session provided by `get_session`.
+
+    Returns:
+        - list[ActivityEventResponse]: The activity events.
+
+    Raises:
+        - HTTPException (400): If the window is empty or longer than `PROGRESS_MAX_WINDOW_DAYS`.
+    """
+    return list_activity(db, current_user.id, since, until, limit)
@@ -0,0 +1,61 @@
+from fastapi import APIRouter, Depends, status
+from sqlalchemy.orm import Session
+from db.database import db_instance
+from db.unit_of_work import UnitOfWorkRoute
+from models.user import User
+from schemas.review import ReviewUpdate, ReviewResponse
+from services.user_service import get_current_user
+from services.review_service import modify_review, remove_review
+
+router = APIRouter(prefix="/reviews", tags=["Reviews"], route_class=UnitOfWorkRoute)
+
+# Update a review
+@router.put("/{review_id}", response_model=ReviewResponse)
+def update_review_details(
+    review_id: int,
+    review: ReviewUpdate,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(db_instance.get_session),
+):
+    """
+    Updates one of the current user's reviews.
+
+    The course's rating aggregates are adjusted in the same transaction.
+
+    Parameters:
+        - review_id (int): The ID of the review to update.
+        - review (ReviewUpdate): The new rating and/or comment.
+        - current_user (User): The current authenticated user obtained from the token.
+        - db (Session): Database session provided by `get_session`.
+
+    Returns:
+        - ReviewResponse: The updated review.
+
+    Raises:
+        - HTTPException (404): If the review does not exist.
+        - HTTPException (403): If the review belongs to another user.
+    """
+    return modify_review(db, review_id, current_user.id, review)
+
+# Delete a review
+@router.delete("/{review_id}", status_code=status.HTTP_204_NO_CONTENT)
+def delete_review_item(
+    review_id: int,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(db_instance.get_session),
+):
+    """
+    Deletes one of the current user's reviews.
+
+    The course's rating aggregates are adjusted in the same transaction.
+
+    Parameters:
+        - review_id (int): The ID of the review to delete.
+        - current_user (User): The current authenticated user obtained from the token.
+        - db (Session): Database session provided by `get_session`.
+
+    Raises:
+        - HTTPException (404): If the review does not exist.
+        - HTTPException (403): If the review belongs to another user.
+    """
+    remove_review(db, review_id, current_user.id)
@@ -0,0 +1,41 @@
+from typing import Optional
+from fastapi import APIRouter, Depends, Query, status
+from sqlalchemy.orm import Session
+from db.database import db_instance
+from db.unit_of_work import UnitOfWorkRoute
+from schemas.sync import ChangesResponse
+from services.sync_service import list_changes
+
+router = APIRouter(prefix="/sync", tags=["Sync"], route_class=UnitOfWorkRoute)
+
+# Get the catalog changes since a sync token
+@router.get("/changes", response_model=ChangesResponse, status_code=status.HTTP_200_OK)
+def get_changes(
+    since: Optional[str] = Query(None, description="Token returned by the previous call; omit it for a full sync"),
+    limit: Optional[int] = Query(None, ge=1, description="Maximum number of changes in this page"),
+    db: Session = Depends(db_instance.get_session),
+):
+    """
+    Retrieves the courses and lessons created, updated or deleted since a sync token.
+
+    Clients store the returned `next_token` and send it back as `since` on the next
+    call, so only what changed is transferred. While `has_more` is true the client
+    should keep calling right away to page through a large delta. A change shows up
+    once every write transaction that started before it has ended.
+
+    Parameters:
+        - since (str, optional): The token returned by the previous call.
+        - limit (int, optional): The page size, capped at `SYNC_PAGE_SIZE`.
+        - db (Session): Database session provided by `get_session`.
+
+    Returns:
+        - ChangesResponse: The changes, the continuation token and `has_more`.
+
+    Raises:
+        - HTTPException (400): If the token is malformed.
+
+    Example response:
+        {"changes": [{"entity": "lesson", "op": "delete", "id": 7, "seq": 1042, "data": null}],
+         "next_token": "48213:1042", "has_more": false}
+    """
+    return list_changes(db, since, limit)
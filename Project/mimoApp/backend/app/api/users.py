@@ -1,12 +1,17 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from models.user import User  # Assuming you have a SQLAlchemy model named User
-from schemas.user import UserResponse, UserCreate  # Pydantic schemas for user data
-from services.user_service import get_current_user, registrer_user, get_user_by_id
+from schemas.user import UserResponse, UserCreate, UserBatchResponse  # Pydantic schemas for user data
+from services.user_service import get_current_user, registrer_user, get_user_by_id, get_users_batch
 from db.database import db_instance  # Se importa para usar get_session()
+from db.unit_of_work import UnitOfWorkRoute
+from schemas.dashboard import DashboardResponse
+from services.dashboard_service import get_dashboard
+from core.query_budget import query_budget
+from core.batch import batch_ids
 
 # Create an instance of the APIRouter for managing user-related routes
-router = APIRouter(prefix="/users", tags=["Users"])
+router = APIRouter(prefix="/users", tags=["Users"], route_class=UnitOfWorkRoute)
 
 # Get the current authenticated user's data
 @router.get("/me", response_model=UserResponse, status_code=status.HTTP_200_OK)
@@ -30,6 +35,38 @@ def read_users_me(current_user: User = Depends(get_current_user)):
     # Converts the SQLAlchemy user object to a Pydantic UserResponse model
     return UserResponse.model_validate(current_user)
 
+
+# Get the current user's home screen
+@router.get("/me/dashboard", response_model=DashboardResponse, status_code=status.HTTP_200_OK)
+@query_budget(3)  # The user, a possible revocation check and the dashboard statement
+def read_my_dashboard(current_user: User = Depends(get_current_user), db: Session = Depends(db_instance.get_session)):
+    """
+    Retrieve everything the home screen needs in one call.
+
+    Returns the user, their enrolled courses with the progress per course and the next
+    lesson to take. The data comes from a single SQL statement and is cached per user
+    for `DASHBOARD_CACHE_SECONDS`; the cache is dropped as soon as the user reports
+    progress or changes enrollments.
+
+    Parameters:
+        - current_user (User): The current authenticated user obtained from the token.
+        - db (Session): The database session provided by the `get_session` dependency.
+
+    Returns:
+        - DashboardResponse: The user and their courses.
+
+    Example response:
+        {
+            "user": {"id": 1, "username": "johndoe", "email": "john@example.com"},
+            "courses": [
+                {"id": 4, "title": "Python", "description": "Basics", "completed": false,
+                 "enrolled_at": "2026-09-01T10:00:00Z", "lesson_count": 12, "completed_lessons": 5,
+                 "progress_percentage": 47.5, "next_lesson": {"id": 31, "title": "Loops"}}
+            ]
+        }
+    """
+    return get_dashboard(db, current_user.id)
+
 # Create a new user
 @router.post("/", status_code=status.HTTP_201_CREATED)
 def create_user(user: UserCreate, db: Session = Depends(db_instance.get_session)):  # Se usa get_session()
@@ -55,6 +92,31 @@ def create_user(user: UserCreate, db: Session = Depends(db_instance.get_session)
     
     return {"message": "User Created Successfully", "user": new_user.username}
 
+# Retrieve several users by their IDs
+@router.get("/batch", response_model=UserBatchResponse, status_code=status.HTTP_200_OK)
+def get_users(ids: list[int] = Depends(batch_ids), db: Session = Depends(db_instance.get_session)):
+    """
+    Retrieve several users by their IDs in a single request.
+
+    This endpoint resolves all the requested ids with one database query, instead of
+    one `GET /users/{user_id}` call per id. Users are returned in the order of the
+    requested ids, and the ids that do not match any user are reported in `missing`.
+
+    Parameters:
+        - ids (str): Comma separated user ids, e.g. `?ids=1,7` (at most `MAX_BATCH_SIZE`).
+        - db (Session): The database session provided by the `get_session` dependency.
+
+    Returns:
+        - UserBatchResponse: The users found and the missing ids.
+
+    Raises:
+        - HTTPException (400): If no ids are given or the batch is too large.
+
+    Example response:
+        {"items": [{"id": 1, "username": "johndoe", "email": "john@example.com"}], "missing": [7]}
+    """
+    return get_users_batch(db, ids)
+
 # Retrieve a specific user by their ID
 @router.get("/{user_id}", response_model=UserResponse, status_code=status.HTTP_200_OK)
 def get_user(user_id: int, db: Session = Depends(db_instance.get_session)):  # Se usa get_session()
@@ -0,0 +1,147 @@
+import asyncio
+import json
+import re
+from dataclasses import dataclass, field
+from typing import List, Pattern
+
+
+@dataclass
+class RouteClass:
+    """
+    A group of routes sharing a concurrency budget.
+
+    Attributes:
+        name (str): The name of the class, used in the metrics.
+        limit (int): How many requests of the class may run at once.
+        queue_timeout (float): How long a request may wait for a slot before being shed.
+        max_waiting (int): How many requests may wait at once; further ones are shed immediately.
+        patterns (list[Pattern]): Regular expressions searched in the path; empty matches everything.
+    """
+    name: str
+    limit: int
+    queue_timeout: float
+    max_waiting: int
+    patterns: List[Pattern] = field(default_factory=list)
+    in_flight: int = 0
+    waiting: int = 0
+    admitted: int = 0
+    shed: int = 0
+    _semaphore: asyncio.Semaphore | None = None
+
+    def matches(self, path: str) -> bool:
+        return not self.patterns or any(pattern.search(path) for pattern in self.patterns)
+
+
+class AdmissionController:
+    """
+    Decides which requests run now, which wait and which are shed.
+
+    Every request is assigned to the first matching `RouteClass`. When the class is
+    at its limit the request waits at most `queue_timeout` for a slot, and is rejected
+    right away if `max_waiting` requests are already waiting, so latency stays bounded
+    under overload instead of growing with the backlog. The counters are only touched
+    from the event loop.
+    """
+
+    def __init__(self, classes: List[RouteClass], exempt: List[str], retry_after: int):
+        self.classes = classes
+        self.exempt = [re.compile(pattern) for pattern in exempt]
+        self.retry_after = retry_after
+
+    def classify(self, path: str) -> RouteClass | None:
+        """
+        Returns the class of a path, or None for exempt (long-lived or internal) routes.
+        """
+        if any(pattern.search(path) for pattern in self.exempt):
+            return None
+        return next((route_class for route_class in self.classes if route_class.matches(path)), None)
+
+    async def acquire(self, route_class: RouteClass) -> bool:
+        """
+        Waits for a slot of the class; returns False if the request must be shed.
+        """
+        if route_class._semaphore is None:
+            route_class._semaphore = asyncio.Semaphore(route_class.limit)  # Bound to the running loop
+        semaphore = route_class._semaphore
+        if semaphore.locked():
+            if route_class.waiting >= route_class.max_waiting:
+                route_class.shed += 1
+                return False
+            route_class.waiting += 1
+            try:
+                await asyncio.wait_for(semaphore.acquire(), route_class.queue_timeout)
+            except asyncio.TimeoutError:
+                route_class.shed += 1
+                return False
+            finally:
+                route_class.waiting -= 1
+        else:
+            await semaphore.acquire()
+        route_class.in_flight += 1
+        route_class.admitted += 1
+        return True
+
+    def release(self, route_class: RouteClass) -> None:
+        route_class.in_flight -= 1
+        route_class._semaphore.release()
+
+    def stats(self) -> dict:
+        """
+        Returns the counters of every class, published under `GET /metrics`.
+        """
+        return {
+            route_class.name: {
+                "limit": route_class.limit,
+                "in_flight": route_class.in_flight,
+                "waiting": route_class.waiting,
+                "admitted": route_class.admitted,
+                "shed": route_class.shed,
+            }
+            for route_class in self.classes
+        }
+
+
+async def send_overloaded(send, retry_after: int, detail: str = "Server overloaded, retry later") -> None:
+    """
+    Sends a `503 Service Unavailable` response with a `Retry-After` header.
+    """
+    body = json.dumps({"detail": detail}).encode()
+    await send({
+        "type": "http.response.start",
+        "status": 503,
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+            (b"retry-after", str(retry_after).encode()),
+        ],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+class AdmissionControlMiddleware:
+    """
+    Pure ASGI middleware applying an `AdmissionController` to HTTP requests.
+
+    It runs before the request reaches the threadpool, so shed requests never hold a
+    thread or a database connection. WebSocket and lifespan traffic pass through.
+    """
+
+    def __init__(self, app, controller: AdmissionController):
+        self.app = app
+        self.controller = controller
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        route_class = self.controller.classify(scope["path"])
+        if route_class is None:
+            await self.app(scope, receive, send)
+            return
+        if not await self.controller.acquire(route_class):
+            await send_overloaded(send, self.controller.retry_after)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.controller.release(route_class)
@@ -0,0 +1,94 @@
+from typing import Iterable, List, Optional
+from fastapi import HTTPException, Query, status
+from core.config import settings
+from core.profiler import attribute_thread
+
+
+def parse_id_list(raw_ids: Optional[str]) -> List[int]:
+    """
+    Parses a comma separated list of ids coming from a query string (e.g. `?ids=1,2,3`).
+
+    Args:
+        raw_ids (str | None): The raw value of the query parameter.
+
+    The size cap is checked first, on the raw values: an oversized list is rejected
+    without converting it.
+
+    Returns:
+        List[int]: The parsed ids, in the order they were given.
+
+    Raises:
+        HTTPException (400): If any of the values is not an integer, or there are more
+        than `MAX_BATCH_SIZE` of them.
+    """
+    if not raw_ids:
+        return []
+    values = raw_ids.split(",", settings.MAX_BATCH_SIZE)  # At most one value past the cap
+    if len(values) > settings.MAX_BATCH_SIZE:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"A batch can contain at most {settings.MAX_BATCH_SIZE} ids",
+        )
+    try:
+        return [int(value) for value in values if value.strip()]
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="ids must be a comma separated list of integers")
+
+
+def check_batch_size(ids: List[int]) -> List[int]:
+    """
+    Removes duplicated ids (keeping the first occurrence) and enforces `MAX_BATCH_SIZE`.
+
+    Args:
+        ids (List[int]): The requested ids.
+
+    Returns:
+        List[int]: The unique ids, in request order.
+
+    Raises:
+        HTTPException (400): If no ids are given or there are more than `MAX_BATCH_SIZE`.
+    """
+    unique_ids = list(dict.fromkeys(ids))
+    if not unique_ids:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="At least one id is required")
+    if len(unique_ids) > settings.MAX_BATCH_SIZE:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"A batch can contain at most {settings.MAX_BATCH_SIZE} ids",
+        )
+    return unique_ids
+
+
+@attribute_thread  # Run in the threadpool like the endpoint (see `core.profiler`)
+def batch_ids(
+    ids: str = Query(..., description="Comma separated ids, e.g. `1,2,3` (at most `MAX_BATCH_SIZE`)"),
+) -> List[int]:
+    """
+    FastAPI dependency reading the `?ids=` parameter of the batch endpoints.
+
+    Returns:
+        List[int]: The unique requested ids, in request order.
+
+    Raises:
+        HTTPException (400): If the list is empty, malformed or too large.
+    """
+    return check_batch_size(parse_id_list(ids))
+
+
+def order_by_ids(rows: Iterable, ids: List[int]) -> dict:
+    """
+    Arranges the rows returned by a single `WHERE id IN (...)` query in request order.
+
+    Args:
+        rows (Iterable): The ORM objects returned by the query (each one with an `id`).
+        ids (List[int]): The requested ids, in the order the client sent them.
+
+    Returns:
+        dict: `{"items": [...], "missing": [...]}` where `items` follows the order of `ids`
+        and `missing` lists the ids that were not found.
+    """
+    found = {row.id: row for row in rows}
+    return {
+        "items": [found[i] for i in ids if i in found],
+        "missing": [i for i in ids if i not in found],
+    }
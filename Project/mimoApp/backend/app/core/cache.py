@@ -0,0 +1,88 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable
+
+
+class TTLCache:
+    """
+    Small thread safe in-process cache whose entries expire after `ttl` seconds.
+
+    The least recently used entries are evicted beyond `maxsize`. Entries can be
+    invalidated explicitly when the data they were computed from changes.
+
+    A value computed from the database may be outdated by an invalidation that happens
+    while it is being read. Readers take `generation()` before reading and pass it to
+    `set`, which then drops the value if its key was invalidated in between.
+    """
+
+    def __init__(self, name: str, maxsize: int, ttl: float):
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()  # key -> (expires, value)
+        self._lock = threading.Lock()
+        self._generation = 0  # Number of invalidations so far
+        # Generation of the last invalidation of the recently invalidated keys; keys evicted
+        # from it count as invalidated at `_forgotten_generation`, the latest evicted one
+        self._invalidated: "OrderedDict[Hashable, int]" = OrderedDict()
+        self._forgotten_generation = 0
+        self._stats = {"hits": 0, "misses": 0, "invalidations": 0, "stale_sets": 0}
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Returns the cached value of `key`, or `default` if it is missing or expired.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= time.monotonic():
+                self._entries.pop(key, None)
+                self._stats["misses"] += 1
+                return default
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            return entry[1]
+
+    def generation(self) -> int:
+        """
+        Returns the current generation, to pass to `set` for a value about to be read.
+        """
+        with self._lock:
+            return self._generation
+
+    def set(self, key: Hashable, value: Any, generation: int | None = None) -> None:
+        """
+        Stores `value` under `key` for `ttl` seconds.
+
+        With `generation` (from `generation()` taken before reading the value), nothing is
+        stored if `key` was invalidated since: the value may predate that change.
+        """
+        with self._lock:
+            if generation is not None and self._invalidated.get(key, self._forgotten_generation) > generation:
+                self._stats["stale_sets"] += 1
+                return
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key: Hashable) -> None:
+        """
+        Drops the entry of `key`, if any.
+        """
+        with self._lock:
+            self._generation += 1
+            self._invalidated[key] = self._generation
+            self._invalidated.move_to_end(key)
+            while len(self._invalidated) > self.maxsize:
+                _, forgotten = self._invalidated.popitem(last=False)
+                self._forgotten_generation = max(self._forgotten_generation, forgotten)
+            if self._entries.pop(key, None) is not None:
+                self._stats["invalidations"] += 1
+
+    def stats(self) -> dict:
+        """
+        Returns the cache counters, published under `GET /metrics`.
+        """
+        with self._lock:
+            return dict(self._stats, size=len(self._entries))
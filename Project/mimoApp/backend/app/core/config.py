@@ -6,14 +6,86 @@ class Settings(BaseSettings):
     Global application settings loaded from environment variables or `.env` file.
     """
 
-    DB_USER: str = Field(..., env="DB_USER")
-    DB_PASSWORD: str = Field(..., env="DB_PASSWORD")
-    DB_HOST: str = Field(..., env="DB_HOST")
-    DB_PORT: str = Field(..., env="DB_PORT")
-    DB_NAME: str = Field(..., env="DB_NAME")
+    DB_BACKEND: str = Field(default="postgresql", env="DB_BACKEND")  # 'postgresql', or 'sqlite' for tests and benchmarks
+    DB_SQLITE_PATH: str = Field(default=":memory:", env="DB_SQLITE_PATH")  # SQLite database file, ':memory:' for an in-memory database
+    DB_USER: str | None = Field(default=None, env="DB_USER")  # The DB_* connection settings are required with PostgreSQL
+    DB_PASSWORD: str | None = Field(default=None, env="DB_PASSWORD")
+    DB_HOST: str | None = Field(default=None, env="DB_HOST")
+    DB_PORT: str | None = Field(default=None, env="DB_PORT")
+    DB_NAME: str | None = Field(default=None, env="DB_NAME")
     SECRET_KEY: str = Field(..., env="SECRET_KEY")
     ALGORITHM: str = Field(default="HS256", env="ALGORITHM")
     ACCESS_TOKEN_EXPIRE_MINUTES: int = Field(default=30, env="ACCESS_TOKEN_EXPIRE_MINUTES")
+    DB_MAX_CONNECTIONS: int = Field(default=31, env="DB_MAX_CONNECTIONS")  # Connections the API may open in total, split across its worker processes
+    DB_POOL_TIMEOUT: int = Field(default=5, env="DB_POOL_TIMEOUT")  # Seconds to wait for a pooled connection before answering 503
+    WEB_CONCURRENCY: int = Field(default=1, env="WEB_CONCURRENCY")  # Number of API worker processes (see gunicorn.conf.py)
+    GRACEFUL_TIMEOUT_SECONDS: int = Field(default=30, env="GRACEFUL_TIMEOUT_SECONDS")  # Time given to in-flight requests on shutdown
+    SYNC_PAGE_SIZE: int = Field(default=500, env="SYNC_PAGE_SIZE")  # Maximum number of changes returned per sync page
+    NOTIFICATION_CHANNEL: str = Field(default="notifications", env="NOTIFICATION_CHANNEL")  # PostgreSQL NOTIFY channel
+    NOTIFICATION_QUEUE_SIZE: int = Field(default=100, env="NOTIFICATION_QUEUE_SIZE")  # Pending messages per client before it is dropped
+    NOTIFICATION_HEARTBEAT_SECONDS: int = Field(default=15, env="NOTIFICATION_HEARTBEAT_SECONDS")  # Keep-alive interval of open streams
+    OUTBOX_DISPATCHER_ENABLED: bool = Field(default=True, env="OUTBOX_DISPATCHER_ENABLED")  # Run the outbox dispatcher in this process
+    OUTBOX_BATCH_SIZE: int = Field(default=100, env="OUTBOX_BATCH_SIZE")  # Events claimed per dispatcher round
+    OUTBOX_POLL_SECONDS: float = Field(default=1.0, env="OUTBOX_POLL_SECONDS")  # Idle wait between empty rounds
+    OUTBOX_MAX_ATTEMPTS: int = Field(default=8, env="OUTBOX_MAX_ATTEMPTS")  # Attempts before an event is marked failed
+    OUTBOX_BACKOFF_SECONDS: float = Field(default=2.0, env="OUTBOX_BACKOFF_SECONDS")  # Base of the exponential retry backoff
+    REVIEW_PRIOR_MEAN: float = Field(default=3.5, env="REVIEW_PRIOR_MEAN")  # Rating assumed for courses with few reviews
+    REVIEW_PRIOR_WEIGHT: int = Field(default=5, env="REVIEW_PRIOR_WEIGHT")  # How many reviews the prior is worth
+    RECOMMENDATION_TOP_K: int = Field(default=20, env="RECOMMENDATION_TOP_K")  # Neighbours stored per course
+    RECOMMENDATION_CHUNK_SIZE: int = Field(default=512, env="RECOMMENDATION_CHUNK_SIZE")  # Courses scored per similarity block
+    JOB_WORKER_PROCESSES: int = Field(default=2, env="JOB_WORKER_PROCESSES")  # Size of the job worker's process pool
+    JOB_POLL_SECONDS: float = Field(default=2.0, env="JOB_POLL_SECONDS")  # Idle wait of the job worker
+    JOB_RETRY_BACKOFF_SECONDS: float = Field(default=30.0, env="JOB_RETRY_BACKOFF_SECONDS")  # Base of the job retry backoff
+    JOB_LEASE_SECONDS: int = Field(default=60, env="JOB_LEASE_SECONDS")  # Running jobs whose worker stopped renewing this long ago are requeued
+    PURGE_RETENTION_DAYS: int = Field(default=30, env="PURGE_RETENTION_DAYS")  # Soft deleted rows are kept this long before being purged
+    PURGE_BATCH_SIZE: int = Field(default=1000, env="PURGE_BATCH_SIZE")  # Rows deleted per purge transaction
+    PURGE_INTERVAL_SECONDS: int = Field(default=3600, env="PURGE_INTERVAL_SECONDS")  # How often the worker schedules the purge job (0 disables it)
+    LESSON_RANK_MAX_LENGTH: int = Field(default=16, env="LESSON_RANK_MAX_LENGTH")  # Courses with longer lesson rank keys get rebalanced
+    LESSON_RANK_REBALANCE_SECONDS: int = Field(default=86400, env="LESSON_RANK_REBALANCE_SECONDS")  # How often the worker schedules the rebalance job (0 disables it)
+    REVOCATION_CHANNEL: str = Field(default="token_revocations", env="REVOCATION_CHANNEL")  # PostgreSQL NOTIFY channel for logouts
+    REVOCATION_SYNC_SECONDS: int = Field(default=60, env="REVOCATION_SYNC_SECONDS")  # How often each worker rebuilds its revocation filter
+    REVOCATION_BLOOM_CAPACITY: int = Field(default=100000, env="REVOCATION_BLOOM_CAPACITY")  # Revocations the filter is sized for (grows if needed)
+    REVOCATION_BLOOM_ERROR_RATE: float = Field(default=0.001, env="REVOCATION_BLOOM_ERROR_RATE")  # Share of valid tokens confirmed against the database
+    REVOCATION_CACHE_SIZE: int = Field(default=10000, env="REVOCATION_CACHE_SIZE")  # Confirmed answers kept in memory
+    REVOCATION_PURGE_SECONDS: int = Field(default=3600, env="REVOCATION_PURGE_SECONDS")  # How often the worker purges expired revocations (0 disables it)
+    PARTITION_PREMAKE_MONTHS: int = Field(default=3, env="PARTITION_PREMAKE_MONTHS")  # Monthly partitions created ahead of time
+    PARTITION_RETENTION_MONTHS: int = Field(default=12, env="PARTITION_RETENTION_MONTHS")  # Older months are detached and archived (0 keeps everything)
+    PARTITION_USER_HASH_MODULUS: int = Field(default=0, env="PARTITION_USER_HASH_MODULUS")  # Sub-partitions by user hash for new months (0 disables them)
+    PARTITION_ARCHIVE_DIR: str = Field(default="archive", env="PARTITION_ARCHIVE_DIR")  # Where detached partitions are written as .csv.gz
+    PARTITION_MAINTENANCE_SECONDS: int = Field(default=86400, env="PARTITION_MAINTENANCE_SECONDS")  # How often the worker schedules partition maintenance (0 disables it)
+    PROGRESS_MAX_WINDOW_DAYS: int = Field(default=366, env="PROGRESS_MAX_WINDOW_DAYS")  # Longest time window accepted by the progress/activity reads
+    DASHBOARD_CACHE_SECONDS: int = Field(default=30, env="DASHBOARD_CACHE_SECONDS")  # Lifetime of a cached user dashboard
+    DASHBOARD_CACHE_SIZE: int = Field(default=10000, env="DASHBOARD_CACHE_SIZE")  # Dashboards cached per worker
+    DASHBOARD_CHANNEL: str = Field(default="dashboard_invalidations", env="DASHBOARD_CHANNEL")  # PostgreSQL NOTIFY channel for cache invalidations
+    DASHBOARD_PROGRESS_DAYS: int = Field(default=365, env="DASHBOARD_PROGRESS_DAYS")  # Progress reports older than this are ignored by the dashboard
+    ADMISSION_ENABLED: bool = Field(default=True, env="ADMISSION_ENABLED")  # Apply admission control to HTTP requests
+    ADMISSION_CONCURRENCY: int = Field(default=0, env="ADMISSION_CONCURRENCY")  # Concurrent regular requests per worker (0: the pool size minus the auth slots)
+    ADMISSION_AUTH_CONCURRENCY: int = Field(default=4, env="ADMISSION_AUTH_CONCURRENCY")  # Concurrent login/registration requests per worker (bcrypt bound)
+    ADMISSION_EXPORT_CONCURRENCY: int = Field(default=1, env="ADMISSION_EXPORT_CONCURRENCY")  # Concurrent export streams per worker, each holding a connection
+    ADMISSION_QUEUE_TIMEOUT_SECONDS: float = Field(default=2.0, env="ADMISSION_QUEUE_TIMEOUT_SECONDS")  # Longest wait for a request slot before a 503
+    ADMISSION_MAX_WAITING: int = Field(default=64, env="ADMISSION_MAX_WAITING")  # Requests allowed to wait per route class; more are shed at once
+    ADMISSION_RETRY_AFTER_SECONDS: int = Field(default=2, env="ADMISSION_RETRY_AFTER_SECONDS")  # Retry-After sent with 503 responses
+    LESSON_RENDER_IN_BACKGROUND: bool = Field(default=False, env="LESSON_RENDER_IN_BACKGROUND")  # Render lesson HTML in the job worker instead of on write
+    ASSET_ROOT: str = Field(default="assets", env="ASSET_ROOT")  # Directory of the content-addressed lesson asset files
+    ASSET_MAX_BYTES: int = Field(default=100 * 1024 * 1024, env="ASSET_MAX_BYTES")  # Largest accepted asset upload
+    ASSET_GC_GRACE_SECONDS: int = Field(default=86400, env="ASSET_GC_GRACE_SECONDS")  # Unreferenced assets uploaded more recently are kept
+    ASSET_GC_INTERVAL_SECONDS: int = Field(default=86400, env="ASSET_GC_INTERVAL_SECONDS")  # How often the worker schedules the orphan collector (0 disables it)
+    QUERY_BUDGET_SAMPLE_RATE: float = Field(default=0.01, env="QUERY_BUDGET_SAMPLE_RATE")  # Share of requests whose SQL statements are counted against their budget
+    QUERY_BUDGET_DEFAULT: int = Field(default=0, env="QUERY_BUDGET_DEFAULT")  # Budget of endpoints without @query_budget (0: unlimited)
+    INDEX_ADVISOR_CAPTURE: bool = Field(default=False, env="INDEX_ADVISOR_CAPTURE")  # Record normalized SQL statements for the index advisor
+    INDEX_ADVISOR_MAX_FINGERPRINTS: int = Field(default=2000, env="INDEX_ADVISOR_MAX_FINGERPRINTS")  # Distinct statements recorded per worker
+    INDEX_ADVISOR_MIN_IMPROVEMENT: float = Field(default=0.2, env="INDEX_ADVISOR_MIN_IMPROVEMENT")  # Smallest plan cost reduction for a hypopg costed proposal
+    CATALOG_SNAPSHOT_DIR: str = Field(default="catalog", env="CATALOG_SNAPSHOT_DIR")  # Directory of the public catalog snapshots, shared by the API and the worker
+    CATALOG_SNAPSHOT_DEBOUNCE_SECONDS: float = Field(default=5, env="CATALOG_SNAPSHOT_DEBOUNCE_SECONDS")  # Catalog writes within this window share one rebuild
+    CATALOG_SNAPSHOT_KEEP: int = Field(default=3, env="CATALOG_SNAPSHOT_KEEP")  # Snapshot versions kept on disk
+    CATALOG_SNAPSHOT_INTERVAL_SECONDS: int = Field(default=3600, env="CATALOG_SNAPSHOT_INTERVAL_SECONDS")  # How often the worker rebuilds the snapshot anyway (0 disables it)
+    PROFILER_TOKEN: str = Field(default="", env="PROFILER_TOKEN")  # Requests sending it in the X-Profile header are profiled ('' disables the header)
+    PROFILER_SAMPLE_RATE: float = Field(default=0.0, env="PROFILER_SAMPLE_RATE")  # Share of the requests profiled at random (0 disables it)
+    PROFILER_INTERVAL_SECONDS: float = Field(default=0.005, env="PROFILER_INTERVAL_SECONDS")  # Time between two stack samples of a profiled request
+    PROFILER_MAX_ACTIVE: int = Field(default=4, env="PROFILER_MAX_ACTIVE")  # Randomly sampled requests profiled at the same time, per worker
+    PROFILER_DIR: str = Field(default="profiles", env="PROFILER_DIR")  # Directory of the stored request profiles
+    PROFILER_MAX_PROFILES: int = Field(default=200, env="PROFILER_MAX_PROFILES")  # Stored profiles kept, the oldest are deleted
+    MAX_BATCH_SIZE: int = Field(default=100, env="MAX_BATCH_SIZE")  # Maximum number of ids accepted by batch lookup endpoints
 
     class Config:
         env_file = ".env"  # Specifies the environment file to load variables from
@@ -0,0 +1,30 @@
+from typing import Optional
+
+
+def _opaque(tag: str) -> str:
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Tells whether an `If-None-Match` header matches the current ETag of a resource.
+
+    The header is a comma separated list of entity tags, or `*`. The comparison is the
+    weak one of RFC 9110 (a `W/` prefix is ignored on both sides), as `If-None-Match`
+    requires: a client revalidating a weak ETag rewritten by a proxy still gets a 304.
+
+    Args:
+        if_none_match (str | None): The raw value of the header.
+        etag (str): The current ETag of the resource, quotes included.
+
+    Returns:
+        bool: True if the client's copy is current (answer 304).
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    current = _opaque(etag)
+    # Entity tags cannot contain commas, so splitting on them is safe
+    return any(_opaque(tag) == current for tag in if_none_match.split(","))
@@ -0,0 +1,30 @@
+import threading
+from typing import Callable, Dict
+
+# Registry of metric sources: each one is a callable returning a JSON serializable dict
+_sources: Dict[str, Callable[[], dict]] = {}
+_lock = threading.Lock()
+
+
+def register_metrics(name: str, source: Callable[[], dict]) -> None:
+    """
+    Registers a metrics source under the given name.
+
+    Args:
+        name (str): The key under which the metrics are published in `GET /metrics`.
+        source (Callable[[], dict]): A function returning the current metric values.
+    """
+    with _lock:
+        _sources[name] = source
+
+
+def metrics_snapshot() -> dict:
+    """
+    Collects the current values of every registered metrics source.
+
+    Returns:
+        dict: A mapping of source name to its metric values.
+    """
+    with _lock:
+        sources = dict(_sources)
+    return {name: source() for name, source in sources.items()}
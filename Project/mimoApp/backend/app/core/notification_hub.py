@@ -0,0 +1,138 @@
+import asyncio
+import json
+import logging
+import threading
+from collections import defaultdict
+from typing import Callable, Dict, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+
+class Subscription:
+    """
+    A connected client waiting for the notifications of one user.
+
+    Messages are buffered in a bounded queue; when the client does not keep up and
+    the queue fills, the hub drops the subscription and `get` returns None so the
+    connection handler can close the socket.
+    """
+
+    def __init__(self, user_id: int, maxsize: int):
+        self.user_id = user_id
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self.dropped = False
+
+    async def get(self):
+        """
+        Waits for the next message, or returns None once the subscription was dropped.
+        """
+        return await self.queue.get()
+
+    def close(self) -> None:
+        # Discard the backlog so the end-of-stream marker always fits in the queue
+        self.dropped = True
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        self.queue.put_nowait(None)
+
+
+class NotificationHub:
+    """
+    Fans out notifications received from PostgreSQL to the connected clients in memory.
+
+    One `LISTEN` connection per worker (see `core.pg_listener`) feeds `publish`, which
+    hands the message over to the event loop; the loop then pushes it into the queue of
+    every subscription of the recipient. Thousands of open connections therefore cost
+    a single database connection.
+
+    NOTIFY payloads only carry the notification and recipient IDs: when the recipient
+    has clients on this worker, `loader` reads the message from the database (once,
+    however many clients the recipient has), otherwise the payload is ignored.
+
+    Attributes:
+        queue_size (int): The number of messages buffered per client.
+        loader (Callable[[int], Optional[dict]]): Returns the message of a notification ID.
+    """
+
+    def __init__(self, queue_size: int, loader: Callable[[int], Optional[dict]]):
+        self.queue_size = queue_size
+        self.loader = loader
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._subscriptions: Dict[int, Set[Subscription]] = defaultdict(set)
+        self._lock = threading.Lock()
+        self._delivered = 0
+        self._dropped = 0
+
+    def bind(self, loop: asyncio.AbstractEventLoop) -> None:
+        """
+        Binds the hub to the event loop serving the WebSocket/SSE connections.
+        """
+        self._loop = loop
+
+    def subscribe(self, user_id: int) -> Subscription:
+        """
+        Registers a new client for the notifications of `user_id`.
+        """
+        subscription = Subscription(user_id, self.queue_size)
+        with self._lock:
+            self._subscriptions[user_id].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """
+        Removes a client, typically when its connection is closed.
+        """
+        with self._lock:
+            subscriptions = self._subscriptions.get(subscription.user_id)
+            if subscriptions is not None:
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    del self._subscriptions[subscription.user_id]
+
+    def publish(self, payload: str) -> None:
+        """
+        Listener callback: loads an announced notification and schedules its delivery on
+        the event loop, if its recipient is connected to this worker.
+
+        Args:
+            payload (str): The JSON payload sent with `pg_notify`: `id` and `user_id`.
+        """
+        if self._loop is None:
+            return
+        try:
+            announced = json.loads(payload)
+            notification_id, user_id = int(announced["id"]), int(announced["user_id"])
+        except (ValueError, KeyError, TypeError):
+            logger.warning("Ignoring malformed notification payload: %r", payload)
+            return
+        with self._lock:
+            if not self._subscriptions.get(user_id):
+                return
+        try:
+            message = self.loader(notification_id)
+        except Exception:
+            logger.exception("Could not load notification %s", notification_id)
+            return
+        if message is not None:
+            self._loop.call_soon_threadsafe(self._fan_out, user_id, message)
+
+    def _fan_out(self, user_id: int, message: dict) -> None:
+        with self._lock:
+            subscriptions = list(self._subscriptions.get(user_id, ()))
+        for subscription in subscriptions:
+            try:
+                subscription.queue.put_nowait(message)
+                self._delivered += 1
+            except asyncio.QueueFull:
+                # Slow consumer: drop it instead of buffering without bound
+                self._dropped += 1
+                self.unsubscribe(subscription)
+                subscription.close()
+
+    def stats(self) -> dict:
+        """
+        Returns the number of connected clients and the delivery counters.
+        """
+        with self._lock:
+            clients = sum(len(subscriptions) for subscriptions in self._subscriptions.values())
+        return {"clients": clients, "delivered": self._delivered, "dropped_clients": self._dropped}
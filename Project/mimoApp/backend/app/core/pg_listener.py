@@ -0,0 +1,94 @@
+import logging
+import select
+import threading
+from collections import defaultdict
+from typing import Callable, Dict, List
+
+logger = logging.getLogger(__name__)
+
+
+class PgListener:
+    """
+    Runs a single PostgreSQL `LISTEN` connection per worker process in a background thread.
+
+    Subsystems subscribe a callback to a channel; every `NOTIFY` received on that
+    channel is passed to the callbacks (from the listener thread, so callbacks must be
+    quick and thread safe). The connection is opened outside the SQLAlchemy pool, so
+    listening never takes a pooled connection away from the requests.
+    """
+
+    def __init__(self, engine, poll_timeout: float = 5.0, reconnect_delay: float = 2.0):
+        self.engine = engine
+        self.poll_timeout = poll_timeout
+        self.reconnect_delay = reconnect_delay
+        self._callbacks: Dict[str, List[Callable[[str], None]]] = defaultdict(list)
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def subscribe(self, channel: str, callback: Callable[[str], None]) -> None:
+        """
+        Registers `callback(payload)` for the notifications sent on `channel`.
+
+        Subscriptions must be made before `start` is called.
+        """
+        self._callbacks[channel].append(callback)
+
+    def start(self) -> None:
+        """
+        Starts the listener thread (no-op when not running on PostgreSQL).
+        """
+        if self.engine.dialect.name != "postgresql" or self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="pg-listener", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """
+        Stops the listener thread and closes its connection.
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.poll_timeout + 1)
+            self._thread = None
+
+    def _connect(self):
+        import psycopg2
+        from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
+
+        url = self.engine.url
+        conn = psycopg2.connect(
+            host=url.host, port=url.port, user=url.username, password=url.password, dbname=url.database
+        )
+        conn.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
+        with conn.cursor() as cursor:
+            for channel in self._callbacks:
+                cursor.execute(f'LISTEN "{channel}"')
+        return conn
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            conn = None
+            try:
+                conn = self._connect()
+                while not self._stop.is_set():
+                    ready, _, _ = select.select([conn], [], [], self.poll_timeout)
+                    if not ready:
+                        continue
+                    conn.poll()
+                    while conn.notifies:
+                        notify = conn.notifies.pop(0)
+                        self._dispatch(notify.channel, notify.payload)
+            except Exception:
+                logger.exception("PostgreSQL listener failed, reconnecting")
+                self._stop.wait(self.reconnect_delay)
+            finally:
+                if conn is not None:
+                    conn.close()
+
+    def _dispatch(self, channel: str, payload: str) -> None:
+        for callback in self._callbacks.get(channel, ()):
+            try:
+                callback(payload)
+            except Exception:
+                logger.exception("Listener callback failed for channel %s", channel)
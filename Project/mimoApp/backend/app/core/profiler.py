@@ -0,0 +1,448 @@
+"""
+Opt-in sampling profiler for individual HTTP requests.
+
+`ProfilerMiddleware` profiles a request when it carries the `X-Profile` header with the
+configured token, or at random for a share of the requests. While a profiled request
+runs, a background thread takes a snapshot of its Python stacks every few milliseconds
+(`sys._current_frames`): nothing is traced, so the request runs at full speed and
+unprofiled requests pay a single random draw.
+
+A request runs partly on the event loop (routing, body validation, response
+serialization) and partly in the threadpool (sync endpoints). Loop samples belong to the
+request when its middleware frame is on the stack, i.e. its task is the one running;
+threadpool threads are attributed while they run a callable wrapped with
+`attribute_thread`: endpoints (done by `db.unit_of_work.UnitOfWorkRoute`), the sync
+dependencies (`get_current_user`, `batch_ids`...) and the application's own
+`run_in_threadpool` calls are. Ticks where neither runs are recorded as `(waiting)`: the
+request is awaiting I/O or a free thread, or runs code in a thread nothing attributes
+(a new sync dependency left undecorated, file I/O of `anyio.open_file`...).
+
+Frames of the `repositories` and `services` packages are annotated as spans, and the
+innermost frame of each sample is grouped by top level package, which separates
+database, validation and hashing time at a glance. Profiles are kept on disk by
+`ProfileStore`, bounded in number, and exported as collapsed stacks (flamegraph.pl,
+speedscope, inferno) or speedscope JSON.
+"""
+import functools
+import hmac
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Callable, Optional
+
+import anyio
+
+MAX_STACK_DEPTH = 200  # Frames kept per sample, innermost first
+MAX_PROFILE_SECONDS = 60  # Longer requests (streams) stop being sampled
+WAITING = "(waiting)"
+
+# Packages whose frames are annotated as spans in the profiles
+SPAN_LAYERS = {"repositories": "repository", "services": "service"}
+
+_PROFILE_ID = re.compile(r"^[0-9a-f]{32}$")
+
+
+class ProfileSession:
+    """
+    The samples of one profiled request.
+
+    Attributes:
+        id (str): The identifier of the profile.
+        method (str): The HTTP method of the request.
+        path (str): The path of the request.
+        trigger (str): 'header' or 'sample'.
+        stacks (Counter): Number of samples per stack, outermost frame first.
+    """
+
+    def __init__(self, method: str, path: str, trigger: str, loop_thread: int, root_frame):
+        self.id = uuid.uuid4().hex
+        self.method = method
+        self.path = path
+        self.trigger = trigger
+        self.started_at = datetime.now(timezone.utc)
+        self.stacks = Counter()
+        self._loop_thread = loop_thread
+        self._root_frame = root_frame
+        self._threads: dict = {}  # Threadpool thread ident -> frame where attribution starts
+        self._start = time.perf_counter()
+        self._lock = threading.Lock()  # Samples are added by the sampler thread
+        self.duration = None
+
+    @contextmanager
+    def attach_thread(self, boundary_frame):
+        """
+        Attributes the samples of the current thread to this request inside the block.
+        """
+        ident = threading.get_ident()
+        previous = self._threads.get(ident)
+        self._threads[ident] = boundary_frame
+        try:
+            yield
+        finally:
+            if previous is None:
+                self._threads.pop(ident, None)
+            else:
+                self._threads[ident] = previous
+
+    def expired(self) -> bool:
+        return time.perf_counter() - self._start > MAX_PROFILE_SECONDS
+
+    def sample(self, frames: dict, label: Callable):
+        """
+        Records one tick from the frames of all threads (`sys._current_frames()`).
+        """
+        stacks = []
+        leaf = frames.get(self._loop_thread)
+        if leaf is not None:
+            stack = _walk(leaf, self._root_frame, label)
+            if stack is not None:
+                stacks.append(("event loop",) + stack)
+        for ident, boundary in list(self._threads.items()):
+            leaf = frames.get(ident)
+            if leaf is not None:
+                stack = _walk(leaf, boundary, label)
+                if stack is not None:
+                    stacks.append(("threadpool",) + stack)
+        with self._lock:
+            if self.duration is not None:
+                return  # Finished while this tick was being taken
+            for stack in stacks or [(WAITING,)]:
+                self.stacks[stack] += 1
+
+    def finish(self):
+        with self._lock:
+            self.duration = time.perf_counter() - self._start
+
+
+def _walk(frame, boundary, label: Callable):
+    """
+    Returns the labels from `boundary` (excluded) down to `frame`, or None if `boundary`
+    is not on the stack.
+    """
+    labels = []
+    while frame is not None:
+        if frame is boundary:
+            labels.reverse()
+            return tuple(labels[-MAX_STACK_DEPTH:])
+        labels.append(label(frame.f_code, frame.f_globals))
+        frame = frame.f_back
+    return None
+
+
+class Sampler:
+    """
+    Background thread sampling the stacks of the requests being profiled.
+
+    The thread starts with the first profile and sleeps on an event while no request is
+    profiled, so it costs nothing the rest of the time.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._sessions = set()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+        self._labels: dict = {}  # Code object -> frame label
+        self.frames: dict = {}  # Frame label -> (file, first line), for the exports
+
+    def active(self) -> int:
+        return len(self._sessions)
+
+    def start(self, session: ProfileSession):
+        with self._lock:
+            self._sessions.add(session)
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+                self._thread.start()
+            self._wakeup.set()
+
+    def stop(self, session: ProfileSession):
+        with self._lock:
+            self._sessions.discard(session)
+
+    def label(self, code, f_globals) -> str:
+        label = self._labels.get(code)
+        if label is None:
+            module = f_globals.get("__name__", "?")
+            label = f"{module}:{getattr(code, 'co_qualname', code.co_name)}"
+            layer = SPAN_LAYERS.get(module.split(".", 1)[0])
+            if layer is not None:
+                label = f"{label} [{layer}]"
+            self._labels[code] = label
+            self.frames[label] = (code.co_filename, code.co_firstlineno)
+        return label
+
+    def _run(self):
+        while True:
+            self._wakeup.wait()
+            with self._lock:
+                sessions = [session for session in self._sessions if not session.expired()]
+                if not self._sessions:
+                    self._wakeup.clear()
+                    continue
+            time.sleep(self.interval)
+            frames = sys._current_frames()
+            for session in sessions:
+                session.sample(frames, self.label)
+            del frames  # Do not keep the frames (and their locals) alive until the next tick
+
+
+_current: ContextVar[Optional[ProfileSession]] = ContextVar("profile_session", default=None)
+
+
+def attribute_thread(endpoint: Callable) -> Callable:
+    """
+    Wraps a sync callable run in the threadpool so that, within a profiled request, the
+    samples of the thread running it count for that request.
+    """
+    @functools.wraps(endpoint)
+    def attributed(*args, **kwargs):
+        session = _current.get()
+        if session is None:
+            return endpoint(*args, **kwargs)
+        with session.attach_thread(sys._getframe()):
+            return endpoint(*args, **kwargs)
+    return attributed
+
+
+def summarize(stacks: dict, interval: float) -> tuple[dict, dict]:
+    """
+    Returns the time in milliseconds spent in each span (inclusive) and in each top level
+    package (innermost frame) of a profile.
+    """
+    spans, packages = Counter(), Counter()
+    for stack, count in stacks.items():
+        frames = stack.split(";")
+        for frame in set(frames):
+            if frame.endswith(("[repository]", "[service]")):
+                spans[frame] += count
+        packages[frames[-1].split(":", 1)[0].split(".", 1)[0]] += count
+
+    def to_ms(counts: Counter) -> dict:
+        return {name: round(count * interval * 1000, 1) for name, count in counts.most_common()}
+    return to_ms(spans), to_ms(packages)
+
+
+def to_collapsed(profile: dict) -> str:
+    """
+    Renders a profile as collapsed stacks: one `frame;frame;frame count` line per stack.
+    """
+    return "".join(f"{stack} {count}\n" for stack, count in sorted(profile["stacks"].items()))
+
+
+def to_speedscope(profile: dict) -> dict:
+    """
+    Renders a profile in the speedscope file format (https://www.speedscope.app).
+
+    Samples are aggregated per stack, so the 'Left Heavy' and 'Sandwich' views are the
+    meaningful ones.
+    """
+    index, frames = {}, []
+    samples, weights = [], []
+    interval_ms = profile["interval_ms"]
+    for stack, count in profile["stacks"].items():
+        sample = []
+        for name in stack.split(";"):
+            if name not in index:
+                index[name] = len(frames)
+                file, line = profile["frames"].get(name, (None, None))
+                frames.append({"name": name, "file": file, "line": line} if file else {"name": name})
+            sample.append(index[name])
+        samples.append(sample)
+        weights.append(count * interval_ms)
+    return {
+        "$schema": "https://www.speedscope.app/file-format-schema.json",
+        "name": f"{profile['method']} {profile['path']}",
+        "exporter": "mimoApp",
+        "activeProfileIndex": 0,
+        "shared": {"frames": frames},
+        "profiles": [{
+            "type": "sampled",
+            "name": f"{profile['method']} {profile['path']} ({profile['duration_ms']} ms)",
+            "unit": "milliseconds",
+            "startValue": 0,
+            "endValue": sum(weights),
+            "samples": samples,
+            "weights": weights,
+        }],
+    }
+
+
+class ProfileStore:
+    """
+    The most recent profiles, one JSON file each in `root`.
+
+    Files are shared by the API workers of the host; beyond `max_profiles` the oldest
+    are deleted.
+    """
+
+    def __init__(self, root: str, max_profiles: int):
+        self.root = root
+        self.max_profiles = max_profiles
+
+    def _path(self, profile_id: str) -> str:
+        return os.path.join(self.root, f"{profile_id}.json")
+
+    def save(self, profile: dict):
+        os.makedirs(self.root, exist_ok=True)
+        tmp_path = os.path.join(self.root, f"{profile['id']}.tmp")
+        with open(tmp_path, "w") as tmp:
+            json.dump(profile, tmp)
+        os.replace(tmp_path, self._path(profile["id"]))
+
+        entries = sorted(
+            (entry for entry in os.scandir(self.root) if entry.name.endswith(".json")),
+            key=lambda entry: entry.stat().st_mtime,
+            reverse=True,
+        )
+        for entry in entries[self.max_profiles:]:
+            try:
+                os.unlink(entry.path)
+            except FileNotFoundError:
+                pass  # Pruned by another worker
+
+    def get(self, profile_id: str) -> dict | None:
+        if not _PROFILE_ID.match(profile_id):
+            return None
+        try:
+            with open(self._path(profile_id)) as file:
+                return json.load(file)
+        except FileNotFoundError:
+            return None
+
+    def list(self) -> list[dict]:
+        """
+        Returns the summaries of the stored profiles, newest first.
+        """
+        if not os.path.isdir(self.root):
+            return []
+        summaries = []
+        for entry in os.scandir(self.root):
+            if not entry.name.endswith(".json"):
+                continue
+            try:
+                with open(entry.path) as file:
+                    profile = json.load(file)
+            except (FileNotFoundError, ValueError):
+                continue  # Pruned or being replaced
+            summaries.append({key: value for key, value in profile.items() if key not in ("stacks", "frames")})
+        summaries.sort(key=lambda summary: summary["started_at"], reverse=True)
+        return summaries
+
+
+class RequestProfiler:
+    """
+    Decides which requests are profiled and records their profiles.
+
+    Attributes:
+        store (ProfileStore): Where finished profiles are kept.
+        sample_rate (float): Share of the requests profiled at random, from 0 to 1.
+        token (str): Value of the `X-Profile` header that profiles a request ('' disables the header).
+        max_active (int): Randomly sampled requests are skipped while this many are being profiled.
+    """
+
+    def __init__(self, store: ProfileStore, interval: float, sample_rate: float, token: str, max_active: int):
+        self.store = store
+        self.sampler = Sampler(interval)
+        self.sample_rate = sample_rate
+        self.token = token.encode()
+        self.max_active = max_active
+        self._stats = Counter()
+
+    def trigger(self, scope) -> str | None:
+        """
+        Returns why the request should be profiled ('header' or 'sample'), or None.
+        """
+        if self.token:
+            for name, value in scope["headers"]:
+                if name == b"x-profile" and hmac.compare_digest(value, self.token):
+                    return "header"
+        if self.sample_rate > 0 and random.random() < self.sample_rate and self.sampler.active() < self.max_active:
+            return "sample"
+        return None
+
+    def record(self, session: ProfileSession, status_code: int | None) -> dict:
+        """
+        Builds the stored form of a finished profile.
+        """
+        stacks = {";".join(stack): count for stack, count in session.stacks.items()}
+        samples = sum(stacks.values())
+        # Ticks run late while request threads hold the GIL: weigh samples by actual wall time
+        interval = session.duration / samples if samples else self.sampler.interval
+        spans, packages = summarize(stacks, interval)
+        labels = {name for stack in session.stacks for name in stack}
+        self._stats[session.trigger] += 1
+        return {
+            "id": session.id,
+            "method": session.method,
+            "path": session.path,
+            "status": status_code,
+            "trigger": session.trigger,
+            "started_at": session.started_at.isoformat(),
+            "duration_ms": round(session.duration * 1000, 1),
+            "interval_ms": round(interval * 1000, 3),
+            "samples": samples,
+            "spans": spans,
+            "packages": packages,
+            "stacks": stacks,
+            "frames": {name: self.sampler.frames[name] for name in labels if name in self.sampler.frames},
+        }
+
+    def stats(self) -> dict:
+        return {"profiled": dict(self._stats), "active": self.sampler.active(), "sample_rate": self.sample_rate}
+
+
+class ProfilerMiddleware:
+    """
+    Pure ASGI middleware profiling the requests selected by `RequestProfiler`.
+
+    The response of a profiled request carries an `X-Profile-Id` header naming its
+    profile under `/debug/profiles`.
+    """
+
+    def __init__(self, app, profiler: RequestProfiler, exclude: tuple = ("/debug/",)):
+        self.app = app
+        self.profiler = profiler
+        self.exclude = exclude
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"].startswith(self.exclude):
+            await self.app(scope, receive, send)
+            return
+        trigger = self.profiler.trigger(scope)
+        if trigger is None:
+            await self.app(scope, receive, send)
+            return
+
+        # This coroutine's frame is on the loop thread's stack whenever the request runs there
+        session = ProfileSession(scope["method"], scope["path"], trigger, threading.get_ident(), sys._getframe())
+        status_code = None
+
+        async def send_with_profile_id(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                message = {**message, "headers": [*message.get("headers", []), (b"x-profile-id", session.id.encode())]}
+            await send(message)
+
+        token = _current.set(session)
+        self.profiler.sampler.start(session)
+        try:
+            await self.app(scope, receive, send_with_profile_id)
+        finally:
+            self.profiler.sampler.stop(session)
+            _current.reset(token)
+            session.finish()
+            profile = self.profiler.record(session, status_code)
+            # A few KB of JSON, written off the event loop
+            await anyio.to_thread.run_sync(self.profiler.store.save, profile)
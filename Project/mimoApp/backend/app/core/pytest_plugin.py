@@ -0,0 +1,110 @@
+"""
+Pytest fixtures for the test suite: transactional sessions and query budgets.
+
+Enable them from a `conftest.py`, and run the suite on SQLite so it needs no server:
+
+    pytest_plugins = ["core.pytest_plugin"]
+
+    DB_BACKEND=sqlite pytest            # in memory
+    DB_BACKEND=sqlite DB_SQLITE_PATH=/tmp/mimo.db pytest   # WAL file
+
+`db_session` wraps each test in a transaction rolled back at the end; the commits made
+by the code under test only release savepoints. `client` is a `TestClient` whose
+requests use that same session. Code that opens its own sessions (background jobs,
+dispatchers) is not covered by the rollback, and the startup events are not run.
+
+While `enforce_query_budgets` is active, every request made through the test client is
+checked against the budget of its endpoint, and a request running too many statements
+fails the test with the list of statements. The `query_budget_of` fixture checks a block
+of code directly:
+
+    def test_dashboard(db_session, query_budget_of):
+        with query_budget_of(1):
+            get_dashboard(db_session, user_id)
+"""
+from contextlib import contextmanager
+import pytest
+from sqlalchemy.orm import Session
+from core.query_budget import QueryBudgetExceeded, count_queries, install
+from db.database import db_instance, _request_session
+
+
+@pytest.fixture
+def db_session():
+    """
+    A session whose work is rolled back at the end of the test.
+    """
+    connection = db_instance.engine.connect()
+    transaction = connection.begin()
+    # Configured like the request sessions (`RequestSessionLocal`), which the endpoints get
+    session = Session(bind=connection, autoflush=False, expire_on_commit=False, join_transaction_mode="create_savepoint")
+    try:
+        yield session
+    finally:
+        session.close()
+        transaction.rollback()
+        connection.close()
+
+
+@pytest.fixture
+def client(db_session):
+    """
+    A test client whose requests run in the test's transaction.
+    """
+    from fastapi.testclient import TestClient
+    from main import app
+    from services.user_service import get_db
+
+    async def override_session():
+        # Each request reads the database, as with the fresh session it gets in production:
+        # objects loaded by an earlier request (or the test) would otherwise be served as is,
+        # missing what bulk updates such as `adjust_course_count` changed since
+        db_session.expire_all()
+        # Like `get_session`: code looking up the request's session finds this one too
+        _request_session.set(db_session)
+        try:
+            yield db_session
+        finally:
+            _request_session.set(None)
+
+    app.dependency_overrides[db_instance.get_session] = override_session
+    app.dependency_overrides[get_db] = override_session
+    try:
+        yield TestClient(app)  # Not entered: the startup events (listeners, dispatcher) do not run
+    finally:
+        app.dependency_overrides.clear()
+
+
+@pytest.fixture(autouse=True)
+def enforce_query_budgets():
+    """
+    Checks every request of the test against its endpoint budget.
+    """
+    from main import query_guard
+
+    install(db_instance.engine)
+    strict = query_guard.strict
+    query_guard.strict = True
+    try:
+        yield query_guard
+    finally:
+        query_guard.strict = strict
+
+
+@pytest.fixture
+def query_budget_of():
+    """
+    Returns a context manager failing the test if its block runs more than `n` statements.
+    """
+    install(db_instance.engine)
+
+    @contextmanager
+    def check(max_queries: int):
+        with count_queries() as counter:
+            yield counter
+        if counter.count > max_queries:
+            raise QueryBudgetExceeded(
+                f"{counter.count} SQL statements, budget is {max_queries}:\n{counter.report()}"
+            )
+
+    return check
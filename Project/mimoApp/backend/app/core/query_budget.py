@@ -0,0 +1,185 @@
+"""
+Per-request SQL statement counting and query budgets.
+
+Endpoints declare how many statements they are expected to run with `@query_budget(n)`
+(below the router decorator). `QueryBudgetMiddleware` counts the statements a request
+executes through engine events and compares the count with the budget of the endpoint
+that served it:
+
+- in production a sample of the requests is checked (`QUERY_BUDGET_SAMPLE_RATE`) and
+  violations are logged with the offending statements;
+- in tests (`core.pytest_plugin`) every request is checked and a violation fails the
+  test, so regressions such as N+1 patterns are caught before they ship.
+
+Counting relies on a context variable: it follows the request into the threadpool where
+sync endpoints and their dependencies run.
+"""
+import logging
+import random
+import re
+import threading
+from contextvars import ContextVar
+from typing import Callable, List, Optional
+from sqlalchemy import event
+
+logger = logging.getLogger(__name__)
+
+MAX_RECORDED_STATEMENTS = 50  # Statements kept per request for the violation report
+
+# Transaction control is not work done by the endpoint: how many of these run depends on
+# the session setup (savepoints of the test fixtures, SQLite's explicit BEGIN), not the code
+_TRANSACTION_CONTROL = re.compile(r"^\s*(BEGIN|COMMIT|ROLLBACK|SAVEPOINT|RELEASE)\b", re.IGNORECASE)
+
+
+class QueryBudgetExceeded(AssertionError):
+    """
+    Raised in strict mode when a request runs more statements than its budget.
+    """
+
+
+class QueryCounter:
+    """
+    The statements executed within one request (or one `count_queries` block).
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.statements: List[str] = []
+
+    def record(self, statement: str):
+        self.count += 1
+        if len(self.statements) < MAX_RECORDED_STATEMENTS:
+            self.statements.append(" ".join(statement.split()))
+
+    def report(self) -> str:
+        lines = [f"  {i}. {statement}" for i, statement in enumerate(self.statements, 1)]
+        if self.count > len(self.statements):
+            lines.append(f"  ... and {self.count - len(self.statements)} more")
+        return "\n".join(lines)
+
+
+_current: ContextVar[Optional[QueryCounter]] = ContextVar("query_counter", default=None)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    counter = _current.get()
+    if counter is not None and not _TRANSACTION_CONTROL.match(statement):
+        counter.record(statement)
+
+
+def install(engine) -> None:
+    """
+    Starts counting the statements executed by `engine` (idempotent).
+    """
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+
+
+class count_queries:
+    """
+    Context manager counting the statements executed inside the block.
+
+    Example:
+        with count_queries() as counter:
+            get_dashboard(db, user_id)
+        assert counter.count == 1
+    """
+
+    def __enter__(self) -> QueryCounter:
+        self.counter = QueryCounter()
+        self._token = _current.set(self.counter)
+        return self.counter
+
+    def __exit__(self, *exc_info):
+        _current.reset(self._token)
+        return False
+
+
+def query_budget(max_queries: int) -> Callable:
+    """
+    Declares the number of SQL statements an endpoint may run per request.
+
+    Must be applied below the router decorator, so the route registers the marked function:
+
+        @router.get("/{id}")
+        @query_budget(2)
+        def get_lesson(...): ...
+    """
+    def decorator(endpoint: Callable) -> Callable:
+        endpoint.__query_budget__ = max_queries
+        return endpoint
+    return decorator
+
+
+class QueryBudgetGuard:
+    """
+    Decides which requests are checked and what happens on a violation.
+
+    Attributes:
+        sample_rate (float): Share of the requests that are checked, from 0 to 1.
+        default_budget (int): Budget of the endpoints without `@query_budget` (0: unlimited).
+        strict (bool): Raise `QueryBudgetExceeded` instead of logging (tests).
+    """
+
+    def __init__(self, sample_rate: float, default_budget: int = 0, strict: bool = False):
+        self.sample_rate = sample_rate
+        self.default_budget = default_budget
+        self.strict = strict
+        self._lock = threading.Lock()
+        self._stats = {"checked": 0, "violations": 0}
+        self._violations_by_endpoint: dict = {}
+
+    def should_check(self) -> bool:
+        return self.strict or (self.sample_rate > 0 and random.random() < self.sample_rate)
+
+    def budget_of(self, endpoint) -> int:
+        return getattr(endpoint, "__query_budget__", self.default_budget)
+
+    def check(self, method: str, path: str, endpoint, counter: QueryCounter):
+        """
+        Compares the statements of a finished request with the budget of its endpoint.
+
+        Raises:
+            QueryBudgetExceeded: On a violation, in strict mode.
+        """
+        budget = self.budget_of(endpoint) if endpoint is not None else 0
+        name = f"{endpoint.__module__}.{endpoint.__qualname__}" if endpoint is not None else path
+        with self._lock:
+            self._stats["checked"] += 1
+            if not budget or counter.count <= budget:
+                return
+            self._stats["violations"] += 1
+            self._violations_by_endpoint[name] = self._violations_by_endpoint.get(name, 0) + 1
+
+        message = f"{method} {path} ({name}) ran {counter.count} SQL statements, budget is {budget}:\n{counter.report()}"
+        if self.strict:
+            raise QueryBudgetExceeded(message)
+        logger.warning(message)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {**self._stats, "violations_by_endpoint": dict(self._violations_by_endpoint)}
+
+
+class QueryBudgetMiddleware:
+    """
+    Pure ASGI middleware counting the statements of the sampled HTTP requests and
+    checking them against the budget of the endpoint (known once routing has run).
+    """
+
+    def __init__(self, app, guard: QueryBudgetGuard):
+        self.app = app
+        self.guard = guard
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self.guard.should_check():
+            await self.app(scope, receive, send)
+            return
+        counter = QueryCounter()
+        token = _current.set(counter)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _current.reset(token)
+        # The router stores the matched endpoint in the (shared) scope
+        self.guard.check(scope["method"], scope["path"], scope.get("endpoint"), counter)
@@ -0,0 +1,77 @@
+"""
+Lexicographic rank keys for user-ordered lists (lessons within a course).
+
+A rank is a string of base-36 digits read as a fraction (`"i"` is 0.5, `"9"` is 0.25...),
+so a new key can always be found between two neighbours and moving an item only
+rewrites that item's key. Keys never end with `"0"`, which guarantees there is room
+between any two of them. Only `0-9a-z` is used: these characters sort the same in
+byte order and in the usual database collations.
+
+Repeated inserts at the same spot make keys longer; `spaced_ranks` generates short,
+evenly spaced keys to rebalance a list.
+"""
+DIGITS = "0123456789abcdefghijklmnopqrstuvwxyz"
+BASE = len(DIGITS)
+
+def _digit(key: str, position: int, default: int) -> int:
+    return DIGITS.index(key[position]) if position < len(key) else default
+
+def rank_between(before: str | None, after: str | None) -> str:
+    """
+    Returns a rank key sorting strictly between `before` and `after`.
+
+    Args:
+        before (str | None): The key of the previous item, or None for the start of the list.
+        after (str | None): The key of the next item, or None for the end of the list.
+
+    Returns:
+        str: The new key, as short as possible.
+
+    Raises:
+        ValueError: If `before` does not sort before `after`.
+    """
+    before = before or ""
+    if after is not None and before >= after:
+        raise ValueError(f"Rank {before!r} does not sort before {after!r}")
+
+    key = []
+    position = 0
+    while True:
+        low = _digit(before, position, 0)
+        high = _digit(after, position, BASE) if after is not None else BASE
+        if low == high:
+            key.append(DIGITS[low])  # Shared prefix
+        elif high - low > 1:
+            key.append(DIGITS[(low + high) // 2])
+            return "".join(key)
+        else:
+            # Adjacent digits: keep the lower one, anything longer now sorts before `after`
+            key.append(DIGITS[low])
+            after = None
+        position += 1
+
+def spaced_ranks(count: int) -> list[str]:
+    """
+    Returns `count` short, evenly spaced keys in ascending order.
+
+    Args:
+        count (int): The number of keys.
+
+    Returns:
+        list[str]: The keys, each at most two digits longer than strictly needed.
+    """
+    width = 1
+    while BASE ** width <= count:
+        width += 1
+    width += 1  # Leaves room for future inserts between neighbours
+    step = BASE ** width // (count + 1)
+
+    ranks = []
+    for index in range(1, count + 1):
+        value = index * step
+        digits = []
+        for _ in range(width):
+            value, digit = divmod(value, BASE)
+            digits.append(DIGITS[digit])
+        ranks.append("".join(reversed(digits)).rstrip("0"))
+    return ranks
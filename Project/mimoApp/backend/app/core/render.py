@@ -0,0 +1,90 @@
+"""
+Markdown to sanitized HTML rendering of lesson content.
+
+Rendering uses `markdown` (with fenced code blocks, and Pygments highlighting when it is
+installed) and `bleach` to strip anything that is not in the allow-list below. Without
+those packages the content is rendered as escaped plain text paragraphs, which is safe
+but unformatted.
+
+Renditions are identified by the SHA-256 of the source (`content_hash`) and by
+`renderer_id()`, which changes whenever the output of the renderer would: bump
+`RENDERER_VERSION` after changing the pipeline, and stored renditions get re-rendered
+lazily on their next read.
+"""
+import hashlib
+import html
+
+RENDERER_VERSION = 1
+
+ALLOWED_TAGS = [
+    "a", "abbr", "b", "blockquote", "br", "code", "div", "em", "h1", "h2", "h3", "h4", "h5", "h6",
+    "hr", "i", "img", "li", "ol", "p", "pre", "span", "strong", "table", "tbody", "td", "th",
+    "thead", "tr", "ul",
+]
+ALLOWED_ATTRIBUTES = {
+    "a": ["href", "title"],
+    "img": ["src", "alt", "title"],
+    "code": ["class"],
+    "div": ["class"],
+    "span": ["class"],
+    "th": ["align"],
+    "td": ["align"],
+}
+ALLOWED_PROTOCOLS = ["http", "https", "mailto"]
+
+def content_hash(content: str) -> str:
+    """
+    Returns the hex SHA-256 of a lesson body.
+    """
+    return hashlib.sha256(content.encode()).hexdigest()
+
+def _markdown_modules():
+    try:
+        import markdown
+        import bleach
+    except ImportError:
+        return None
+    return markdown, bleach
+
+def _has_pygments() -> bool:
+    try:
+        import pygments  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+def renderer_id() -> str:
+    """
+    Identifies the current rendering pipeline, e.g. '1:markdown+pygments' or '1:plain'.
+    """
+    if _markdown_modules() is None:
+        return f"{RENDERER_VERSION}:plain"
+    return f"{RENDERER_VERSION}:markdown" + ("+pygments" if _has_pygments() else "")
+
+def render_content(content: str) -> str:
+    """
+    Renders a lesson body to sanitized HTML.
+
+    Args:
+        content (str): The Markdown source.
+
+    Returns:
+        str: The HTML fragment.
+    """
+    modules = _markdown_modules()
+    if modules is None:
+        paragraphs = [part.strip() for part in content.split("\n\n") if part.strip()]
+        return "".join(f"<p>{html.escape(part).replace(chr(10), '<br>')}</p>" for part in paragraphs)
+
+    markdown, bleach = modules
+    extensions = ["fenced_code", "tables", "sane_lists"]
+    if _has_pygments():
+        extensions.append("codehilite")
+    rendered = markdown.markdown(content, extensions=extensions, output_format="html")
+    return bleach.clean(
+        rendered,
+        tags=ALLOWED_TAGS,
+        attributes=ALLOWED_ATTRIBUTES,
+        protocols=ALLOWED_PROTOCOLS,
+        strip=True,
+    )
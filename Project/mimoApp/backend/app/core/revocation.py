@@ -0,0 +1,185 @@
+import hashlib
+import logging
+import math
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Iterable, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter over strings: no false negatives, tunable false positive rate.
+
+    Positions are derived from one BLAKE2b digest with double hashing, so a lookup costs
+    a single hash whatever the number of probes.
+    """
+
+    def __init__(self, capacity: int, error_rate: float):
+        capacity = max(1, capacity)
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.probes = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, key: str):
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        first, second = int.from_bytes(digest[:8], "little"), int.from_bytes(digest[8:], "little") | 1
+        return ((first + i * second) % self.size for i in range(self.probes))
+
+    def add(self, key: str) -> None:
+        for position in self._positions(key):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, key: str) -> bool:
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+
+class RevocationCache:
+    """
+    In-process view of the revoked access tokens, checked on every authenticated request.
+
+    A Bloom filter of the revoked token ids answers the common case (token not revoked)
+    without any I/O. Ids matching the filter are looked up in a bounded cache of exact
+    answers and, on a miss, confirmed with `confirm(jti)` (a database query); the answer
+    is cached until the token expires.
+
+    The filter is rebuilt from `load()` every `sync_seconds` in a background thread: this
+    picks up revocations made elsewhere and drops the expired ones, which a Bloom filter
+    cannot delete. Revocations announced in between (LISTEN/NOTIFY) are added with `add`.
+    """
+
+    def __init__(
+        self,
+        load: Callable[[], Iterable[Tuple[str, float]]],
+        confirm: Callable[[str], bool],
+        sync_seconds: float,
+        capacity: int,
+        error_rate: float,
+        cache_size: int,
+    ):
+        self.load = load
+        self.confirm = confirm
+        self.sync_seconds = sync_seconds
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.cache_size = cache_size
+        self._bloom = BloomFilter(capacity, error_rate)
+        self._answers: "OrderedDict[str, Tuple[bool, float]]" = OrderedDict()  # jti -> (revoked, expires)
+        self._lock = threading.Lock()
+        self._added_during_rebuild: list | None = None
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._stats = {"checks": 0, "filter_hits": 0, "confirmations": 0, "revoked": 0, "rebuilds": 0, "entries": 0}
+
+    def start(self) -> None:
+        """
+        Loads the revocations and starts the background rebuild thread.
+        """
+        if self._thread is not None:
+            return
+        try:
+            self.rebuild()
+        except Exception:
+            logger.exception("Initial load of the token revocations failed, retrying in the background")
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="revocation-sync", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """
+        Stops the background rebuild thread.
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.sync_seconds):
+            try:
+                self.rebuild()
+            except Exception:
+                logger.exception("Refreshing the token revocations failed")
+
+    def rebuild(self) -> None:
+        """
+        Replaces the filter with one built from the revocations that have not expired.
+        """
+        with self._lock:
+            self._added_during_rebuild = []
+        try:
+            entries = list(self.load())
+            bloom = BloomFilter(max(self.capacity, 2 * len(entries)), self.error_rate)
+            for jti, _ in entries:
+                bloom.add(jti)
+        finally:
+            with self._lock:
+                added, self._added_during_rebuild = self._added_during_rebuild, None
+        with self._lock:
+            for jti in added:
+                bloom.add(jti)
+            self._bloom = bloom
+            # Expired answers are useless; negative ones may be stale if the token was
+            # revoked by another process since, so they are confirmed again on the next hit
+            now = time.time()
+            for jti in [jti for jti, (revoked, expires) in self._answers.items() if expires <= now or not revoked]:
+                del self._answers[jti]
+            self._stats["rebuilds"] += 1
+            self._stats["entries"] = len(entries) + len(added)
+
+    def add(self, jti: str, expires: float) -> None:
+        """
+        Marks a token as revoked in this process (own logouts and NOTIFY messages).
+        """
+        with self._lock:
+            self._bloom.add(jti)
+            if self._added_during_rebuild is not None:
+                self._added_during_rebuild.append(jti)
+            self._remember(jti, True, expires)
+
+    def _remember(self, jti: str, revoked: bool, expires: float) -> None:
+        self._answers[jti] = (revoked, expires)
+        self._answers.move_to_end(jti)
+        while len(self._answers) > self.cache_size:
+            self._answers.popitem(last=False)
+
+    def is_revoked(self, jti: str, expires: float) -> bool:
+        """
+        Tells whether a token is revoked.
+
+        Args:
+            jti (str): The ID of the token.
+            expires (float): The expiry of the token (POSIX timestamp), used to age the cached answer.
+
+        Returns:
+            bool: True if the token was revoked.
+        """
+        with self._lock:
+            self._stats["checks"] += 1
+            if jti not in self._bloom:
+                return False
+            self._stats["filter_hits"] += 1
+            answer = self._answers.get(jti)
+            if answer is not None:
+                self._answers.move_to_end(jti)
+                if answer[0]:
+                    self._stats["revoked"] += 1
+                return answer[0]
+
+        # Rare path: the filter matched but the answer is unknown, ask the database
+        revoked = self.confirm(jti)
+        with self._lock:
+            self._stats["confirmations"] += 1
+            if revoked:
+                self._stats["revoked"] += 1
+            self._remember(jti, revoked, expires)
+        return revoked
+
+    def stats(self) -> dict:
+        """
+        Returns the cache counters, published under `GET /metrics`.
+        """
+        with self._lock:
+            return dict(self._stats, cached_answers=len(self._answers), filter_bits=self._bloom.size)
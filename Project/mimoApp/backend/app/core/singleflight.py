@@ -0,0 +1,80 @@
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent identical calls so that only one of them does the work.
+
+    While a call for a given key is in flight, any other caller asking for the same
+    key waits for that call and receives its result (or its exception) instead of
+    running the function again. Once the call finishes the key is forgotten, so this
+    is not a cache: later callers always trigger a fresh call.
+
+    Callers are threads (Starlette's threadpool for sync endpoints). The result is
+    handed to every caller as is, so it must not belong to the leader: ORM instances
+    are shared as copied values (`db.shared_rows`), never as objects of a session.
+
+    Attributes:
+        name (str): The name used when publishing the metrics.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, Future] = {}
+        self._requests = 0
+        self._executions = 0
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """
+        Runs `fn` for `key`, or waits for the call already in flight for the same key.
+
+        Args:
+            key (Hashable): Identifies identical calls, e.g. `("course", 1)`.
+            fn (Callable[[], Any]): The function doing the actual work.
+
+        Returns:
+            Any: The result of the (possibly shared) call.
+        """
+        with self._lock:
+            self._requests += 1
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._calls[key] = future
+                self._executions += 1
+
+        if not leader:
+            return future.result()
+
+        try:
+            future.set_result(fn())
+        except BaseException as exc:
+            future.set_exception(exc)
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+        return future.result()
+
+    def stats(self) -> dict:
+        """
+        Returns the coalescing metrics of this group.
+
+        Returns:
+            dict: The number of requests, the number of actual executions, the number of
+            requests served by a shared call and the coalescing ratio (shared / requests).
+        """
+        with self._lock:
+            requests, executions = self._requests, self._executions
+            in_flight = len(self._calls)
+        shared = requests - executions
+        return {
+            "requests": requests,
+            "executions": executions,
+            "shared": shared,
+            "coalescing_ratio": round(shared / requests, 4) if requests else 0.0,
+            "in_flight": in_flight,
+        }
@@ -0,0 +1,189 @@
+import gzip
+import hashlib
+import mmap
+import os
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+
+
+def _brotli():
+    try:
+        import brotli
+    except ImportError:
+        return None
+    return brotli
+
+# Stored variants of a snapshot, most preferred first: (Content-Encoding, file suffix)
+_VARIANTS = [("br", ".br"), ("gzip", ".gz"), ("identity", "")]
+
+
+@dataclass
+class Snapshot:
+    """
+    One published version of a document, mapped in memory.
+
+    Attributes:
+        version (str): The content hash of the document, also its ETag.
+        variants (dict): The mapped bytes of each stored encoding, by Content-Encoding.
+    """
+    version: str
+    variants: dict = field(default_factory=dict)
+
+    def etag(self, encoding: str) -> str:
+        return f'"{self.version}"' if encoding == "identity" else f'"{self.version}-{encoding}"'
+
+    def select(self, accept_encoding: str | None) -> tuple[str, memoryview]:
+        """
+        Picks the smallest stored variant the client accepts.
+
+        Args:
+            accept_encoding (str | None): The `Accept-Encoding` request header.
+
+        Returns:
+            tuple: `(encoding, body)`; `encoding` is 'identity' when nothing else fits.
+        """
+        accepted = set()
+        for item in (accept_encoding or "").split(","):
+            coding, _, params = item.partition(";")
+            name, _, value = params.partition("=")
+            try:
+                if name.strip() == "q" and float(value) == 0:
+                    continue  # Explicitly refused
+            except ValueError:
+                pass
+            accepted.add(coding.strip().lower())
+        for encoding, _ in _VARIANTS:
+            if encoding in self.variants and (encoding == "identity" or encoding in accepted or "*" in accepted):
+                return encoding, self.variants[encoding]
+        return "identity", self.variants["identity"]
+
+
+class SnapshotStore:
+    """
+    Versioned, precompressed files of one document on local disk, served from memory maps.
+
+    `publish` writes `root/name-<version>.json` plus its gzip (and brotli, when the
+    module is installed) variants, then points `root/name.current` at the version. Every
+    file is written to a temporary name and renamed into place, so readers never see a
+    partial file and the pointer only ever names a complete version.
+
+    `current` re-reads the pointer only when its modification time changed (one `stat`
+    per call) and keeps the files of the current version mapped: responses are slices
+    of the page cache, never copied into Python objects. Replaced versions stay valid
+    for as long as a response still holds their memory.
+    """
+
+    def __init__(self, root: str, name: str):
+        self.root = root
+        self.name = name
+        self._lock = threading.Lock()
+        self._pointer_mtime = None
+        self._snapshot = None
+
+    def _pointer_path(self) -> str:
+        return os.path.join(self.root, f"{self.name}.current")
+
+    def path_for(self, version: str, suffix: str = "") -> str:
+        return os.path.join(self.root, f"{self.name}-{version}.json{suffix}")
+
+    def _write_atomic(self, path: str, data: bytes):
+        tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        with open(tmp_path, "wb") as tmp:
+            tmp.write(data)
+            tmp.flush()
+            os.fsync(tmp.fileno())
+        os.replace(tmp_path, path)
+
+    def publish(self, body: bytes, keep: int = 3) -> str:
+        """
+        Publishes a new version of the document, unless it is unchanged.
+
+        Args:
+            body (bytes): The JSON document.
+            keep (int): How many versions to keep on disk, the current one included.
+
+        Returns:
+            str: The version now current.
+        """
+        os.makedirs(self.root, exist_ok=True)
+        version = hashlib.sha256(body).hexdigest()[:16]
+        if self.published_version() == version:
+            return version
+
+        self._write_atomic(self.path_for(version), body)
+        self._write_atomic(self.path_for(version, ".gz"), gzip.compress(body, compresslevel=9, mtime=0))
+        brotli = _brotli()
+        if brotli is not None:
+            self._write_atomic(self.path_for(version, ".br"), brotli.compress(body, quality=11))
+        self._write_atomic(self._pointer_path(), version.encode())
+        self._prune(version, keep)
+        return version
+
+    def published_version(self) -> str | None:
+        """
+        Returns the version the pointer names, or None if nothing was published yet.
+        """
+        try:
+            with open(self._pointer_path(), "rb") as pointer:
+                return pointer.read().decode().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def _prune(self, current: str, keep: int):
+        """
+        Deletes all but the `keep` most recent versions (and stale temporary files).
+        """
+        prefix = f"{self.name}-"
+        versions = {}
+        for entry in os.scandir(self.root):
+            if not entry.name.startswith(prefix):
+                continue
+            if entry.name.endswith(".tmp"):
+                if entry.stat().st_mtime < time.time() - 3600:
+                    os.unlink(entry.path)  # Left over by a crashed publisher
+                continue
+            version = entry.name[len(prefix):].split(".", 1)[0]
+            versions[version] = max(versions.get(version, 0), entry.stat().st_mtime)
+        stale = sorted((v for v in versions if v != current), key=versions.get, reverse=True)[max(keep - 1, 0):]
+        for version in stale:
+            for _, suffix in _VARIANTS:
+                try:
+                    os.unlink(self.path_for(version, suffix))
+                except FileNotFoundError:
+                    pass
+
+    def _map(self, version: str) -> Snapshot | None:
+        snapshot = Snapshot(version)
+        for encoding, suffix in _VARIANTS:
+            try:
+                with open(self.path_for(version, suffix), "rb") as file:
+                    # The mapping outlives the file descriptor; an empty file cannot be mapped
+                    if os.fstat(file.fileno()).st_size == 0:
+                        continue
+                    snapshot.variants[encoding] = memoryview(mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ))
+            except FileNotFoundError:
+                continue
+        return snapshot if "identity" in snapshot.variants else None
+
+    def current(self) -> Snapshot | None:
+        """
+        Returns the current snapshot, or None if nothing was published yet.
+        """
+        try:
+            stat = os.stat(self._pointer_path())
+        except FileNotFoundError:
+            return None
+        mtime = (stat.st_ino, stat.st_mtime_ns)  # The pointer is replaced, never rewritten in place
+        if mtime == self._pointer_mtime:
+            return self._snapshot
+
+        with self._lock:
+            if mtime != self._pointer_mtime:
+                version = self.published_version()
+                if self._snapshot is None or self._snapshot.version != version:
+                    self._snapshot = self._map(version) if version else None
+                # A version pruned under our feet is retried on the next call
+                self._pointer_mtime = mtime if self._snapshot is not None else None
+            return self._snapshot
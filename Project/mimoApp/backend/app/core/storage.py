@@ -0,0 +1,140 @@
+import hashlib
+import os
+import re
+import uuid
+from typing import AsyncIterator, Iterator
+
+import anyio
+from core.profiler import attribute_thread
+
+_SHA256 = re.compile(r"^[0-9a-f]{64}$")
+
+
+class BlobTooLarge(Exception):
+    """
+    Raised when an upload exceeds the size limit of the store.
+    """
+
+
+class BlobStore:
+    """
+    Content-addressed files on local disk.
+
+    A blob lives at `root/ab/cd/abcd...`, named after the SHA-256 of its content, so
+    identical uploads share one file and a stored file never changes. Uploads are
+    streamed chunk by chunk into `root/tmp` while being hashed, then moved into place
+    with an atomic rename: readers never see a partial blob.
+    """
+
+    def __init__(self, root: str, max_bytes: int):
+        self.root = root
+        self.max_bytes = max_bytes
+
+    @staticmethod
+    def is_valid_key(sha256: str) -> bool:
+        return bool(_SHA256.match(sha256))
+
+    def path_for(self, sha256: str) -> str:
+        """
+        Returns the path of a blob (which may not exist).
+        """
+        return os.path.join(self.root, sha256[:2], sha256[2:4], sha256)
+
+    def _tmp_dir(self) -> str:
+        return os.path.join(self.root, "tmp")
+
+    async def write(self, chunks: AsyncIterator[bytes]) -> tuple[str, int]:
+        """
+        Stores a stream of bytes.
+
+        If the blob already exists the upload is discarded and the existing file is
+        touched, which tells the orphan collector it was just uploaded again.
+
+        Args:
+            chunks (AsyncIterator[bytes]): The content, e.g. `request.stream()`.
+
+        Returns:
+            tuple: `(sha256, size)` of the content.
+
+        Raises:
+            BlobTooLarge: If the content exceeds `max_bytes` (nothing is stored).
+        """
+        os.makedirs(self._tmp_dir(), exist_ok=True)
+        tmp_path = os.path.join(self._tmp_dir(), uuid.uuid4().hex)
+        digest = hashlib.sha256()
+        size = 0
+        try:
+            async with await anyio.open_file(tmp_path, "wb") as tmp:
+                async for chunk in chunks:
+                    size += len(chunk)
+                    if size > self.max_bytes:
+                        raise BlobTooLarge(f"Files are limited to {self.max_bytes} bytes")
+                    digest.update(chunk)
+                    await tmp.write(chunk)
+                await tmp.flush()
+                await anyio.to_thread.run_sync(attribute_thread(os.fsync), tmp.wrapped.fileno())
+
+            sha256 = digest.hexdigest()
+            path = self.path_for(sha256)
+            if os.path.exists(path):
+                os.utime(path)
+                os.unlink(tmp_path)
+            else:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                os.replace(tmp_path, path)
+            return sha256, size
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+    def delete(self, sha256: str, older_than: float) -> bool:
+        """
+        Deletes a blob unless it was written or touched after `older_than` (a timestamp),
+        i.e. unless an upload of the same content may be about to reference it again.
+
+        Returns:
+            bool: True if the file was deleted.
+        """
+        path = self.path_for(sha256)
+        try:
+            if os.stat(path).st_mtime >= older_than:
+                return False
+            os.unlink(path)
+            return True
+        except FileNotFoundError:
+            return False
+
+    def iter_blobs(self, older_than: float) -> Iterator[str]:
+        """
+        Yields the keys of the stored blobs last written before `older_than`.
+        """
+        for first in _scandirs(self.root):
+            if first.name == "tmp":
+                continue
+            for second in _scandirs(first.path):
+                for entry in os.scandir(second.path):
+                    if entry.is_file() and self.is_valid_key(entry.name) and entry.stat().st_mtime < older_than:
+                        yield entry.name
+
+    def purge_tmp(self, older_than: float) -> int:
+        """
+        Deletes the leftovers of interrupted uploads.
+
+        Returns:
+            int: The number of files deleted.
+        """
+        deleted = 0
+        for entry in _scandirs(self._tmp_dir(), files=True):
+            if entry.stat().st_mtime < older_than:
+                os.unlink(entry.path)
+                deleted += 1
+        return deleted
+
+
+def _scandirs(path: str, files: bool = False):
+    try:
+        entries = list(os.scandir(path))
+    except FileNotFoundError:
+        return []
+    return [entry for entry in entries if (entry.is_file() if files else entry.is_dir())]
@@ -0,0 +1,92 @@
+"""
+Workload capture: normalized SQL fingerprints of the statements the application runs.
+
+Literals and bound parameters are replaced with `?` (and `IN` lists collapsed), so the
+statements that differ only by their values share a fingerprint, like the entries of
+PostgreSQL's `pg_stat_statements`. Used by the index advisor (`services.index_advisor`).
+"""
+import hashlib
+import re
+import threading
+import time
+from sqlalchemy import event
+
+_PARAMETER = re.compile(r"%\(\w+\)s|%s|\$\d+|:\w+|\?")
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"\bIN\s*\(\s*\?(?:\s*,\s*\?)*\s*\)", re.IGNORECASE)
+_SPACES = re.compile(r"\s+")
+
+
+def normalize_statement(statement: str) -> str:
+    """
+    Returns the statement with its values replaced by `?` and whitespace collapsed.
+    """
+    statement = _STRING.sub("?", statement)
+    statement = _PARAMETER.sub("?", statement)
+    statement = _NUMBER.sub("?", statement)
+    statement = _IN_LIST.sub("IN (?)", statement)
+    return _SPACES.sub(" ", statement).strip()
+
+
+def fingerprint(normalized: str) -> str:
+    return hashlib.sha1(normalized.encode()).hexdigest()[:16]
+
+
+class QueryWorkload:
+    """
+    Thread safe in-process aggregate of statement fingerprints: calls and total time.
+
+    At most `max_fingerprints` distinct statements are kept; further new ones are counted
+    as dropped, so the memory used is bounded whatever the workload.
+    """
+
+    def __init__(self, max_fingerprints: int):
+        self.max_fingerprints = max_fingerprints
+        self._entries: dict = {}  # fingerprint -> {"query", "calls", "total_ms"}
+        self._dropped = 0
+        self._lock = threading.Lock()
+
+    def record(self, statement: str, elapsed_ms: float):
+        normalized = normalize_statement(statement)
+        key = fingerprint(normalized)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                if len(self._entries) >= self.max_fingerprints:
+                    self._dropped += 1
+                    return
+                entry = self._entries[key] = {"query": normalized, "calls": 0, "total_ms": 0.0}
+            entry["calls"] += 1
+            entry["total_ms"] += elapsed_ms
+
+    def snapshot(self) -> list[dict]:
+        """
+        Returns the recorded fingerprints, the most expensive first.
+        """
+        with self._lock:
+            entries = [{"fingerprint": key, **entry} for key, entry in self._entries.items()]
+        return sorted(entries, key=lambda entry: entry["total_ms"], reverse=True)
+
+    def reset(self):
+        with self._lock:
+            self._entries.clear()
+            self._dropped = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"fingerprints": len(self._entries), "dropped": self._dropped}
+
+    def install(self, engine):
+        """
+        Starts recording the statements executed by `engine`.
+        """
+        @event.listens_for(engine, "before_cursor_execute")
+        def _start(conn, cursor, statement, parameters, context, executemany):
+            conn.info["workload_started"] = time.perf_counter()
+
+        @event.listens_for(engine, "after_cursor_execute")
+        def _stop(conn, cursor, statement, parameters, context, executemany):
+            started = conn.info.pop("workload_started", None)
+            if started is not None:
+                self.record(statement, (time.perf_counter() - started) * 1000)
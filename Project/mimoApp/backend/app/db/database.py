@@ -1,53 +1,241 @@
-from sqlalchemy import create_engine
+from contextlib import contextmanager
+from contextvars import ContextVar
+import anyio
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker, Session, declarative_base
+from sqlalchemy.pool import QueuePool
 from core.config import settings
-from typing import Generator
+from core.pg_listener import PgListener
+from typing import AsyncGenerator, Generator
 
 # Create the base for SQLAlchemy models
 Base = declarative_base()
+
+# The unit of work of the HTTP request being served, if any (see `Database.get_session`)
+_request_session: ContextVar[Session | None] = ContextVar("request_session", default=None)
 # Import all models to create the tables
 from models.user import User
+from models.category import CourseCategory
 from models.course import Course
 from models.Lesson import Lesson
+from models.user_course import UserCourse
+from models.sync import Tombstone
+from models.notification import Notification
+from models.outbox import OutboxEvent
+from models.review import Review, CourseRating
+from models.recommendation import CourseRecommendation, RecommendationState
+from models.job import Job
+from models.revoked_token import RevokedToken
+from models.progress import LessonProgress, ActivityEvent
+from models.lesson_rendition import LessonRendition
+from models.asset import Asset, LessonAsset
+
+def pool_limits(max_connections: int, workers: int):
+    """
+    Splits the connection budget of the API between its worker processes.
+
+    Every worker keeps one connection for its `LISTEN` thread (`pg_listener`); the rest
+    of its share goes to the pool, two thirds as persistent connections and one third as
+    overflow. The defaults (31 connections, 1 worker) give the historical 20 + 10 pool.
+
+    Args:
+        max_connections (int): The connections the API may open in total (`DB_MAX_CONNECTIONS`).
+        workers (int): The number of worker processes (`WEB_CONCURRENCY`).
+
+    Returns:
+        tuple: `(pool_size, max_overflow)` for each worker.
+    """
+    per_worker = max(2, max_connections // max(1, workers) - 1)
+    pool_size = max(1, per_worker * 2 // 3)
+    return pool_size, per_worker - pool_size
+
+def _mark_flushed(session, flush_context):
+    session.info["flushed"] = True
+
+def _clear_flushed(session, transaction):
+    if transaction.parent is None:  # The outermost transaction committed or rolled back
+        session.info.pop("flushed", None)
+
+def _configure_sqlite(engine, wal: bool):
+    """
+    Connection setup of the SQLite backend.
+
+    Foreign keys are off by default in SQLite (cascades rely on them), and pysqlite's own
+    transaction handling gets in the way of savepoints, so transactions are begun
+    explicitly instead, which the rollback test fixtures need (see `core.pytest_plugin`).
+    """
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA foreign_keys = ON")
+        if wal:
+            cursor.execute("PRAGMA journal_mode = WAL")  # Readers do not block the writer
+            cursor.execute("PRAGMA synchronous = NORMAL")
+            cursor.execute(f"PRAGMA busy_timeout = {settings.DB_POOL_TIMEOUT * 1000}")
+        cursor.close()
+
+    @event.listens_for(engine, "begin")
+    def _on_begin(connection):
+        connection.exec_driver_sql("BEGIN")
+
+def create_sqlite_engine(path: str):
+    """
+    Creates the engine of the SQLite backend.
+
+    A file database gets a regular pool, one connection per concurrent session, with
+    writers waiting on each other through `busy_timeout`. An in-memory database only
+    lives as long as its connection, so there is a single one, and sessions take turns
+    on it: the pool hands it to one session at a time, the others wait up to
+    `DB_POOL_TIMEOUT`. Two sessions never run transactions on it at the same time.
+
+    Args:
+        path (str): The database file, or '' / ':memory:' for an in-memory database.
+
+    Returns:
+        Engine: The configured engine.
+    """
+    in_memory = path in ("", ":memory:")
+    if in_memory:
+        engine = create_engine(
+            "sqlite://",
+            poolclass=QueuePool,
+            pool_size=1,
+            max_overflow=0,  # The one connection is checked out by one session at a time
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+            connect_args={"check_same_thread": False},
+        )
+    else:
+        pool_size, max_overflow = pool_limits(settings.DB_MAX_CONNECTIONS, settings.WEB_CONCURRENCY)
+        engine = create_engine(
+            f"sqlite:///{path}",
+            poolclass=QueuePool,
+            pool_size=pool_size,
+            max_overflow=max_overflow,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+            connect_args={"check_same_thread": False, "timeout": settings.DB_POOL_TIMEOUT},
+        )
+    _configure_sqlite(engine, wal=not in_memory)
+    return engine
 
 class Database:
     """
-    Class to manage the PostgreSQL connection using SQLAlchemy.
+    Class to manage the database connection using SQLAlchemy.
+
+    PostgreSQL is the production backend. `DB_BACKEND=sqlite` runs the application on
+    SQLite, in memory or in a WAL file, so the test and benchmark suites need no server;
+    PostgreSQL-only features (NOTIFY, partitioning, the index advisor...) are skipped there.
     """
 
     def __init__(self):
+        if settings.DB_BACKEND == "sqlite":
+            self._create_sqlite_engine()
+        else:
+            self._create_postgresql_engine()
+
+        # Create a configured session factory
+        self.SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
+        # Request sessions keep their objects loaded across commits: serializing the response
+        # after the handler committed must not check a connection out again to refresh them
+        self.RequestSessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=self.engine)
+        # Remembers whether the open transaction sent writes (see `release_request_session`)
+        event.listen(self.RequestSessionLocal, "after_flush", _mark_flushed)
+        event.listen(self.RequestSessionLocal, "after_transaction_end", _clear_flushed)
+
+    def _create_postgresql_engine(self):
+        missing = [name for name in ("DB_USER", "DB_PASSWORD", "DB_HOST", "DB_PORT", "DB_NAME") if not getattr(settings, name)]
+        if missing:
+            raise RuntimeError(f"The PostgreSQL backend requires {', '.join(missing)} (or DB_BACKEND=sqlite)")
         self.SQLALCHEMY_DATABASE_URL = (
             f"postgresql+psycopg2://{settings.DB_USER}:{settings.DB_PASSWORD}"
             f"@{settings.DB_HOST}:{settings.DB_PORT}/{settings.DB_NAME}"
         )
 
-        # Create the engine with connection pooling
+        # Create the engine with connection pooling, sized for this worker process
+        pool_size, max_overflow = pool_limits(settings.DB_MAX_CONNECTIONS, settings.WEB_CONCURRENCY)
         self.engine = create_engine(
             self.SQLALCHEMY_DATABASE_URL,
-            pool_size=20,                # Maximum number of connections in the pool
-            max_overflow=10,             # Additional connections allowed beyond pool_size
+            pool_size=pool_size,         # Maximum number of connections in the pool
+            max_overflow=max_overflow,   # Additional connections allowed beyond pool_size
+            pool_timeout=settings.DB_POOL_TIMEOUT,  # Seconds to wait for a free connection
             pool_pre_ping=True,          # Checks the connection's health before using it
         )
 
-        # Create a configured session factory
-        self.SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
+    def _create_sqlite_engine(self):
+        self.engine = create_sqlite_engine(settings.DB_SQLITE_PATH)
+        self.SQLALCHEMY_DATABASE_URL = str(self.engine.url)
 
-    def get_session(self) -> Generator[Session, None, None]:
+    def reset_after_fork(self):
         """
-        Provides a new database session.
+        Drops the pooled connections inherited from a parent process without closing them.
+
+        Must run first thing in a forked child (see `gunicorn.conf.py` and `worker.py`):
+        the parent keeps using those sockets, and the child opens its own on demand.
+        """
+        self.engine.dispose(close=False)
+
+    async def get_session(self) -> AsyncGenerator[Session, None]:
+        """
+        Provides the unit of work of the current request.
         Use this method in FastAPI dependencies.
 
+        FastAPI resolves a dependency once per request, so every dependency of a request
+        (`get_current_user`, the route itself...) shares this session. A session only
+        checks a connection out of the pool on its first query and hands it back when it
+        commits; routes using `UnitOfWorkRoute` (`db.unit_of_work`) also end a read-only
+        transaction as soon as the handler returns, before the response is serialized.
+
         Returns:
-            Session: A new database session.
+            Session: The request's database session.
         """
+        db = self.RequestSessionLocal()
+        _request_session.set(db)  # Set in the request task, so visible to the threadpool calls
+        try:
+            yield db
+        finally:
+            _request_session.set(None)
+            await anyio.to_thread.run_sync(db.close)
+
+    @contextmanager
+    def session_scope(self) -> Generator[Session, None, None]:
+        """
+        Provides the current request's session when called while serving a request, or
+        a new session closed on exit otherwise (jobs, background threads).
+
+        For code that needs a session but has none passed in, e.g. the revocation check.
+        """
+        db = _request_session.get()
+        if db is not None:
+            yield db
+            return
         db = self.SessionLocal()
         try:
             yield db
         finally:
             db.close()
 
+    def release_request_session(self):
+        """
+        Ends the current request's transaction when the handler left one open, so its
+        connection returns to the pool right away. A transaction that only read data is
+        committed. One holding writes the handler flushed but did not commit is rolled
+        back: those writes are discarded, as they would be when the session closes.
+        Changes still pending in the session (never flushed) are left alone, they are
+        discarded when the session closes.
+        """
+        db = _request_session.get()
+        if db is None or not db.in_transaction():
+            return
+        if db.info.get("flushed"):
+            db.rollback()
+        elif not (db.new or db.dirty or db.deleted):
+            db.commit()
+
 # Instantiate the Database class
 db_instance = Database()
 
+# Single LISTEN connection per worker, shared by every subsystem that needs NOTIFY
+pg_listener = PgListener(db_instance.engine)
+
 # Create the database tables
 Base.metadata.create_all(bind=db_instance.engine)
@@ -0,0 +1,27 @@
+from sqlalchemy.orm import Session
+
+def dialect_name(db: Session) -> str:
+    """
+    Returns the name of the SQL dialect the session is bound to ('postgresql', 'sqlite', ...).
+    """
+    return db.get_bind().dialect.name
+
+def upsert(db: Session, table):
+    """
+    Returns an `INSERT` construct supporting `on_conflict_do_update` for the session's dialect.
+
+    PostgreSQL and SQLite both implement `INSERT ... ON CONFLICT`, but SQLAlchemy exposes it
+    through dialect specific constructs.
+
+    Args:
+        db (Session): The database session the statement will run on.
+        table: The table (or mapped class) to insert into.
+
+    Returns:
+        Insert: A dialect specific insert statement.
+    """
+    if dialect_name(db) == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        from sqlalchemy.dialects.postgresql import insert
+    return insert(table)
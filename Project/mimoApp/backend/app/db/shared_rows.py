@@ -0,0 +1,38 @@
+"""
+Sharing loaded rows between sessions, e.g. the result of a coalesced read (`core.singleflight`).
+
+An ORM instance belongs to the session that loaded it: handing it to another thread
+lets that thread trigger lazy loads and expirations on a session it does not own. The
+call loading the rows copies their column values out (`row_values`), and every session
+builds its own persistent instance from the copy (`adopt_row`) without a query.
+"""
+from sqlalchemy import inspect
+from sqlalchemy.orm import Session, make_transient_to_detached
+
+def row_values(obj):
+    """
+    Copies the column values of a loaded instance, or returns None for None.
+    """
+    if obj is None:
+        return None
+    return {attr.key: getattr(obj, attr.key) for attr in inspect(obj).mapper.column_attrs}
+
+def adopt_row(db: Session, model, values: dict | None):
+    """
+    Returns the instance of `model` with the given column values, attached to `db`.
+
+    If `db` already holds that row, its instance is updated from the values and returned.
+
+    Args:
+        db (Session): The session the instance is attached to.
+        model: The mapped class.
+        values (dict | None): The column values copied by `row_values`.
+
+    Returns:
+        The persistent instance, or None if `values` is None.
+    """
+    if values is None:
+        return None
+    instance = model(**values)
+    make_transient_to_detached(instance)  # A row that exists, not a new one to insert
+    return db.merge(instance, load=False)
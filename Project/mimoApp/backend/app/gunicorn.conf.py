@@ -0,0 +1,47 @@
+"""
+Gunicorn configuration for running MimoApp in production.
+
+Gunicorn pre-forks `WEB_CONCURRENCY` Uvicorn workers. With `preload_app` the
+application (models, metadata, table creation) is imported once in the master and
+shared copy-on-write by the workers; the database pool created during that import is
+reset in every child right after the fork, so no connection is ever shared between
+processes. Each worker sizes its pool from `DB_MAX_CONNECTIONS` (see `db.database.pool_limits`).
+
+Usage:
+
+    gunicorn -c gunicorn.conf.py main:app
+
+For development, `uvicorn main:app --reload` still works unchanged.
+"""
+import os
+from core.config import settings
+
+bind = os.getenv("BIND", "0.0.0.0:8000")
+workers = settings.WEB_CONCURRENCY
+worker_class = "uvicorn.workers.UvicornWorker"
+preload_app = True
+
+# On SIGTERM workers stop accepting connections and get this long to finish the
+# in-flight requests before being killed
+graceful_timeout = settings.GRACEFUL_TIMEOUT_SECONDS
+timeout = int(os.getenv("WORKER_TIMEOUT", "60"))
+keepalive = 5
+
+accesslog = "-"
+errorlog = "-"
+
+def post_fork(server, worker):
+    """
+    Forgets the pooled connections inherited from the master before the worker serves requests.
+    """
+    from db.database import db_instance
+
+    db_instance.reset_after_fork()
+
+def worker_exit(server, worker):
+    """
+    Closes the worker's own connections once it has drained its requests.
+    """
+    from db.database import db_instance
+
+    db_instance.engine.dispose()
@@ -18,12 +18,39 @@ You should have received a copy of the GNU General Public License along with PRO
 
 """
 
-from fastapi import FastAPI
+import asyncio
+import re
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 from api.auth import router as auth_router
 from api.users import router as users_router
 from api.courses import router as courses_router
 from api.Lesson import router as lesson_router
+from api.metrics import router as metrics_router
+from api.sync import router as sync_router
+from api.notifications import router as notifications_router
+from api.reviews import router as reviews_router
+from api.categories import router as categories_router
+from api.admin import router as admin_router
+from api.jobs import router as jobs_router
+from api.progress import router as progress_router
+from api.assets import router as assets_router
+from api.debug import router as debug_router
+from db.database import db_instance, pg_listener, pool_limits
+from services.notification_service import notification_hub
+from services.outbox_service import outbox_dispatcher
+from services.revocation_service import revocation_cache
+from services.partition_service import ensure_partitions
+from services.index_advisor import query_workload
+from services.profile_service import request_profiler
+from core.config import settings
+from core.admission import AdmissionController, AdmissionControlMiddleware, RouteClass
+from core.query_budget import QueryBudgetGuard, QueryBudgetMiddleware, install as install_query_counter
+from core.profiler import ProfilerMiddleware
+from core.metrics import register_metrics
+import services.event_handlers  # Registers the outbox event handlers
 
 
 app = FastAPI(
@@ -37,6 +64,63 @@ origins = [
     "http://localhost:3000",  
     "https://mimoapp.com"     
 ]
+
+# Query budgets: a sample of the requests is checked against the number of SQL statements
+# their endpoint declares with @query_budget, violations are logged with the statements.
+# Added first, so it runs inside admission control and only sees admitted requests.
+query_guard = QueryBudgetGuard(settings.QUERY_BUDGET_SAMPLE_RATE, settings.QUERY_BUDGET_DEFAULT)
+install_query_counter(db_instance.engine)
+register_metrics("query_budget", query_guard.stats)
+app.add_middleware(QueryBudgetMiddleware, guard=query_guard)
+
+# Sampling profiler for the requests sending the X-Profile header or picked at random
+# (GET /debug/profiles). Inside admission control too: queueing time is not profiled.
+if settings.PROFILER_TOKEN or settings.PROFILER_SAMPLE_RATE:
+    app.add_middleware(ProfilerMiddleware, profiler=request_profiler)
+
+# Workload capture for the index advisor (GET /admin/index-advice)
+if settings.INDEX_ADVISOR_CAPTURE:
+    query_workload.install(db_instance.engine)
+
+# Admission control: requests beyond what the worker's database pool can serve are shed
+# with a 503 instead of queueing without bound. Login and registration (bcrypt, CPU bound)
+# get their own budget so they cannot starve the other endpoints, nor the other way round.
+# Exports keep a pooled connection for their whole stream, so they get a small budget too.
+pool_size, max_overflow = pool_limits(settings.DB_MAX_CONNECTIONS, settings.WEB_CONCURRENCY)
+admission = AdmissionController(
+    classes=[
+        RouteClass(
+            "auth",
+            limit=settings.ADMISSION_AUTH_CONCURRENCY,
+            queue_timeout=settings.ADMISSION_QUEUE_TIMEOUT_SECONDS,
+            max_waiting=settings.ADMISSION_MAX_WAITING,
+            patterns=[re.compile(r"/auth/(login|register)$")],
+        ),
+        RouteClass(
+            "export",
+            limit=settings.ADMISSION_EXPORT_CONCURRENCY,
+            queue_timeout=settings.ADMISSION_QUEUE_TIMEOUT_SECONDS,
+            max_waiting=settings.ADMISSION_MAX_WAITING,
+            patterns=[re.compile(r"^/admin/export/")],
+        ),
+        RouteClass(
+            "default",
+            limit=settings.ADMISSION_CONCURRENCY or max(
+                1, pool_size + max_overflow - settings.ADMISSION_AUTH_CONCURRENCY - settings.ADMISSION_EXPORT_CONCURRENCY
+            ),
+            queue_timeout=settings.ADMISSION_QUEUE_TIMEOUT_SECONDS,
+            max_waiting=settings.ADMISSION_MAX_WAITING,
+        ),
+    ],
+    # Notification streams and asset downloads hold no database connection while open; docs
+    # and metrics must stay reachable
+    exempt=[r"/notifications/stream$", r"^/assets/", r"^/metrics", r"^/docs", r"^/redoc", r"^/openapi\.json$"],
+    retry_after=settings.ADMISSION_RETRY_AFTER_SECONDS,
+)
+register_metrics("admission", admission.stats)
+if settings.ADMISSION_ENABLED:
+    app.add_middleware(AdmissionControlMiddleware, controller=admission)
+# Added last so it wraps admission control and 503 responses carry the CORS headers too
 app.add_middleware(
     CORSMiddleware,
     allow_origins=origins,
@@ -46,10 +130,62 @@ app.add_middleware(
 )
 
 
+@app.exception_handler(PoolTimeoutError)
+async def pool_timeout_handler(request: Request, exc: PoolTimeoutError):
+    """
+    Answers 503 when no database connection frees up within `DB_POOL_TIMEOUT`.
+    """
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Database busy, retry later"},
+        headers={"Retry-After": str(settings.ADMISSION_RETRY_AFTER_SECONDS)},
+    )
+
+
 app.include_router(auth_router, prefix="/auth", tags=["Auth"])
 app.include_router(users_router, prefix="/users", tags=["Users"])
 app.include_router(courses_router, prefix="/courses", tags=["Courses"])
 app.include_router(lesson_router, prefix="/lesson", tags=["Lesson"])  
+app.include_router(metrics_router)
+app.include_router(sync_router)
+app.include_router(notifications_router)
+app.include_router(reviews_router)
+app.include_router(categories_router)
+app.include_router(admin_router)
+app.include_router(jobs_router)
+app.include_router(progress_router)
+app.include_router(assets_router)
+app.include_router(debug_router)
+
+
+@app.on_event("startup")
+async def start_background_services():
+    """
+    Starts the per-worker background services once the event loop is running.
+    """
+    notification_hub.bind(asyncio.get_running_loop())
+    db = db_instance.SessionLocal()
+    try:
+        ensure_partitions(db)  # The event tables reject rows without a partition for their month
+    finally:
+        db.close()
+    pg_listener.start()
+    revocation_cache.start()
+    if settings.OUTBOX_DISPATCHER_ENABLED:
+        outbox_dispatcher.start()
+
+
+@app.on_event("shutdown")
+def stop_background_services():
+    """
+    Stops the per-worker background services and closes the pooled connections.
+
+    Runs after the server has drained the in-flight requests.
+    """
+    outbox_dispatcher.stop()
+    revocation_cache.stop()
+    pg_listener.stop()
+    db_instance.engine.dispose()
 
 
 @app.get("/", tags=["Root"])
@@ -0,0 +1,43 @@
+from logging.config import fileConfig
+from alembic import context
+from db.database import Base, db_instance
+
+config = context.config
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name)
+
+
+def run_migrations_offline():
+    context.configure(
+        url=db_instance.SQLALCHEMY_DATABASE_URL,
+        target_metadata=Base.metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations(connection):
+    # New tables first, as on application start: the revisions only alter existing ones
+    Base.metadata.create_all(bind=connection)
+    context.configure(connection=connection, target_metadata=Base.metadata)
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online():
+    # A caller may pass its own connection (`config.attributes["connection"]`), e.g. the tests
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        run_migrations(connection)
+        return
+    with db_instance.engine.connect() as connection:
+        run_migrations(connection)
+        connection.commit()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,65 @@
+"""
+Helpers keeping the migrations idempotent.
+
+`Base.metadata.create_all` runs whenever the application (or `migrations/env.py`) starts
+and creates the tables and indexes that do not exist yet. A new database therefore
+already has the current schema, and an existing one is missing the columns, indexes
+and constraints added to its existing tables since it was created. Each revision only
+adds what is missing, through these helpers, and fills the new columns of the rows
+that were already there.
+"""
+from alembic import op
+from sqlalchemy import inspect, text
+
+
+def is_postgresql() -> bool:
+    return op.get_bind().dialect.name == "postgresql"
+
+
+def has_column(table: str, column: str) -> bool:
+    return column in {c["name"] for c in inspect(op.get_bind()).get_columns(table)}
+
+
+def has_index(table: str, name: str) -> bool:
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    if bind.dialect.name == "sqlite":
+        # SQLite's reflection skips expression indexes such as lower(email): read the catalog
+        names = set(bind.execute(
+            text("SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = :table"), {"table": table}
+        ).scalars())
+    else:
+        names = {index["name"] for index in inspector.get_indexes(table)}
+    names |= {constraint["name"] for constraint in inspector.get_unique_constraints(table)}
+    return name in names
+
+
+def add_column(table: str, column) -> bool:
+    """
+    Adds `column` to `table` unless it exists. Returns True if it was added.
+    """
+    if has_column(table, column.name):
+        return False
+    op.add_column(table, column)
+    return True
+
+
+def create_index(name: str, table: str, columns: list, **kw) -> bool:
+    """
+    Creates the index unless an index or unique constraint of that name exists.
+    Returns True if it was created.
+    """
+    if has_index(table, name):
+        return False
+    op.create_index(name, table, columns, **kw)
+    return True
+
+
+def drop_index(name: str, table: str) -> bool:
+    """
+    Drops the index if it exists. Returns True if it was dropped.
+    """
+    if not has_index(table, name):
+        return False
+    op.drop_index(name, table_name=table)
+    return True
@@ -0,0 +1,19 @@
+"""Baseline: the users, courses, lessons and user_courses tables as first created by create_all
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-19
+"""
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    pass  # Created by Base.metadata.create_all
+
+
+def downgrade():
+    pass
@@ -0,0 +1,57 @@
+"""Catalog change feed: updated_at, change_seq and change_xid on courses, lessons and tombstones
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+from migrations.schema import add_column, create_index, is_postgresql
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    for table in ("courses", "lessons"):
+        if add_column(table, sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True)):
+            op.execute(f"UPDATE {table} SET updated_at = CURRENT_TIMESTAMP")
+            if is_postgresql():  # SQLite cannot add a NOT NULL column with a non constant default
+                op.alter_column(table, "updated_at", server_default=sa.func.now(), nullable=False)
+        add_column(table, sa.Column("change_seq", sa.BigInteger(), nullable=True))
+        create_index(f"ix_{table}_change_seq", table, ["change_seq"])
+
+    for table in ("courses", "lessons", "tombstones"):
+        # Rows written before transaction IDs were recorded sort first, as if committed long ago
+        if add_column(table, sa.Column("change_xid", sa.BigInteger(), server_default="0", nullable=False)) and is_postgresql():
+            op.alter_column(table, "change_xid", server_default=None)
+        create_index(f"ix_{table}_change_xid_seq", table, ["change_xid", "change_seq"])
+
+    # Rows that predate the feed have no position: number them after the highest one, so
+    # clients that already synced receive them as upserts
+    bind = op.get_bind()
+    for table in ("courses", "lessons"):
+        highest = bind.execute(sa.text(
+            "SELECT coalesce(max(seq), 0) FROM ("
+            "SELECT max(change_seq) AS seq FROM courses UNION ALL "
+            "SELECT max(change_seq) FROM lessons UNION ALL "
+            "SELECT max(change_seq) FROM tombstones) AS stamped"
+        )).scalar()
+        bind.execute(
+            sa.text(f"UPDATE {table} SET change_seq = :highest + id WHERE change_seq IS NULL"),
+            {"highest": highest},
+        )
+    if is_postgresql():
+        op.execute(
+            "SELECT setval('catalog_change_seq', greatest(1, ("
+            "SELECT max(seq) FROM (SELECT max(change_seq) AS seq FROM courses UNION ALL "
+            "SELECT max(change_seq) FROM lessons UNION ALL SELECT max(change_seq) FROM tombstones) AS stamped)))"
+        )
+
+
+def downgrade():
+    for table in ("courses", "lessons", "tombstones"):
+        op.drop_index(f"ix_{table}_change_xid_seq", table_name=table)
+        op.drop_column(table, "change_xid")
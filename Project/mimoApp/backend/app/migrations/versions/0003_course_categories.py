@@ -0,0 +1,33 @@
+"""Course categories: category_id on courses
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+from migrations.schema import add_column, has_column, is_postgresql
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Existing courses start uncategorized, matching the zero counters of the new categories.
+    # The (category_id, id) index only covers live courses: it comes with deleted_at (0006)
+    if is_postgresql():
+        add_column("courses", sa.Column(
+            "category_id", sa.Integer(), sa.ForeignKey("course_categories.id", ondelete="SET NULL"), nullable=True
+        ))
+    elif not has_column("courses", "category_id"):
+        # Alembic cannot add the constraint separately on SQLite, the column definition can carry it
+        op.execute(
+            "ALTER TABLE courses ADD COLUMN category_id INTEGER "
+            "REFERENCES course_categories (id) ON DELETE SET NULL"
+        )
+
+
+def downgrade():
+    pass  # Kept: dropping a foreign key column is not supported on SQLite
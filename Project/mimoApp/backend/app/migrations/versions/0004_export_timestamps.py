@@ -0,0 +1,34 @@
+"""Exports: created_at and is_admin on users, enrolled_at on user_courses
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+from migrations.schema import add_column, create_index, is_postgresql
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    add_column("users", sa.Column("is_admin", sa.Boolean(), server_default=sa.false(), nullable=False))
+
+    # Registration and enrollment times are unknown for existing rows: they are counted
+    # as of the upgrade, so the first incremental extract after it includes them
+    for table, column in (("users", "created_at"), ("user_courses", "enrolled_at")):
+        if add_column(table, sa.Column(column, sa.DateTime(timezone=True), nullable=True)):
+            op.execute(f"UPDATE {table} SET {column} = CURRENT_TIMESTAMP")
+            if is_postgresql():  # SQLite cannot add a NOT NULL column with a non constant default
+                op.alter_column(table, column, server_default=sa.func.now(), nullable=False)
+        create_index(f"ix_{table}_{column}", table, [column])
+
+
+def downgrade():
+    for table, column in (("users", "created_at"), ("user_courses", "enrolled_at")):
+        op.drop_index(f"ix_{table}_{column}", table_name=table)
+        op.drop_column(table, column)
+    op.drop_column("users", "is_admin")
@@ -0,0 +1,29 @@
+"""Job leases: lease_expires_at on jobs
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-19
+"""
+from datetime import datetime, timedelta, timezone
+from alembic import op
+import sqlalchemy as sa
+from migrations.schema import add_column
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if add_column("jobs", sa.Column("lease_expires_at", sa.DateTime(timezone=True), nullable=True)):
+        # Workers from before this revision never renew a lease: their running jobs get
+        # the hour the old stale check allowed them
+        op.get_bind().execute(
+            sa.text("UPDATE jobs SET lease_expires_at = :expires WHERE status = 'running'"),
+            {"expires": datetime.now(timezone.utc) + timedelta(hours=1)},
+        )
+
+
+def downgrade():
+    op.drop_column("jobs", "lease_expires_at")
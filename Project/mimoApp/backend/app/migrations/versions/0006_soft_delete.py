@@ -0,0 +1,60 @@
+"""Soft delete: deleted_at on courses, lessons and user_courses, live-only indexes
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+from migrations.schema import add_column, create_index, drop_index, is_postgresql
+
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+LIVE = "deleted_at IS NULL"
+
+
+def _live(**kw):
+    return dict(postgresql_where=sa.text(LIVE), sqlite_where=sa.text(LIVE), **kw)
+
+
+def upgrade():
+    for table in ("courses", "lessons", "user_courses"):
+        add_column(table, sa.Column("deleted_at", sa.DateTime(timezone=True), nullable=True))
+
+    # Titles are only unique among live rows, so a deleted title can be reused. The
+    # unique index of the original schema goes; an inline UNIQUE constraint can only be
+    # dropped on PostgreSQL (SQLite would have to rebuild the table)
+    for table in ("courses", "lessons"):
+        drop_index(f"ix_{table}_title", table)
+        if is_postgresql():
+            for constraint in inspect(op.get_bind()).get_unique_constraints(table):
+                if constraint["column_names"] == ["title"]:
+                    op.drop_constraint(constraint["name"], table, type_="unique")
+        create_index(f"uq_{table}_title_live", table, ["title"], unique=True, **_live())
+
+    create_index("ix_courses_category_id_id", "courses", ["category_id", "id"], **_live())
+    create_index(
+        "ix_courses_deleted_at", "courses", ["deleted_at"],
+        postgresql_where=sa.text("deleted_at IS NOT NULL"), sqlite_where=sa.text("deleted_at IS NOT NULL"),
+    )
+    create_index("ix_lessons_course_id", "lessons", ["course_id"])
+    create_index("ix_user_courses_user_id_live", "user_courses", ["user_id", "course_id"], **_live())
+    create_index("ix_user_courses_course_id", "user_courses", ["course_id"])
+
+    # Purging a course removes its lessons through the foreign key; SQLite cannot alter
+    # a foreign key, and the purge job deletes the lessons first anyway
+    if is_postgresql():
+        for foreign_key in inspect(op.get_bind()).get_foreign_keys("lessons"):
+            if foreign_key["referred_table"] == "courses" and foreign_key["options"].get("ondelete") != "CASCADE":
+                op.drop_constraint(foreign_key["name"], "lessons", type_="foreignkey")
+                op.create_foreign_key(
+                    foreign_key["name"], "lessons", "courses", ["course_id"], ["id"], ondelete="CASCADE"
+                )
+
+
+def downgrade():
+    pass  # Kept: restoring global title uniqueness could fail on reused titles
@@ -0,0 +1,44 @@
+"""Lesson ranks: rank on lessons and the ordered outline index
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-19
+"""
+from itertools import groupby
+from alembic import op
+import sqlalchemy as sa
+from core.ranking import spaced_ranks
+from migrations.schema import add_column, create_index, drop_index, is_postgresql
+
+revision = "0007"
+down_revision = "0006"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if add_column("lessons", sa.Column("rank", sa.String(), nullable=True)):
+        # Existing lessons keep their creation (ID) order, with evenly spaced keys per course
+        bind = op.get_bind()
+        rows = bind.execute(sa.text("SELECT course_id, id FROM lessons ORDER BY course_id, id")).all()
+        for _, course_rows in groupby(rows, key=lambda row: row[0]):
+            lesson_ids = [lesson_id for _, lesson_id in course_rows]
+            bind.execute(
+                sa.text("UPDATE lessons SET rank = :rank WHERE id = :id"),
+                [{"id": lesson_id, "rank": rank} for lesson_id, rank in zip(lesson_ids, spaced_ranks(len(lesson_ids)))],
+            )
+        if is_postgresql():  # SQLite cannot make an existing column NOT NULL
+            op.alter_column("lessons", "rank", nullable=False)
+
+    # Replaces the course index of the live lessons, which the outline index covers
+    drop_index("ix_lessons_course_id_live", "lessons")
+    create_index(
+        "ix_lessons_course_id_rank_live", "lessons", ["course_id", "rank", "id"],
+        postgresql_include=["title"],
+        postgresql_where=sa.text("deleted_at IS NULL"), sqlite_where=sa.text("deleted_at IS NULL"),
+    )
+
+
+def downgrade():
+    op.drop_index("ix_lessons_course_id_rank_live", table_name="lessons")
+    op.drop_column("lessons", "rank")
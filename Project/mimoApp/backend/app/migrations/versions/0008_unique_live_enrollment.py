@@ -0,0 +1,39 @@
+"""Enrollments: one live enrollment per user and course
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+from migrations.schema import create_index, drop_index, has_index
+
+revision = "0008"
+down_revision = "0007"
+branch_labels = None
+depends_on = None
+
+LIVE = "deleted_at IS NULL"
+
+
+def upgrade():
+    if not has_index("user_courses", "uq_user_courses_user_course_live"):
+        # Duplicates left by concurrent enrollments: the oldest one stays live
+        op.execute(
+            "UPDATE user_courses SET deleted_at = CURRENT_TIMESTAMP "
+            "WHERE deleted_at IS NULL AND id NOT IN ("
+            "SELECT min(id) FROM user_courses WHERE deleted_at IS NULL GROUP BY user_id, course_id)"
+        )
+    drop_index("ix_user_courses_user_id_live", "user_courses")
+    create_index(
+        "uq_user_courses_user_course_live", "user_courses", ["user_id", "course_id"], unique=True,
+        postgresql_where=sa.text(LIVE), sqlite_where=sa.text(LIVE),
+    )
+
+
+def downgrade():
+    op.drop_index("uq_user_courses_user_course_live", table_name="user_courses")
+    op.create_index(
+        "ix_user_courses_user_id_live", "user_courses", ["user_id", "course_id"],
+        postgresql_where=sa.text(LIVE), sqlite_where=sa.text(LIVE),
+    )
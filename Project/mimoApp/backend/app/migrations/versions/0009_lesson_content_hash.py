@@ -0,0 +1,32 @@
+"""Lesson renditions: content_hash on lessons
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+from core.render import content_hash
+from migrations.schema import add_column
+
+revision = "0009"
+down_revision = "0008"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # lesson_renditions is a new table (created by `create_all`). Existing lessons get the
+    # hash of their content; their HTML is rendered lazily on the first read
+    if add_column("lessons", sa.Column("content_hash", sa.String(64), nullable=True)):
+        bind = op.get_bind()
+        rows = bind.execute(sa.text("SELECT id, content FROM lessons")).all()
+        if rows:
+            bind.execute(
+                sa.text("UPDATE lessons SET content_hash = :hash WHERE id = :id"),
+                [{"id": lesson_id, "hash": content_hash(content)} for lesson_id, content in rows],
+            )
+
+
+def downgrade():
+    op.drop_column("lessons", "content_hash")
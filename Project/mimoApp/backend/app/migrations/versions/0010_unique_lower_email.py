@@ -0,0 +1,31 @@
+"""Users: one account per email, ignoring case
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+from migrations.schema import create_index, drop_index, has_index
+
+revision = "0010"
+down_revision = "0009"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if not has_index("users", "uq_users_lower_email"):
+        # Accounts cannot be merged automatically: they must be resolved before upgrading
+        duplicates = op.get_bind().execute(sa.text(
+            "SELECT lower(email) FROM users WHERE email IS NOT NULL GROUP BY lower(email) HAVING count(*) > 1"
+        )).scalars().all()
+        if duplicates:
+            raise RuntimeError(f"Several users share the emails {', '.join(duplicates)} (ignoring case)")
+    drop_index("ix_users_lower_email", "users")
+    create_index("uq_users_lower_email", "users", [sa.text("lower(email)")], unique=True)
+
+
+def downgrade():
+    op.drop_index("uq_users_lower_email", table_name="users")
+    op.create_index("ix_users_lower_email", "users", [sa.text("lower(email)")])
@@ -0,0 +1,21 @@
+"""Jobs: index of the jobs of a type by status and completion time
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2026-10-19
+"""
+from alembic import op
+from migrations.schema import create_index
+
+revision = "0011"
+down_revision = "0010"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    create_index("ix_jobs_kind_status_finished", "jobs", ["kind", "status", "finished_at"])
+
+
+def downgrade():
+    op.drop_index("ix_jobs_kind_status_finished", table_name="jobs")
@@ -1,6 +1,7 @@
-from sqlalchemy import Column, Integer, String
+from sqlalchemy import Column, Integer, BigInteger, String, DateTime, Index, func, text
 from db.database import Base
 from sqlalchemy import ForeignKey
+from models.sync import next_change_seq, current_change_xid
 
 class Lesson(Base):
     """
@@ -15,11 +16,42 @@ class Lesson(Base):
         title (str): The title of the lesson, which must be unique.
         content (str): The content of the lesson.
         course_id (int): The ID of the course to which the lesson belongs (foreign key).
+        updated_at (datetime): When the lesson was created or last modified.
+        change_seq (int): Position of the last change in the catalog change feed.
+        change_xid (int): ID of the transaction that made the last change (see `models.sync`).
+        deleted_at (datetime): When the lesson was soft deleted, or None while it is live.
+        rank (str): Lexicographic position of the lesson within its course (see `core.ranking`).
+        content_hash (str): SHA-256 of the content, the key of its HTML rendition.
     """
     __tablename__ = "lessons"  # Name of the table in the database
 
     # Define columns in the 'lessons' table
     id = Column(Integer, primary_key=True, index=True)  # Primary key for the lesson
-    title = Column(String, unique=True, index=True, nullable=False)  # Unique lesson title
+    title = Column(String, nullable=False)  # Lesson title, unique among live lessons
     content= Column(String, nullable=False)  # Content of the lesson
-    course_id = Column(Integer, ForeignKey("courses.id"), nullable=False)  # Foreign key linking to 'courses.id'
+    course_id = Column(Integer, ForeignKey("courses.id", ondelete="CASCADE"), nullable=False)  # Foreign key linking to 'courses.id'
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)  # Last modification
+    change_seq = Column(BigInteger, default=next_change_seq(), onupdate=next_change_seq(), index=True)  # Sync feed position
+    change_xid = Column(BigInteger, default=current_change_xid(), onupdate=current_change_xid(), nullable=False)  # Writing transaction
+    deleted_at = Column(DateTime(timezone=True), nullable=True)  # Soft delete marker, purged in the background
+    rank = Column(String, nullable=False)  # Position within the course, ordered as a string
+    content_hash = Column(String(64), nullable=True)  # Key of the rendered HTML (lesson_renditions)
+
+    # Partial indexes only cover live lessons, so soft deleted rows cost nothing to reads
+    __table_args__ = (
+        # The sync feed reads changes in (change_xid, change_seq) order
+        Index("ix_lessons_change_xid_seq", "change_xid", "change_seq"),
+        Index(
+            "uq_lessons_title_live", "title", unique=True,
+            postgresql_where=text("deleted_at IS NULL"), sqlite_where=text("deleted_at IS NULL"),
+        ),
+        # Ordered outline of a course: (course_id, rank, id) in order, title included so the
+        # outline is an index-only scan on PostgreSQL
+        Index(
+            "ix_lessons_course_id_rank_live", "course_id", "rank", "id",
+            postgresql_include=["title"],
+            postgresql_where=text("deleted_at IS NULL"), sqlite_where=text("deleted_at IS NULL"),
+        ),
+        # Set based purges and cascades look lessons up by course, live or not
+        Index("ix_lessons_course_id", "course_id"),
+    )
@@ -0,0 +1,41 @@
+"""
+    This model defines the 'assets' and 'lesson_assets' tables. Asset files (images, audio,
+    downloads) are stored on disk by the SHA-256 of their content, see `core.storage`; the
+    'assets' table records one row per distinct blob, so identical uploads share it, and
+    'lesson_assets' names the blobs attached to each lesson.
+    """
+from sqlalchemy import Column, ForeignKey, Integer, BigInteger, String, DateTime, func
+from db.database import Base
+
+class Asset(Base):
+    """
+    Attributes:
+        sha256 (str): SHA-256 of the content, also its location on disk (primary key).
+        size (int): The size of the content in bytes.
+        content_type (str): The media type given by the first upload.
+        uploaded_at (datetime): When the content was last uploaded; unreferenced blobs are
+            only collected once this is older than `ASSET_GC_GRACE_SECONDS`.
+    """
+    __tablename__ = "assets"  # Name of the table in the database
+
+    # Define columns in the 'assets' table
+    sha256 = Column(String(64), primary_key=True)  # Content hash
+    size = Column(BigInteger, nullable=False)  # Content length
+    content_type = Column(String, nullable=False)  # Media type
+    uploaded_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)  # Last upload time
+
+class LessonAsset(Base):
+    """
+    Attributes:
+        lesson_id (int): The ID of the lesson (primary key, foreign key).
+        filename (str): The name of the file within the lesson (primary key).
+        asset_sha256 (str): The content of the file (foreign key).
+        created_at (datetime): When the file was attached or last replaced.
+    """
+    __tablename__ = "lesson_assets"  # Name of the table in the database
+
+    # Define columns in the 'lesson_assets' table
+    lesson_id = Column(Integer, ForeignKey("lessons.id", ondelete="CASCADE"), primary_key=True)  # Owning lesson
+    filename = Column(String, primary_key=True)  # File name within the lesson
+    asset_sha256 = Column(String(64), ForeignKey("assets.sha256"), nullable=False, index=True)  # Content, indexed for the orphan collector
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)  # Attach time
@@ -0,0 +1,23 @@
+"""
+    This model defines the 'course_categories' table. Categories can be nested through
+    `parent_id`, and each one caches the number of courses it contains so the catalog
+    menu never has to count courses on every request.
+    """
+from sqlalchemy import Column, ForeignKey, Integer, String
+from db.database import Base
+
+class CourseCategory(Base):
+    """
+    Attributes:
+        id (int): The unique identifier of the category (primary key).
+        name (str): The unique name of the category.
+        parent_id (int): The ID of the parent category, or None for a top level category.
+        course_count (int): Cached number of courses directly in this category.
+    """
+    __tablename__ = "course_categories"  # Name of the table in the database
+
+    # Define columns in the 'course_categories' table
+    id = Column(Integer, primary_key=True, index=True)  # Primary key for the category
+    name = Column(String, unique=True, nullable=False)  # Unique category name
+    parent_id = Column(Integer, ForeignKey("course_categories.id", ondelete="SET NULL"), nullable=True, index=True)  # Parent category
+    course_count = Column(Integer, nullable=False, default=0, server_default="0")  # Cached number of courses
@@ -1,5 +1,6 @@
-from sqlalchemy import Column, Integer, String
+from sqlalchemy import Column, ForeignKey, Integer, BigInteger, String, DateTime, Index, func, text
 from db.database import Base
+from models.sync import next_change_seq, current_change_xid
 
 class Course(Base):
     """
@@ -13,10 +14,40 @@ class Course(Base):
         id (int): The unique identifier for the course (primary key).
         title (str): The title of the course, which must be unique.
         description (str): A description of the course content.
+        category_id (int): The ID of the category of the course, if any (foreign key).
+        updated_at (datetime): When the course was created or last modified.
+        change_seq (int): Position of the last change in the catalog change feed.
+        change_xid (int): ID of the transaction that made the last change (see `models.sync`).
+        deleted_at (datetime): When the course was soft deleted, or None while it is live.
     """
     __tablename__ = "courses"  # Name of the table in the database
 
     # Define columns in the 'courses' table
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)  # Primary key for the course
-    title = Column(String, unique=True, index=True, nullable=False)  # Unique course title
+    title = Column(String, nullable=False)  # Course title, unique among live courses
     description = Column(String, nullable=False)  # Course description
+    category_id = Column(Integer, ForeignKey("course_categories.id", ondelete="SET NULL"), nullable=True)  # Course category
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)  # Last modification
+    change_seq = Column(BigInteger, default=next_change_seq(), onupdate=next_change_seq(), index=True)  # Sync feed position
+    change_xid = Column(BigInteger, default=current_change_xid(), onupdate=current_change_xid(), nullable=False)  # Writing transaction
+    deleted_at = Column(DateTime(timezone=True), nullable=True)  # Soft delete marker, purged in the background
+
+    # Partial indexes only cover live courses, so soft deleted rows cost nothing to reads
+    __table_args__ = (
+        # The sync feed reads changes in (change_xid, change_seq) order
+        Index("ix_courses_change_xid_seq", "change_xid", "change_seq"),
+        Index(
+            "uq_courses_title_live", "title", unique=True,
+            postgresql_where=text("deleted_at IS NULL"), sqlite_where=text("deleted_at IS NULL"),
+        ),
+        # Category browsing reads (category_id, id) in order for keyset pagination
+        Index(
+            "ix_courses_category_id_id", "category_id", "id",
+            postgresql_where=text("deleted_at IS NULL"), sqlite_where=text("deleted_at IS NULL"),
+        ),
+        # Lets the purge job find soft deleted courses without scanning the table
+        Index(
+            "ix_courses_deleted_at", "deleted_at",
+            postgresql_where=text("deleted_at IS NOT NULL"), sqlite_where=text("deleted_at IS NOT NULL"),
+        ),
+    )
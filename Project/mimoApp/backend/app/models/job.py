@@ -0,0 +1,61 @@
+"""
+    This model defines the 'jobs' table, the queue of the background job runner. Heavy
+    work (rebuilding recommendations, reports, maintenance) is enqueued here by the API
+    and executed by `worker.py` in a process pool, outside the API request workers.
+    """
+from sqlalchemy import Column, Integer, String, DateTime, JSON, Index, func, text
+from sqlalchemy.dialects.postgresql import JSONB
+from db.database import Base
+
+class Job(Base):
+    """
+    Attributes:
+        id (int): The unique identifier of the job (primary key).
+        kind (str): The registered job type, e.g. 'recommendations.refresh'.
+        payload (dict): The arguments of the job.
+        status (str): 'queued', 'running', 'succeeded' or 'failed'.
+        priority (int): Higher priorities run first.
+        attempts (int): How many times the job has been started.
+        max_attempts (int): How many attempts are allowed before the job is marked failed.
+        run_at (datetime): The job is not started before this time (used for retry backoff).
+        result (dict): The value returned by the job, once it succeeded.
+        error (str): The error of the last failed attempt.
+        worker (str): The worker that is running (or last ran) the job.
+        lease_expires_at (datetime): Until when the running job belongs to its worker, which
+            renews the lease while the job runs; an expired lease means the worker died.
+        created_at (datetime): When the job was enqueued.
+        started_at (datetime): When the last attempt started.
+        finished_at (datetime): When the job succeeded or finally failed.
+    """
+    __tablename__ = "jobs"  # Name of the table in the database
+
+    # Define columns in the 'jobs' table
+    id = Column(Integer, primary_key=True, index=True)  # Primary key for the job
+    kind = Column(String, nullable=False)  # Registered job type
+    payload = Column(JSON().with_variant(JSONB, "postgresql"), nullable=False, default=dict)  # Job arguments
+    status = Column(String, nullable=False, default="queued", server_default="queued")  # Job state
+    priority = Column(Integer, nullable=False, default=0, server_default="0")  # Higher runs first
+    attempts = Column(Integer, nullable=False, default=0, server_default="0")  # Attempts so far
+    max_attempts = Column(Integer, nullable=False, default=3, server_default="3")  # Attempts allowed
+    run_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())  # Earliest start
+    result = Column(JSON().with_variant(JSONB, "postgresql"), nullable=True)  # Job return value
+    error = Column(String, nullable=True)  # Last error
+    worker = Column(String, nullable=True)  # Worker running the job
+    lease_expires_at = Column(DateTime(timezone=True), nullable=True)  # Heartbeat deadline of the running job
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())  # Enqueue time
+    started_at = Column(DateTime(timezone=True), nullable=True)  # Last start time
+    finished_at = Column(DateTime(timezone=True), nullable=True)  # Completion time
+
+    # Workers only scan the queued jobs, in priority order
+    __table_args__ = (
+        Index(
+            "ix_jobs_queued",
+            priority.desc(),
+            run_at,
+            id,
+            postgresql_where=text("status = 'queued'"),
+            sqlite_where=text("status = 'queued'"),
+        ),
+        # Pending and failed jobs of a type, latest success of a type (`has_failed_since_success`)
+        Index("ix_jobs_kind_status_finished", kind, status, finished_at),
+    )
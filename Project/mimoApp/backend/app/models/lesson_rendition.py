@@ -0,0 +1,24 @@
+"""
+    This model defines the 'lesson_renditions' table: the sanitized HTML of lesson bodies,
+    rendered once at write time (or by a background job) instead of on every view. Rows are
+    keyed by the hash of the source and the renderer that produced them, so identical
+    bodies share a rendition and a renderer upgrade simply misses and re-renders.
+    """
+from sqlalchemy import Column, String, Text, DateTime, func
+from db.database import Base
+
+class LessonRendition(Base):
+    """
+    Attributes:
+        content_hash (str): SHA-256 of the lesson source (primary key).
+        renderer (str): The renderer that produced the HTML, see `core.render.renderer_id` (primary key).
+        html (str): The sanitized HTML.
+        rendered_at (datetime): When the HTML was rendered.
+    """
+    __tablename__ = "lesson_renditions"  # Name of the table in the database
+
+    # Define columns in the 'lesson_renditions' table
+    content_hash = Column(String(64), primary_key=True)  # Source hash
+    renderer = Column(String, primary_key=True)  # Renderer identifier
+    html = Column(Text, nullable=False)  # Rendered HTML
+    rendered_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)  # Render time
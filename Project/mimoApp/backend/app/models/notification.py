@@ -0,0 +1,28 @@
+"""
+    This model defines the 'notifications' table, which stores the messages delivered to
+    each user. Rows are persisted first and then pushed in real time to the user's open
+    WebSocket/SSE connections through PostgreSQL LISTEN/NOTIFY.
+    """
+from sqlalchemy import Column, ForeignKey, Integer, String, Boolean, DateTime, Index, func
+from db.database import Base
+
+class Notification(Base):
+    """
+    Attributes:
+        id (int): The unique identifier of the notification (primary key).
+        user_id (int): The ID of the user the notification is addressed to (foreign key).
+        message (str): The text of the notification.
+        is_read (bool): Whether the user has already read the notification.
+        created_at (datetime): When the notification was created.
+    """
+    __tablename__ = "notifications"  # Name of the table in the database
+
+    # Define columns in the 'notifications' table
+    id = Column(Integer, primary_key=True, index=True)  # Primary key for the notification
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)  # Recipient
+    message = Column(String, nullable=False)  # Notification text
+    is_read = Column(Boolean, default=False, nullable=False)  # Read flag
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)  # Creation time
+
+    # A user's inbox is always read newest first
+    __table_args__ = (Index("ix_notifications_user_id_id", "user_id", "id"),)
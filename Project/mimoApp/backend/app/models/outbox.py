@@ -0,0 +1,46 @@
+"""
+    This model defines the 'outbox_events' table (transactional outbox). Domain changes
+    such as a user registering or a lesson being published insert an event in the same
+    transaction, and a background dispatcher later hands the events to their handlers,
+    keeping emails, notifications and stats updates off the request path.
+    """
+from sqlalchemy import Column, Integer, String, DateTime, JSON, Index, func, text
+from sqlalchemy.dialects.postgresql import JSONB
+from db.database import Base
+
+class OutboxEvent(Base):
+    """
+    Attributes:
+        id (int): The unique identifier of the event (primary key).
+        event_type (str): The kind of event, e.g. 'user.registered'.
+        payload (dict): The data handlers need to process the event.
+        status (str): 'pending', 'done' or 'failed' (retries exhausted).
+        attempts (int): How many times the dispatcher has tried to process the event.
+        available_at (datetime): The event is not claimed before this time (retry backoff).
+        last_error (str): The error of the last failed attempt, if any.
+        created_at (datetime): When the event was recorded.
+        processed_at (datetime): When the event was processed successfully.
+    """
+    __tablename__ = "outbox_events"  # Name of the table in the database
+
+    # Define columns in the 'outbox_events' table
+    id = Column(Integer, primary_key=True)  # Primary key, also the dispatch order
+    event_type = Column(String, nullable=False)  # Kind of event
+    payload = Column(JSON().with_variant(JSONB, "postgresql"), nullable=False)  # Event data
+    status = Column(String, nullable=False, default="pending", server_default="pending")  # Processing state
+    attempts = Column(Integer, nullable=False, default=0, server_default="0")  # Processing attempts
+    available_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())  # Next attempt
+    last_error = Column(String, nullable=True)  # Last failure
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())  # Recording time
+    processed_at = Column(DateTime(timezone=True), nullable=True)  # Completion time
+
+    # The dispatcher only ever scans pending events, so the index skips processed ones
+    __table_args__ = (
+        Index(
+            "ix_outbox_events_pending",
+            "available_at",
+            "id",
+            postgresql_where=text("status = 'pending'"),
+            sqlite_where=text("status = 'pending'"),
+        ),
+    )
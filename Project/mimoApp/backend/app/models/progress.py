@@ -0,0 +1,90 @@
+"""
+    This model defines the high-volume event tables of the application: 'lesson_progress'
+    (the ERD's Progress table, one row per progress report of a user on a lesson) and
+    'activity_events' (a log of what users do). Both are append-only and, on PostgreSQL,
+    partitioned by month on their timestamp (see `services.partition_service`), so old
+    months can be detached and archived instead of deleted row by row.
+    """
+from datetime import datetime, timezone
+from sqlalchemy import Column, ForeignKey, BigInteger, Integer, Float, String, DateTime, JSON, Identity, Index, PrimaryKeyConstraint, event, func, select
+from sqlalchemy.dialects.postgresql import JSONB
+from db.database import Base
+
+def _utcnow():
+    """
+    Partition keys are part of the primary key, so they are set on the client: the
+    session then knows the full identity of a new row without reading it back, which
+    SQLite could not do (it returns server timestamps as strings).
+    """
+    return datetime.now(timezone.utc)
+
+class LessonProgress(Base):
+    """
+    Attributes:
+        id (int): The identifier of the progress report (primary key, with `recorded_at`).
+        user_id (int): The ID of the learner (foreign key).
+        course_id (int): The ID of the course of the lesson.
+        lesson_id (int): The ID of the lesson.
+        completion_percentage (float): How much of the lesson was completed, from 0 to 100.
+        recorded_at (datetime): When the progress was reported (partition key).
+    """
+    __tablename__ = "lesson_progress"  # Name of the table in the database
+
+    # Define columns in the 'lesson_progress' table
+    id = Column(BigInteger, Identity(), nullable=False)  # Report ID
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)  # Learner
+    course_id = Column(Integer, nullable=False)  # Course (no foreign key: courses are purged independently)
+    lesson_id = Column(Integer, nullable=False)  # Lesson (no foreign key: lessons are purged independently)
+    completion_percentage = Column(Float, nullable=False)  # 0 to 100
+    recorded_at = Column(DateTime(timezone=True), nullable=False, default=_utcnow, server_default=func.now())  # Partition key
+
+    __table_args__ = (
+        # A partitioned table's primary key must contain the partition key
+        PrimaryKeyConstraint("id", "recorded_at"),
+        # Per user history within a time window (created on every partition)
+        Index("ix_lesson_progress_user_course_recorded", "user_id", "course_id", "recorded_at"),
+        {"postgresql_partition_by": "RANGE (recorded_at)"},
+    )
+
+
+class ActivityEvent(Base):
+    """
+    Attributes:
+        id (int): The identifier of the event (primary key, with `occurred_at`).
+        user_id (int): The ID of the user (foreign key).
+        event_type (str): What happened, e.g. 'lesson.progress'.
+        course_id (int): The related course, if any.
+        lesson_id (int): The related lesson, if any.
+        data (dict): Event specific details.
+        occurred_at (datetime): When the event happened (partition key).
+    """
+    __tablename__ = "activity_events"  # Name of the table in the database
+
+    # Define columns in the 'activity_events' table
+    id = Column(BigInteger, Identity(), nullable=False)  # Event ID
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)  # Actor
+    event_type = Column(String, nullable=False)  # Event type
+    course_id = Column(Integer, nullable=True)  # Related course
+    lesson_id = Column(Integer, nullable=True)  # Related lesson
+    data = Column(JSON().with_variant(JSONB, "postgresql"), nullable=False, default=dict)  # Details
+    occurred_at = Column(DateTime(timezone=True), nullable=False, default=_utcnow, server_default=func.now())  # Partition key
+
+    __table_args__ = (
+        PrimaryKeyConstraint("id", "occurred_at"),
+        Index("ix_activity_events_user_occurred", "user_id", "occurred_at"),
+        {"postgresql_partition_by": "RANGE (occurred_at)"},
+    )
+
+
+def _assign_id_without_identity(mapper, connection, target):
+    """
+    SQLite (the test backend) has no identity columns and only generates rowids for a
+    single column primary key, so the ID of these composite keys is assigned here.
+    """
+    if connection.dialect.name != "sqlite" or target.id is not None:
+        return
+    model = type(target)
+    target.id = connection.scalar(select(func.coalesce(func.max(model.id), 0) + 1))
+
+event.listen(LessonProgress, "before_insert", _assign_id_without_identity)
+event.listen(ActivityEvent, "before_insert", _assign_id_without_identity)
@@ -0,0 +1,35 @@
+"""
+    This model defines the precomputed "learners who took this course also took..."
+    recommendations ('course_recommendations') and the small key/value table
+    ('recommendation_state') where the batch job keeps its incremental refresh watermark.
+    """
+from sqlalchemy import Column, ForeignKey, Integer, Float, String, BigInteger
+from db.database import Base
+
+class CourseRecommendation(Base):
+    """
+    Attributes:
+        course_id (int): The ID of the course the recommendation is shown on (primary key).
+        rank (int): The position of the recommendation, starting at 1 (primary key).
+        recommended_course_id (int): The ID of the recommended course (foreign key).
+        score (float): The cosine similarity of the co-enrollment vectors of both courses.
+    """
+    __tablename__ = "course_recommendations"  # Name of the table in the database
+
+    # Define columns in the 'course_recommendations' table; the primary key serves reads in rank order
+    course_id = Column(Integer, ForeignKey("courses.id", ondelete="CASCADE"), primary_key=True)  # Source course
+    rank = Column(Integer, primary_key=True)  # 1 = most similar
+    recommended_course_id = Column(Integer, ForeignKey("courses.id", ondelete="CASCADE"), nullable=False)  # Recommended course
+    score = Column(Float, nullable=False)  # Cosine similarity
+
+class RecommendationState(Base):
+    """
+    Attributes:
+        name (str): The name of the state entry (primary key).
+        value (int): Its value, e.g. the last `user_courses.id` already processed.
+    """
+    __tablename__ = "recommendation_state"  # Name of the table in the database
+
+    # Define columns in the 'recommendation_state' table
+    name = Column(String, primary_key=True)  # State entry name
+    value = Column(BigInteger, nullable=False)  # State entry value
@@ -0,0 +1,53 @@
+"""
+    This model defines the 'reviews' table, where users rate the courses they took, and the
+    'course_ratings' table, which keeps running aggregates per course so the top rated
+    ranking is read from an index instead of computing `AVG(rating)` on every request.
+    """
+from sqlalchemy import Column, ForeignKey, Integer, Float, String, DateTime, Index, UniqueConstraint, CheckConstraint, func
+from db.database import Base
+
+class Review(Base):
+    """
+    Attributes:
+        id (int): The unique identifier of the review (primary key).
+        user_id (int): The ID of the author (foreign key).
+        course_id (int): The ID of the reviewed course (foreign key).
+        rating (int): The rating, from 1 to 5.
+        comment (str): An optional comment.
+        created_at (datetime): When the review was written.
+        updated_at (datetime): When the review was last modified.
+    """
+    __tablename__ = "reviews"  # Name of the table in the database
+
+    # Define columns in the 'reviews' table
+    id = Column(Integer, primary_key=True, index=True)  # Primary key for the review
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)  # Author
+    course_id = Column(Integer, ForeignKey("courses.id", ondelete="CASCADE"), nullable=False, index=True)  # Reviewed course
+    rating = Column(Integer, nullable=False)  # Rating from 1 to 5
+    comment = Column(String, nullable=True)  # Optional comment
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)  # Creation time
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)  # Last modification
+
+    __table_args__ = (
+        UniqueConstraint("user_id", "course_id", name="uq_reviews_user_course"),  # One review per user and course
+        CheckConstraint("rating BETWEEN 1 AND 5", name="ck_reviews_rating_range"),
+    )
+
+class CourseRating(Base):
+    """
+    Attributes:
+        course_id (int): The ID of the course (primary key, foreign key).
+        rating_sum (int): The sum of all the ratings of the course.
+        rating_count (int): The number of reviews of the course.
+        score (float): The Bayesian weighted rating used to rank the courses.
+    """
+    __tablename__ = "course_ratings"  # Name of the table in the database
+
+    # Define columns in the 'course_ratings' table
+    course_id = Column(Integer, ForeignKey("courses.id", ondelete="CASCADE"), primary_key=True)  # Rated course
+    rating_sum = Column(Integer, nullable=False, default=0)  # Running sum of ratings
+    rating_count = Column(Integer, nullable=False, default=0)  # Running number of reviews
+    score = Column(Float, nullable=False, default=0.0)  # Bayesian weighted rating
+
+    # The top rated page walks this index in order
+    __table_args__ = (Index("ix_course_ratings_score", score.desc(), course_id),)
@@ -0,0 +1,23 @@
+"""
+    This model defines the 'revoked_tokens' table: the ids (`jti`) of access tokens that
+    were revoked before their expiry, e.g. on logout. Rows are only useful until the
+    token expires and are purged afterwards.
+    """
+from sqlalchemy import Column, ForeignKey, Integer, String, DateTime, func
+from db.database import Base
+
+class RevokedToken(Base):
+    """
+    Attributes:
+        jti (str): The unique identifier of the revoked token (primary key).
+        user_id (int): The ID of the user the token was issued to (foreign key).
+        expires_at (datetime): When the token expires; the row can be purged afterwards.
+        revoked_at (datetime): When the token was revoked.
+    """
+    __tablename__ = "revoked_tokens"  # Name of the table in the database
+
+    # Define columns in the 'revoked_tokens' table
+    jti = Column(String, primary_key=True)  # Token ID
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)  # Token owner
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)  # Token expiry
+    revoked_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)  # Revocation time
@@ -0,0 +1,96 @@
+"""
+    This model defines the catalog change tracking used by the incremental sync feed:
+    a global sequence and the writing transaction's ID stamped on every insert/update of
+    courses and lessons, and the 'tombstones' table that remembers deleted rows so
+    clients can remove them too.
+    """
+from sqlalchemy import Column, BigInteger, Integer, String, DateTime, Index, Sequence, func
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
+from db.database import Base
+
+# Monotonic sequence shared by courses, lessons and tombstones (the sync token)
+catalog_change_seq = Sequence("catalog_change_seq", metadata=Base.metadata)
+
+class next_change_seq(FunctionElement):
+    """
+    The next value of the catalog change sequence, as a column default.
+
+    PostgreSQL draws it from `catalog_change_seq`. Databases without sequences (SQLite,
+    used by the test suite) take the highest value stamped so far plus one, which is only
+    monotonic with a single writer at a time.
+    """
+    type = BigInteger()
+    inherit_cache = True
+
+@compiles(next_change_seq)
+def _next_change_seq_default(element, compiler, **kw):
+    return (
+        "(SELECT coalesce(max(seq), 0) + 1 FROM ("
+        "SELECT max(change_seq) AS seq FROM courses UNION ALL "
+        "SELECT max(change_seq) FROM lessons UNION ALL "
+        "SELECT max(change_seq) FROM tombstones))"
+    )
+
+@compiles(next_change_seq, "postgresql")
+def _next_change_seq_postgresql(element, compiler, **kw):
+    return compiler.process(catalog_change_seq.next_value(), **kw)
+
+class current_change_xid(FunctionElement):
+    """
+    The ID of the writing transaction, as a column default.
+
+    The feed is ordered by `(change_xid, change_seq)` and only shows the rows of the
+    transactions older than every transaction still running (`change_watermark`): no
+    row can appear later below that point. SQLite runs one writer at a time and
+    stamps 0, so its feed is ordered by `change_seq` alone.
+    """
+    type = BigInteger()
+    inherit_cache = True
+
+@compiles(current_change_xid)
+def _current_change_xid_default(element, compiler, **kw):
+    return "0"
+
+@compiles(current_change_xid, "postgresql")
+def _current_change_xid_postgresql(element, compiler, **kw):
+    return "txid_current()"
+
+class change_watermark(FunctionElement):
+    """
+    The oldest transaction ID still running: every row with a lower `change_xid` is
+    committed (or rolled back) and visible to the current statement.
+    """
+    type = BigInteger()
+    inherit_cache = True
+
+@compiles(change_watermark)
+def _change_watermark_default(element, compiler, **kw):
+    return "1"
+
+@compiles(change_watermark, "postgresql")
+def _change_watermark_postgresql(element, compiler, **kw):
+    return "txid_snapshot_xmin(txid_current_snapshot())"
+
+class Tombstone(Base):
+    """
+    Attributes:
+        id (int): The unique identifier of the tombstone (primary key).
+        entity (str): The kind of row that was deleted ('course' or 'lesson').
+        entity_id (int): The ID the deleted row had.
+        change_seq (int): The position of the deletion in the catalog change sequence.
+        change_xid (int): The ID of the transaction that deleted the row.
+        deleted_at (datetime): When the row was deleted.
+    """
+    __tablename__ = "tombstones"  # Name of the table in the database
+
+    # Define columns in the 'tombstones' table
+    id = Column(Integer, primary_key=True, index=True)  # Primary key for the tombstone
+    entity = Column(String, nullable=False)  # 'course' or 'lesson'
+    entity_id = Column(Integer, nullable=False)  # ID of the deleted row
+    change_seq = Column(BigInteger, default=next_change_seq(), index=True)  # Position in the change feed
+    change_xid = Column(BigInteger, default=current_change_xid(), nullable=False)  # Writing transaction
+    deleted_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)  # Deletion time
+
+    # The feed reads each source in (change_xid, change_seq) order
+    __table_args__ = (Index("ix_tombstones_change_xid_seq", "change_xid", "change_seq"),)
@@ -2,7 +2,7 @@
     username, email, and hashed password. It ensures that users can be uniquely identified by their 
     username and email, and stores passwords securely in a hashed format.
     """
-from sqlalchemy import Column, Integer, String
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Index, false, func
 from db.database import Base
 
 class User(Base):
@@ -12,6 +12,8 @@ class User(Base):
         username (str): The user's unique username.
         email (str): The user's unique email address.
         hashed_password (str): The hashed password for the user, used for authentication.
+        is_admin (bool): Whether the user can use the administration endpoints.
+        created_at (datetime): When the user registered.
     """
     __tablename__ = "users"  # Name of the table in the database
 
@@ -20,3 +22,10 @@ class User(Base):
     username = Column(String, unique=True, index=True)  # Unique username for the user
     email = Column(String, unique=True, index=True)  # Unique email address for the user
     hashed_password = Column(String, nullable=False)  # Hashed password, cannot be null
+    is_admin = Column(Boolean, nullable=False, default=False, server_default=false())  # Administration rights
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False, index=True)  # Registration time
+
+    __table_args__ = (
+        # Emails are looked up case-insensitively (login, registration), and unique that way
+        Index("uq_users_lower_email", func.lower(email), unique=True),
+    )
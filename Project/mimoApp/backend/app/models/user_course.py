@@ -2,7 +2,7 @@
     This model defines the 'user_courses' table, with columns for storing the relationship 
     between users and courses, and whether the user has completed the course. It also ensures 
     referential integrity between users and courses via foreign keys."""
-from sqlalchemy import Column, ForeignKey, Integer, Boolean
+from sqlalchemy import Column, ForeignKey, Integer, Boolean, DateTime, Index, func, text
 from db.database import Base
 
 class UserCourse(Base):
@@ -12,6 +12,8 @@ class UserCourse(Base):
         user_id (int): The ID of the user enrolled in the course (foreign key).
         course_id (int): The ID of the course the user is enrolled in (foreign key).
         completed (bool): Whether the user has completed the course.
+        enrolled_at (datetime): When the user enrolled in the course.
+        deleted_at (datetime): When the enrollment was soft deleted, or None while it is live.
     """
     __tablename__ = "user_courses"  # Name of the table in the database
 
@@ -20,4 +22,16 @@ class UserCourse(Base):
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"))  # Foreign key linking to 'users.id'
     course_id = Column(Integer, ForeignKey("courses.id", ondelete="CASCADE"))  # Foreign key linking to 'courses.id'
     completed = Column(Boolean, default=False)  # Whether the user has completed the course, default is False
+    enrolled_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False, index=True)  # Enrollment time
+    deleted_at = Column(DateTime(timezone=True), nullable=True)  # Soft delete marker, purged in the background
 
+    __table_args__ = (
+        # Live enrollments of a user, at most one per course (soft deleted rows are skipped,
+        # so a user can enroll again after leaving); `create_enrollment` relies on it
+        Index(
+            "uq_user_courses_user_course_live", "user_id", "course_id", unique=True,
+            postgresql_where=text("deleted_at IS NULL"), sqlite_where=text("deleted_at IS NULL"),
+        ),
+        # Set based purges and cascades look enrollments up by course
+        Index("ix_user_courses_course_id", "course_id"),
+    )
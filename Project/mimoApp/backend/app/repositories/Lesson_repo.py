@@ -1,6 +1,34 @@
+from sqlalchemy import case, func, update
 from sqlalchemy.orm import Session
 from models.Lesson import Lesson
+from models.course import Course
 from schemas.Lesson import LessonCreate
+from repositories.sync_repo import add_tombstone
+from repositories.course_repo import lock_course
+from core.ranking import rank_between
+from core.render import content_hash
+from repositories.outbox_repo import add_outbox_event, LESSON_PUBLISHED
+
+def _live_lessons(db: Session):
+    """
+    Base query of the lessons that are visible: neither the lesson nor its course is soft deleted.
+    """
+    return (
+        db.query(Lesson)
+        .join(Course, Course.id == Lesson.course_id)
+        .filter(Lesson.deleted_at.is_(None), Course.deleted_at.is_(None))
+    )
+
+def _next_rank(db: Session, course_id: int):
+    """
+    Returns a rank key placing a new lesson after the last live lesson of a course.
+    """
+    last_rank = (
+        db.query(func.max(Lesson.rank))
+        .filter(Lesson.course_id == course_id, Lesson.deleted_at.is_(None))
+        .scalar()
+    )
+    return rank_between(last_rank, None)
 
 def create_lesson(db: Session, lesson: LessonCreate):
     """
@@ -16,16 +44,32 @@ def create_lesson(db: Session, lesson: LessonCreate):
 
     Returns:
         Lesson: The created `Lesson` object with the assigned database ID.
+
+    Raises:
+        ValueError: If the course does not exist or is soft deleted.
     """
-    # Create a new Lesson object using the data from the LessonCreate schema
+    # Lock the course so concurrent appends do not compute the same rank (and it cannot be deleted meanwhile)
+    if not lock_course(db, lesson.course_id):
+        db.rollback()
+        raise ValueError("Course not found.")
+
+    # Create a new Lesson object using the data from the LessonCreate schema, last in its course
     db_lesson = Lesson(
         title=lesson.title,
         content=lesson.content,
-        course_id=lesson.course_id
+        content_hash=content_hash(lesson.content),
+        course_id=lesson.course_id,
+        rank=_next_rank(db, lesson.course_id)
     )
     
-    # Add the new lesson to the session and commit the transaction
+    # Add the new lesson to the session and record the event in the same transaction
     db.add(db_lesson)
+    db.flush()  # Assigns the lesson ID used in the event payload
+    add_outbox_event(db, LESSON_PUBLISHED, {
+        "lesson_id": db_lesson.id,
+        "course_id": db_lesson.course_id,
+        "title": db_lesson.title,
+    })
     db.commit()
     db.refresh(db_lesson)  # Refresh the object to get the latest state from the database
     
@@ -34,29 +78,33 @@ def create_lesson(db: Session, lesson: LessonCreate):
 
 def delete_lesson(db: Session, lesson_id: int):
     """
-    Deletes a lesson from the database.
+    Soft deletes a lesson from the database.
 
-    This function deletes a lesson from the database by its ID. After committing the transaction, 
-    it returns the deleted `Lesson` object.
+    A single `UPDATE ... SET deleted_at = now()` statement; the row itself is removed
+    later by the purge job (`services.purge_service`).
 
     Args:
         db (Session): The database session used to interact with the database.
         lesson_id (int): The ID of the lesson to be deleted.
 
     Returns:
-        Lesson: The deleted `Lesson` object, or None if not found.
+        bool: True if a live lesson was deleted, False if not found.
     """
-    # Query the database for the lesson by its ID
-    db_lesson = db.query(Lesson).filter(Lesson.id == lesson_id).first()
-    
-    # Check if the lesson exists
-    if db_lesson:
-        # Delete the lesson from the session
-        db.delete(db_lesson)
-        db.commit()
+    # Mark the live lesson as deleted, without loading it
+    deleted = db.execute(
+        update(Lesson)
+        .where(Lesson.id == lesson_id, Lesson.deleted_at.is_(None))
+        .values(deleted_at=func.now())
+        .returning(Lesson.id)
+    ).first()
     
-    # Return the deleted lesson (or None if not found)
-    return db_lesson
+    # Check if the lesson existed
+    if deleted is None:
+        return False
+
+    add_tombstone(db, "lesson", lesson_id)  # Let sync clients know the lesson is gone
+    db.commit()
+    return True
 
 def get_all_lessons(db: Session):
     """
@@ -70,8 +118,8 @@ def get_all_lessons(db: Session):
     Returns:
         List[Lesson]: A list of all `Lesson` objects in the database.
     """
-    # Query the database for all lessons
-    return db.query(Lesson).all()
+    # Query the database for all live lessons
+    return _live_lessons(db).all()
 
 def get_lesson_by_id(db: Session, lesson_id: int):
     """
@@ -84,8 +132,8 @@ def get_lesson_by_id(db: Session, lesson_id: int):
     Returns:
         Lesson: The `Lesson` object corresponding to the given ID, or None if not found.
     """
-    # Query the database for the lesson by its ID
-    return db.query(Lesson).filter(Lesson.id == lesson_id).first()
+    # Query the database for the live lesson by its ID
+    return _live_lessons(db).filter(Lesson.id == lesson_id).first()
 
 def get_lessons_by_course_id(db: Session, course_id: int):
     """
@@ -96,10 +144,10 @@ def get_lessons_by_course_id(db: Session, course_id: int):
         course_id (int): The ID of the course for which lessons are to be fetched.
 
     Returns:
-        List[Lesson]: A list of `Lesson` objects associated with the given course ID.
+        List[Lesson]: A list of `Lesson` objects associated with the given course ID, in course order.
     """
-    # Query the database for lessons with the specified course ID
-    return db.query(Lesson).filter(Lesson.course_id == course_id).all()
+    # Query the database for lessons with the specified course ID, in rank order
+    return _live_lessons(db).filter(Lesson.course_id == course_id).order_by(Lesson.rank, Lesson.id).all()
 
 def update_lesson(db: Session, lesson_id: int, lesson: LessonCreate):
     """
@@ -112,15 +160,25 @@ def update_lesson(db: Session, lesson_id: int, lesson: LessonCreate):
 
     Returns:
         Lesson: The updated `Lesson` object, or None if not found.
+
+    Raises:
+        ValueError: If the lesson moves to a course that does not exist or is soft deleted.
     """
-    # Query the database for the lesson by its ID
-    db_lesson = db.query(Lesson).filter(Lesson.id == lesson_id).first()
+    # Query the database for the live lesson by its ID
+    db_lesson = _live_lessons(db).filter(Lesson.id == lesson_id).first()
     
     # Check if the lesson exists
     if db_lesson:
+        if lesson.course_id != db_lesson.course_id:
+            # A lesson moved to another course goes last in that course, which must be live
+            if not lock_course(db, lesson.course_id):
+                db.rollback()
+                raise ValueError("Course not found.")
+            db_lesson.rank = _next_rank(db, lesson.course_id)
         # Update the lesson's title, content, and course ID
         db_lesson.title = lesson.title
         db_lesson.content = lesson.content
+        db_lesson.content_hash = content_hash(lesson.content)
         db_lesson.course_id = lesson.course_id
         
         # Commit the changes
@@ -142,4 +200,99 @@ def get_lesson_by_title(db: Session, title: str):
         Lesson: The `Lesson` object corresponding to the given title, or None if not found.
     """
     # Query the database for the lesson by its title
-    return db.query(Lesson).filter(Lesson.title == title).first()
+    return _live_lessons(db).filter(Lesson.title == title).first()
+
+def get_lessons_by_ids(db: Session, lesson_ids: list[int]):
+    """
+    Retrieves several lessons by their IDs with a single query.
+
+    Args:
+        db (Session): The database session used to interact with the database.
+        lesson_ids (list[int]): The IDs of the lessons to be retrieved.
+
+    Returns:
+        List[Lesson]: The `Lesson` objects found, in no particular order.
+    """
+    # One `WHERE id IN (...)` round trip instead of one query per id
+    return _live_lessons(db).filter(Lesson.id.in_(lesson_ids)).all()
+
+def get_lesson_outline(db: Session, course_id: int):
+    """
+    Retrieves the ordered outline (id, title, rank) of the live lessons of a course.
+
+    Only reads columns of the `ix_lessons_course_id_rank_live` index, in index order.
+
+    Args:
+        db (Session): The database session used to interact with the database.
+        course_id (int): The ID of the course.
+
+    Returns:
+        List[tuple]: `(id, title, rank)` rows, in course order.
+    """
+    return (
+        db.query(Lesson.id, Lesson.title, Lesson.rank)
+        .filter(Lesson.course_id == course_id, Lesson.deleted_at.is_(None))
+        .order_by(Lesson.rank, Lesson.id)
+        .all()
+    )
+
+def set_lesson_ranks(db: Session, course_id: int, ranks: dict[int, str]):
+    """
+    Writes new rank keys for several lessons of a course with a single statement.
+
+    `UPDATE lessons SET rank = CASE id WHEN ... END WHERE id IN (...)`; the caller holds
+    the course lock and commits.
+
+    Args:
+        db (Session): The database session used to interact with the database.
+        course_id (int): The ID of the course the lessons belong to.
+        ranks (dict[int, str]): The new rank of each lesson, by lesson ID.
+    """
+    if not ranks:
+        return
+    db.execute(
+        update(Lesson)
+        .where(Lesson.id.in_(ranks), Lesson.course_id == course_id, Lesson.deleted_at.is_(None))
+        .values(rank=case(ranks, value=Lesson.id))
+        .execution_options(synchronize_session=False)
+    )
+
+def get_courses_with_long_ranks(db: Session, max_length: int):
+    """
+    Retrieves the courses having a live lesson whose rank key is longer than `max_length`.
+
+    Args:
+        db (Session): The database session used to interact with the database.
+        max_length (int): The longest acceptable rank key.
+
+    Returns:
+        List[int]: The IDs of the courses to rebalance.
+    """
+    rows = (
+        db.query(Lesson.course_id)
+        .filter(Lesson.deleted_at.is_(None), func.length(Lesson.rank) > max_length)
+        .distinct()
+        .all()
+    )
+    return [course_id for course_id, in rows]
+
+def get_catalog_lessons(db: Session):
+    """
+    Retrieves the `(course_id, id, title)` of every live lesson of the live courses.
+
+    Rows come in course order, course after course, following the
+    `ix_lessons_course_id_rank_live` index.
+
+    Args:
+        db (Session): The database session used to interact with the database.
+
+    Returns:
+        List[tuple]: `(course_id, id, title)` rows.
+    """
+    return (
+        db.query(Lesson.course_id, Lesson.id, Lesson.title)
+        .join(Course, Course.id == Lesson.course_id)
+        .filter(Lesson.deleted_at.is_(None), Course.deleted_at.is_(None))
+        .order_by(Lesson.course_id, Lesson.rank, Lesson.id)
+        .all()
+    )
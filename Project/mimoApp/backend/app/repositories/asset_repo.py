@@ -0,0 +1,135 @@
+from datetime import datetime
+from sqlalchemy import delete, exists, func, select
+from sqlalchemy.orm import Session
+from models.asset import Asset, LessonAsset
+from db.dialect import upsert
+
+def attach_asset(db: Session, lesson_id: int, filename: str, sha256: str, size: int, content_type: str):
+    """
+    Records a stored blob and attaches it to a lesson under a file name.
+
+    The blob row is shared by identical uploads (its upload time is refreshed); an
+    existing file of the lesson with the same name is replaced.
+
+    Args:
+        db (Session): The database session used to interact with the database.
+        lesson_id (int): The ID of the lesson.
+        filename (str): The name of the file within the lesson.
+        sha256 (str): The SHA-256 of the stored content.
+        size (int): The size of the content in bytes.
+        content_type (str): The media type of the content.
+
+    Returns:
+        tuple: The `(LessonAsset, Asset)` rows.
+    """
+    asset_insert = upsert(db, Asset).values(sha256=sha256, size=size, content_type=content_type)
+    db.execute(asset_insert.on_conflict_do_update(
+        index_elements=[Asset.sha256],
+        set_={"uploaded_at": func.now()},
+    ))
+    link_insert = upsert(db, LessonAsset).values(lesson_id=lesson_id, filename=filename, asset_sha256=sha256)
+    db.execute(link_insert.on_conflict_do_update(
+        index_elements=[LessonAsset.lesson_id, LessonAsset.filename],
+        set_={"asset_sha256": sha256, "created_at": func.now()},
+    ))
+    db.commit()
+    return (
+        db.query(LessonAsset, Asset)
+        .join(Asset, Asset.sha256 == LessonAsset.asset_sha256)
+        .filter(LessonAsset.lesson_id == lesson_id, LessonAsset.filename == filename)
+        .one()
+    )
+
+def get_lesson_assets(db: Session, lesson_id: int):
+    """
+    Retrieves the files attached to a lesson, by name.
+
+    Args:
+        db (Session): The database session used to interact with the database.
+        lesson_id (int): The ID of the lesson.
+
+    Returns:
+        List[tuple]: `(LessonAsset, Asset)` rows ordered by file name.
+    """
+    return (
+        db.query(LessonAsset, Asset)
+        .join(Asset, Asset.sha256 == LessonAsset.asset_sha256)
+        .filter(LessonAsset.lesson_id == lesson_id)
+        .order_by(LessonAsset.filename)
+        .all()
+    )
+
+def get_asset(db: Session, sha256: str):
+    """
+    Retrieves a blob row by its hash.
+
+    Args:
+        db (Session): The database session used to interact with the database.
+        sha256 (str): The SHA-256 of the content.
+
+    Returns:
+        Asset: The `Asset` object, or None if not found.
+    """
+    return db.get(Asset, sha256)
+
+def detach_asset(db: Session, lesson_id: int, filename: str):
+    """
+    Removes a file from a lesson. The blob itself is left to the orphan collector.
+
+    Args:
+        db (Session): The database session used to interact with the database.
+        lesson_id (int): The ID of the lesson.
+        filename (str): The name of the file within the lesson.
+
+    Returns:
+        bool: True if the file was attached, False otherwise.
+    """
+    deleted = db.execute(
+        delete(LessonAsset).where(LessonAsset.lesson_id == lesson_id, LessonAsset.filename == filename)
+    ).rowcount
+    db.commit()
+    return deleted > 0
+
+def delete_orphan_assets(db: Session, uploaded_before: datetime, limit: int):
+    """
+    Deletes a batch of blob rows no lesson refers to and that were not uploaded recently.
+
+    The reference check is part of the `DELETE` itself, so a blob attached in the
+    meantime is kept.
+
+    Args:
+        db (Session): The database session used to interact with the database.
+        uploaded_before (datetime): Only blobs last uploaded before this time are deleted.
+        limit (int): The maximum number of rows to delete.
+
+    Returns:
+        List[str]: The hashes of the deleted rows, whose files can be removed.
+    """
+    referenced = exists().where(LessonAsset.asset_sha256 == Asset.sha256)
+    batch = (
+        select(Asset.sha256)
+        .where(Asset.uploaded_at < uploaded_before, ~referenced)
+        .limit(limit)
+        .scalar_subquery()
+    )
+    deleted = db.execute(
+        delete(Asset)
+        .where(Asset.sha256.in_(batch), ~referenced)
+        .returning(Asset.sha256)
+        .execution_options(synchronize_session=False)
+    ).scalars().all()
+    db.commit()
+    return deleted
+
+def get_known_assets(db: Session, hashes: list[str]):
+    """
+    Returns which of the given hashes have a blob row.
+
+    Args:
+        db (Session): The database session used to interact with the database.
+        hashes (list[str]): The hashes to check.
+
+    Returns:
+        set[str]: The hashes that are known.
+    """
+    return set(db.execute(select(Asset.sha256).where(Asset.sha256.in_(hashes))).scalars())
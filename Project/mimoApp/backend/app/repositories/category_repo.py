@@ -0,0 +1,86 @@
+from sqlalchemy.orm import Session
+from models.category import CourseCategory
+from models.course import Course
+
+def create_category(db: Session, name: str, parent_id: int | None):
+    """
+    Creates a new course category.
+
+    Args:
+        db (Session): The database session used to interact with the database.
+        name (str): The unique name of the category.
+        parent_id (int | None): The ID of the parent category, or None for a top level one.
+
+    Returns:
+        CourseCategory: The created `CourseCategory` object.
+    """
+    db_category = CourseCategory(name=name, parent_id=parent_id)
+    db.add(db_category)
+    db.commit()
+    db.refresh(db_category)
+    return db_category
+
+def get_category_by_id(db: Session, category_id: int):
+    """
+    Retrieves a category by its ID.
+
+    Args:
+        db (Session): The database session used to interact with the database.
+        category_id (int): The ID of the category.
+
+    Returns:
+        CourseCategory: The `CourseCategory` object, or None if not found.
+    """
+    return db.query(CourseCategory).filter(CourseCategory.id == category_id).first()
+
+def get_all_categories(db: Session):
+    """
+    Retrieves all the categories, with their cached course counts.
+
+    Args:
+        db (Session): The database session used to interact with the database.
+
+    Returns:
+        List[CourseCategory]: All the `CourseCategory` objects, ordered by name.
+    """
+    return db.query(CourseCategory).order_by(CourseCategory.name).all()
+
+def adjust_course_count(db: Session, category_id: int | None, delta: int):
+    """
+    Adds `delta` to the cached course count of a category.
+
+    A single atomic `UPDATE ... SET course_count = course_count + :delta`, run in the
+    caller's transaction so the counter always matches the committed courses.
+
+    Args:
+        db (Session): The database session used to interact with the database.
+        category_id (int | None): The ID of the category (nothing happens for None).
+        delta (int): The change in the number of courses.
+    """
+    if category_id is None or delta == 0:
+        return
+    db.query(CourseCategory).filter(CourseCategory.id == category_id).update(
+        {CourseCategory.course_count: CourseCategory.course_count + delta},
+        synchronize_session=False,
+    )
+
+def get_courses_in_category(db: Session, category_id: int, after_id: int | None, limit: int):
+    """
+    Retrieves a page of the courses of a category using keyset pagination.
+
+    The `(category_id, id)` index serves both the filter and the ordering, so each
+    page costs the same no matter how deep the client has scrolled.
+
+    Args:
+        db (Session): The database session used to interact with the database.
+        category_id (int): The ID of the category.
+        after_id (int | None): The ID of the last course of the previous page.
+        limit (int): The maximum number of courses to return.
+
+    Returns:
+        List[Course]: The courses of the page, ordered by ID.
+    """
+    query = db.query(Course).filter(Course.category_id == category_id, Course.deleted_at.is_(None))
+    if after_id is not None:
+        query = query.filter(Course.id > after_id)
+    return query.order_by(Course.id).limit(limit).all()
@@ -1,6 +1,9 @@
+from sqlalchemy import func, update
 from sqlalchemy.orm import Session
 from models.course import Course
 from schemas.course import CourseCreate
+from repositories.sync_repo import add_tombstone
+from repositories.category_repo import adjust_course_count
 
 def create_course(db: Session, course: CourseCreate):    
     """
@@ -20,11 +23,13 @@ def create_course(db: Session, course: CourseCreate):
     # Create a new Course object using the data from the CourseCreate schema
     db_course = Course(
         title=course.title, 
-        description=course.description
+        description=course.description,
+        category_id=course.category_id
     )
     
-    # Add the new course to the session and commit the transaction
+    # Add the new course to the session, count it in its category and commit the transaction
     db.add(db_course)
+    adjust_course_count(db, db_course.category_id, 1)
     db.commit()
     db.refresh(db_course)  # Refresh the object to get the latest state from the database
     
@@ -43,8 +48,8 @@ def get_all_courses(db: Session):
     Returns:
         List[Course]: A list of all `Course` objects in the database.
     """
-    # Query the database for all courses
-    return db.query(Course).all()
+    # Query the database for all live courses
+    return db.query(Course).filter(Course.deleted_at.is_(None)).all()
 
 def get_course_by_id(db: Session, course_id: int):
     """
@@ -57,8 +62,8 @@ def get_course_by_id(db: Session, course_id: int):
     Returns:
         Course: The `Course` object corresponding to the given ID, or None if not found.
     """
-    # Query the database for the course by its ID
-    return db.query(Course).filter(Course.id == course_id).first()
+    # Query the database for the live course by its ID
+    return db.query(Course).filter(Course.id == course_id, Course.deleted_at.is_(None)).first()
 
 def update_course(db: Session, course_id: int, course: CourseCreate):
     """
@@ -74,14 +79,25 @@ def update_course(db: Session, course_id: int, course: CourseCreate):
     Returns:
         Course | None: The updated `Course` object, or None if not found.
     """
-    # Query the database for the course by its ID
-    db_course = db.query(Course).filter(Course.id == course_id).first()
+    # Lock the live course: a concurrent move must not change the category counted out below
+    db_course = (
+        db.query(Course)
+        .filter(Course.id == course_id, Course.deleted_at.is_(None))
+        .with_for_update()
+        .populate_existing()
+        .first()
+    )
     
     # Check if the course exists
     if db_course:
         # Update the course details
         db_course.title = course.title
         db_course.description = course.description
+        if "category_id" in course.model_fields_set and course.category_id != db_course.category_id:
+            # Move the course between the cached category counters
+            adjust_course_count(db, db_course.category_id, -1)
+            adjust_course_count(db, course.category_id, 1)
+            db_course.category_id = course.category_id
         db.commit()
     
     # Return the updated course (or None if not found)
@@ -89,22 +105,66 @@ def update_course(db: Session, course_id: int, course: CourseCreate):
 
 def delete_course(db: Session, course_id: int):
     """
-    Deletes a course from the database by its ID.
+    Soft deletes a course by its ID.
+
+    A single `UPDATE ... SET deleted_at = now()` statement: the course disappears from
+    every read right away, while its lessons and enrollments are removed later, in
+    bounded batches, by the purge job (`services.purge_service`).
 
     Args:
         db (Session): The database session used to interact with the database.
         course_id (int): The ID of the course to be deleted.
 
     Returns:
-        Course: The deleted `Course` object, or None if not found.
+        bool: True if a live course was deleted, False if not found.
     """
-    # Query the database for the course by its ID
-    db_course = db.query(Course).filter(Course.id == course_id).first()
+    # Mark the live course as deleted, without loading it
+    category_id = db.execute(
+        update(Course)
+        .where(Course.id == course_id, Course.deleted_at.is_(None))
+        .values(deleted_at=func.now())
+        .returning(Course.category_id)
+    ).first()
     
-    # Check if the course exists
-    if db_course:
-        db.delete(db_course)
-        db.commit()
-    
-    # Return the deleted course (or None if not found)
-    return db_course
\ No newline at end of file
+    # Check if the course existed
+    if category_id is None:
+        return False
+
+    adjust_course_count(db, category_id[0], -1)
+    add_tombstone(db, "course", course_id)  # Let sync clients know the course is gone
+    db.commit()
+    return True
+
+def get_courses_by_ids(db: Session, course_ids: list[int]):
+    """
+    Retrieves several courses by their IDs with a single query.
+
+    Args:
+        db (Session): The database session used to interact with the database.
+        course_ids (list[int]): The IDs of the courses to be retrieved.
+
+    Returns:
+        List[Course]: The `Course` objects found, in no particular order.
+    """
+    # One `WHERE id IN (...)` round trip instead of one query per id
+    return db.query(Course).filter(Course.id.in_(course_ids), Course.deleted_at.is_(None)).all()
+
+def lock_course(db: Session, course_id: int):
+    """
+    Locks a live course row until the end of the transaction (`SELECT ... FOR UPDATE`).
+
+    Serializes the writers that compute lesson ranks from the current order of a course.
+
+    Args:
+        db (Session): The database session used to interact with the database.
+        course_id (int): The ID of the course to lock.
+
+    Returns:
+        bool: True if the live course exists, False otherwise.
+    """
+    return (
+        db.query(Course.id)
+        .filter(Course.id == course_id, Course.deleted_at.is_(None))
+        .with_for_update()
+        .first()
+    ) is not None
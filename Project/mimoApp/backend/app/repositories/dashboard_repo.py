@@ -0,0 +1,110 @@
+from datetime import datetime
+from sqlalchemy import and_, case, func, select, true
+from sqlalchemy.orm import Session
+from models.user import User
+from models.course import Course
+from models.Lesson import Lesson
+from models.user_course import UserCourse
+from models.progress import LessonProgress
+
+def get_dashboard_rows(db: Session, user_id: int, progress_since: datetime):
+    """
+    Retrieves everything the home screen shows with a single SQL statement.
+
+    CTEs chain the live enrollments of the user, the latest progress report of each of
+    their lessons (bounded by `progress_since`, so only recent progress partitions are
+    read), per course totals and the first unfinished lesson of each course in rank order.
+
+    Args:
+        db (Session): The database session used to interact with the database.
+        user_id (int): The ID of the user.
+        progress_since (datetime): Progress reports older than this are ignored.
+
+    Returns:
+        List[Row]: One row per enrolled course, most recent enrollment first, each carrying
+        the user columns; a single row with empty course columns if the user has no
+        enrollment; no row if the user does not exist.
+    """
+    enrolled = (
+        select(UserCourse.course_id, UserCourse.completed, UserCourse.enrolled_at)
+        .join(Course, Course.id == UserCourse.course_id)
+        .where(
+            UserCourse.user_id == user_id,
+            UserCourse.deleted_at.is_(None),
+            Course.deleted_at.is_(None),
+        )
+        .cte("enrolled")
+    )
+    latest_progress = (
+        select(
+            LessonProgress.lesson_id,
+            LessonProgress.completion_percentage,
+            func.row_number().over(
+                partition_by=LessonProgress.lesson_id,
+                order_by=(LessonProgress.recorded_at.desc(), LessonProgress.id.desc()),
+            ).label("position"),
+        )
+        .where(
+            LessonProgress.user_id == user_id,
+            LessonProgress.recorded_at >= progress_since,
+            LessonProgress.course_id.in_(select(enrolled.c.course_id)),
+        )
+        .cte("latest_progress")
+    )
+    completion = func.coalesce(latest_progress.c.completion_percentage, 0.0)
+    lesson_state = (
+        select(Lesson.id, Lesson.title, Lesson.course_id, Lesson.rank, completion.label("completion"))
+        .join(enrolled, enrolled.c.course_id == Lesson.course_id)
+        .outerjoin(latest_progress, and_(latest_progress.c.lesson_id == Lesson.id, latest_progress.c.position == 1))
+        .where(Lesson.deleted_at.is_(None))
+        .cte("lesson_state")
+    )
+    course_progress = (
+        select(
+            lesson_state.c.course_id,
+            func.count().label("lesson_count"),
+            func.sum(case((lesson_state.c.completion >= 100, 1), else_=0)).label("completed_lessons"),
+            func.avg(lesson_state.c.completion).label("progress_percentage"),
+        )
+        .group_by(lesson_state.c.course_id)
+        .cte("course_progress")
+    )
+    next_lesson = (
+        select(
+            lesson_state.c.course_id,
+            lesson_state.c.id,
+            lesson_state.c.title,
+            func.row_number().over(
+                partition_by=lesson_state.c.course_id,
+                order_by=(lesson_state.c.rank, lesson_state.c.id),
+            ).label("position"),
+        )
+        .where(lesson_state.c.completion < 100)
+        .cte("next_lesson")
+    )
+
+    statement = (
+        select(
+            User.id.label("user_id"),
+            User.username,
+            User.email,
+            Course.id.label("course_id"),
+            Course.title.label("course_title"),
+            Course.description.label("course_description"),
+            enrolled.c.completed,
+            enrolled.c.enrolled_at,
+            func.coalesce(course_progress.c.lesson_count, 0).label("lesson_count"),
+            func.coalesce(course_progress.c.completed_lessons, 0).label("completed_lessons"),
+            func.coalesce(course_progress.c.progress_percentage, 0.0).label("progress_percentage"),
+            next_lesson.c.id.label("next_lesson_id"),
+            next_lesson.c.title.label("next_lesson_title"),
+        )
+        .select_from(User)
+        .outerjoin(enrolled, true())
+        .outerjoin(Course, Course.id == enrolled.c.course_id)
+        .outerjoin(course_progress, course_progress.c.course_id == enrolled.c.course_id)
+        .outerjoin(next_lesson, and_(next_lesson.c.course_id == enrolled.c.course_id, next_lesson.c.position == 1))
+        .where(User.id == user_id)
+        .order_by(enrolled.c.enrolled_at.desc())
+    )
+    return db.execute(statement).all()
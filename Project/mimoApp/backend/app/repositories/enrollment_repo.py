@@ -0,0 +1,111 @@
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import Session
+from models.user_course import UserCourse
+from db.dialect import upsert
+
+def get_enrollment(db: Session, user_id: int, course_id: int):
+    """
+    Retrieves the live enrollment of a user in a course.
+
+    Args:
+        db (Session): The database session used to interact with the database.
+        user_id (int): The ID of the user.
+        course_id (int): The ID of the course.
+
+    Returns:
+        UserCourse: The `UserCourse` object, or None if the user is not enrolled.
+    """
+    return (
+        db.query(UserCourse)
+        .filter(UserCourse.user_id == user_id, UserCourse.course_id == course_id, UserCourse.deleted_at.is_(None))
+        .first()
+    )
+
+def get_enrolled_user_ids(db: Session, course_id: int):
+    """
+    Retrieves the users with a live enrollment in a course.
+
+    Args:
+        db (Session): The database session used to interact with the database.
+        course_id (int): The ID of the course.
+
+    Returns:
+        List[int]: The IDs of the enrolled users.
+    """
+    return db.scalars(
+        select(UserCourse.user_id).where(UserCourse.course_id == course_id, UserCourse.deleted_at.is_(None))
+    ).all()
+
+def create_enrollment(db: Session, user_id: int, course_id: int):
+    """
+    Enrolls a user in a course, unless they already are.
+
+    A single `INSERT ... ON CONFLICT DO NOTHING` against the unique index of the live
+    enrollments, so two concurrent requests cannot both enroll the user.
+
+    Args:
+        db (Session): The database session used to interact with the database.
+        user_id (int): The ID of the user.
+        course_id (int): The ID of the course.
+
+    Returns:
+        UserCourse: The created `UserCourse` object, or None if the user was already enrolled.
+    """
+    db_enrollment = db.scalars(
+        upsert(db, UserCourse)
+        .values(user_id=user_id, course_id=course_id)
+        .on_conflict_do_nothing(
+            index_elements=[UserCourse.user_id, UserCourse.course_id],
+            index_where=UserCourse.deleted_at.is_(None),
+        )
+        .returning(UserCourse)
+    ).first()
+    db.commit()
+    return db_enrollment
+
+def delete_enrollment(db: Session, user_id: int, course_id: int):
+    """
+    Soft deletes the live enrollment of a user in a course.
+
+    Args:
+        db (Session): The database session used to interact with the database.
+        user_id (int): The ID of the user.
+        course_id (int): The ID of the course.
+
+    Returns:
+        bool: True if an enrollment was deleted, False if the user was not enrolled.
+    """
+    deleted = db.execute(
+        update(UserCourse)
+        .where(UserCourse.user_id == user_id, UserCourse.course_id == course_id, UserCourse.deleted_at.is_(None))
+        .values(deleted_at=func.now())
+    ).rowcount
+    db.commit()
+    return deleted > 0
+
+def complete_enrollment(db: Session, user_id: int, course_id: int):
+    """
+    Marks the live enrollment of a user in a course as completed, once.
+
+    The change is left to the caller to commit.
+
+    Args:
+        db (Session): The database session used to interact with the database.
+        user_id (int): The ID of the user.
+        course_id (int): The ID of the course.
+
+    Returns:
+        bool: True if the enrollment was just completed, False if the user is not enrolled
+        or had already completed the course.
+    """
+    completed = db.execute(
+        update(UserCourse)
+        .where(
+            UserCourse.user_id == user_id,
+            UserCourse.course_id == course_id,
+            UserCourse.deleted_at.is_(None),
+            UserCourse.completed.is_not(True),
+        )
+        .values(completed=True)
+    ).rowcount
+    return completed > 0
@@ -0,0 +1,198 @@
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from models.job import Job
+
+def enqueue_job(
+    db: Session, kind: str, payload: dict, priority: int = 0, max_attempts: int = 3, commit: bool = True,
+    delay_seconds: float = 0,
+):
+    """
+    Adds a job to the queue.
+
+    Args:
+        db (Session): The database session used to interact with the database.
+        kind (str): The registered job type.
+        payload (dict): The arguments of the job.
+        priority (int): Higher priorities run first.
+        max_attempts (int): How many attempts are allowed.
+        commit (bool): Commit right away; pass False to enqueue in the caller's transaction.
+        delay_seconds (float): The job is not started before this many seconds have passed.
+
+    Returns:
+        Job: The queued `Job` object.
+    """
+    db_job = Job(kind=kind, payload=payload, priority=priority, max_attempts=max_attempts)
+    if delay_seconds:
+        db_job.run_at = datetime.now(timezone.utc) + timedelta(seconds=delay_seconds)
+    db.add(db_job)
+    if commit:
+        db.commit()
+        db.refresh(db_job)
+    return db_job
+
+def has_pending_job(db: Session, kind: str, include_running: bool = True):
+    """
+    Tells whether a job of the given type is queued or running.
+
+    Args:
+        db (Session): The database session used to interact with the database.
+        kind (str): The registered job type.
+        include_running (bool): Pass False to only look at jobs that have not started yet.
+
+    Returns:
+        bool: True if such a job is already pending.
+    """
+    statuses = ("queued", "running") if include_running else ("queued",)
+    return db.query(Job.id).filter(Job.kind == kind, Job.status.in_(statuses)).first() is not None
+
+def has_failed_since_success(db: Session, kind: str):
+    """
+    Tells whether a job of the given type failed for good after the last one that succeeded.
+
+    Args:
+        db (Session): The database session used to interact with the database.
+        kind (str): The registered job type.
+
+    Returns:
+        bool: True if such a job exhausted its attempts since the last success (or if none ever succeeded).
+    """
+    last_success = (
+        db.query(func.max(Job.finished_at))
+        .filter(Job.kind == kind, Job.status == "succeeded")
+        .scalar()
+    )
+    failed = db.query(Job.id).filter(Job.kind == kind, Job.status == "failed")
+    if last_success is not None:
+        failed = failed.filter(Job.finished_at >= last_success)  # A tie counts as a failure
+    return failed.first() is not None
+
+def get_job(db: Session, job_id: int):
+    """
+    Retrieves a job by its ID.
+
+    Args:
+        db (Session): The database session used to interact with the database.
+        job_id (int): The ID of the job.
+
+    Returns:
+        Job: The `Job` object, or None if not found.
+    """
+    return db.query(Job).filter(Job.id == job_id).first()
+
+def claim_jobs(db: Session, limit: int, worker: str, lease_seconds: float):
+    """
+    Marks up to `limit` due jobs as running and returns them, highest priority first.
+
+    `FOR UPDATE SKIP LOCKED` lets several workers claim from the queue at the same time
+    without ever starting the same job twice. The claiming worker holds each job for
+    `lease_seconds` and must keep renewing the lease (`renew_leases`) while it runs.
+
+    Args:
+        db (Session): The database session used to interact with the database.
+        limit (int): The maximum number of jobs to claim.
+        worker (str): The name of the claiming worker.
+        lease_seconds (float): The duration of the lease.
+
+    Returns:
+        List[Job]: The claimed jobs.
+    """
+    now = datetime.now(timezone.utc)
+    jobs = (
+        db.query(Job)
+        .filter(Job.status == "queued", Job.run_at <= now)
+        .order_by(Job.priority.desc(), Job.run_at, Job.id)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+        .all()
+    )
+    for db_job in jobs:
+        db_job.status = "running"
+        db_job.attempts += 1
+        db_job.started_at = now
+        db_job.worker = worker
+        db_job.lease_expires_at = now + timedelta(seconds=lease_seconds)
+    db.commit()
+    return jobs
+
+def renew_leases(db: Session, job_ids: list[int], worker: str, lease_seconds: float):
+    """
+    Extends the leases of the jobs a worker is still running (its heartbeat).
+
+    Returns:
+        int: The number of renewed leases; a job requeued in the meantime is not renewed.
+    """
+    if not job_ids:
+        return 0
+    count = (
+        db.query(Job)
+        .filter(Job.id.in_(job_ids), Job.status == "running", Job.worker == worker)
+        .update(
+            {Job.lease_expires_at: datetime.now(timezone.utc) + timedelta(seconds=lease_seconds)},
+            synchronize_session=False,
+        )
+    )
+    db.commit()
+    return count
+
+def complete_job(db: Session, job_id: int, worker: str, result):
+    """
+    Marks a job as succeeded and stores its result.
+
+    Only applies while `worker` still holds the job: if its lease expired and the job
+    was requeued, the other attempt owns the outcome.
+    """
+    db.query(Job).filter(Job.id == job_id, Job.status == "running", Job.worker == worker).update(
+        {
+            Job.status: "succeeded", Job.result: result, Job.error: None,
+            Job.lease_expires_at: None, Job.finished_at: datetime.now(timezone.utc),
+        },
+        synchronize_session=False,
+    )
+    db.commit()
+
+def fail_job(db: Session, job_id: int, worker: str, error: str, backoff_seconds: float):
+    """
+    Records a failed attempt: the job is queued again with exponential backoff, or
+    marked failed once `max_attempts` is reached. Ignored unless `worker` still holds
+    the job (see `complete_job`).
+
+    Returns:
+        bool: True if the job will be retried.
+    """
+    db_job = (
+        db.query(Job)
+        .filter(Job.id == job_id, Job.status == "running", Job.worker == worker)
+        .with_for_update()
+        .first()
+    )
+    if db_job is None:
+        db.commit()
+        return False
+    db_job.error = error[:2000]
+    db_job.lease_expires_at = None
+    retry = db_job.attempts < db_job.max_attempts
+    if retry:
+        db_job.status = "queued"
+        db_job.run_at = datetime.now(timezone.utc) + timedelta(seconds=backoff_seconds * 2 ** (db_job.attempts - 1))
+    else:
+        db_job.status = "failed"
+        db_job.finished_at = datetime.now(timezone.utc)
+    db.commit()
+    return retry
+
+def requeue_expired_jobs(db: Session):
+    """
+    Puts back in the queue the running jobs whose lease expired: their worker stopped
+    renewing it, so it died or lost the database. Jobs of live workers are left alone.
+
+    Returns:
+        int: The number of requeued jobs.
+    """
+    count = (
+        db.query(Job)
+        .filter(Job.status == "running", Job.lease_expires_at < datetime.now(timezone.utc))
+        .update({Job.status: "queued", Job.lease_expires_at: None}, synchronize_session=False)
+    )
+    db.commit()
+    return count
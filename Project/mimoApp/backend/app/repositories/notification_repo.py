@@ -0,0 +1,102 @@
+import json
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+from models.notification import Notification
+from core.config import settings
+
+def add_notification(db: Session, user_id: int, message: str):
+    """
+    Adds a notification and its announcement to the current transaction, without committing.
+
+    The `pg_notify` call runs in the same transaction as the insert, so PostgreSQL only
+    delivers it to the listeners once the caller commits (and never if it rolls back).
+    The payload only carries the IDs (NOTIFY payloads are limited to 8000 bytes): the
+    listeners read the notification itself from the table.
+
+    Args:
+        db (Session): The database session used to interact with the database.
+        user_id (int): The ID of the recipient.
+        message (str): The text of the notification.
+
+    Returns:
+        Notification: The pending `Notification` object, with its ID assigned.
+    """
+    db_notification = Notification(user_id=user_id, message=message)
+    db.add(db_notification)
+    db.flush()  # Assigns the ID used in the payload
+
+    if db.get_bind().dialect.name == "postgresql":
+        payload = json.dumps({"id": db_notification.id, "user_id": user_id})
+        db.execute(select(func.pg_notify(settings.NOTIFICATION_CHANNEL, payload)))
+    return db_notification
+
+def create_notification(db: Session, user_id: int, message: str):
+    """
+    Creates a new notification and announces it on the notification channel.
+
+    Args:
+        db (Session): The database session used to interact with the database.
+        user_id (int): The ID of the recipient.
+        message (str): The text of the notification.
+
+    Returns:
+        Notification: The created `Notification` object.
+    """
+    db_notification = add_notification(db, user_id, message)
+    db.commit()
+    db.refresh(db_notification)
+    return db_notification
+
+def get_notification(db: Session, notification_id: int):
+    """
+    Retrieves a notification by its ID.
+
+    Args:
+        db (Session): The database session used to interact with the database.
+        notification_id (int): The ID of the notification.
+
+    Returns:
+        Notification: The `Notification` object, or None if not found.
+    """
+    return db.get(Notification, notification_id)
+
+def get_notifications_for_user(db: Session, user_id: int, limit: int, before_id: int | None = None):
+    """
+    Retrieves a page of a user's notifications, newest first.
+
+    Args:
+        db (Session): The database session used to interact with the database.
+        user_id (int): The ID of the recipient.
+        limit (int): The maximum number of notifications to return.
+        before_id (int | None): Only return notifications older than this ID (keyset pagination).
+
+    Returns:
+        List[Notification]: The user's notifications.
+    """
+    query = db.query(Notification).filter(Notification.user_id == user_id)
+    if before_id is not None:
+        query = query.filter(Notification.id < before_id)
+    return query.order_by(Notification.id.desc()).limit(limit).all()
+
+def mark_notification_read(db: Session, notification_id: int, user_id: int):
+    """
+    Marks a notification of the given user as read.
+
+    Args:
+        db (Session): The database session used to interact with the database.
+        notification_id (int): The ID of the notification.
+        user_id (int): The ID of the owner, so users cannot touch other users' notifications.
+
+    Returns:
+        Notification: The updated `Notification` object, or None if not found.
+    """
+    db_notification = (
+        db.query(Notification)
+        .filter(Notification.id == notification_id, Notification.user_id == user_id)
+        .first()
+    )
+    if db_notification:
+        db_notification.is_read = True
+        db.commit()
+        db.refresh(db_notification)
+    return db_notification
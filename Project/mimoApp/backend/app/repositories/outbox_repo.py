@@ -0,0 +1,84 @@
+from datetime import datetime, timedelta, timezone
+from sqlalchemy.orm import Session
+from models.outbox import OutboxEvent
+
+# Event types written by the domain code
+USER_REGISTERED = "user.registered"
+LESSON_PUBLISHED = "lesson.published"
+COURSE_COMPLETED = "course.completed"
+
+def add_outbox_event(db: Session, event_type: str, payload: dict):
+    """
+    Records a domain event in the outbox.
+
+    The event is only added to the session: the caller commits it together with the
+    domain change, so the event exists if and only if the change was committed.
+
+    Args:
+        db (Session): The database session used to interact with the database.
+        event_type (str): The kind of event, e.g. `USER_REGISTERED`.
+        payload (dict): JSON serializable data for the handlers.
+
+    Returns:
+        OutboxEvent: The pending `OutboxEvent` object.
+    """
+    event = OutboxEvent(event_type=event_type, payload=payload)
+    db.add(event)
+    return event
+
+def claim_outbox_events(db: Session, limit: int):
+    """
+    Locks a batch of pending events that are due for processing.
+
+    Uses `FOR UPDATE SKIP LOCKED`, so several dispatchers (one per worker process) can
+    run at the same time without ever claiming the same event. The locks are held until
+    the caller commits.
+
+    Args:
+        db (Session): The database session used to interact with the database.
+        limit (int): The maximum number of events to claim.
+
+    Returns:
+        List[OutboxEvent]: The claimed events, oldest first.
+    """
+    return (
+        db.query(OutboxEvent)
+        .filter(OutboxEvent.status == "pending", OutboxEvent.available_at <= datetime.now(timezone.utc))
+        .order_by(OutboxEvent.available_at, OutboxEvent.id)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+        .all()
+    )
+
+def mark_outbox_event_done(event: OutboxEvent):
+    """
+    Marks a claimed event as processed. The caller commits.
+    """
+    event.status = "done"
+    event.attempts += 1
+    event.processed_at = datetime.now(timezone.utc)
+    event.last_error = None
+
+def mark_outbox_event_failed(event: OutboxEvent, error: str, max_attempts: int, backoff_seconds: float):
+    """
+    Records a failed attempt and schedules the next one with exponential backoff.
+
+    After `max_attempts` the event is marked 'failed' and no longer retried. The caller commits.
+
+    Args:
+        event (OutboxEvent): The claimed event.
+        error (str): A description of the failure.
+        max_attempts (int): The number of attempts before giving up.
+        backoff_seconds (float): The delay before the first retry, doubled on each attempt.
+
+    Returns:
+        bool: True if the event will be retried, False if it was marked failed.
+    """
+    event.attempts += 1
+    event.last_error = error[:1000]
+    if event.attempts >= max_attempts:
+        event.status = "failed"
+        return False
+    delay = min(backoff_seconds * 2 ** (event.attempts - 1), 3600)
+    event.available_at = datetime.now(timezone.utc) + timedelta(seconds=delay)
+    return True
@@ -0,0 +1,167 @@
+from datetime import datetime
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+from models.progress import LessonProgress, ActivityEvent
+from models.Lesson import Lesson
+
+# Every read below bounds the partition key (`recorded_at` / `occurred_at`) so PostgreSQL
+# only scans the monthly partitions overlapping the requested window
+
+def record_progress(db: Session, user_id: int, course_id: int, lesson_id: int, completion_percentage: float, commit: bool = True):
+    """
+    Appends a progress report and the matching activity event in one transaction.
+
+    Args:
+        db (Session): The database session used to interact with the database.
+        user_id (int): The ID of the learner.
+        course_id (int): The ID of the course of the lesson.
+        lesson_id (int): The ID of the lesson.
+        completion_percentage (float): The completion, from 0 to 100.
+        commit (bool): Commit right away; pass False to only flush, in the caller's transaction.
+
+    Returns:
+        LessonProgress: The created `LessonProgress` object.
+    """
+    db_progress = LessonProgress(
+        user_id=user_id,
+        course_id=course_id,
+        lesson_id=lesson_id,
+        completion_percentage=completion_percentage,
+    )
+    db.add(db_progress)
+    db.add(ActivityEvent(
+        user_id=user_id,
+        event_type="lesson.progress",
+        course_id=course_id,
+        lesson_id=lesson_id,
+        data={"completion_percentage": completion_percentage},
+    ))
+    if commit:
+        db.commit()  # The primary key (id, recorded_at) is known: no need to read the row back
+    else:
+        db.flush()
+    return db_progress
+
+def count_missing_lessons(db: Session, user_id: int, course_id: int):
+    """
+    Counts the live lessons of a course the user never reported as fully completed.
+
+    Not bounded by a window: it is only run when a lesson reaches 100%, and reads the
+    `(user_id, course_id)` prefix of the progress index on each partition.
+
+    Args:
+        db (Session): The database session used to interact with the database.
+        user_id (int): The ID of the learner.
+        course_id (int): The ID of the course.
+
+    Returns:
+        int: The number of lessons left; 0 means the course is completed.
+    """
+    completed = (
+        select(LessonProgress.lesson_id)
+        .where(
+            LessonProgress.user_id == user_id,
+            LessonProgress.course_id == course_id,
+            LessonProgress.completion_percentage >= 100,
+        )
+    )
+    return db.execute(
+        select(func.count(Lesson.id)).where(
+            Lesson.course_id == course_id,
+            Lesson.deleted_at.is_(None),
+            Lesson.id.not_in(completed),
+        )
+    ).scalar_one()
+
+def get_progress_history(db: Session, user_id: int, since: datetime, until: datetime, course_id: int | None = None):
+    """
+    Retrieves a user's progress reports within a time window, newest first.
+
+    Args:
+        db (Session): The database session used to interact with the database.
+        user_id (int): The ID of the learner.
+        since (datetime): Start of the window (inclusive).
+        until (datetime): End of the window (exclusive).
+        course_id (int | None): Only the reports of this course.
+
+    Returns:
+        List[LessonProgress]: The progress reports.
+    """
+    query = db.query(LessonProgress).filter(
+        LessonProgress.user_id == user_id,
+        LessonProgress.recorded_at >= since,
+        LessonProgress.recorded_at < until,
+    )
+    if course_id is not None:
+        query = query.filter(LessonProgress.course_id == course_id)
+    return query.order_by(LessonProgress.recorded_at.desc()).all()
+
+def get_latest_progress(db: Session, user_id: int, since: datetime, until: datetime, course_id: int | None = None):
+    """
+    Retrieves the most recent progress report of each lesson within a time window.
+
+    Args:
+        db (Session): The database session used to interact with the database.
+        user_id (int): The ID of the learner.
+        since (datetime): Start of the window (inclusive).
+        until (datetime): End of the window (exclusive).
+        course_id (int | None): Only the lessons of this course.
+
+    Returns:
+        List[LessonProgress]: One report per lesson.
+    """
+    latest = (
+        db.query(
+            LessonProgress.id,
+            LessonProgress.recorded_at,
+            func.row_number().over(
+                partition_by=LessonProgress.lesson_id,
+                order_by=(LessonProgress.recorded_at.desc(), LessonProgress.id.desc()),
+            ).label("position"),
+        )
+        .filter(
+            LessonProgress.user_id == user_id,
+            LessonProgress.recorded_at >= since,
+            LessonProgress.recorded_at < until,
+        )
+    )
+    if course_id is not None:
+        latest = latest.filter(LessonProgress.course_id == course_id)
+    latest = latest.subquery()
+    return (
+        db.query(LessonProgress)
+        .join(latest, (LessonProgress.id == latest.c.id) & (LessonProgress.recorded_at == latest.c.recorded_at))
+        .filter(
+            latest.c.position == 1,
+            LessonProgress.recorded_at >= since,  # Repeated so the outer scan is pruned too
+            LessonProgress.recorded_at < until,
+        )
+        .order_by(LessonProgress.lesson_id)
+        .all()
+    )
+
+def get_activity(db: Session, user_id: int, since: datetime, until: datetime, limit: int):
+    """
+    Retrieves a user's activity events within a time window, newest first.
+
+    Args:
+        db (Session): The database session used to interact with the database.
+        user_id (int): The ID of the user.
+        since (datetime): Start of the window (inclusive).
+        until (datetime): End of the window (exclusive).
+        limit (int): The maximum number of events to return.
+
+    Returns:
+        List[ActivityEvent]: The activity events.
+    """
+    return (
+        db.query(ActivityEvent)
+        .filter(
+            ActivityEvent.user_id == user_id,
+            ActivityEvent.occurred_at >= since,
+            ActivityEvent.occurred_at < until,
+        )
+        .order_by(ActivityEvent.occurred_at.desc())
+        .limit(limit)
+        .all()
+    )
@@ -0,0 +1,99 @@
+from sqlalchemy import func, insert
+from sqlalchemy.orm import Session
+from models.course import Course
+from models.user_course import UserCourse
+from models.recommendation import CourseRecommendation, RecommendationState
+
+ENROLLMENT_WATERMARK = "user_courses.last_id"
+
+def iter_enrollments(db: Session, batch_size: int = 10000):
+    """
+    Streams every live `(user_id, course_id)` enrollment pair without loading the ORM objects.
+
+    Rows missing either ID (both columns are nullable) are skipped.
+
+    Args:
+        db (Session): The database session used to interact with the database.
+        batch_size (int): The number of rows fetched per round trip.
+
+    Returns:
+        Iterator[tuple]: The `(user_id, course_id)` pairs.
+    """
+    return (
+        db.query(UserCourse.user_id, UserCourse.course_id)
+        .filter(UserCourse.deleted_at.is_(None), UserCourse.user_id.isnot(None), UserCourse.course_id.isnot(None))
+        .yield_per(batch_size)
+    )
+
+def get_max_enrollment_id(db: Session):
+    """
+    Returns the highest `user_courses.id`, or 0 when there are no enrollments.
+    """
+    return db.query(func.max(UserCourse.id)).scalar() or 0
+
+def get_courses_enrolled_since(db: Session, last_id: int):
+    """
+    Returns the IDs of the courses that got enrollments with an ID greater than `last_id`.
+    """
+    rows = (
+        db.query(UserCourse.course_id)
+        .filter(UserCourse.id > last_id, UserCourse.course_id.isnot(None))
+        .distinct()
+        .all()
+    )
+    return [course_id for (course_id,) in rows]
+
+def get_state(db: Session, name: str, default: int = 0):
+    """
+    Reads a value of the recommendation job state.
+    """
+    state = db.query(RecommendationState).filter(RecommendationState.name == name).first()
+    return state.value if state else default
+
+def set_state(db: Session, name: str, value: int):
+    """
+    Writes a value of the recommendation job state. The caller commits.
+    """
+    state = db.query(RecommendationState).filter(RecommendationState.name == name).first()
+    if state is None:
+        db.add(RecommendationState(name=name, value=value))
+    else:
+        state.value = value
+
+def replace_recommendations(db: Session, course_ids: list[int] | None, rows: list[dict]):
+    """
+    Replaces the stored recommendations of the given courses. The caller commits.
+
+    Args:
+        db (Session): The database session used to interact with the database.
+        course_ids (list[int] | None): The courses whose recommendations are being
+            recomputed, or None to replace every stored row (full rebuild).
+        rows (list[dict]): The new `course_id`/`rank`/`recommended_course_id`/`score` rows.
+    """
+    query = db.query(CourseRecommendation)
+    if course_ids is not None:
+        query = query.filter(CourseRecommendation.course_id.in_(course_ids))
+    query.delete(synchronize_session=False)
+    if rows:
+        db.execute(insert(CourseRecommendation), rows)  # executemany in one round trip
+
+def get_recommendations(db: Session, course_id: int, limit: int):
+    """
+    Retrieves the precomputed recommendations of a course.
+
+    Args:
+        db (Session): The database session used to interact with the database.
+        course_id (int): The ID of the course.
+        limit (int): The maximum number of recommendations.
+
+    Returns:
+        List[tuple]: `(Course, score)` pairs, most similar first.
+    """
+    return (
+        db.query(Course, CourseRecommendation.score)
+        .join(CourseRecommendation, CourseRecommendation.recommended_course_id == Course.id)
+        .filter(CourseRecommendation.course_id == course_id, Course.deleted_at.is_(None))
+        .order_by(CourseRecommendation.rank)
+        .limit(limit)
+        .all()
+    )
@@ -0,0 +1,62 @@
+from sqlalchemy import delete, or_, select
+from sqlalchemy.orm import Session
+from models.Lesson import Lesson
+from models.lesson_rendition import LessonRendition
+from db.dialect import upsert
+
+def get_rendition(db: Session, content_hash: str, renderer: str):
+    """
+    Retrieves the rendered HTML of a content hash, by primary key.
+
+    Args:
+        db (Session): The database session used to interact with the database.
+        content_hash (str): The SHA-256 of the source.
+        renderer (str): The renderer identifier.
+
+    Returns:
+        str: The HTML, or None if this source was not rendered by this renderer yet.
+    """
+    return (
+        db.query(LessonRendition.html)
+        .filter(LessonRendition.content_hash == content_hash, LessonRendition.renderer == renderer)
+        .scalar()
+    )
+
+def save_rendition(db: Session, content_hash: str, renderer: str, html: str):
+    """
+    Stores rendered HTML. Concurrent renders of the same source keep the first row.
+
+    Args:
+        db (Session): The database session used to interact with the database.
+        content_hash (str): The SHA-256 of the source.
+        renderer (str): The renderer identifier.
+        html (str): The rendered HTML.
+    """
+    db.execute(
+        upsert(db, LessonRendition)
+        .values(content_hash=content_hash, renderer=renderer, html=html)
+        .on_conflict_do_nothing(index_elements=[LessonRendition.content_hash, LessonRendition.renderer])
+    )
+    db.commit()
+
+def delete_stale_renditions(db: Session, renderer: str):
+    """
+    Deletes the renditions made by another renderer or whose source no lesson uses anymore.
+
+    Args:
+        db (Session): The database session used to interact with the database.
+        renderer (str): The current renderer identifier.
+
+    Returns:
+        int: The number of rows deleted.
+    """
+    deleted = db.execute(
+        delete(LessonRendition).where(or_(
+            LessonRendition.renderer != renderer,
+            LessonRendition.content_hash.not_in(
+                select(Lesson.content_hash).where(Lesson.content_hash.is_not(None))
+            ),
+        ))
+    ).rowcount
+    db.commit()
+    return deleted
@@ -0,0 +1,226 @@
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import Session
+from models.course import Course
+from models.review import Review, CourseRating
+from db.dialect import upsert
+from core.config import settings
+
+def _bayesian_score(rating_sum, rating_count):
+    """
+    Bayesian weighted rating: the course average pulled towards `REVIEW_PRIOR_MEAN` as if
+    it had `REVIEW_PRIOR_WEIGHT` extra reviews, so one 5-star review does not top the ranking.
+    Works on numbers as well as SQL expressions.
+    """
+    prior_weight = settings.REVIEW_PRIOR_WEIGHT
+    return (prior_weight * settings.REVIEW_PRIOR_MEAN + rating_sum) / (prior_weight + rating_count)
+
+def _apply_rating_delta(db: Session, course_id: int, sum_delta: int, count_delta: int):
+    """
+    Adds the given deltas to the running aggregates of a course and refreshes its score.
+
+    A single `INSERT ... ON CONFLICT DO UPDATE` statement, so concurrent reviews of the
+    same course never lose an update. It runs in the caller's transaction.
+    """
+    table = CourseRating.__table__
+    statement = upsert(db, table).values(
+        course_id=course_id,
+        rating_sum=sum_delta,
+        rating_count=count_delta,
+        score=_bayesian_score(sum_delta, count_delta),
+    )
+    new_sum = table.c.rating_sum + statement.excluded.rating_sum
+    new_count = table.c.rating_count + statement.excluded.rating_count
+    statement = statement.on_conflict_do_update(
+        index_elements=[table.c.course_id],
+        set_={
+            "rating_sum": new_sum,
+            "rating_count": new_count,
+            "score": _bayesian_score(new_sum, new_count),
+        },
+    )
+    db.execute(statement)
+
+def create_review(db: Session, user_id: int, course_id: int, rating: int, comment: str | None):
+    """
+    Creates a review and updates the course aggregates in the same transaction.
+
+    Args:
+        db (Session): The database session used to interact with the database.
+        user_id (int): The ID of the author.
+        course_id (int): The ID of the reviewed course.
+        rating (int): The rating, from 1 to 5.
+        comment (str | None): An optional comment.
+
+    Returns:
+        Review: The created `Review` object.
+    """
+    db_review = Review(user_id=user_id, course_id=course_id, rating=rating, comment=comment)
+    db.add(db_review)
+    db.flush()  # Fails here on a duplicate review, before touching the aggregates
+    _apply_rating_delta(db, course_id, rating, 1)
+    db.commit()
+    db.refresh(db_review)
+    return db_review
+
+def get_review(db: Session, review_id: int, for_update: bool = False):
+    """
+    Retrieves a review by its ID.
+
+    Args:
+        db (Session): The database session used to interact with the database.
+        review_id (int): The ID of the review.
+        for_update (bool): Lock the row until the transaction ends (`SELECT ... FOR UPDATE`),
+            so the rating read is still current when the aggregates are adjusted from it.
+
+    Returns:
+        Review: The `Review` object, or None if not found.
+    """
+    query = db.query(Review).filter(Review.id == review_id)
+    if for_update:
+        query = query.with_for_update().populate_existing()
+    return query.first()
+
+def get_reviews_by_course(db: Session, course_id: int, limit: int, offset: int):
+    """
+    Retrieves a page of the reviews of a course, newest first.
+
+    Args:
+        db (Session): The database session used to interact with the database.
+        course_id (int): The ID of the course.
+        limit (int): The maximum number of reviews to return.
+        offset (int): The number of reviews to skip.
+
+    Returns:
+        List[Review]: The course reviews.
+    """
+    return (
+        db.query(Review)
+        .filter(Review.course_id == course_id)
+        .order_by(Review.id.desc())
+        .offset(offset)
+        .limit(limit)
+        .all()
+    )
+
+def update_review(db: Session, db_review: Review, rating: int | None, comment: str | None):
+    """
+    Updates a review and adjusts the course aggregates in the same transaction.
+
+    The delta is computed from the stored rating, so `db_review` must have been read
+    with `get_review(..., for_update=True)` in this transaction.
+
+    Args:
+        db (Session): The database session used to interact with the database.
+        db_review (Review): The review to update, locked.
+        rating (int | None): The new rating, or None to keep it.
+        comment (str | None): The new comment, or None to keep it.
+
+    Returns:
+        Review: The updated `Review` object.
+    """
+    if rating is not None and rating != db_review.rating:
+        _apply_rating_delta(db, db_review.course_id, rating - db_review.rating, 0)
+        db_review.rating = rating
+    if comment is not None:
+        db_review.comment = comment
+    db.commit()
+    db.refresh(db_review)
+    return db_review
+
+def delete_review(db: Session, db_review: Review):
+    """
+    Deletes a review and removes it from the course aggregates in the same transaction.
+
+    Args:
+        db (Session): The database session used to interact with the database.
+        db_review (Review): The review to delete, locked like for `update_review`.
+    """
+    _apply_rating_delta(db, db_review.course_id, -db_review.rating, -1)
+    db.delete(db_review)
+    db.commit()
+
+def remove_user_ratings(db: Session, user_id: int):
+    """
+    Subtracts every review of a user from the course aggregates, before the user is deleted.
+
+    A single `UPDATE course_ratings ... FROM (reviews grouped by course)` statement, so deleting
+    a prolific reviewer costs one round trip; the reviews themselves go with the user through
+    the `ON DELETE CASCADE` foreign key. It runs in the caller's transaction.
+
+    Args:
+        db (Session): The database session used to interact with the database.
+        user_id (int): The ID of the user about to be deleted.
+    """
+    totals = (
+        select(
+            Review.course_id,
+            func.sum(Review.rating).label("rating_sum"),
+            func.count(Review.id).label("rating_count"),
+        )
+        .where(Review.user_id == user_id)
+        .group_by(Review.course_id)
+        .subquery()
+    )
+    new_sum = CourseRating.rating_sum - totals.c.rating_sum
+    new_count = CourseRating.rating_count - totals.c.rating_count
+    db.execute(
+        update(CourseRating)
+        .where(CourseRating.course_id == totals.c.course_id)
+        .values(rating_sum=new_sum, rating_count=new_count, score=_bayesian_score(new_sum, new_count))
+        .execution_options(synchronize_session=False)
+    )
+
+def get_top_rated_courses(db: Session, limit: int, offset: int):
+    """
+    Retrieves a page of the courses ranked by their precomputed Bayesian score.
+
+    Reads the `ix_course_ratings_score` index in order; no aggregation happens here.
+
+    Args:
+        db (Session): The database session used to interact with the database.
+        limit (int): The maximum number of courses to return.
+        offset (int): The number of courses to skip.
+
+    Returns:
+        List[tuple]: `(Course, CourseRating)` pairs, best first.
+    """
+    return (
+        db.query(Course, CourseRating)
+        .join(CourseRating, CourseRating.course_id == Course.id)
+        .filter(CourseRating.rating_count > 0, Course.deleted_at.is_(None))
+        .order_by(CourseRating.score.desc(), CourseRating.course_id)
+        .offset(offset)
+        .limit(limit)
+        .all()
+    )
+
+def rebuild_course_ratings(db: Session):
+    """
+    Recomputes every course aggregate from the reviews table.
+
+    Only needed after changing `REVIEW_PRIOR_MEAN`/`REVIEW_PRIOR_WEIGHT` or to repair drift;
+    the aggregates are otherwise maintained incrementally.
+
+    Args:
+        db (Session): The database session used to interact with the database.
+
+    Returns:
+        int: The number of courses with reviews.
+    """
+    rows = (
+        db.query(Review.course_id, func.sum(Review.rating), func.count(Review.id))
+        .group_by(Review.course_id)
+        .all()
+    )
+    db.query(CourseRating).delete(synchronize_session=False)
+    db.add_all(
+        CourseRating(
+            course_id=course_id,
+            rating_sum=int(rating_sum),
+            rating_count=rating_count,
+            score=_bayesian_score(int(rating_sum), rating_count),
+        )
+        for course_id, rating_sum, rating_count in rows
+    )
+    db.commit()
+    return len(rows)
@@ -0,0 +1,75 @@
+import json
+from datetime import datetime, timezone
+from sqlalchemy import delete, func, select
+from sqlalchemy.orm import Session
+from models.revoked_token import RevokedToken
+from db.dialect import dialect_name, upsert
+from core.config import settings
+
+def revoke_token(db: Session, jti: str, user_id: int, expires_at: datetime):
+    """
+    Records a revoked token and announces it on the revocation channel.
+
+    Revoking the same token twice is a no-op. The `pg_notify` call runs in the same
+    transaction, so the other workers only hear about the revocation once it is committed.
+
+    Args:
+        db (Session): The database session used to interact with the database.
+        jti (str): The ID of the token.
+        user_id (int): The ID of the user the token was issued to.
+        expires_at (datetime): When the token expires.
+    """
+    db.execute(
+        upsert(db, RevokedToken)
+        .values(jti=jti, user_id=user_id, expires_at=expires_at)
+        .on_conflict_do_nothing(index_elements=[RevokedToken.jti])
+    )
+    if dialect_name(db) == "postgresql":
+        payload = json.dumps({"jti": jti, "exp": expires_at.timestamp()})
+        db.execute(select(func.pg_notify(settings.REVOCATION_CHANNEL, payload)))
+    db.commit()
+
+def is_token_revoked(db: Session, jti: str):
+    """
+    Tells whether a token is revoked, by primary key lookup.
+
+    Args:
+        db (Session): The database session used to interact with the database.
+        jti (str): The ID of the token.
+
+    Returns:
+        bool: True if the token was revoked.
+    """
+    return db.query(RevokedToken.jti).filter(RevokedToken.jti == jti).first() is not None
+
+def get_active_revocations(db: Session):
+    """
+    Retrieves the revocations of the tokens that have not expired yet.
+
+    Args:
+        db (Session): The database session used to interact with the database.
+
+    Returns:
+        List[tuple]: `(jti, expires_at)` rows.
+    """
+    return (
+        db.query(RevokedToken.jti, RevokedToken.expires_at)
+        .filter(RevokedToken.expires_at > datetime.now(timezone.utc))
+        .all()
+    )
+
+def delete_expired_revocations(db: Session):
+    """
+    Deletes the revocations of the tokens that have expired (and are rejected anyway).
+
+    Args:
+        db (Session): The database session used to interact with the database.
+
+    Returns:
+        int: The number of rows deleted.
+    """
+    deleted = db.execute(
+        delete(RevokedToken).where(RevokedToken.expires_at <= datetime.now(timezone.utc))
+    ).rowcount
+    db.commit()
+    return deleted
@@ -0,0 +1,93 @@
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Session
+from models.course import Course
+from models.Lesson import Lesson
+from models.sync import Tombstone, change_watermark
+
+def add_tombstone(db: Session, entity: str, entity_id: int):
+    """
+    Records the deletion of a catalog row so sync clients can remove it too.
+
+    The tombstone is only added to the session: it must be committed by the caller in
+    the same transaction as the deletion itself.
+
+    Args:
+        db (Session): The database session used to interact with the database.
+        entity (str): The kind of row that is being deleted ('course' or 'lesson').
+        entity_id (int): The ID of the deleted row.
+
+    Returns:
+        Tombstone: The pending `Tombstone` object.
+    """
+    tombstone = Tombstone(entity=entity, entity_id=entity_id)
+    db.add(tombstone)
+    return tombstone
+
+def get_changes_since(db: Session, since: tuple[int, int], limit: int):
+    """
+    Retrieves the catalog changes after the position `since`, in feed order.
+
+    The feed is ordered by `(change_xid, change_seq)`: the writing transaction first,
+    then the order of the writes within it. Only the changes of transactions older than
+    every transaction still running are returned (`change_watermark`). A transaction
+    that is still open may hold a lower sequence number than a committed one, and it
+    will never commit a position below that point. A long running write transaction
+    therefore holds the feed back until it ends.
+
+    Each source (courses, lessons, tombstones) is read through its `(change_xid,
+    change_seq)` index with at most `limit + 1` rows, so the merged result always
+    contains the first `limit` changes overall plus one extra row telling whether there
+    are more.
+
+    Args:
+        db (Session): The database session used to interact with the database.
+        since (tuple[int, int]): The `(change_xid, change_seq)` of the last change the
+            client has already seen, `(0, 0)` for a full sync.
+        limit (int): The maximum number of changes to return.
+
+    Returns:
+        List[tuple]: `((change_xid, change_seq), entity, op, row)` tuples in feed order,
+        with at most `limit + 1` entries.
+    """
+    changes = []
+
+    # Created or updated courses
+    courses = (
+        db.query(Course)
+        .filter(
+            tuple_(Course.change_xid, Course.change_seq) > since,
+            Course.change_xid < change_watermark(),
+            Course.deleted_at.is_(None),
+        )
+        .order_by(Course.change_xid, Course.change_seq)
+        .limit(limit + 1)
+        .all()
+    )
+    changes += [((c.change_xid, c.change_seq), "course", "upsert", c) for c in courses]
+
+    # Created or updated lessons (soft deleted rows are reported through their tombstone)
+    lessons = (
+        db.query(Lesson)
+        .filter(
+            tuple_(Lesson.change_xid, Lesson.change_seq) > since,
+            Lesson.change_xid < change_watermark(),
+            Lesson.deleted_at.is_(None),
+        )
+        .order_by(Lesson.change_xid, Lesson.change_seq)
+        .limit(limit + 1)
+        .all()
+    )
+    changes += [((l.change_xid, l.change_seq), "lesson", "upsert", l) for l in lessons]
+
+    # Deleted courses and lessons
+    tombstones = (
+        db.query(Tombstone)
+        .filter(tuple_(Tombstone.change_xid, Tombstone.change_seq) > since, Tombstone.change_xid < change_watermark())
+        .order_by(Tombstone.change_xid, Tombstone.change_seq)
+        .limit(limit + 1)
+        .all()
+    )
+    changes += [((t.change_xid, t.change_seq), t.entity, "delete", t) for t in tombstones]
+
+    changes.sort(key=lambda change: change[0])
+    return changes[: limit + 1]
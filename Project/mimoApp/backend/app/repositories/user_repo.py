@@ -1,7 +1,11 @@
+from sqlalchemy import delete, func
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from models.user import User
 from schemas.user import UserCreate
 from core.security import hash_password
+from repositories.outbox_repo import add_outbox_event, USER_REGISTERED
+from repositories.review_repo import remove_user_ratings
 
 def create_user(db: Session, user: UserCreate):
     """
@@ -19,7 +23,7 @@ def create_user(db: Session, user: UserCreate):
         User: The created `User` object with the assigned database ID.
     """
     # Check if the user already exists by email
-    existing_user = db.query(User).filter(User.email == user.email).first()
+    existing_user = db.query(User).filter(func.lower(User.email) == user.email.lower()).first()
     if existing_user:
         raise ValueError("User with this email already exists.")
     
@@ -33,8 +37,17 @@ def create_user(db: Session, user: UserCreate):
         hashed_password=hashed_password
     )
     
-    # Add the user to the session and commit the transaction
+    # Add the user to the session and record the event in the same transaction
     db.add(db_user)
+    try:
+        db.flush()  # Assigns the user ID used in the event payload
+    except IntegrityError:
+        db.rollback()
+        # A concurrent registration of the same email won the race (uq_users_lower_email)
+        if db.query(User.id).filter(func.lower(User.email) == user.email.lower()).first():
+            raise ValueError("User with this email already exists.")
+        raise
+    add_outbox_event(db, USER_REGISTERED, {"user_id": db_user.id, "email": db_user.email})
     db.commit()
     db.refresh(db_user)  # Refresh the object to get the latest state from the database
     
@@ -70,8 +83,8 @@ def get_user_by_email(db: Session, email: str):
     Returns:
         User: The `User` object corresponding to the given email, or None if not found.
     """
-    # Query the database for the user by their email
-    return db.query(User).filter(User.email == email).first()
+    # Query the database for the user by their email, ignoring case (served by uq_users_lower_email)
+    return db.query(User).filter(func.lower(User.email) == email.lower()).first()
 
 def get_all_users(db: Session):
     """
@@ -92,27 +105,31 @@ def delete_user(db: Session, user_id: int):
     """
     Deletes a user from the database by their ID.
 
+    A single set-based `DELETE`: enrollments, reviews and notifications are removed by the
+    database through their `ON DELETE CASCADE` foreign keys instead of being loaded one by
+    one. The user's ratings are first subtracted from the course aggregates.
+
     Args:
         db (Session): The database session used to interact with the database.
         user_id (int): The ID of the user to be deleted.
 
     Returns:
-        User: The deleted `User` object, or None if not found.
+        bool: True if the user was deleted, False if not found.
     """
     # Verifica que el user_id sea un número entero
     if not isinstance(user_id, int):
         raise ValueError("El user_id debe ser un número entero.")
     
-    # Query the database for the user by their ID
-    db_user = db.query(User).filter(User.id == user_id).first()
+    remove_user_ratings(db, user_id)
+    deleted = db.execute(delete(User).where(User.id == user_id).returning(User.id)).first()
     
-    # Check if the user exists
-    if db_user:
-        db.delete(db_user)
-        db.commit()
-    
-    # Return the deleted user (or None if not found)
-    return db_user
+    # Check if the user existed
+    if deleted is None:
+        db.rollback()
+        return False
+
+    db.commit()
+    return True
 
 def update_user(db: Session, user_id: int, user: UserCreate):
     """
@@ -163,3 +180,17 @@ def get_user_by_id(db: Session, user_id: int):
     
     # Query the database for the user by their ID
     return db.query(User).filter(User.id == user_id).first()
+
+def get_users_by_ids(db: Session, user_ids: list[int]):
+    """
+    Retrieves several users by their IDs with a single query.
+
+    Args:
+        db (Session): The database session used to interact with the database.
+        user_ids (list[int]): The IDs of the users to be retrieved.
+
+    Returns:
+        List[User]: The `User` objects found, in no particular order.
+    """
+    # One `WHERE id IN (...)` round trip instead of one query per id
+    return db.query(User).filter(User.id.in_(user_ids)).all()
@@ -6,15 +6,15 @@ class LessonCreate(BaseModel):
     Schema for creating a new lesson.
 
     This schema is used to validate the request body when creating a new lesson.
-    It includes the title and description of the lesson.
+    It includes the title and content of the lesson.
 
     Attributes:
         title (str): The title of the lesson. It must be unique.
-        description (str): The detailed description of the lesson.
+        content (str): The content of the lesson.
     """
     id: int = Field(..., description="The unique identifier of the lesson.")
     title: str = Field(..., description="The title of the lesson. It must be unique.")
-    description: str = Field(..., description="The detailed description of the lesson.")
+    content: str = Field(..., description="The content of the lesson.")
     course_id: int = Field(..., description="The ID of the course to which the lesson belongs.")
 
 
@@ -23,17 +23,19 @@ class LessonResponse(BaseModel):
     Schema for the lesson response.
 
     This schema is used to return the information of a lesson in the API response.
-    It includes the lesson ID, title, and description.
+    It includes the lesson ID, title, and content.
 
     Attributes:
         id (int): The unique identifier of the lesson.
         title (str): The title of the lesson.
-        description (str): The description of the lesson.
+        content (str): The content of the lesson.
+        rank (str): The position of the lesson within its course.
     """
     id: int = Field(..., description="The unique identifier of the lesson.")
     title: str = Field(..., description="The title of the lesson.")
-    description: str = Field(..., description="The description of the lesson.")
+    content: str = Field(..., description="The content of the lesson.")
     course_id: int = Field(..., description="The ID of the course to which the lesson belongs.")
+    rank: Optional[str] = Field(None, description="Sort key of the lesson within its course.")
 
     class Config:
         """
@@ -54,8 +56,65 @@ class LessonUpdate(BaseModel):
 
     Attributes:
         title (Optional[str]): The updated title of the lesson.
-        description (Optional[str]): The updated description of the lesson.
+        content (Optional[str]): The updated content of the lesson.
     """
     id : int = Field(..., description="The unique identifier of the lesson.")
     title: Optional[str] = Field(None, description="The updated title of the lesson.")
-    description: Optional[str] = Field(None, description="The updated description of the lesson.")
+    content: Optional[str] = Field(None, description="The updated content of the lesson.")
+
+
+class LessonBatchResponse(BaseModel):
+    """
+    Schema for the response of a batch lesson lookup.
+
+    Attributes:
+        items (list[LessonResponse]): The lessons found, in the order they were requested.
+        missing (list[int]): The requested ids that do not match any lesson.
+    """
+    items: list[LessonResponse] = Field(..., description="The lessons found, in request order.")
+    missing: list[int] = Field(default_factory=list, description="Requested ids that were not found.")
+
+
+class LessonOutlineItem(BaseModel):
+    """
+    Schema for one entry of the ordered outline of a course.
+
+    Attributes:
+        id (int): The unique identifier of the lesson.
+        title (str): The title of the lesson.
+        rank (str): The sort key of the lesson within its course.
+    """
+    id: int = Field(..., description="The unique identifier of the lesson.")
+    title: str = Field(..., description="The title of the lesson.")
+    rank: str = Field(..., description="Sort key of the lesson within its course.", example="i")
+
+    class Config:
+        """
+        Configuration for the Pydantic model.
+
+        Enables ORM mode to allow the model to be used with SQLAlchemy objects.
+        """
+        orm_mode = True  # Required to work with SQLAlchemy ORM
+        from_attributes = True  # Improved compatibility with SQLAlchemy models
+
+
+class LessonMove(BaseModel):
+    """
+    Schema for moving one lesson within its course.
+
+    Attributes:
+        lesson_id (int): The lesson to move.
+        after_id (Optional[int]): The lesson it should follow, or None to make it the first one.
+    """
+    lesson_id: int = Field(..., description="The lesson to move.", example=7)
+    after_id: Optional[int] = Field(None, description="The lesson it should follow; null moves it first.", example=3)
+
+
+class LessonReorder(BaseModel):
+    """
+    Schema for a bulk reorder of the lessons of a course.
+
+    Attributes:
+        moves (list[LessonMove]): The moves, applied in order.
+    """
+    moves: list[LessonMove] = Field(..., min_length=1, description="The moves, applied in order.")
@@ -0,0 +1,18 @@
+from pydantic import BaseModel, Field
+
+class LessonAssetResponse(BaseModel):
+    """
+    Schema for a file attached to a lesson.
+
+    Attributes:
+        filename (str): The name of the file within the lesson.
+        sha256 (str): The SHA-256 of the content.
+        size (int): The size of the content in bytes.
+        content_type (str): The media type of the content.
+        url (str): Where the content can be downloaded; it never changes for a given content.
+    """
+    filename: str = Field(..., description="The name of the file within the lesson.", example="diagram.png")
+    sha256: str = Field(..., description="The SHA-256 of the content.")
+    size: int = Field(..., description="The size of the content in bytes.", example=48213)
+    content_type: str = Field(..., description="The media type of the content.", example="image/png")
+    url: str = Field(..., description="The download URL of the content.")
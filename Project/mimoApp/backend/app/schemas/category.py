@@ -0,0 +1,44 @@
+from pydantic import BaseModel, Field
+from typing import Optional
+from schemas.course import CourseResponse
+
+class CategoryCreate(BaseModel):
+    """
+    Schema for creating a new course category.
+
+    Attributes:
+        name (str): The unique name of the category.
+        parent_id (Optional[int]): The ID of the parent category, for nested categories.
+    """
+    name: str = Field(..., min_length=1, max_length=100, description="The unique name of the category", example="Web Development")
+    parent_id: Optional[int] = Field(None, description="The ID of the parent category", example=1)
+
+
+class CategoryResponse(BaseModel):
+    """
+    Schema for the category response.
+
+    Attributes:
+        id (int): The unique identifier of the category.
+        name (str): The name of the category.
+        parent_id (Optional[int]): The ID of the parent category.
+        course_count (int): The number of courses directly in the category.
+        total_course_count (int): The number of courses in the category and all its subcategories.
+    """
+    id: int = Field(..., description="The unique identifier of the category", example=2)
+    name: str = Field(..., description="The name of the category", example="Web Development")
+    parent_id: Optional[int] = Field(None, description="The ID of the parent category", example=1)
+    course_count: int = Field(..., description="Courses directly in the category", example=12)
+    total_course_count: int = Field(..., description="Courses in the category and its subcategories", example=30)
+
+
+class CategoryCoursesPage(BaseModel):
+    """
+    Schema for a page of the courses of a category.
+
+    Attributes:
+        items (list[CourseResponse]): The courses of the page, ordered by ID.
+        next_after_id (Optional[int]): The cursor for the next page, or None on the last page.
+    """
+    items: list[CourseResponse] = Field(..., description="The courses of the page")
+    next_after_id: Optional[int] = Field(None, description="Pass as `after_id` to get the next page", example=57)
@@ -1,4 +1,5 @@
 from pydantic import BaseModel, Field
+from typing import Optional
 
 class CourseCreate(BaseModel):
     """
@@ -10,10 +11,12 @@ class CourseCreate(BaseModel):
     Attributes:
         title (str): The title of the course.
         description (str): A detailed description of the course.
+        category_id (Optional[int]): The ID of the category of the course.
     """
     id: int = Field(..., description="The unique identifier of the course", example=1)
     title: str = Field(..., description="The title of the course", example="Introduction to FastAPI")
     description: str = Field(..., description="Detailed description of the course", example="Learn the basics of FastAPI and building APIs.")
+    category_id: Optional[int] = Field(None, description="The ID of the category of the course", example=3)
 
 class CourseUpdate(BaseModel):
     """
@@ -25,10 +28,12 @@ class CourseUpdate(BaseModel):
     Attributes:
         title (str): The updated title of the course.
         description (str): The updated description of the course.
+        category_id (Optional[int]): The new category of the course (null removes it).
     """
     id: int = Field(..., description="The unique identifier of the course", example=1)
     title: str = Field(None, description="The updated title of the course", example="FastAPI Essentials")
     description: str = Field(None, description="The updated description of the course", example="Essential concepts and features of FastAPI.")
+    category_id: Optional[int] = Field(None, description="The new category of the course", example=3)
 
 class CourseResponse(BaseModel):
     """
@@ -41,10 +46,12 @@ class CourseResponse(BaseModel):
         id (int): The unique identifier of the course.
         title (str): The title of the course.
         description (str): A detailed description of the course.
+        category_id (Optional[int]): The ID of the category of the course.
     """
     id: int = Field(..., description="The unique identifier of the course", example=1)
     title: str = Field(..., description="The title of the course", example="Introduction to FastAPI")
     description: str = Field(..., description="Detailed description of the course", example="Learn the basics of FastAPI and building APIs.")
+    category_id: Optional[int] = Field(None, description="The ID of the category of the course", example=3)
 
     class Config:
         """
@@ -55,3 +62,53 @@ class CourseResponse(BaseModel):
         """
         orm_mode = True
         from_attributes = True
+
+
+class CatalogLesson(BaseModel):
+    """
+    Schema for a lesson listed in the public catalog.
+
+    Attributes:
+        id (int): The unique identifier of the lesson.
+        title (str): The title of the lesson.
+    """
+    id: int = Field(..., description="The unique identifier of the lesson", example=4)
+    title: str = Field(..., description="The title of the lesson", example="Path parameters")
+
+
+class CatalogCourse(CourseResponse):
+    """
+    Schema for a course of the public catalog, with the titles of its lessons.
+
+    Attributes:
+        lessons (list[CatalogLesson]): The live lessons of the course, in course order.
+    """
+    lessons: list[CatalogLesson] = Field(default_factory=list, description="The lessons of the course, in course order")
+
+
+class CourseBatchResponse(BaseModel):
+    """
+    Schema for the response of a batch course lookup.
+
+    Attributes:
+        items (list[CourseResponse]): The courses found, in the order they were requested.
+        missing (list[int]): The requested ids that do not match any course.
+    """
+    items: list[CourseResponse] = Field(..., description="The courses found, in request order")
+    missing: list[int] = Field(default_factory=list, description="Requested ids that were not found", example=[42])
+
+
+class RecommendedCourse(BaseModel):
+    """
+    Schema for a course recommended on another course's page.
+
+    Attributes:
+        id (int): The unique identifier of the recommended course.
+        title (str): The title of the recommended course.
+        description (str): The description of the recommended course.
+        score (float): How similar the audiences of both courses are (cosine similarity, 0 to 1).
+    """
+    id: int = Field(..., description="The unique identifier of the course", example=7)
+    title: str = Field(..., description="The title of the course", example="SQL for Beginners")
+    description: str = Field(..., description="Detailed description of the course")
+    score: float = Field(..., description="Co-enrollment similarity, from 0 to 1", example=0.42)
@@ -0,0 +1,53 @@
+from datetime import datetime
+from typing import Optional
+from pydantic import BaseModel, Field
+from schemas.user import UserResponse
+
+class DashboardLesson(BaseModel):
+    """
+    Schema for the next lesson of a course on the dashboard.
+
+    Attributes:
+        id (int): The unique identifier of the lesson.
+        title (str): The title of the lesson.
+    """
+    id: int = Field(..., description="The unique identifier of the lesson.")
+    title: str = Field(..., description="The title of the lesson.")
+
+
+class DashboardCourse(BaseModel):
+    """
+    Schema for an enrolled course on the dashboard.
+
+    Attributes:
+        id (int): The unique identifier of the course.
+        title (str): The title of the course.
+        description (str): The description of the course.
+        completed (bool): Whether the course is marked as completed.
+        enrolled_at (datetime): When the user enrolled.
+        lesson_count (int): The number of lessons of the course.
+        completed_lessons (int): The lessons the user completed.
+        progress_percentage (float): The average completion of the lessons, from 0 to 100.
+        next_lesson (Optional[DashboardLesson]): The first unfinished lesson, in course order.
+    """
+    id: int = Field(..., description="The unique identifier of the course.")
+    title: str = Field(..., description="The title of the course.")
+    description: str = Field(..., description="The description of the course.")
+    completed: bool = Field(..., description="Whether the course is marked as completed.")
+    enrolled_at: datetime = Field(..., description="When the user enrolled.")
+    lesson_count: int = Field(..., description="The number of lessons of the course.")
+    completed_lessons: int = Field(..., description="The lessons the user completed.")
+    progress_percentage: float = Field(..., description="Average completion of the lessons, from 0 to 100.", example=42.5)
+    next_lesson: Optional[DashboardLesson] = Field(None, description="The first unfinished lesson, if any.")
+
+
+class DashboardResponse(BaseModel):
+    """
+    Schema for the home screen of a user.
+
+    Attributes:
+        user (UserResponse): The current user.
+        courses (list[DashboardCourse]): The enrolled courses, most recent enrollment first.
+    """
+    user: UserResponse = Field(..., description="The current user.")
+    courses: list[DashboardCourse] = Field(default_factory=list, description="The enrolled courses.")
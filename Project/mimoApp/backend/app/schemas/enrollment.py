@@ -0,0 +1,28 @@
+from datetime import datetime
+from pydantic import BaseModel, Field
+
+class EnrollmentResponse(BaseModel):
+    """
+    Schema for the enrollment response.
+
+    Attributes:
+        id (int): The unique identifier of the enrollment.
+        user_id (int): The ID of the enrolled user.
+        course_id (int): The ID of the course.
+        completed (bool): Whether the user has completed the course.
+        enrolled_at (datetime): When the user enrolled.
+    """
+    id: int = Field(..., description="The unique identifier of the enrollment.")
+    user_id: int = Field(..., description="The ID of the enrolled user.")
+    course_id: int = Field(..., description="The ID of the course.")
+    completed: bool = Field(..., description="Whether the user has completed the course.")
+    enrolled_at: datetime = Field(..., description="When the user enrolled.")
+
+    class Config:
+        """
+        Configuration for the Pydantic model.
+
+        Enables ORM mode to allow the model to be used with SQLAlchemy objects.
+        """
+        orm_mode = True  # Required to work with SQLAlchemy ORM
+        from_attributes = True  # Improved compatibility with SQLAlchemy models
@@ -0,0 +1,55 @@
+from datetime import datetime
+from pydantic import BaseModel, Field
+from typing import Any, Optional
+
+class JobCreate(BaseModel):
+    """
+    Schema for enqueuing a background job.
+
+    Attributes:
+        kind (str): The registered job type.
+        payload (dict): The arguments of the job.
+        priority (int): Higher priorities run first.
+        max_attempts (int): How many attempts are allowed before the job is marked failed.
+    """
+    kind: str = Field(..., description="The registered job type.", example="recommendations.refresh")
+    payload: dict = Field(default_factory=dict, description="The arguments of the job.")
+    priority: int = Field(0, ge=-100, le=100, description="Higher priorities run first.")
+    max_attempts: int = Field(3, ge=1, le=20, description="Attempts allowed before the job fails.")
+
+
+class JobResponse(BaseModel):
+    """
+    Schema for the job status response.
+
+    Attributes:
+        id (int): The unique identifier of the job.
+        kind (str): The job type.
+        status (str): 'queued', 'running', 'succeeded' or 'failed'.
+        priority (int): The job priority.
+        attempts (int): The attempts so far.
+        result (Any): The job result, once it succeeded.
+        error (Optional[str]): The error of the last failed attempt.
+        created_at (datetime): When the job was enqueued.
+        started_at (Optional[datetime]): When the last attempt started.
+        finished_at (Optional[datetime]): When the job finished.
+    """
+    id: int = Field(..., description="The unique identifier of the job.")
+    kind: str = Field(..., description="The job type.")
+    status: str = Field(..., description="'queued', 'running', 'succeeded' or 'failed'.")
+    priority: int = Field(..., description="The job priority.")
+    attempts: int = Field(..., description="The attempts so far.")
+    result: Any = Field(None, description="The job result, once it succeeded.")
+    error: Optional[str] = Field(None, description="The error of the last failed attempt.")
+    created_at: datetime = Field(..., description="When the job was enqueued.")
+    started_at: Optional[datetime] = Field(None, description="When the last attempt started.")
+    finished_at: Optional[datetime] = Field(None, description="When the job finished.")
+
+    class Config:
+        """
+        Configuration for the Pydantic model.
+
+        Enables ORM mode to allow the model to be used with SQLAlchemy objects.
+        """
+        orm_mode = True  # Required to work with SQLAlchemy ORM
+        from_attributes = True  # Improved compatibility with SQLAlchemy models
@@ -0,0 +1,26 @@
+from datetime import datetime
+from pydantic import BaseModel, Field
+
+class NotificationResponse(BaseModel):
+    """
+    Schema for the notification response.
+
+    Attributes:
+        id (int): The unique identifier of the notification.
+        message (str): The text of the notification.
+        is_read (bool): Whether the user has already read the notification.
+        created_at (datetime): When the notification was created.
+    """
+    id: int = Field(..., description="The unique identifier of the notification.")
+    message: str = Field(..., description="The text of the notification.")
+    is_read: bool = Field(..., description="Whether the notification has been read.")
+    created_at: datetime = Field(..., description="When the notification was created.")
+
+    class Config:
+        """
+        Configuration for the Pydantic model.
+
+        Enables ORM mode to allow the model to be used with SQLAlchemy objects.
+        """
+        orm_mode = True  # Required to work with SQLAlchemy ORM
+        from_attributes = True  # Improved compatibility with SQLAlchemy models
@@ -0,0 +1,70 @@
+from datetime import datetime
+from typing import Optional
+from pydantic import BaseModel, Field
+
+class ProgressCreate(BaseModel):
+    """
+    Schema for reporting progress on a lesson.
+
+    Attributes:
+        lesson_id (int): The ID of the lesson.
+        completion_percentage (float): How much of the lesson is completed, from 0 to 100.
+    """
+    lesson_id: int = Field(..., description="The ID of the lesson.", example=3)
+    completion_percentage: float = Field(..., ge=0, le=100, description="Completion, from 0 to 100.", example=75)
+
+
+class ProgressResponse(BaseModel):
+    """
+    Schema for a progress report.
+
+    Attributes:
+        id (int): The identifier of the report.
+        course_id (int): The ID of the course of the lesson.
+        lesson_id (int): The ID of the lesson.
+        completion_percentage (float): The reported completion.
+        recorded_at (datetime): When the progress was reported.
+    """
+    id: int = Field(..., description="The identifier of the report.")
+    course_id: int = Field(..., description="The ID of the course of the lesson.")
+    lesson_id: int = Field(..., description="The ID of the lesson.")
+    completion_percentage: float = Field(..., description="The reported completion, from 0 to 100.")
+    recorded_at: datetime = Field(..., description="When the progress was reported.")
+
+    class Config:
+        """
+        Configuration for the Pydantic model.
+
+        Enables ORM mode to allow the model to be used with SQLAlchemy objects.
+        """
+        orm_mode = True  # Required to work with SQLAlchemy ORM
+        from_attributes = True  # Improved compatibility with SQLAlchemy models
+
+
+class ActivityEventResponse(BaseModel):
+    """
+    Schema for an entry of the activity log.
+
+    Attributes:
+        id (int): The identifier of the event.
+        event_type (str): What happened.
+        course_id (Optional[int]): The related course, if any.
+        lesson_id (Optional[int]): The related lesson, if any.
+        data (dict): Event specific details.
+        occurred_at (datetime): When the event happened.
+    """
+    id: int = Field(..., description="The identifier of the event.")
+    event_type: str = Field(..., description="What happened.", example="lesson.progress")
+    course_id: Optional[int] = Field(None, description="The related course, if any.")
+    lesson_id: Optional[int] = Field(None, description="The related lesson, if any.")
+    data: dict = Field(default_factory=dict, description="Event specific details.")
+    occurred_at: datetime = Field(..., description="When the event happened.")
+
+    class Config:
+        """
+        Configuration for the Pydantic model.
+
+        Enables ORM mode to allow the model to be used with SQLAlchemy objects.
+        """
+        orm_mode = True  # Required to work with SQLAlchemy ORM
+        from_attributes = True  # Improved compatibility with SQLAlchemy models
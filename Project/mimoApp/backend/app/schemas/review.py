@@ -0,0 +1,75 @@
+from datetime import datetime
+from pydantic import BaseModel, Field
+from typing import Optional
+
+class ReviewCreate(BaseModel):
+    """
+    Schema for creating a new review.
+
+    Attributes:
+        rating (int): The rating, from 1 to 5.
+        comment (Optional[str]): An optional comment.
+    """
+    rating: int = Field(..., ge=1, le=5, description="The rating, from 1 to 5.", example=5)
+    comment: Optional[str] = Field(None, max_length=2000, description="An optional comment.", example="Clear and practical.")
+
+
+class ReviewUpdate(BaseModel):
+    """
+    Schema for updating an existing review. All fields are optional.
+
+    Attributes:
+        rating (Optional[int]): The new rating, from 1 to 5.
+        comment (Optional[str]): The new comment.
+    """
+    rating: Optional[int] = Field(None, ge=1, le=5, description="The new rating, from 1 to 5.", example=4)
+    comment: Optional[str] = Field(None, max_length=2000, description="The new comment.")
+
+
+class ReviewResponse(BaseModel):
+    """
+    Schema for the review response.
+
+    Attributes:
+        id (int): The unique identifier of the review.
+        user_id (int): The ID of the author.
+        course_id (int): The ID of the reviewed course.
+        rating (int): The rating, from 1 to 5.
+        comment (Optional[str]): The comment, if any.
+        created_at (datetime): When the review was written.
+    """
+    id: int = Field(..., description="The unique identifier of the review.")
+    user_id: int = Field(..., description="The ID of the author.")
+    course_id: int = Field(..., description="The ID of the reviewed course.")
+    rating: int = Field(..., description="The rating, from 1 to 5.")
+    comment: Optional[str] = Field(None, description="The comment, if any.")
+    created_at: datetime = Field(..., description="When the review was written.")
+
+    class Config:
+        """
+        Configuration for the Pydantic model.
+
+        Enables ORM mode to allow the model to be used with SQLAlchemy objects.
+        """
+        orm_mode = True  # Required to work with SQLAlchemy ORM
+        from_attributes = True  # Improved compatibility with SQLAlchemy models
+
+
+class TopRatedCourse(BaseModel):
+    """
+    Schema for an entry of the top rated courses ranking.
+
+    Attributes:
+        id (int): The unique identifier of the course.
+        title (str): The title of the course.
+        description (str): The description of the course.
+        average_rating (float): The plain average of the ratings.
+        review_count (int): The number of reviews.
+        score (float): The Bayesian weighted rating used for the ranking.
+    """
+    id: int = Field(..., description="The unique identifier of the course", example=1)
+    title: str = Field(..., description="The title of the course", example="Introduction to FastAPI")
+    description: str = Field(..., description="The description of the course")
+    average_rating: float = Field(..., description="The plain average of the ratings", example=4.6)
+    review_count: int = Field(..., description="The number of reviews", example=128)
+    score: float = Field(..., description="The Bayesian weighted rating used for the ranking", example=4.52)
@@ -0,0 +1,33 @@
+from pydantic import BaseModel, Field
+from typing import Literal, Optional
+
+class CatalogChange(BaseModel):
+    """
+    Schema for a single change in the catalog change feed.
+
+    Attributes:
+        entity (str): The kind of row that changed ('course' or 'lesson').
+        op (str): 'upsert' when the row was created or updated, 'delete' when it was removed.
+        id (int): The ID of the changed row.
+        seq (int): The position of the change in the feed.
+        data (dict | None): The current state of the row for upserts, None for deletes.
+    """
+    entity: Literal["course", "lesson"] = Field(..., description="The kind of row that changed.", example="course")
+    op: Literal["upsert", "delete"] = Field(..., description="Whether the row was created/updated or deleted.", example="upsert")
+    id: int = Field(..., description="The ID of the changed row.", example=1)
+    seq: int = Field(..., description="The position of the change in the feed.", example=1042)
+    data: Optional[dict] = Field(None, description="The current state of the row, for upserts.")
+
+
+class ChangesResponse(BaseModel):
+    """
+    Schema for a page of the catalog change feed.
+
+    Attributes:
+        changes (list[CatalogChange]): The changes, in feed order.
+        next_token (str): The token to send as `since` to fetch the following changes.
+        has_more (bool): Whether more changes are available right away.
+    """
+    changes: list[CatalogChange] = Field(..., description="The changes, in feed order.")
+    next_token: str = Field(..., description="Token to pass as `since` on the next call.", example="48213:1042")
+    has_more: bool = Field(..., description="Whether another page is immediately available.")
@@ -33,17 +33,21 @@ class UserCreate(UserBase):
     password: str = Field(..., min_length=6, description="The password for the new user. Minimum length of 6 characters.")
 
 
-class UserResponse(UserBase):
+class UserResponse(BaseModel):
     """
     Schema for the user response.
 
     This schema is used to return user information in the API response.
-    It includes the user ID along with the basic user details.
+    It includes the user ID along with the basic user details, and never the password.
 
     Attributes:
         id (int): The unique identifier of the user.
+        username (str): The unique username of the user.
+        email (EmailStr): The email address of the user.
     """
     id: int = Field(..., description="The unique identifier of the user.")
+    username: str = Field(..., description="The unique username of the user.")
+    email: EmailStr = Field(..., description="The email address of the user.")
 
     class Config:
         """
@@ -53,3 +57,15 @@ class UserResponse(UserBase):
         """
         orm_mode = True  # Required for Pydantic to work with ORM models
         from_attributes = True  # Improved compatibility with SQLAlchemy models
+
+
+class UserBatchResponse(BaseModel):
+    """
+    Schema for the response of a batch user lookup.
+
+    Attributes:
+        items (list[UserResponse]): The users found, in the order they were requested.
+        missing (list[int]): The requested ids that do not match any user.
+    """
+    items: list[UserResponse] = Field(..., description="The users found, in request order.")
+    missing: list[int] = Field(default_factory=list, description="Requested ids that were not found.")
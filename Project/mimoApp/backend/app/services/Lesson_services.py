@@ -3,14 +3,32 @@ from repositories.Lesson_repo import (
     create_lesson, 
     get_all_lessons, 
     get_lesson_by_id, 
-    get_lesson_by_title,
+    get_lesson_by_title as find_lesson_by_title,
     update_lesson, 
     delete_lesson,
-    get_lessons_by_course_id
+    get_lessons_by_course_id,
+    get_lessons_by_ids,
+    get_lesson_outline,
+    set_lesson_ranks,
+    get_courses_with_long_ranks
 )
-from schemas.Lesson import LessonCreate, LessonUpdate
+from repositories.course_repo import get_course_by_id, lock_course
+from schemas.Lesson import LessonCreate, LessonUpdate, LessonMove
 from models.Lesson import Lesson
-from fastapi import HTTPException
+from fastapi import HTTPException, status
+from core.batch import check_batch_size, order_by_ids
+from core.config import settings
+from core.ranking import rank_between, spaced_ranks
+from services.render_service import prerender_lesson
+from services.catalog_service import schedule_catalog_snapshot
+from core.metrics import register_metrics
+from core.singleflight import SingleFlight
+from db.shared_rows import row_values, adopt_row
+
+# Concurrent reads of the same course's lessons (outline or full rows) share one in-flight query
+lesson_flight = SingleFlight("lessons")
+register_metrics("singleflight.lessons", lesson_flight.stats)
+
 
 def add_lesson(db: Session, lesson: LessonCreate):
     """
@@ -25,8 +43,17 @@ def add_lesson(db: Session, lesson: LessonCreate):
 
     Returns:
         Lesson: The newly created lesson object.
+
+    Raises:
+        HTTPException (404): If the course does not exist.
     """
-    return create_lesson(db, lesson)
+    try:
+        db_lesson = create_lesson(db, lesson)
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Course not found")
+    prerender_lesson(db, db_lesson)  # Render once now rather than on every view
+    schedule_catalog_snapshot(db)
+    return db_lesson
 
 def list_lessons(db: Session):
     """
@@ -73,7 +100,12 @@ def get_lessons_by_course(db: Session, course_id: int):
     Returns:
         List[Lesson]: A list of lesson objects for the specified course.
     """
-    return get_lessons_by_course_id(db, course_id)
+    # Concurrent callers share the values read by one of them, each gets its own instances
+    rows = lesson_flight.do(
+        ("course_lessons", course_id),
+        lambda: [row_values(lesson) for lesson in get_lessons_by_course_id(db, course_id)],
+    )
+    return [adopt_row(db, Lesson, values) for values in rows]
 
 def update_lesson_details(db: Session, lesson_id: int, lesson: LessonUpdate):
     """
@@ -89,8 +121,18 @@ def update_lesson_details(db: Session, lesson_id: int, lesson: LessonUpdate):
 
     Returns:
         Lesson: The updated lesson object, or None if not found.
+
+    Raises:
+        HTTPException (404): If the lesson moves to a course that does not exist.
     """
-    return update_lesson(db, lesson_id, lesson)
+    try:
+        db_lesson = update_lesson(db, lesson_id, lesson)
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Course not found")
+    if db_lesson is not None:
+        prerender_lesson(db, db_lesson)
+        schedule_catalog_snapshot(db)
+    return db_lesson
 
 def remove_lesson(db: Session, lesson_id: int):
     """
@@ -104,9 +146,12 @@ def remove_lesson(db: Session, lesson_id: int):
         lesson_id (int): The ID of the lesson to delete.
 
     Returns:
-        dict: A message indicating whether the lesson was deleted or not found.
+        bool: True if the lesson was deleted, False if not found.
     """
-    return delete_lesson(db, lesson_id)
+    deleted = delete_lesson(db, lesson_id)
+    if deleted:
+        schedule_catalog_snapshot(db)
+    return deleted
 
 def get_lesson_by_title(db: Session, title: str):
     """
@@ -122,7 +167,7 @@ def get_lesson_by_title(db: Session, title: str):
     Returns:
         Lesson: The lesson object corresponding to the given title, or None if not found.
     """
-    return get_lesson_by_title(db, title)
+    return find_lesson_by_title(db, title)
 
 def list_lesson(db:Session):
     """
@@ -137,4 +182,127 @@ def list_lesson(db:Session):
     Returns:
         List[Lesson]: A list of all lesson objects.
     """
-    return get_all_lessons(db)
\ No newline at end of file
+    return get_all_lessons(db)
+
+def get_lessons_batch(db: Session, lesson_ids: list[int]):
+    """
+    Service function to get several lessons by their IDs.
+
+    This function validates the batch size and resolves all the ids with a single
+    repository query, returning the lessons in the order they were requested.
+
+    Args:
+        db (Session): The database session for database operations.
+        lesson_ids (list[int]): The IDs of the lessons to retrieve.
+
+    Returns:
+        dict: The found lessons under `items` and the unknown ids under `missing`.
+    """
+    lesson_ids = check_batch_size(lesson_ids)
+    return order_by_ids(get_lessons_by_ids(db, lesson_ids), lesson_ids)
+
+def list_lesson_outline(db: Session, course_id: int):
+    """
+    Service function to get the ordered outline of a course.
+
+    Args:
+        db (Session): The database session for database operations.
+        course_id (int): The ID of the course.
+
+    Returns:
+        List[tuple]: `(id, title, rank)` rows, in course order.
+
+    Raises:
+        HTTPException (404): If the course does not exist.
+    """
+    def read_outline():
+        if get_course_by_id(db, course_id) is None:
+            return None
+        return get_lesson_outline(db, course_id)  # Rows are plain immutable values, safe to share
+
+    # Concurrent callers share the rows read by one of them
+    outline = lesson_flight.do(("course_outline", course_id), read_outline)
+    if outline is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Course not found")
+    return outline
+
+def reorder_lessons(db: Session, course_id: int, moves: list[LessonMove]):
+    """
+    Service function to move several lessons of a course at once.
+
+    Moves are applied in order on the current outline; each moved lesson gets a rank key
+    between its new neighbours, so no other lesson is renumbered. All the new keys are
+    written with a single `UPDATE`. The course row is locked meanwhile, so concurrent
+    reorders of the same course are serialized.
+
+    Args:
+        db (Session): The database session for database operations.
+        course_id (int): The ID of the course.
+        moves (list[LessonMove]): The moves to apply.
+
+    Returns:
+        List[tuple]: The new outline, as `(id, title, rank)` rows in course order.
+
+    Raises:
+        HTTPException (404): If the course does not exist.
+        HTTPException (400): If there are more than `MAX_BATCH_SIZE` moves or a move refers
+            to a lesson that is not in the course.
+    """
+    if len(moves) > settings.MAX_BATCH_SIZE:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {settings.MAX_BATCH_SIZE} moves are allowed per request",
+        )
+    if not lock_course(db, course_id):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Course not found")
+
+    outline = get_lesson_outline(db, course_id)
+    order = [lesson_id for lesson_id, _, _ in outline]
+    ranks = {lesson_id: rank for lesson_id, _, rank in outline}
+    changed = {}
+    for move in moves:
+        if move.lesson_id not in ranks or (move.after_id is not None and move.after_id not in ranks):
+            db.rollback()
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Moves must refer to lessons of this course")
+        if move.after_id == move.lesson_id:
+            db.rollback()
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="A lesson cannot follow itself")
+
+        order.remove(move.lesson_id)
+        position = 0 if move.after_id is None else order.index(move.after_id) + 1
+        order.insert(position, move.lesson_id)
+        before = ranks[order[position - 1]] if position > 0 else None
+        after = ranks[order[position + 1]] if position + 1 < len(order) else None
+        try:
+            ranks[move.lesson_id] = changed[move.lesson_id] = rank_between(before, after)
+        except ValueError:
+            # Two neighbours share a key (concurrent appends): respace the whole course
+            ranks = dict(zip(order, spaced_ranks(len(order))))
+            changed = dict(ranks)
+
+    set_lesson_ranks(db, course_id, changed)
+    db.commit()
+    schedule_catalog_snapshot(db)
+    return get_lesson_outline(db, course_id)
+
+def rebalance_lesson_ranks(db: Session, max_length: int | None = None):
+    """
+    Rewrites the rank keys of the courses whose keys grew too long with short, evenly spaced ones.
+
+    Keys get longer when many lessons are inserted at the same spot; rebalancing keeps
+    them (and the index) compact. Each course is handled in its own short transaction.
+
+    Args:
+        db (Session): The database session for database operations.
+        max_length (int | None): The longest acceptable key (defaults to `LESSON_RANK_MAX_LENGTH`).
+
+    Returns:
+        int: The number of courses rebalanced.
+    """
+    course_ids = get_courses_with_long_ranks(db, max_length or settings.LESSON_RANK_MAX_LENGTH)
+    for course_id in course_ids:
+        if lock_course(db, course_id):
+            order = [lesson_id for lesson_id, _, _ in get_lesson_outline(db, course_id)]
+            set_lesson_ranks(db, course_id, dict(zip(order, spaced_ranks(len(order)))))
+        db.commit()
+    return len(course_ids)
@@ -0,0 +1,192 @@
+"""
+Lesson assets: images, audio and downloadable files attached to lessons.
+
+Uploads are streamed to disk and deduplicated by SHA-256 (`core.storage.BlobStore`), so
+file contents never go through JSON or database columns. Since a blob never changes,
+downloads are served as files, with range requests and immutable cache headers.
+
+Blobs no lesson refers to anymore (replaced or detached files, purged lessons) are
+deleted by the `assets.collect_orphans` job, or from the command line:
+
+    python -m services.asset_service
+"""
+import argparse
+import os
+import re
+import time
+from datetime import datetime, timedelta, timezone
+from typing import AsyncIterator
+from fastapi import HTTPException, status
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from db.database import db_instance
+from repositories.Lesson_repo import get_lesson_by_id
+from repositories.asset_repo import attach_asset, get_lesson_assets, get_asset, detach_asset, delete_orphan_assets, get_known_assets
+from core.config import settings
+from core.profiler import attribute_thread
+from core.storage import BlobStore, BlobTooLarge
+
+blob_store = BlobStore(settings.ASSET_ROOT, settings.ASSET_MAX_BYTES)
+
+# A plain file name: no path separators, no leading dot
+_FILENAME = re.compile(r"^[\w][\w .()-]{0,254}$")
+
+# Media types a browser may display in the page of the API. Anything else (HTML, SVG,
+# scripts...) could run in its origin, so it is always downloaded as an attachment
+INLINE_MEDIA_TYPES = frozenset({
+    "image/png", "image/jpeg", "image/gif", "image/webp", "image/avif",
+    "video/mp4", "video/webm", "video/ogg",
+    "audio/mpeg", "audio/ogg", "audio/wav", "audio/webm", "audio/mp4",
+})
+
+def is_inline_media_type(content_type: str | None) -> bool:
+    """
+    Tells whether content of this media type may be displayed inline.
+
+    Args:
+        content_type (str | None): The media type stored with the blob, parameters included.
+
+    Returns:
+        bool: True for the images, videos and audio of `INLINE_MEDIA_TYPES`.
+    """
+    return bool(content_type) and content_type.split(";")[0].strip().lower() in INLINE_MEDIA_TYPES
+
+def _asset_view(link, asset):
+    return {
+        "filename": link.filename,
+        "sha256": asset.sha256,
+        "size": asset.size,
+        "content_type": asset.content_type,
+        "url": f"/assets/{asset.sha256}",
+    }
+
+async def upload_lesson_asset(db: Session, lesson_id: int, filename: str, content_type: str | None, chunks: AsyncIterator[bytes]):
+    """
+    Service function streaming a file to the blob store and attaching it to a lesson.
+
+    Args:
+        db (Session): The database session for database operations.
+        lesson_id (int): The ID of the lesson.
+        filename (str): The name of the file within the lesson; replaces a file with the same name.
+        content_type (str | None): The media type sent by the client.
+        chunks (AsyncIterator[bytes]): The request body.
+
+    Returns:
+        dict: The attached file.
+
+    Raises:
+        HTTPException (400): If the file name is invalid.
+        HTTPException (404): If the lesson does not exist.
+        HTTPException (413): If the file exceeds `ASSET_MAX_BYTES`.
+    """
+    if not _FILENAME.match(filename):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid file name")
+    if await run_in_threadpool(attribute_thread(get_lesson_by_id), db, lesson_id) is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Lesson not found")
+    await run_in_threadpool(attribute_thread(db.rollback))  # Hand the connection back to the pool while the body streams
+    try:
+        sha256, size = await blob_store.write(chunks)
+    except BlobTooLarge as exc:
+        raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=str(exc))
+    link, asset = await run_in_threadpool(
+        attribute_thread(attach_asset), db, lesson_id, filename, sha256, size, content_type or "application/octet-stream"
+    )
+    return _asset_view(link, asset)
+
+def list_lesson_assets(db: Session, lesson_id: int):
+    """
+    Service function listing the files attached to a lesson.
+
+    Raises:
+        HTTPException (404): If the lesson does not exist.
+    """
+    if get_lesson_by_id(db, lesson_id) is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Lesson not found")
+    return [_asset_view(link, asset) for link, asset in get_lesson_assets(db, lesson_id)]
+
+def remove_lesson_asset(db: Session, lesson_id: int, filename: str):
+    """
+    Service function detaching a file from a lesson.
+
+    Raises:
+        HTTPException (404): If the lesson has no such file.
+    """
+    if not detach_asset(db, lesson_id, filename):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="File not found")
+
+def get_asset_file(db: Session, sha256: str):
+    """
+    Service function resolving a blob to its file on disk.
+
+    Returns:
+        tuple: `(path, Asset)`.
+
+    Raises:
+        HTTPException (404): If the blob is unknown, or its file is missing from disk.
+    """
+    asset = get_asset(db, sha256) if blob_store.is_valid_key(sha256) else None
+    path = blob_store.path_for(sha256) if asset is not None else None
+    if path is None or not os.path.isfile(path):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Asset not found")
+    return path, asset
+
+def collect_orphan_assets(db: Session, grace_seconds: int | None = None, batch_size: int | None = None):
+    """
+    Deletes the blobs no lesson refers to anymore.
+
+    Only blobs not uploaded within the grace period are considered, so a file being
+    uploaded right now (stored but not attached yet) is never collected. Three passes:
+    unreferenced blob rows and their files, files without a row (e.g. an upload that
+    failed after storing its content) and leftovers of interrupted uploads.
+
+    Args:
+        db (Session): The database session for database operations.
+        grace_seconds (int | None): Defaults to `ASSET_GC_GRACE_SECONDS`.
+        batch_size (int | None): Defaults to `PURGE_BATCH_SIZE`.
+
+    Returns:
+        dict: The number of rows and files deleted.
+    """
+    grace_seconds = settings.ASSET_GC_GRACE_SECONDS if grace_seconds is None else grace_seconds
+    batch_size = batch_size or settings.PURGE_BATCH_SIZE
+    cutoff = time.time() - grace_seconds
+    counts = {"rows": 0, "files": 0, "tmp": 0}
+
+    uploaded_before = datetime.now(timezone.utc) - timedelta(seconds=grace_seconds)
+    while True:
+        deleted = delete_orphan_assets(db, uploaded_before, batch_size)
+        counts["rows"] += len(deleted)
+        counts["files"] += sum(blob_store.delete(sha256, cutoff) for sha256 in deleted)
+        if len(deleted) < batch_size:
+            break
+
+    batch = []
+    for sha256 in blob_store.iter_blobs(cutoff):
+        batch.append(sha256)
+        if len(batch) == batch_size:
+            counts["files"] += _delete_unknown(db, batch, cutoff)
+            batch = []
+    if batch:
+        counts["files"] += _delete_unknown(db, batch, cutoff)
+
+    counts["tmp"] = blob_store.purge_tmp(cutoff)
+    return counts
+
+def _delete_unknown(db: Session, hashes: list[str], cutoff: float):
+    known = get_known_assets(db, hashes)
+    return sum(blob_store.delete(sha256, cutoff) for sha256 in hashes if sha256 not in known)
+
+def main():
+    parser = argparse.ArgumentParser(description="Delete the lesson assets no lesson refers to.")
+    parser.add_argument("--grace-seconds", type=int, help=f"default: {settings.ASSET_GC_GRACE_SECONDS}")
+    parser.add_argument("--batch-size", type=int, help=f"default: {settings.PURGE_BATCH_SIZE}")
+    args = parser.parse_args()
+
+    db = db_instance.SessionLocal()
+    try:
+        print(collect_orphan_assets(db, args.grace_seconds, args.batch_size))
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
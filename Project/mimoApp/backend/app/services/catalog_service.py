@@ -0,0 +1,111 @@
+"""
+Public course catalog: every live course with the titles of its lessons, in course order.
+
+The catalog is read on every visit but changes rarely, so it is published as a static
+JSON document (`core.snapshot.SnapshotStore`), precompressed once, and `GET /courses/`
+serves the bytes straight from a memory map without touching the database. Course and
+lesson writes schedule the `catalog.snapshot` job a few seconds later
+(`CATALOG_SNAPSHOT_DEBOUNCE_SECONDS`), so a burst of edits produces a single rebuild.
+Until a snapshot exists, while a rebuild is pending (the snapshot may predate the
+latest writes) and after a rebuild failed for good, until one succeeds, the endpoint
+falls back to `list_catalog`: readers never see a catalog older than the last
+committed write.
+
+The snapshot can also be rebuilt from the command line:
+
+    python -m services.catalog_service
+"""
+import json
+from itertools import groupby
+from sqlalchemy.orm import Session
+from db.database import db_instance
+from repositories.course_repo import get_all_courses
+from repositories.Lesson_repo import get_catalog_lessons
+from repositories.job_repo import enqueue_job, has_pending_job, has_failed_since_success
+from core.config import settings
+from core.snapshot import SnapshotStore
+
+catalog_store = SnapshotStore(settings.CATALOG_SNAPSHOT_DIR, "catalog")
+
+def list_catalog(db: Session):
+    """
+    Service function building the catalog from live queries (two statements).
+
+    Args:
+        db (Session): The database session for database operations.
+
+    Returns:
+        list[dict]: The courses by ID, each with its `lessons` (`id` and `title`) in course order.
+    """
+    lessons = {
+        course_id: [{"id": lesson_id, "title": title} for _, lesson_id, title in rows]
+        for course_id, rows in groupby(get_catalog_lessons(db), key=lambda row: row[0])
+    }
+    return [
+        {
+            "id": course.id,
+            "title": course.title,
+            "description": course.description,
+            "category_id": course.category_id,
+            "lessons": lessons.get(course.id, []),
+        }
+        for course in sorted(get_all_courses(db), key=lambda course: course.id)
+    ]
+
+def current_catalog_snapshot(db: Session):
+    """
+    Service function returning the snapshot to serve, if it is up to date.
+
+    A `catalog.snapshot` job that is queued or running means the catalog changed since
+    the current snapshot was built (or is being rebuilt right now), so it is not served.
+    Neither is it after a rebuild exhausted its attempts: the change it was scheduled
+    for is missing from the snapshot until a later rebuild succeeds.
+
+    Args:
+        db (Session): The database session for database operations.
+
+    Returns:
+        Snapshot | None: The current snapshot, or None if there is none or a rebuild is pending.
+    """
+    snapshot = catalog_store.current()
+    if snapshot is None or has_pending_job(db, "catalog.snapshot") or has_failed_since_success(db, "catalog.snapshot"):
+        return None
+    return snapshot
+
+def build_catalog_snapshot(db: Session):
+    """
+    Service function publishing the current catalog as a new snapshot version.
+
+    The version is the hash of the document, so an unchanged catalog writes nothing.
+
+    Args:
+        db (Session): The database session for database operations.
+
+    Returns:
+        dict: The published `version` and its uncompressed size in `bytes`.
+    """
+    body = json.dumps(list_catalog(db), ensure_ascii=False, separators=(",", ":")).encode()
+    return {"version": catalog_store.publish(body, settings.CATALOG_SNAPSHOT_KEEP), "bytes": len(body)}
+
+def schedule_catalog_snapshot(db: Session):
+    """
+    Service function asking for a rebuild after the catalog changed.
+
+    Writes that happen before the scheduled rebuild starts share it. A rebuild that is
+    already running may have read the catalog before this change, so it does not count.
+
+    Args:
+        db (Session): The database session for database operations.
+    """
+    if not has_pending_job(db, "catalog.snapshot", include_running=False):
+        enqueue_job(db, "catalog.snapshot", {}, delay_seconds=settings.CATALOG_SNAPSHOT_DEBOUNCE_SECONDS)
+
+def main():
+    db = db_instance.SessionLocal()
+    try:
+        print(build_catalog_snapshot(db))
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
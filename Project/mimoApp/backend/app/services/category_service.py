@@ -0,0 +1,94 @@
+from collections import defaultdict
+from fastapi import HTTPException, status
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from repositories.category_repo import (
+    create_category,
+    get_category_by_id,
+    get_all_categories,
+    get_courses_in_category,
+)
+from schemas.category import CategoryCreate
+
+def add_category(db: Session, category: CategoryCreate):
+    """
+    Service function to add a new course category.
+
+    Raises:
+        HTTPException (404): If the parent category does not exist.
+        HTTPException (409): If a category with the same name already exists.
+    """
+    if category.parent_id is not None and get_category_by_id(db, category.parent_id) is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Parent category not found")
+    try:
+        db_category = create_category(db, category.name, category.parent_id)
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Category already exists")
+    return {
+        "id": db_category.id,
+        "name": db_category.name,
+        "parent_id": db_category.parent_id,
+        "course_count": db_category.course_count,
+        "total_course_count": db_category.course_count,
+    }
+
+def list_categories(db: Session):
+    """
+    Service function to list all categories with their course counts.
+
+    The direct counts are the cached counters; the totals of nested categories are
+    summed in memory, since the category tree is small.
+
+    Args:
+        db (Session): The database session for database operations.
+
+    Returns:
+        List[dict]: The categories with `course_count` and `total_course_count`.
+    """
+    categories = get_all_categories(db)
+    children = defaultdict(list)
+    for category in categories:
+        children[category.parent_id].append(category)
+
+    totals = {}
+    def total(category, seen=frozenset()):
+        if category.id not in totals:
+            # `seen` guards against a cycle introduced by hand in the database
+            totals[category.id] = category.course_count + sum(
+                total(child, seen | {category.id}) for child in children[category.id] if child.id not in seen
+            )
+        return totals[category.id]
+
+    return [
+        {
+            "id": category.id,
+            "name": category.name,
+            "parent_id": category.parent_id,
+            "course_count": category.course_count,
+            "total_course_count": total(category),
+        }
+        for category in categories
+    ]
+
+def list_category_courses(db: Session, category_id: int, after_id: int | None, limit: int):
+    """
+    Service function to get a page of the courses of a category.
+
+    Args:
+        db (Session): The database session for database operations.
+        category_id (int): The ID of the category.
+        after_id (int | None): The cursor returned with the previous page.
+        limit (int): The page size.
+
+    Returns:
+        dict: The courses under `items` and the cursor of the next page under `next_after_id`.
+
+    Raises:
+        HTTPException (404): If the category does not exist.
+    """
+    if get_category_by_id(db, category_id) is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Category not found")
+    courses = get_courses_in_category(db, category_id, after_id, limit)
+    next_after_id = courses[-1].id if len(courses) == limit else None
+    return {"items": courses, "next_after_id": next_after_id}
@@ -1,13 +1,30 @@
+from fastapi import HTTPException, status
 from sqlalchemy.orm import Session
+from repositories.category_repo import get_category_by_id
 from repositories.course_repo import (
     create_course, 
     get_all_courses, 
     get_course_by_id, 
     update_course, 
-    delete_course
+    delete_course,
+    get_courses_by_ids
 )
 from schemas.course import CourseCreate, CourseUpdate
 from models.course import Course
+from core.batch import check_batch_size, order_by_ids
+from core.metrics import register_metrics
+from core.singleflight import SingleFlight
+from db.shared_rows import row_values, adopt_row
+from services.catalog_service import schedule_catalog_snapshot
+
+# Concurrent reads of the same course share one in-flight query
+course_flight = SingleFlight("courses")
+register_metrics("singleflight.courses", course_flight.stats)
+
+
+def _check_category(db: Session, category_id: int | None):
+    if category_id is not None and get_category_by_id(db, category_id) is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Category not found")
 
 def add_course(db: Session, course: CourseCreate):
     """
@@ -22,8 +39,14 @@ def add_course(db: Session, course: CourseCreate):
 
     Returns:
         Course: The newly created course object.
+
+    Raises:
+        HTTPException (404): If the category does not exist.
     """
-    return create_course(db, course)
+    _check_category(db, course.category_id)
+    db_course = create_course(db, course)
+    schedule_catalog_snapshot(db)
+    return db_course
 
 def list_courses(db: Session):
     """
@@ -54,7 +77,9 @@ def get_course(db: Session, course_id: int):
     Returns:
         Course: The course object corresponding to the given ID, or None if not found.
     """
-    return get_course_by_id(db, course_id)
+    # Concurrent callers share the values read by one of them, each gets its own instance
+    values = course_flight.do(("course", course_id), lambda: row_values(get_course_by_id(db, course_id)))
+    return adopt_row(db, Course, values)
 
 def update_course_details(db: Session, course_id: int, course: CourseUpdate):
     """
@@ -70,8 +95,16 @@ def update_course_details(db: Session, course_id: int, course: CourseUpdate):
 
     Returns:
         Course: The updated course object, or None if not found.
+
+    Raises:
+        HTTPException (404): If the new category does not exist.
     """
-    return update_course(db, course_id, course)
+    if "category_id" in course.model_fields_set:
+        _check_category(db, course.category_id)
+    db_course = update_course(db, course_id, course)
+    if db_course is not None:
+        schedule_catalog_snapshot(db)
+    return db_course
 
 def remove_course(db: Session, course_id: int):
     """
@@ -87,7 +120,10 @@ def remove_course(db: Session, course_id: int):
     Returns:
         Course: The deleted course object, or None if not found.
     """
-    return delete_course(db, course_id)
+    deleted = delete_course(db, course_id)
+    if deleted:
+        schedule_catalog_snapshot(db)
+    return deleted
 
 def list_course(db: Session):
     """
@@ -103,3 +139,20 @@ def list_course(db: Session):
         List[Course]: A list of all course objects.
     """
     return get_all_courses(db)
+
+def get_courses_batch(db: Session, course_ids: list[int]):
+    """
+    Service function to get several courses by their IDs.
+
+    This function validates the batch size and resolves all the ids with a single
+    repository query, returning the courses in the order they were requested.
+
+    Args:
+        db (Session): The database session for database operations.
+        course_ids (list[int]): The IDs of the courses to retrieve.
+
+    Returns:
+        dict: The found courses under `items` and the unknown ids under `missing`.
+    """
+    course_ids = check_batch_size(course_ids)
+    return order_by_ids(get_courses_by_ids(db, course_ids), course_ids)
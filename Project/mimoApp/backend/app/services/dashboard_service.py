@@ -0,0 +1,92 @@
+import json
+from datetime import datetime, timedelta, timezone
+from fastapi import HTTPException, status
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+from db.database import pg_listener
+from db.dialect import dialect_name
+from repositories.dashboard_repo import get_dashboard_rows
+from core.cache import TTLCache
+from core.config import settings
+from core.metrics import register_metrics
+
+# Short lived per-user cache; entries are dropped as soon as the user's progress or enrollments change
+dashboard_cache = TTLCache("dashboard", settings.DASHBOARD_CACHE_SIZE, settings.DASHBOARD_CACHE_SECONDS)
+register_metrics("cache.dashboard", dashboard_cache.stats)
+
+def _on_invalidation_notify(payload: str):
+    dashboard_cache.invalidate(json.loads(payload)["user_id"])
+
+pg_listener.subscribe(settings.DASHBOARD_CHANNEL, _on_invalidation_notify)
+
+def _build_dashboard(rows):
+    first = rows[0]
+    return {
+        "user": {"id": first.user_id, "username": first.username, "email": first.email},
+        "courses": [
+            {
+                "id": row.course_id,
+                "title": row.course_title,
+                "description": row.course_description,
+                "completed": bool(row.completed),
+                "enrolled_at": row.enrolled_at,
+                "lesson_count": row.lesson_count,
+                "completed_lessons": row.completed_lessons,
+                "progress_percentage": round(float(row.progress_percentage), 2),
+                "next_lesson": (
+                    {"id": row.next_lesson_id, "title": row.next_lesson_title}
+                    if row.next_lesson_id is not None else None
+                ),
+            }
+            for row in rows
+            if row.course_id is not None
+        ],
+    }
+
+def get_dashboard(db: Session, user_id: int):
+    """
+    Service function to get the home screen data of a user.
+
+    Served from the per-worker cache when possible, otherwise computed with a single query.
+    The result is not cached if the user's dashboard was invalidated during that query.
+
+    Args:
+        db (Session): The database session for database operations.
+        user_id (int): The ID of the user.
+
+    Returns:
+        dict: The user and their enrolled courses with progress and next lesson.
+
+    Raises:
+        HTTPException (404): If the user does not exist.
+    """
+    dashboard = dashboard_cache.get(user_id)
+    if dashboard is not None:
+        return dashboard
+
+    generation = dashboard_cache.generation()
+    since = datetime.now(timezone.utc) - timedelta(days=settings.DASHBOARD_PROGRESS_DAYS)
+    rows = get_dashboard_rows(db, user_id, since)
+    if not rows:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+    dashboard = _build_dashboard(rows)
+    dashboard_cache.set(user_id, dashboard, generation)
+    return dashboard
+
+def invalidate_dashboard(db: Session, user_id: int):
+    """
+    Drops the cached dashboard of a user in every API worker.
+
+    Call it after committing a change to the user's progress or enrollments: the local
+    entry is dropped right away, the other workers are told through `DASHBOARD_CHANNEL`.
+
+    Args:
+        db (Session): The database session for database operations.
+        user_id (int): The ID of the user.
+    """
+    dashboard_cache.invalidate(user_id)
+    if dialect_name(db) == "postgresql":
+        # Sent on its own connection, so the caller's session (and its loaded objects) is untouched
+        with db.get_bind().connect() as connection:
+            connection.execute(select(func.pg_notify(settings.DASHBOARD_CHANNEL, json.dumps({"user_id": user_id}))))
+            connection.commit()
@@ -0,0 +1,32 @@
+from fastapi import HTTPException, status
+from sqlalchemy.orm import Session
+from repositories.course_repo import get_course_by_id
+from repositories.enrollment_repo import get_enrollment, create_enrollment, delete_enrollment
+from services.dashboard_service import invalidate_dashboard
+
+def enroll(db: Session, user_id: int, course_id: int):
+    """
+    Service function to enroll a user in a course. Enrolling twice is a no-op, also when
+    both requests run at the same time.
+
+    Raises:
+        HTTPException (404): If the course does not exist.
+    """
+    if get_course_by_id(db, course_id) is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Course not found")
+    enrollment = create_enrollment(db, user_id, course_id)
+    if enrollment is None:
+        return get_enrollment(db, user_id, course_id)
+    invalidate_dashboard(db, user_id)
+    return enrollment
+
+def unenroll(db: Session, user_id: int, course_id: int):
+    """
+    Service function to remove a user's enrollment in a course.
+
+    Raises:
+        HTTPException (404): If the user is not enrolled in the course.
+    """
+    if not delete_enrollment(db, user_id, course_id):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Enrollment not found")
+    invalidate_dashboard(db, user_id)
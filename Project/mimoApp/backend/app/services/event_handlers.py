@@ -0,0 +1,30 @@
+from sqlalchemy.orm import Session
+from repositories.enrollment_repo import get_enrolled_user_ids
+from repositories.course_repo import get_course_by_id
+from repositories.outbox_repo import USER_REGISTERED, LESSON_PUBLISHED, COURSE_COMPLETED
+from services.outbox_service import outbox_handler
+from services.notification_service import stage_notification
+
+@outbox_handler(USER_REGISTERED)
+def welcome_new_user(db: Session, payload: dict):
+    """
+    Sends the welcome notification to a user who just registered.
+    """
+    stage_notification(db, payload["user_id"], "Welcome to MimoApp!")
+
+@outbox_handler(LESSON_PUBLISHED)
+def announce_new_lesson(db: Session, payload: dict):
+    """
+    Notifies the learners enrolled in a course that a new lesson is available.
+    """
+    for user_id in get_enrolled_user_ids(db, payload["course_id"]):
+        stage_notification(db, user_id, f"New lesson available: {payload['title']}")
+
+@outbox_handler(COURSE_COMPLETED)
+def congratulate_course_completion(db: Session, payload: dict):
+    """
+    Congratulates a learner who completed every lesson of a course.
+    """
+    course = get_course_by_id(db, payload["course_id"])
+    if course is not None:  # Deleted since
+        stage_notification(db, payload["user_id"], f"Congratulations, you completed {course.title}!")
@@ -0,0 +1,263 @@
+"""
+Streaming bulk export of users, enrollments and lesson metadata.
+
+Rows are read through a server-side cursor (`yield_per`) and encoded chunk by chunk,
+so memory use does not depend on the size of the table. Only live rows are exported:
+soft deleted enrollments and lessons, and those of soft deleted courses, are left out. Supported formats are CSV,
+NDJSON and Parquet (one row group per chunk, requires `pyarrow`).
+
+Command line usage:
+
+    python -m services.export_service users --format csv --output users.csv
+    python -m services.export_service enrollments --format parquet --since 2026-01-01 --output enrollments.parquet
+"""
+import argparse
+import csv
+import io
+import json
+import sys
+from datetime import datetime
+from typing import Iterator
+from fastapi import HTTPException, status
+from sqlalchemy import select, types
+from db.database import db_instance
+from models.user import User
+from models.course import Course
+from models.user_course import UserCourse
+from models.Lesson import Lesson
+
+# Courses that are not soft deleted, for the datasets of rows belonging to a course
+_LIVE_COURSES = select(Course.id).where(Course.deleted_at.is_(None))
+
+# Exportable datasets: the allowed columns (never secrets such as password hashes), the
+# timestamp used by the `since` filter for incremental extracts and the live-row filter
+DATASETS = {
+    "users": {
+        "columns": {
+            "id": User.id,
+            "username": User.username,
+            "email": User.email,
+            "is_admin": User.is_admin,
+            "created_at": User.created_at,
+        },
+        "since": User.created_at,
+        "order": User.id,
+        "where": [],
+    },
+    "enrollments": {
+        "columns": {
+            "id": UserCourse.id,
+            "user_id": UserCourse.user_id,
+            "course_id": UserCourse.course_id,
+            "completed": UserCourse.completed,
+            "enrolled_at": UserCourse.enrolled_at,
+        },
+        "since": UserCourse.enrolled_at,
+        "order": UserCourse.id,
+        "where": [UserCourse.deleted_at.is_(None), UserCourse.course_id.in_(_LIVE_COURSES)],
+    },
+    "lessons": {
+        "columns": {
+            "id": Lesson.id,
+            "title": Lesson.title,
+            "course_id": Lesson.course_id,
+            "updated_at": Lesson.updated_at,
+        },
+        "since": Lesson.updated_at,
+        "order": Lesson.id,
+        "where": [Lesson.deleted_at.is_(None), Lesson.course_id.in_(_LIVE_COURSES)],
+    },
+}
+
+FORMATS = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+CHUNK_SIZE = 5000  # Rows fetched from the cursor and encoded per chunk
+
+def resolve_export(dataset: str, export_format: str, columns: list[str] | None):
+    """
+    Validates an export request.
+
+    Args:
+        dataset (str): One of `DATASETS`.
+        export_format (str): One of `FORMATS`.
+        columns (list[str] | None): The columns to export, or None for all of them.
+
+    Returns:
+        list[str]: The columns to export, in order.
+
+    Raises:
+        HTTPException (400): If the dataset, the format or a column is unknown.
+        HTTPException (501): If Parquet is requested but `pyarrow` is not installed.
+    """
+    if dataset not in DATASETS:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Unknown dataset '{dataset}'")
+    if export_format not in FORMATS:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Unknown format '{export_format}'")
+    if export_format == "parquet":
+        # Checked up front: once streaming has started the status code can no longer change
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            raise HTTPException(status_code=status.HTTP_501_NOT_IMPLEMENTED, detail="Parquet export requires pyarrow")
+    available = DATASETS[dataset]["columns"]
+    columns = columns or list(available)
+    unknown = [column for column in columns if column not in available]
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown columns for {dataset}: {', '.join(unknown)}",
+        )
+    return columns
+
+def _iter_chunks(dataset: str, columns: list[str], since: datetime | None) -> Iterator[list]:
+    """
+    Yields the rows of a dataset in chunks of `CHUNK_SIZE`, read with a server-side cursor.
+
+    The session is owned by the generator because a streaming response keeps reading
+    after the request handler (and its session dependency) has returned.
+    """
+    spec = DATASETS[dataset]
+    statement = select(*(spec["columns"][column] for column in columns)).where(*spec["where"]).order_by(spec["order"])
+    if since is not None:
+        statement = statement.where(spec["since"] >= since)
+
+    db = db_instance.SessionLocal()
+    try:
+        result = db.execute(statement.execution_options(yield_per=CHUNK_SIZE))
+        for partition in result.partitions():
+            yield partition
+    finally:
+        db.close()
+
+def _encode_value(value):
+    return value.isoformat() if isinstance(value, datetime) else value
+
+def _stream_csv(chunks, columns) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    for chunk in chunks:
+        writer.writerows([[_encode_value(value) for value in row] for row in chunk])
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+def _stream_ndjson(chunks, columns) -> Iterator[bytes]:
+    for chunk in chunks:
+        yield "".join(
+            json.dumps({column: _encode_value(value) for column, value in zip(columns, row)}) + "\n"
+            for row in chunk
+        ).encode()
+
+class _DrainableSink(io.RawIOBase):
+    """
+    Write-only file object whose content is handed out (and forgotten) after each row group.
+    """
+
+    def __init__(self):
+        self._parts = []
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._parts.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        data, self._parts = b"".join(self._parts), []
+        return data
+
+def _arrow_type(pa, column_type):
+    if isinstance(column_type, types.Boolean):
+        return pa.bool_()
+    if isinstance(column_type, types.Integer):  # BigInteger and SmallInteger included
+        return pa.int64()
+    if isinstance(column_type, types.Float):
+        return pa.float64()
+    if isinstance(column_type, types.DateTime):
+        return pa.timestamp("us", tz="UTC" if column_type.timezone else None)
+    return pa.string()
+
+def arrow_schema(dataset: str, columns: list[str]):
+    """
+    Builds the Parquet schema of an export from the model columns.
+
+    Every row group is written with this schema: inferring it from the first chunk would
+    type a column that is NULL throughout that chunk as `null` and reject the next one.
+
+    Args:
+        dataset (str): One of `DATASETS`.
+        columns (list[str]): The exported columns, in order.
+
+    Returns:
+        pyarrow.Schema: One nullable field per column.
+    """
+    import pyarrow as pa
+
+    available = DATASETS[dataset]["columns"]
+    return pa.schema([pa.field(column, _arrow_type(pa, available[column].type)) for column in columns])
+
+def _stream_parquet(chunks, schema) -> Iterator[bytes]:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    sink = _DrainableSink()
+    writer = pq.ParquetWriter(sink, schema, compression="snappy")
+    try:
+        for chunk in chunks:
+            batch = pa.RecordBatch.from_pydict(
+                {field.name: [row[i] for row in chunk] for i, field in enumerate(schema)}, schema=schema
+            )
+            writer.write_batch(batch)  # One row group per chunk
+            yield sink.drain()
+    finally:
+        writer.close()  # Writes the footer, also for an empty export
+    yield sink.drain()
+
+def stream_export(dataset: str, export_format: str, columns: list[str], since: datetime | None = None) -> Iterator[bytes]:
+    """
+    Streams a dataset in the requested format with constant memory.
+
+    Args:
+        dataset (str): One of `DATASETS` (already validated with `resolve_export`).
+        export_format (str): One of `FORMATS`.
+        columns (list[str]): The columns to export.
+        since (datetime | None): Only export rows created/updated at or after this time.
+
+    Returns:
+        Iterator[bytes]: The encoded file, chunk by chunk.
+    """
+    chunks = _iter_chunks(dataset, columns, since)
+    if export_format == "csv":
+        return _stream_csv(chunks, columns)
+    if export_format == "ndjson":
+        return _stream_ndjson(chunks, columns)
+    return _stream_parquet(chunks, arrow_schema(dataset, columns))
+
+def main():
+    parser = argparse.ArgumentParser(description="Export users, enrollments or lessons.")
+    parser.add_argument("dataset", choices=sorted(DATASETS))
+    parser.add_argument("--format", dest="export_format", choices=sorted(FORMATS), default="csv")
+    parser.add_argument("--columns", help="comma separated list of columns (default: all)")
+    parser.add_argument("--since", type=datetime.fromisoformat, help="ISO date/time for incremental extracts")
+    parser.add_argument("--output", help="output file (default: standard output)")
+    args = parser.parse_args()
+
+    columns = resolve_export(args.dataset, args.export_format, args.columns.split(",") if args.columns else None)
+    output = open(args.output, "wb") if args.output else sys.stdout.buffer
+    try:
+        for data in stream_export(args.dataset, args.export_format, columns, args.since):
+            output.write(data)
+    finally:
+        if args.output:
+            output.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,452 @@
+"""
+Index advisor: proposes indexes from the observed query workload.
+
+The workload is either captured by the application itself (`INDEX_ADVISOR_CAPTURE`,
+see `core.workload`) or read from `pg_stat_statements`. Each normalized statement is
+scanned for the columns it filters, ranges over and sorts by, per table, and the
+resulting candidate indexes are checked against the indexes declared on the models
+(primary keys, unique constraints and `Index` objects, partial ones only when the
+query carries their predicate).
+
+When the `hypopg` extension is installed, candidates are costed with hypothetical
+indexes: each statement is explained (generic plan, PostgreSQL 16+) with and without
+the index, and only the candidates that lower the cost by `INDEX_ADVISOR_MIN_IMPROVEMENT`
+are kept. Without it, only the candidates for which no index is usable at all are
+proposed, ranked by the time spent in the statements they would serve.
+
+`LIKE` / `ILIKE` filters are not index candidates: with a bound pattern, a B-tree index
+is only usable for a constant prefix under the `C` collation, and a trigram index
+(`gin_trgm_ops`) cannot be costed with hypothetical indexes, so such indexes are left
+to a deliberate migration.
+
+Proposals come with their `CREATE INDEX CONCURRENTLY` statement and can be rendered as
+an Alembic migration.
+
+Command line usage (reads pg_stat_statements):
+
+    python -m services.index_advisor
+    python -m services.index_advisor --migration migrations/versions/add_indexes.py --down-revision 1a2b3c4d
+"""
+import argparse
+import json
+import re
+import uuid
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from fastapi import HTTPException, status
+from sqlalchemy import Column, UniqueConstraint, text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session
+from db.database import Base
+from db.dialect import dialect_name
+from core.config import settings
+from core.metrics import register_metrics
+from core.workload import QueryWorkload, normalize_statement
+
+# Statements captured by this process when `INDEX_ADVISOR_CAPTURE` is enabled (see main)
+query_workload = QueryWorkload(settings.INDEX_ADVISOR_MAX_FINGERPRINTS)
+register_metrics("index_advisor.workload", query_workload.stats)
+
+SOURCES = ("app", "pg_stat_statements")
+
+_KEYWORDS = (
+    "ON|WHERE|JOIN|LEFT|RIGHT|INNER|OUTER|FULL|CROSS|GROUP|ORDER|LIMIT|OFFSET|SET|USING|FOR|"
+    "RETURNING|VALUES|UNION|HAVING|WINDOW|AS|DEFAULT|SELECT"
+)
+_TABLE_REF = re.compile(
+    rf'\b(?:FROM|JOIN|UPDATE|INTO)\s+"?(\w+)"?(?:\s+AS\s+"?(\w+)"?|\s+(?!(?:{_KEYWORDS})\b)(\w+))?',
+    re.IGNORECASE,
+)
+_COLUMN = r'(lower\()?"?(\w+)"?\."?(\w+)"?\)?'
+_EQUALITY = re.compile(rf"{_COLUMN}\s*(?:=|\bIN\s*\()\s*(?:lower\()?\?", re.IGNORECASE)
+_RANGE = re.compile(rf"{_COLUMN}\s*(?:<=|>=|<|>|\bBETWEEN\b)\s*(?:lower\()?\?", re.IGNORECASE)
+_IS_NULL = re.compile(r'"?(\w+)"?\."?(\w+)"?\s+IS\s+(NOT\s+)?NULL', re.IGNORECASE)
+_JOIN = re.compile(r'"?(\w+)"?\."?(\w+)"?\s*=\s*"?(\w+)"?\."?(\w+)"?')
+_ORDER_BY = re.compile(r"\bORDER BY\s+(.+?)(?:\bLIMIT\b|\bOFFSET\b|\bFOR\b|\)|$)", re.IGNORECASE)
+
+
+@dataclass
+class DeclaredIndex:
+    name: str
+    columns: tuple
+    where: str | None = None
+
+
+@dataclass
+class Candidate:
+    table: str
+    columns: tuple
+    where: str | None
+    queries: list = field(default_factory=list)
+    usable: int = 0  # Leading columns already served by a declared index
+
+    @property
+    def calls(self):
+        return sum(query["calls"] for query in self.queries)
+
+    @property
+    def total_ms(self):
+        return sum(query["total_ms"] for query in self.queries)
+
+
+def _expression_sql(expression) -> str:
+    if isinstance(expression, Column):
+        return expression.name
+    sql = str(expression.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+    return re.sub(r"\b\w+\.", "", sql)  # Index expressions are written without the table name
+
+
+def _normalize_predicate(predicate: str) -> str:
+    return " ".join(re.sub(r"\b\w+\.", "", predicate).split()).lower()
+
+
+def declared_indexes() -> dict:
+    """
+    Returns the indexes declared on the models, by table: primary keys, unique
+    constraints and `Index` objects (with their partial predicate, if any).
+    """
+    indexes = defaultdict(list)
+    for table in Base.metadata.sorted_tables:
+        if table.primary_key.columns:
+            indexes[table.name].append(DeclaredIndex(f"{table.name}_pkey", tuple(c.name for c in table.primary_key.columns)))
+        for constraint in table.constraints:
+            if isinstance(constraint, UniqueConstraint):
+                indexes[table.name].append(DeclaredIndex(constraint.name or "unique", tuple(c.name for c in constraint.columns)))
+        for column in table.columns:
+            if column.unique and not column.index:
+                indexes[table.name].append(DeclaredIndex(f"{table.name}_{column.name}_key", (column.name,)))
+        for index in table.indexes:
+            where = index.dialect_options["postgresql"].get("where")
+            indexes[table.name].append(DeclaredIndex(
+                index.name,
+                tuple(_expression_sql(expression) for expression in index.expressions),
+                _normalize_predicate(str(where)) if where is not None else None,
+            ))
+    return indexes
+
+
+def _column_name(lower, column) -> str:
+    return f"lower({column})" if lower else column
+
+
+def parse_query(query: str) -> dict:
+    """
+    Extracts, per table, the columns a normalized statement filters on.
+
+    Returns:
+        dict: `{table: {"eq": [...], "range": [...], "order": [...], "join": [...], "null": set()}}`
+        for the model tables the statement reads; column expressions such as `lower(email)`
+        are kept as written.
+    """
+    known = {table.name for table in Base.metadata.sorted_tables}
+    if re.match(r"\s*INSERT\b", query, re.IGNORECASE):
+        return {}
+
+    aliases = {}
+    for table, alias, bare_alias in _TABLE_REF.findall(query):
+        if table in known:
+            aliases[table] = table
+            if alias or bare_alias:
+                aliases[alias or bare_alias] = table
+
+    usage = defaultdict(lambda: {"eq": [], "range": [], "order": [], "join": [], "null": set()})
+
+    def add(kind, qualifier, column):
+        table = aliases.get(qualifier)
+        if table is not None and column not in usage[table][kind]:
+            usage[table][kind].append(column)
+
+    for lower, qualifier, column in _EQUALITY.findall(query):
+        add("eq", qualifier, _column_name(lower, column))
+    for lower, qualifier, column in _RANGE.findall(query):
+        add("range", qualifier, _column_name(lower, column))
+    for qualifier, column, negated in _IS_NULL.findall(query):
+        if qualifier in aliases:
+            usage[aliases[qualifier]]["null"].add(f"{column} is {'not ' if negated else ''}null")
+    for left, left_column, right, right_column in _JOIN.findall(query):
+        if left in aliases and right in aliases and aliases[left] != aliases[right]:
+            add("join", left, left_column)
+            add("join", right, right_column)
+    for clause in _ORDER_BY.findall(query):
+        for lower, qualifier, column in re.findall(_COLUMN, clause):
+            add("order", qualifier, _column_name(lower, column))
+    return dict(usage)
+
+
+def _candidate_columns(usage: dict) -> tuple:
+    """
+    Equality columns first, then one range column, or the sort column when there is no
+    range, so one index serves both the filter and the ordering. Tables that are only
+    joined get an index on their join column.
+    """
+    columns = list(usage["eq"])
+    ranged = [column for column in usage["range"] if column not in columns]
+    if ranged:
+        columns.append(ranged[0])
+    elif columns:
+        columns += [column for column in usage["order"][:1] if column not in columns]
+    if not columns:
+        columns = usage["join"][:1]
+    return tuple(columns)
+
+
+def _coverage(index: DeclaredIndex, columns: tuple, predicates: set) -> int:
+    """
+    Number of leading columns of `index` the candidate can use (0 if the index is partial
+    and the statements do not carry its predicate).
+    """
+    if index.where is not None and index.where not in predicates:
+        return 0
+    used = 0
+    for column in index.columns:
+        if column not in columns:
+            break
+        used += 1
+    return used
+
+
+def collect_candidates(workload: list[dict]) -> list[Candidate]:
+    """
+    Groups the workload by the index each statement would need, skipping the statements
+    already fully served by a declared index.
+
+    Returns:
+        List[Candidate]: The candidates, with `usable` set to the usable prefix length of the
+        least served of their statements.
+    """
+    indexes = declared_indexes()
+    candidates = {}
+    for entry in workload:
+        for table, usage in parse_query(entry["query"]).items():
+            columns = _candidate_columns(usage)
+            if not columns:
+                continue
+            best = max((_coverage(index, columns, usage["null"]) for index in indexes.get(table, [])), default=0)
+            if best >= len(columns):
+                continue
+            # Live-row predicates shared by every statement make the index partial, like the model indexes
+            where = "deleted_at IS NULL" if "deleted_at is null" in usage["null"] else None
+            candidate = candidates.setdefault((table, columns, where), Candidate(table, columns, where))
+            candidate.usable = min(candidate.usable, best) if candidate.queries else best
+            candidate.queries.append(entry)
+    return sorted(candidates.values(), key=lambda candidate: candidate.total_ms, reverse=True)
+
+
+def index_name(candidate: Candidate) -> str:
+    parts = [re.sub(r"\W+", "_", column).strip("_") for column in candidate.columns]
+    name = "_".join(["ix", candidate.table, *parts] + (["live"] if candidate.where else []))
+    return name[:63]
+
+
+def index_ddl(candidate: Candidate) -> str:
+    ddl = f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {index_name(candidate)} ON {candidate.table} ({', '.join(candidate.columns)})"
+    if candidate.where:
+        ddl += f" WHERE {candidate.where}"
+    return ddl
+
+
+def _has_hypopg(db: Session) -> bool:
+    if dialect_name(db) != "postgresql":
+        return False
+    return db.execute(text("SELECT 1 FROM pg_extension WHERE extname = 'hypopg'")).first() is not None
+
+
+def _generic_sql(query: str) -> str:
+    counter = iter(range(1, 10000))
+    return re.sub(r"\?", lambda _: f"${next(counter)}", query)
+
+
+def _plan_cost(db: Session, query: str) -> float | None:
+    """
+    Estimated total cost of the generic plan of a normalized statement, or None if it
+    cannot be explained (PostgreSQL older than 16, ambiguous parameter types...).
+    """
+    try:
+        with db.begin_nested():
+            plan = db.execute(text("EXPLAIN (GENERIC_PLAN, FORMAT JSON) " + _generic_sql(query).replace(":", r"\:"))).scalar()
+    except Exception:
+        return None
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return plan[0]["Plan"]["Total Cost"]
+
+
+def _cost_with_hypopg(db: Session, candidate: Candidate, sample: int = 3):
+    """
+    Costs the most expensive statements of a candidate without and with a hypothetical
+    version of its index.
+
+    Returns:
+        tuple: `(cost_before, cost_after, benefit_ms)`, or None if no statement could be explained.
+    """
+    queries = sorted(candidate.queries, key=lambda query: query["total_ms"], reverse=True)[:sample]
+    before = {query["fingerprint"]: _plan_cost(db, query["query"]) for query in queries}
+    if all(cost is None for cost in before.values()):
+        return None
+    ddl = index_ddl(candidate).replace(" CONCURRENTLY IF NOT EXISTS", "")
+    oid = db.execute(text("SELECT indexrelid FROM hypopg_create_index(:ddl)"), {"ddl": ddl}).scalar()
+    try:
+        after = {query["fingerprint"]: _plan_cost(db, query["query"]) for query in queries}
+    finally:
+        db.execute(text("SELECT hypopg_drop_index(:oid)"), {"oid": oid})
+
+    cost_before = cost_after = benefit_ms = 0.0
+    for query in queries:
+        old, new = before[query["fingerprint"]], after[query["fingerprint"]]
+        if old is None or new is None or old <= 0:
+            continue
+        cost_before += old
+        cost_after += new
+        benefit_ms += query["total_ms"] * max(0.0, (old - new) / old)
+    return cost_before, cost_after, benefit_ms
+
+
+def load_workload(db: Session, source: str, limit: int) -> list[dict]:
+    """
+    Reads the workload to analyze: the statements captured by this process, or the top
+    of `pg_stat_statements` for the current database.
+
+    Raises:
+        HTTPException (400): If the source is unknown or unavailable.
+    """
+    if source == "app":
+        if not settings.INDEX_ADVISOR_CAPTURE:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Workload capture is disabled (INDEX_ADVISOR_CAPTURE)")
+        return query_workload.snapshot()[:limit]
+    if source != "pg_stat_statements":
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Unknown source '{source}'")
+    if dialect_name(db) != "postgresql" or db.execute(
+        text("SELECT 1 FROM pg_extension WHERE extname = 'pg_stat_statements'")
+    ).first() is None:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="pg_stat_statements is not installed")
+    rows = db.execute(text(
+        "SELECT queryid, query, calls, total_exec_time FROM pg_stat_statements"
+        " WHERE dbid = (SELECT oid FROM pg_database WHERE datname = current_database())"
+        " ORDER BY total_exec_time DESC LIMIT :limit"
+    ), {"limit": limit}).all()
+    return [
+        {"fingerprint": str(queryid), "query": normalize_statement(query), "calls": calls, "total_ms": total_ms}
+        for queryid, query, calls, total_ms in rows
+    ]
+
+
+def advise_indexes(db: Session, source: str = "app", limit: int = 200) -> dict:
+    """
+    Service function proposing indexes for the observed workload.
+
+    Args:
+        db (Session): The database session for database operations.
+        source (str): 'app' (statements captured by this process) or 'pg_stat_statements'.
+        limit (int): The number of most expensive statements to analyze.
+
+    Returns:
+        dict: The proposals, the most beneficial first, each with its DDL, its estimated
+        benefit and the statements it serves.
+    """
+    workload = load_workload(db, source, limit)
+    hypopg = _has_hypopg(db)
+    proposals = []
+    try:
+        for candidate in collect_candidates(workload):
+            proposal = {
+                "table": candidate.table,
+                "columns": list(candidate.columns),
+                "where": candidate.where,
+                "name": index_name(candidate),
+                "ddl": index_ddl(candidate),
+                "calls": candidate.calls,
+                "workload_ms": round(candidate.total_ms, 2),
+                "queries": [
+                    {key: query[key] for key in ("fingerprint", "query", "calls", "total_ms")}
+                    for query in sorted(candidate.queries, key=lambda query: query["total_ms"], reverse=True)[:3]
+                ],
+            }
+            costs = _cost_with_hypopg(db, candidate) if hypopg else None
+            if costs is not None:
+                cost_before, cost_after, benefit_ms = costs
+                if cost_before <= 0 or (cost_before - cost_after) / cost_before < settings.INDEX_ADVISOR_MIN_IMPROVEMENT:
+                    continue
+                proposal.update(method="hypopg", cost_before=cost_before, cost_after=cost_after, estimated_benefit_ms=round(benefit_ms, 2))
+            elif candidate.usable:
+                continue  # An index already serves part of the filter: only hypothetical costing can tell
+            else:
+                proposal.update(method="workload", estimated_benefit_ms=proposal["workload_ms"])
+            proposals.append(proposal)
+    finally:
+        db.rollback()  # Ends the read transaction the EXPLAINs ran in
+
+    proposals.sort(key=lambda proposal: proposal["estimated_benefit_ms"], reverse=True)
+    return {"source": source, "hypopg": hypopg, "statements": len(workload), "proposals": proposals}
+
+
+def render_migration(proposals: list[dict], down_revision: str | None = None, message: str = "Add indexes proposed by the index advisor") -> str:
+    """
+    Renders proposals as an Alembic migration. Indexes are created concurrently, outside
+    the migration transaction, so applying it does not lock the tables.
+    """
+    revision = uuid.uuid4().hex[:12]
+    upgrade, downgrade = [], []
+    for proposal in proposals:
+        columns = ", ".join(
+            f'sa.text("{column}")' if "(" in column else f'"{column}"' for column in proposal["columns"]
+        )
+        options = "postgresql_concurrently=True, if_not_exists=True"
+        if proposal["where"]:
+            options += f', postgresql_where=sa.text("{proposal["where"]}")'
+        upgrade.append(f'        op.create_index("{proposal["name"]}", "{proposal["table"]}", [{columns}], {options})')
+        downgrade.append(f'        op.drop_index("{proposal["name"]}", table_name="{proposal["table"]}", postgresql_concurrently=True, if_exists=True)')
+    if not upgrade:
+        upgrade = downgrade = ["        pass"]
+
+    return "\n".join([
+        f'"""{message}',
+        "",
+        f"Revision ID: {revision}",
+        f"Revises: {down_revision or ''}",
+        f"Create Date: {datetime.now(timezone.utc):%Y-%m-%d %H:%M:%S}",
+        '"""',
+        "from alembic import op",
+        "import sqlalchemy as sa",
+        "",
+        f'revision = "{revision}"',
+        f'down_revision = "{down_revision}"' if down_revision else "down_revision = None",
+        "branch_labels = None",
+        "depends_on = None",
+        "",
+        "",
+        "def upgrade():",
+        "    with op.get_context().autocommit_block():",
+        *upgrade,
+        "",
+        "",
+        "def downgrade():",
+        "    with op.get_context().autocommit_block():",
+        *reversed(downgrade),
+        "",
+    ])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Propose indexes from pg_stat_statements.")
+    parser.add_argument("--limit", type=int, default=200, help="number of most expensive statements to analyze")
+    parser.add_argument("--migration", help="write the proposals as an Alembic migration to this file")
+    parser.add_argument("--down-revision", help="revision the migration follows")
+    args = parser.parse_args()
+
+    from db.database import db_instance
+    db = db_instance.SessionLocal()
+    try:
+        advice = advise_indexes(db, "pg_stat_statements", args.limit)
+    finally:
+        db.close()
+
+    for proposal in advice["proposals"]:
+        print(f"-- {proposal['method']}: ~{proposal['estimated_benefit_ms']} ms over {proposal['calls']} calls")
+        print(proposal["ddl"] + ";")
+    if args.migration:
+        with open(args.migration, "w") as migration:
+            migration.write(render_migration(advice["proposals"], args.down_revision))
+
+if __name__ == "__main__":
+    main()
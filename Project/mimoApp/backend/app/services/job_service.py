@@ -0,0 +1,67 @@
+from typing import Callable, Dict
+from fastapi import HTTPException, status
+from sqlalchemy.orm import Session
+from repositories.job_repo import enqueue_job, get_job
+
+# Registered job types: each function receives the job payload and returns a JSON serializable result
+_jobs: Dict[str, Callable[[dict], object]] = {}
+
+def job(kind: str):
+    """
+    Decorator registering a function as the implementation of a job type.
+
+    Job functions run in a worker process of `worker.py`, so they must be defined at
+    module level and open their own database sessions.
+
+    Example:
+        @job("recommendations.refresh")
+        def refresh(payload: dict): ...
+    """
+    def register(func: Callable[[dict], object]):
+        _jobs[kind] = func
+        return func
+    return register
+
+def registered_jobs():
+    """
+    Returns the names of the registered job types.
+    """
+    import services.jobs  # noqa: F401 - registers the built-in jobs
+    return sorted(_jobs)
+
+def execute_job(kind: str, payload: dict):
+    """
+    Runs a job in the current process. Entry point of the worker's process pool.
+
+    Args:
+        kind (str): The registered job type.
+        payload (dict): The arguments of the job.
+
+    Returns:
+        object: The value returned by the job function.
+    """
+    import services.jobs  # noqa: F401 - child processes started with 'spawn' start empty
+    return _jobs[kind](payload or {})
+
+def submit_job(db: Session, kind: str, payload: dict, priority: int = 0, max_attempts: int = 3):
+    """
+    Service function to enqueue a job.
+
+    Raises:
+        HTTPException (400): If the job type is not registered.
+    """
+    if kind not in registered_jobs():
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Unknown job kind '{kind}'")
+    return enqueue_job(db, kind, payload, priority, max_attempts)
+
+def get_job_status(db: Session, job_id: int):
+    """
+    Service function to get a job.
+
+    Raises:
+        HTTPException (404): If the job does not exist.
+    """
+    db_job = get_job(db, job_id)
+    if db_job is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found")
+    return db_job
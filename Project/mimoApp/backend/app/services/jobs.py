@@ -0,0 +1,142 @@
+"""
+Built-in job types of the background job runner (see `worker.py`).
+
+Every job opens its own session: jobs run in worker processes, never in the API.
+"""
+from db.database import db_instance
+from services.job_service import job
+
+@job("recommendations.refresh")
+def refresh_recommendations_job(payload: dict):
+    """
+    Recomputes the recommendations of the courses with new enrollments.
+    """
+    from services.recommendation_service import refresh_recommendations
+
+    db = db_instance.SessionLocal()
+    try:
+        return {"courses": refresh_recommendations(db, payload.get("top_k"))}
+    finally:
+        db.close()
+
+@job("recommendations.rebuild")
+def rebuild_recommendations_job(payload: dict):
+    """
+    Recomputes the recommendations of every course.
+    """
+    from services.recommendation_service import rebuild_recommendations
+
+    db = db_instance.SessionLocal()
+    try:
+        return {"courses": rebuild_recommendations(db, payload.get("top_k"))}
+    finally:
+        db.close()
+
+@job("reviews.rebuild_ratings")
+def rebuild_ratings_job(payload: dict):
+    """
+    Recomputes the rating aggregates of every course from the reviews.
+    """
+    from repositories.review_repo import rebuild_course_ratings
+
+    db = db_instance.SessionLocal()
+    try:
+        return {"courses": rebuild_course_ratings(db)}
+    finally:
+        db.close()
+
+@job("purge.soft_deleted")
+def purge_soft_deleted_job(payload: dict):
+    """
+    Permanently deletes the soft deleted courses, lessons and enrollments past retention.
+    """
+    from services.purge_service import purge_soft_deleted
+
+    db = db_instance.SessionLocal()
+    try:
+        return purge_soft_deleted(db, payload.get("retention_days"), payload.get("batch_size"))
+    finally:
+        db.close()
+
+@job("lessons.rebalance_ranks")
+def rebalance_lesson_ranks_job(payload: dict):
+    """
+    Rewrites the lesson rank keys of the courses whose keys grew too long.
+    """
+    from services.Lesson_services import rebalance_lesson_ranks
+
+    db = db_instance.SessionLocal()
+    try:
+        return {"courses": rebalance_lesson_ranks(db, payload.get("max_length"))}
+    finally:
+        db.close()
+
+@job("auth.purge_revocations")
+def purge_revocations_job(payload: dict):
+    """
+    Deletes the revocations of the access tokens that have expired.
+    """
+    from repositories.revocation_repo import delete_expired_revocations
+
+    db = db_instance.SessionLocal()
+    try:
+        return {"deleted": delete_expired_revocations(db)}
+    finally:
+        db.close()
+
+@job("partitions.maintain")
+def maintain_partitions_job(payload: dict):
+    """
+    Creates the upcoming monthly partitions and archives the expired ones.
+    """
+    from services.partition_service import maintain_partitions
+
+    db = db_instance.SessionLocal()
+    try:
+        return maintain_partitions(db)
+    finally:
+        db.close()
+
+@job("lessons.render")
+def render_lesson_job(payload: dict):
+    """
+    Renders the HTML of a lesson that was created or updated.
+    """
+    from repositories.Lesson_repo import get_lesson_by_id
+    from services.render_service import render_lesson
+
+    db = db_instance.SessionLocal()
+    try:
+        lesson = get_lesson_by_id(db, payload["lesson_id"])
+        if lesson is None:
+            return {"rendered": False}
+        render_lesson(db, lesson)
+        return {"rendered": True}
+    finally:
+        db.close()
+
+@job("assets.collect_orphans")
+def collect_orphan_assets_job(payload: dict):
+    """
+    Deletes the lesson asset files no lesson refers to anymore.
+    """
+    from services.asset_service import collect_orphan_assets
+
+    db = db_instance.SessionLocal()
+    try:
+        return collect_orphan_assets(db, payload.get("grace_seconds"), payload.get("batch_size"))
+    finally:
+        db.close()
+
+@job("catalog.snapshot")
+def build_catalog_snapshot_job(payload: dict):
+    """
+    Publishes a new snapshot of the public course catalog.
+    """
+    from services.catalog_service import build_catalog_snapshot
+
+    db = db_instance.SessionLocal()
+    try:
+        return build_catalog_snapshot(db)
+    finally:
+        db.close()
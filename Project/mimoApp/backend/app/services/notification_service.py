@@ -0,0 +1,99 @@
+from sqlalchemy.orm import Session
+from repositories.notification_repo import (
+    add_notification,
+    create_notification,
+    get_notification,
+    get_notifications_for_user,
+    mark_notification_read,
+)
+from db.database import db_instance, pg_listener
+from core.config import settings
+from core.metrics import register_metrics
+from core.notification_hub import NotificationHub
+
+def load_notification(notification_id: int):
+    """
+    Reads an announced notification for the hub, in the listener thread.
+
+    Args:
+        notification_id (int): The ID carried by the NOTIFY payload.
+
+    Returns:
+        dict | None: The message pushed to the clients, or None if the row is gone.
+    """
+    db = db_instance.SessionLocal()
+    try:
+        notification = get_notification(db, notification_id)
+        if notification is None:
+            return None
+        return {
+            "id": notification.id,
+            "user_id": notification.user_id,
+            "message": notification.message,
+            "created_at": notification.created_at.isoformat() if notification.created_at else None,
+        }
+    finally:
+        db.close()
+
+# In-memory fan-out of the notifications received by this worker's LISTEN connection
+notification_hub = NotificationHub(queue_size=settings.NOTIFICATION_QUEUE_SIZE, loader=load_notification)
+pg_listener.subscribe(settings.NOTIFICATION_CHANNEL, notification_hub.publish)
+register_metrics("notifications", notification_hub.stats)
+
+def send_notification(db: Session, user_id: int, message: str):
+    """
+    Service function to persist a notification and push it to the user's open connections.
+
+    Args:
+        db (Session): The database session for database operations.
+        user_id (int): The ID of the recipient.
+        message (str): The text of the notification.
+
+    Returns:
+        Notification: The created notification object.
+    """
+    return create_notification(db, user_id, message)
+
+def stage_notification(db: Session, user_id: int, message: str):
+    """
+    Service function to add a notification to the caller's transaction, e.g. from an
+    outbox handler. It is stored and pushed when the caller commits.
+
+    Args:
+        db (Session): The database session for database operations.
+        user_id (int): The ID of the recipient.
+        message (str): The text of the notification.
+
+    Returns:
+        Notification: The pending notification object.
+    """
+    return add_notification(db, user_id, message)
+
+def list_notifications(db: Session, user_id: int, limit: int = 50, before_id: int | None = None):
+    """
+    Service function to list a user's notifications, newest first.
+
+    Args:
+        db (Session): The database session for database operations.
+        user_id (int): The ID of the recipient.
+        limit (int): The maximum number of notifications to return.
+        before_id (int | None): Only return notifications older than this ID.
+
+    Returns:
+        List[Notification]: The user's notifications.
+    """
+    return get_notifications_for_user(db, user_id, limit, before_id)
+
+def read_notification(db: Session, notification_id: int, user_id: int):
+    """
+    Service function to mark one of the user's notifications as read.
+
+    Args:
+        db (Session): The database session for database operations.
+        notification_id (int): The ID of the notification.
+        user_id (int): The ID of the owner.
+
+    Returns:
+        Notification: The updated notification object, or None if not found.
+    """
+    return mark_notification_read(db, notification_id, user_id)
@@ -0,0 +1,157 @@
+import logging
+import threading
+import time
+from collections import defaultdict
+from typing import Callable, Dict, List
+from sqlalchemy.orm import Session
+from db.database import db_instance
+from repositories.outbox_repo import (
+    claim_outbox_events,
+    mark_outbox_event_done,
+    mark_outbox_event_failed,
+)
+from core.config import settings
+from core.metrics import register_metrics
+
+logger = logging.getLogger(__name__)
+
+# Handlers registered per event type; each one receives the dispatcher's session and the event payload
+_handlers: Dict[str, List[Callable[[Session, dict], None]]] = defaultdict(list)
+
+def outbox_handler(event_type: str):
+    """
+    Decorator registering a function as a handler of the given outbox event type.
+
+    Handlers run in the dispatcher thread, in the transaction that claimed the event:
+    they write through the session they are given and never commit. The handlers of an
+    event share a savepoint, so when one of them raises, the writes of the others are
+    rolled back too and the event is retried as a whole, without duplicates.
+
+    Example:
+        @outbox_handler(USER_REGISTERED)
+        def send_welcome(db: Session, payload: dict): ...
+    """
+    def register(func: Callable[[Session, dict], None]):
+        _handlers[event_type].append(func)
+        return func
+    return register
+
+
+class OutboxDispatcher:
+    """
+    Background thread delivering outbox events to their handlers in batches.
+
+    Each round claims up to `OUTBOX_BATCH_SIZE` due events with `FOR UPDATE SKIP LOCKED`,
+    runs their handlers, records the outcome and commits, all in one transaction: the
+    handlers' writes are committed with the event's 'done' status or not at all. When
+    a round finds nothing to do the thread sleeps `OUTBOX_POLL_SECONDS`.
+    """
+
+    def __init__(self):
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+        self._started_at = time.monotonic()
+        self._counters = {"batches": 0, "dispatched": 0, "retried": 0, "failed": 0}
+        self._last_batch_seconds = 0.0
+
+    def start(self) -> None:
+        """
+        Starts the dispatcher thread.
+        """
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="outbox-dispatcher", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """
+        Asks the dispatcher to stop after the current round and waits for it.
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=30)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                processed = self.dispatch_batch()
+            except Exception:
+                logger.exception("Outbox dispatch round failed")
+                processed = 0
+            if processed == 0:
+                self._stop.wait(settings.OUTBOX_POLL_SECONDS)
+
+    def dispatch_batch(self) -> int:
+        """
+        Claims and processes one batch of events in a new session.
+
+        Returns:
+            int: The number of events claimed.
+        """
+        db = db_instance.SessionLocal()
+        try:
+            return self.process_batch(db)
+        finally:
+            db.close()
+
+    def process_batch(self, db: Session) -> int:
+        """
+        Claims one batch of events, runs their handlers and commits, all in one transaction.
+
+        The handlers of each event run in a savepoint: the writes of an event whose
+        handlers fail are discarded, and committed together with the 'done' status
+        otherwise, so a retried event never delivers twice.
+
+        Args:
+            db (Session): The session the batch runs in.
+
+        Returns:
+            int: The number of events claimed.
+        """
+        started = time.perf_counter()
+        events = claim_outbox_events(db, settings.OUTBOX_BATCH_SIZE)
+        dispatched = retried = failed = 0
+        for event in events:
+            try:
+                with db.begin_nested():
+                    for handler in _handlers.get(event.event_type, ()):
+                        handler(db, event.payload)
+            except Exception as exc:
+                logger.warning("Outbox event %s (%s) failed: %s", event.id, event.event_type, exc)
+                if mark_outbox_event_failed(
+                    event, repr(exc), settings.OUTBOX_MAX_ATTEMPTS, settings.OUTBOX_BACKOFF_SECONDS
+                ):
+                    retried += 1
+                else:
+                    failed += 1
+            else:
+                mark_outbox_event_done(event)
+                dispatched += 1
+        db.commit()
+
+        if events:
+            with self._lock:
+                self._counters["batches"] += 1
+                self._counters["dispatched"] += dispatched
+                self._counters["retried"] += retried
+                self._counters["failed"] += failed
+                self._last_batch_seconds = time.perf_counter() - started
+        return len(events)
+
+    def stats(self) -> dict:
+        """
+        Returns the dispatcher's throughput counters.
+        """
+        with self._lock:
+            stats = dict(self._counters)
+            stats["last_batch_seconds"] = round(self._last_batch_seconds, 4)
+        uptime = time.monotonic() - self._started_at
+        stats["events_per_second"] = round(stats["dispatched"] / uptime, 3) if uptime > 0 else 0.0
+        return stats
+
+
+outbox_dispatcher = OutboxDispatcher()
+register_metrics("outbox", outbox_dispatcher.stats)
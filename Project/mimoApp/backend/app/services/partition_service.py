@@ -0,0 +1,202 @@
+"""
+Maintenance of the monthly partitions of the event tables (`lesson_progress`, `activity_events`).
+
+On PostgreSQL these tables are declared `PARTITION BY RANGE` on their timestamp (see
+`models.progress`). This module:
+
+- creates the partitions of the current month and of the next `PARTITION_PREMAKE_MONTHS`
+  months, optionally sub-partitioned by `HASH (user_id)` into `PARTITION_USER_HASH_MODULUS`
+  tables, so inserts never hit a missing partition;
+- archives the months older than `PARTITION_RETENTION_MONTHS`: the partition is copied to
+  `PARTITION_ARCHIVE_DIR/<partition>.csv.gz`, then detached and dropped, which frees the
+  space at once without a long `DELETE` and its vacuum debt.
+
+Other databases have no partitions: both steps are no-ops there.
+
+Command line usage:
+
+    python -m services.partition_service            # create future partitions and archive old ones
+    python -m services.partition_service --no-archive
+"""
+import argparse
+import gzip
+import logging
+import os
+import re
+from datetime import date, datetime, timezone
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from db.dialect import dialect_name
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Partitioned tables and the column their monthly partitions may be hash sub-partitioned on
+PARTITIONED_TABLES = {
+    "lesson_progress": "user_id",
+    "activity_events": "user_id",
+}
+
+_LOCK_KEY = 0x70617274  # pg_advisory_xact_lock key serializing partition DDL across processes
+
+def _add_months(month: date, count: int) -> date:
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+def _current_month() -> date:
+    today = datetime.now(timezone.utc).date()
+    return today.replace(day=1)
+
+def partition_name(table: str, month: date) -> str:
+    """
+    Returns the name of the partition of `table` holding `month`, e.g. `lesson_progress_p202610`.
+    """
+    return f"{table}_p{month:%Y%m}"
+
+def list_partitions(db: Session, table: str):
+    """
+    Returns the monthly partitions currently attached to a table.
+
+    Returns:
+        dict: Partition name -> first day of its month.
+    """
+    pattern = re.compile(rf"^{re.escape(table)}_p(\d{{4}})(\d{{2}})$")
+    names = db.execute(
+        text(
+            "SELECT child.relname FROM pg_inherits "
+            "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+            "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+            "WHERE parent.relname = :table"
+        ),
+        {"table": table},
+    ).scalars()
+    partitions = {}
+    for name in names:
+        match = pattern.match(name)
+        if match:
+            partitions[name] = date(int(match.group(1)), int(match.group(2)), 1)
+    return partitions
+
+def ensure_partitions(db: Session, months_ahead: int | None = None, hash_modulus: int | None = None):
+    """
+    Creates the missing partitions from the current month to `months_ahead` months later.
+
+    Args:
+        db (Session): The database session for database operations.
+        months_ahead (int | None): Defaults to `PARTITION_PREMAKE_MONTHS`.
+        hash_modulus (int | None): Hash sub-partitions per month for the new partitions,
+            defaults to `PARTITION_USER_HASH_MODULUS` (0 for none).
+
+    Returns:
+        list[str]: The names of the partitions created.
+    """
+    if dialect_name(db) != "postgresql":
+        return []
+    months_ahead = settings.PARTITION_PREMAKE_MONTHS if months_ahead is None else months_ahead
+    hash_modulus = settings.PARTITION_USER_HASH_MODULUS if hash_modulus is None else hash_modulus
+
+    db.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": _LOCK_KEY})
+    created = []
+    first = _current_month()
+    for table, hash_column in PARTITIONED_TABLES.items():
+        existing = list_partitions(db, table)
+        for offset in range(months_ahead + 1):
+            month = _add_months(first, offset)
+            name = partition_name(table, month)
+            if name in existing:
+                continue
+            statement = (
+                f'CREATE TABLE "{name}" PARTITION OF "{table}" '
+                f"FOR VALUES FROM ('{month.isoformat()}') TO ('{_add_months(month, 1).isoformat()}')"
+            )
+            if hash_modulus > 0:
+                statement += f' PARTITION BY HASH ("{hash_column}")'
+            db.execute(text(statement))
+            for remainder in range(hash_modulus):
+                db.execute(text(
+                    f'CREATE TABLE "{name}_h{remainder}" PARTITION OF "{name}" '
+                    f"FOR VALUES WITH (MODULUS {hash_modulus}, REMAINDER {remainder})"
+                ))
+            created.append(name)
+    db.commit()
+    if created:
+        logger.info("Created partitions: %s", ", ".join(created))
+    return created
+
+def archive_partitions(db: Session, retention_months: int | None = None, archive_dir: str | None = None):
+    """
+    Archives and drops the partitions of the months older than the retention period.
+
+    Each partition is handled in one transaction: it is locked against writes, copied
+    to a gzip compressed CSV file, detached from its table and dropped. The file is
+    complete before the data is dropped.
+
+    Args:
+        db (Session): The database session for database operations.
+        retention_months (int | None): Defaults to `PARTITION_RETENTION_MONTHS` (0 keeps everything).
+        archive_dir (str | None): Defaults to `PARTITION_ARCHIVE_DIR`.
+
+    Returns:
+        list[str]: The paths of the archive files written.
+    """
+    if dialect_name(db) != "postgresql":
+        return []
+    retention_months = settings.PARTITION_RETENTION_MONTHS if retention_months is None else retention_months
+    if retention_months <= 0:
+        return []
+    archive_dir = archive_dir or settings.PARTITION_ARCHIVE_DIR
+    os.makedirs(archive_dir, exist_ok=True)
+    cutoff = _add_months(_current_month(), -retention_months)
+
+    archived = []
+    for table in PARTITIONED_TABLES:
+        for name, month in sorted(list_partitions(db, table).items(), key=lambda item: item[1]):
+            if month >= cutoff:
+                continue
+            db.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": _LOCK_KEY})
+            db.execute(text(f'LOCK TABLE "{name}" IN SHARE MODE'))  # Blocks writes, not reads
+
+            path = os.path.join(archive_dir, f"{name}.csv.gz")
+            cursor = db.connection().connection.cursor()  # Same transaction as the session
+            try:
+                with gzip.open(f"{path}.tmp", "wb") as archive:
+                    cursor.copy_expert(f'COPY (SELECT * FROM "{name}") TO STDOUT WITH (FORMAT csv, HEADER)', archive)
+            finally:
+                cursor.close()
+            os.replace(f"{path}.tmp", path)
+
+            db.execute(text(f'ALTER TABLE "{table}" DETACH PARTITION "{name}"'))
+            db.execute(text(f'DROP TABLE "{name}"'))
+            db.commit()
+            archived.append(path)
+            logger.info("Archived partition %s to %s", name, path)
+    return archived
+
+def maintain_partitions(db: Session):
+    """
+    Creates the upcoming partitions and archives the expired ones.
+
+    Returns:
+        dict: The partitions created and the archive files written.
+    """
+    return {"created": ensure_partitions(db), "archived": archive_partitions(db)}
+
+def main():
+    parser = argparse.ArgumentParser(description="Create upcoming partitions and archive old ones.")
+    parser.add_argument("--months-ahead", type=int, default=None, help="partitions created ahead of the current month")
+    parser.add_argument("--retention-months", type=int, default=None, help="months kept before archiving")
+    parser.add_argument("--no-archive", action="store_true", help="only create partitions")
+    args = parser.parse_args()
+
+    from db.database import db_instance
+    logging.basicConfig(level=logging.INFO)
+    db = db_instance.SessionLocal()
+    try:
+        ensure_partitions(db, args.months_ahead)
+        if not args.no_archive:
+            archive_partitions(db, args.retention_months)
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
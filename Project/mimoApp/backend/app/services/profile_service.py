@@ -0,0 +1,60 @@
+"""
+Request profiles: the recorder used by the profiling middleware and the lookups of
+`/debug/profiles` (see `core.profiler`).
+
+A request is profiled when it sends `X-Profile: <PROFILER_TOKEN>`, or at random with
+`PROFILER_SAMPLE_RATE`. Its response names the profile in the `X-Profile-Id` header.
+"""
+from fastapi import HTTPException, status
+from core.config import settings
+from core.metrics import register_metrics
+from core.profiler import ProfileStore, RequestProfiler, to_collapsed, to_speedscope
+
+profile_store = ProfileStore(settings.PROFILER_DIR, settings.PROFILER_MAX_PROFILES)
+request_profiler = RequestProfiler(
+    profile_store,
+    interval=settings.PROFILER_INTERVAL_SECONDS,
+    sample_rate=settings.PROFILER_SAMPLE_RATE,
+    token=settings.PROFILER_TOKEN,
+    max_active=settings.PROFILER_MAX_ACTIVE,
+)
+register_metrics("profiler", request_profiler.stats)
+
+def list_profiles(path: str | None = None, limit: int = 50):
+    """
+    Service function listing the stored profiles, newest first.
+
+    Args:
+        path (str | None): Only the profiles of requests whose path starts with this.
+        limit (int): The maximum number of profiles returned.
+
+    Returns:
+        list[dict]: The profile summaries: request, duration and time per span and package.
+    """
+    profiles = profile_store.list()
+    if path:
+        profiles = [profile for profile in profiles if profile["path"].startswith(path)]
+    return profiles[:limit]
+
+def get_profile(profile_id: str, export_format: str = "json"):
+    """
+    Service function retrieving a stored profile.
+
+    Args:
+        profile_id (str): The ID of the profile (the `X-Profile-Id` response header).
+        export_format (str): 'json' (as stored), 'collapsed' or 'speedscope'.
+
+    Returns:
+        dict | str: The profile in the requested format.
+
+    Raises:
+        HTTPException (404): If the profile does not exist (or was pruned).
+    """
+    profile = profile_store.get(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Profile not found")
+    if export_format == "collapsed":
+        return to_collapsed(profile)
+    if export_format == "speedscope":
+        return to_speedscope(profile)
+    return profile
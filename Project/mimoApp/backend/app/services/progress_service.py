@@ -0,0 +1,76 @@
+from datetime import datetime, timedelta, timezone
+from fastapi import HTTPException, status
+from sqlalchemy.orm import Session
+from repositories.Lesson_repo import get_lesson_by_id
+from repositories.progress_repo import record_progress, count_missing_lessons, get_progress_history, get_latest_progress, get_activity
+from repositories.enrollment_repo import complete_enrollment
+from repositories.outbox_repo import add_outbox_event, COURSE_COMPLETED
+from services.dashboard_service import invalidate_dashboard
+from core.config import settings
+
+DEFAULT_WINDOW = timedelta(days=30)
+
+def _aware(moment: datetime | None):
+    # Naive query parameters are taken as UTC
+    if moment is not None and moment.tzinfo is None:
+        return moment.replace(tzinfo=timezone.utc)
+    return moment
+
+def _window(since: datetime | None, until: datetime | None):
+    """
+    Resolves a read window, defaulting to the last 30 days.
+
+    Raises:
+        HTTPException (400): If the window is empty or longer than `PROGRESS_MAX_WINDOW_DAYS`.
+    """
+    until = _aware(until) or datetime.now(timezone.utc)
+    since = _aware(since) or until - DEFAULT_WINDOW
+    if since >= until:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="'since' must be before 'until'")
+    if until - since > timedelta(days=settings.PROGRESS_MAX_WINDOW_DAYS):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"The window cannot exceed {settings.PROGRESS_MAX_WINDOW_DAYS} days",
+        )
+    return since, until
+
+def report_progress(db: Session, user_id: int, lesson_id: int, completion_percentage: float):
+    """
+    Service function to record a user's progress on a lesson.
+
+    When the report completes the last lesson of a course the user is enrolled in, the
+    enrollment is marked completed and `course.completed` is recorded in the outbox, in
+    the same transaction as the report.
+
+    Raises:
+        HTTPException (404): If the lesson does not exist.
+    """
+    lesson = get_lesson_by_id(db, lesson_id)
+    if lesson is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Lesson not found")
+    progress = record_progress(db, user_id, lesson.course_id, lesson_id, completion_percentage, commit=False)
+    if (
+        completion_percentage >= 100
+        and count_missing_lessons(db, user_id, lesson.course_id) == 0
+        and complete_enrollment(db, user_id, lesson.course_id)
+    ):
+        add_outbox_event(db, COURSE_COMPLETED, {"user_id": user_id, "course_id": lesson.course_id})
+    db.commit()
+    invalidate_dashboard(db, user_id)
+    return progress
+
+def list_progress(db: Session, user_id: int, since: datetime | None, until: datetime | None, course_id: int | None, latest: bool):
+    """
+    Service function to list a user's progress reports, or only the latest one per lesson.
+    """
+    since, until = _window(since, until)
+    if latest:
+        return get_latest_progress(db, user_id, since, until, course_id)
+    return get_progress_history(db, user_id, since, until, course_id)
+
+def list_activity(db: Session, user_id: int, since: datetime | None, until: datetime | None, limit: int):
+    """
+    Service function to list a user's recent activity.
+    """
+    since, until = _window(since, until)
+    return get_activity(db, user_id, since, until, limit)
@@ -0,0 +1,102 @@
+"""
+Background purge of soft deleted courses, lessons and enrollments (and of the lesson
+HTML renditions nothing refers to anymore).
+
+Deleting a course or a lesson only sets its `deleted_at` column, so the API request
+costs one `UPDATE`. Once the rows are older than `PURGE_RETENTION_DAYS` this job deletes
+them for good, children first, in batches of `PURGE_BATCH_SIZE` rows with a commit after
+each batch: locks are held briefly and the WAL/replication stream is never flooded by
+one huge transaction.
+
+Command line usage:
+
+    python -m services.purge_service
+    python -m services.purge_service --retention-days 0     # purge everything soft deleted
+"""
+import argparse
+import logging
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import delete, or_, select
+from sqlalchemy.orm import Session
+from models.course import Course
+from models.Lesson import Lesson
+from models.user_course import UserCourse
+from repositories.rendition_repo import delete_stale_renditions
+from core.config import settings
+from core.render import renderer_id
+
+logger = logging.getLogger(__name__)
+
+def _purge_in_batches(db: Session, model, condition, batch_size: int):
+    """
+    Deletes the rows of `model` matching `condition`, `batch_size` rows per transaction.
+
+    Returns:
+        int: The number of rows deleted.
+    """
+    total = 0
+    while True:
+        batch = select(model.id).where(condition).limit(batch_size).scalar_subquery()
+        deleted = db.execute(
+            delete(model).where(model.id.in_(batch)).execution_options(synchronize_session=False)
+        ).rowcount
+        db.commit()
+        total += deleted
+        if deleted < batch_size:
+            return total
+
+def purge_soft_deleted(db: Session, retention_days: int | None = None, batch_size: int | None = None):
+    """
+    Permanently deletes the soft deleted rows older than the retention period.
+
+    Children are purged before their parents, so the final course deletes never have to
+    cascade over a large number of rows. The rows of a soft deleted course are purged
+    even if they are live themselves.
+
+    Args:
+        db (Session): The database session for database operations.
+        retention_days (int | None): Defaults to `PURGE_RETENTION_DAYS`.
+        batch_size (int | None): Defaults to `PURGE_BATCH_SIZE`.
+
+    Returns:
+        dict: The number of purged rows per table.
+    """
+    if retention_days is None:
+        retention_days = settings.PURGE_RETENTION_DAYS
+    batch_size = batch_size or settings.PURGE_BATCH_SIZE
+    cutoff = datetime.now(timezone.utc) - timedelta(days=retention_days)
+
+    purged_courses = select(Course.id).where(Course.deleted_at < cutoff)
+    counts = {
+        "enrollments": _purge_in_batches(
+            db, UserCourse,
+            or_(UserCourse.deleted_at < cutoff, UserCourse.course_id.in_(purged_courses)),
+            batch_size,
+        ),
+        "lessons": _purge_in_batches(
+            db, Lesson,
+            or_(Lesson.deleted_at < cutoff, Lesson.course_id.in_(purged_courses)),
+            batch_size,
+        ),
+        "courses": _purge_in_batches(db, Course, Course.deleted_at < cutoff, batch_size),
+        "renditions": delete_stale_renditions(db, renderer_id()),
+    }
+    logger.info("Purged soft deleted rows: %s", counts)
+    return counts
+
+def main():
+    parser = argparse.ArgumentParser(description="Purge soft deleted courses, lessons and enrollments.")
+    parser.add_argument("--retention-days", type=int, default=None, help="only purge rows deleted before this many days ago")
+    parser.add_argument("--batch-size", type=int, default=None, help="rows deleted per transaction")
+    args = parser.parse_args()
+
+    from db.database import db_instance
+    logging.basicConfig(level=logging.INFO)
+    db = db_instance.SessionLocal()
+    try:
+        purge_soft_deleted(db, args.retention_days, args.batch_size)
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
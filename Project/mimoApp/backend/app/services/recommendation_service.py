@@ -0,0 +1,201 @@
+"""
+Batch job computing "learners who took this course also took..." recommendations.
+
+The enrollments in `user_courses` are loaded into a sparse user x course matrix and
+item-item cosine similarity is computed block by block, so memory stays bounded by
+`RECOMMENDATION_CHUNK_SIZE` x number of courses. The top-K neighbours of every course
+are stored in `course_recommendations`, which the API reads directly.
+
+Requires NumPy and SciPy (only for the batch job, not for serving):
+
+    python -m services.recommendation_service            # refresh courses with new enrollments
+    python -m services.recommendation_service --full     # rebuild every course
+"""
+import argparse
+import logging
+from sqlalchemy.orm import Session
+from repositories.recommendation_repo import (
+    ENROLLMENT_WATERMARK,
+    iter_enrollments,
+    get_max_enrollment_id,
+    get_courses_enrolled_since,
+    get_state,
+    set_state,
+    replace_recommendations,
+    get_recommendations,
+)
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+def _import_numeric():
+    try:
+        import numpy as np
+        from scipy import sparse
+    except ImportError as exc:  # pragma: no cover - depends on the environment
+        raise RuntimeError("The recommendation job requires numpy and scipy (pip install numpy scipy)") from exc
+    return np, sparse
+
+def _build_matrix(db: Session):
+    """
+    Builds the column-normalized binary user x course matrix.
+
+    Returns:
+        tuple: `(matrix, course_ids)` where `matrix` is a CSC matrix whose column j holds
+        the L2-normalized enrollment vector of `course_ids[j]`.
+    """
+    np, sparse = _import_numeric()
+    pairs = np.fromiter(
+        (value for pair in iter_enrollments(db) for value in pair), dtype=np.int64
+    ).reshape(-1, 2)
+    if pairs.size == 0:
+        return None, np.empty(0, dtype=np.int64)
+
+    user_ids, user_index = np.unique(pairs[:, 0], return_inverse=True)
+    course_ids, course_index = np.unique(pairs[:, 1], return_inverse=True)
+    matrix = sparse.csc_matrix(
+        (np.ones(len(pairs), dtype=np.float32), (user_index, course_index)),
+        shape=(len(user_ids), len(course_ids)),
+    )
+    matrix.sum_duplicates()
+    matrix.data[:] = 1.0  # Duplicate enrollments count once
+
+    # Binary columns: the L2 norm is the square root of the number of learners
+    norms = np.sqrt(np.asarray(matrix.sum(axis=0)).ravel())
+    norms[norms == 0] = 1.0
+    matrix = matrix @ sparse.diags(1.0 / norms)
+    return matrix.tocsc(), course_ids
+
+def _top_k_rows(matrix, course_ids, columns, top_k: int):
+    """
+    Computes the top-K most similar courses of the given matrix columns.
+
+    Similarity is computed for one block of `RECOMMENDATION_CHUNK_SIZE` courses at a time:
+    a sparse (block x users) @ (users x courses) product, densified per block only.
+    """
+    np, _ = _import_numeric()
+    transposed = matrix.T.tocsr()
+    rows = []
+    chunk_size = settings.RECOMMENDATION_CHUNK_SIZE
+    for start in range(0, len(columns), chunk_size):
+        block = columns[start:start + chunk_size]
+        similarity = (transposed[block] @ matrix).toarray()
+        similarity[np.arange(len(block)), block] = 0.0  # A course is not its own recommendation
+
+        k = min(top_k, similarity.shape[1])
+        candidates = np.argpartition(-similarity, k - 1, axis=1)[:, :k]
+        for row, column in enumerate(block):
+            scores = similarity[row, candidates[row]]
+            order = np.argsort(-scores, kind="stable")
+            rank = 0
+            for position in order:
+                score = float(scores[position])
+                if score <= 0.0:
+                    break
+                rank += 1
+                rows.append({
+                    "course_id": int(course_ids[column]),
+                    "rank": rank,
+                    "recommended_course_id": int(course_ids[candidates[row, position]]),
+                    "score": round(score, 6),
+                })
+    return rows
+
+def rebuild_recommendations(db: Session, top_k: int | None = None):
+    """
+    Recomputes the recommendations of every course with enrollments.
+
+    Every stored row is replaced, so courses that lost all their learners (or were
+    deleted) stop having and being recommendations.
+
+    Args:
+        db (Session): The database session for database operations.
+        top_k (int | None): Neighbours kept per course (defaults to `RECOMMENDATION_TOP_K`).
+
+    Returns:
+        int: The number of courses processed.
+    """
+    np, _ = _import_numeric()
+    watermark = get_max_enrollment_id(db)
+    matrix, course_ids = _build_matrix(db)
+    rows = []
+    if matrix is not None:
+        rows = _top_k_rows(matrix, course_ids, np.arange(len(course_ids)), top_k or settings.RECOMMENDATION_TOP_K)
+    replace_recommendations(db, None, rows)
+    set_state(db, ENROLLMENT_WATERMARK, watermark)
+    db.commit()
+    logger.info("Rebuilt recommendations for %d courses", len(course_ids))
+    return len(course_ids)
+
+def refresh_recommendations(db: Session, top_k: int | None = None):
+    """
+    Recomputes the recommendations of the courses that got new enrollments since the last run.
+
+    Only the rows of those courses are recomputed (against the full, current matrix);
+    other courses pick up the change on the next full rebuild. A changed course with no
+    live enrollment left loses its recommendations.
+
+    Args:
+        db (Session): The database session for database operations.
+        top_k (int | None): Neighbours kept per course (defaults to `RECOMMENDATION_TOP_K`).
+
+    Returns:
+        int: The number of courses processed.
+    """
+    np, _ = _import_numeric()
+    last_id = get_state(db, ENROLLMENT_WATERMARK)
+    watermark = get_max_enrollment_id(db)
+    changed = get_courses_enrolled_since(db, last_id)
+    if not changed:
+        return 0
+
+    matrix, course_ids = _build_matrix(db)
+    rows = []
+    if matrix is not None:
+        # Changed courses whose enrollments were all deleted are not in the matrix:
+        # searchsorted returns their insertion point, which must not be taken for them
+        wanted = np.array(sorted(changed), dtype=np.int64)
+        columns = np.searchsorted(course_ids, wanted)
+        found = columns < len(course_ids)
+        found[found] = course_ids[columns[found]] == wanted[found]
+        rows = _top_k_rows(matrix, course_ids, columns[found], top_k or settings.RECOMMENDATION_TOP_K)
+    replace_recommendations(db, changed, rows)
+    set_state(db, ENROLLMENT_WATERMARK, watermark)
+    db.commit()
+    logger.info("Refreshed recommendations for %d courses", len(changed))
+    return len(changed)
+
+def list_recommendations(db: Session, course_id: int, limit: int):
+    """
+    Service function to get the precomputed recommendations of a course.
+
+    Args:
+        db (Session): The database session for database operations.
+        course_id (int): The ID of the course.
+        limit (int): The maximum number of recommendations.
+
+    Returns:
+        List[dict]: The recommended courses with their similarity score.
+    """
+    return [
+        {"id": course.id, "title": course.title, "description": course.description, "score": score}
+        for course, score in get_recommendations(db, course_id, limit)
+    ]
+
+def main():
+    parser = argparse.ArgumentParser(description="Compute co-enrollment course recommendations.")
+    parser.add_argument("--full", action="store_true", help="rebuild every course instead of the changed ones")
+    parser.add_argument("--top-k", type=int, default=None, help="neighbours kept per course")
+    args = parser.parse_args()
+
+    from db.database import db_instance
+    logging.basicConfig(level=logging.INFO)
+    db = db_instance.SessionLocal()
+    try:
+        job = rebuild_recommendations if args.full else refresh_recommendations
+        job(db, args.top_k)
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
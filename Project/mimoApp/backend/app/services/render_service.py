@@ -0,0 +1,56 @@
+import logging
+from sqlalchemy.orm import Session
+from models.Lesson import Lesson
+from repositories.rendition_repo import get_rendition, save_rendition
+from repositories.job_repo import enqueue_job
+from core.config import settings
+from core.render import content_hash, render_content, renderer_id
+
+logger = logging.getLogger(__name__)
+
+def render_lesson(db: Session, lesson: Lesson):
+    """
+    Service function returning the sanitized HTML of a lesson, rendering it if needed.
+
+    The HTML is looked up by content hash and renderer, so it is only rendered once per
+    distinct body and renderer version: at write time normally, or lazily on the first
+    read after a renderer upgrade.
+
+    Args:
+        db (Session): The database session for database operations.
+        lesson (Lesson): The lesson to render.
+
+    Returns:
+        tuple: `(html, etag)`, the ETag identifying this exact rendition.
+    """
+    source_hash = lesson.content_hash or content_hash(lesson.content)
+    renderer = renderer_id()
+    html = get_rendition(db, source_hash, renderer)
+    if html is None:
+        html = render_content(lesson.content)
+        save_rendition(db, source_hash, renderer, html)
+    return html, f'"{source_hash[:32]}-{renderer}"'
+
+def prerender_lesson(db: Session, lesson: Lesson):
+    """
+    Service function rendering a lesson after it was created or updated.
+
+    With `LESSON_RENDER_IN_BACKGROUND` the work is handed to the job worker instead of
+    being done in the request.
+
+    The lesson is already committed: a rendering failure is logged and the lesson is
+    rendered on its first read instead (see `render_lesson`), rather than failing a
+    request whose write succeeded.
+
+    Args:
+        db (Session): The database session for database operations.
+        lesson (Lesson): The lesson that was written.
+    """
+    try:
+        if settings.LESSON_RENDER_IN_BACKGROUND:
+            enqueue_job(db, "lessons.render", {"lesson_id": lesson.id})
+        else:
+            render_lesson(db, lesson)
+    except Exception:
+        db.rollback()
+        logger.exception("Pre-rendering lesson %s failed, it will be rendered on its first read", lesson.id)
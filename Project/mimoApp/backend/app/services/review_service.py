@@ -0,0 +1,98 @@
+from fastapi import HTTPException, status
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from repositories.course_repo import get_course_by_id
+from repositories.review_repo import (
+    create_review,
+    get_review,
+    get_reviews_by_course,
+    update_review,
+    delete_review,
+    get_top_rated_courses,
+)
+from schemas.review import ReviewCreate, ReviewUpdate
+
+def add_review(db: Session, user_id: int, course_id: int, review: ReviewCreate):
+    """
+    Service function to review a course.
+
+    Args:
+        db (Session): The database session for database operations.
+        user_id (int): The ID of the author.
+        course_id (int): The ID of the course to review.
+        review (ReviewCreate): The rating and comment.
+
+    Returns:
+        Review: The created review object.
+
+    Raises:
+        HTTPException (404): If the course does not exist.
+        HTTPException (409): If the user already reviewed this course.
+    """
+    if get_course_by_id(db, course_id) is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Course not found")
+    try:
+        return create_review(db, user_id, course_id, review.rating, review.comment)
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="You already reviewed this course")
+
+def list_reviews(db: Session, course_id: int, limit: int, offset: int):
+    """
+    Service function to list the reviews of a course, newest first.
+    """
+    return get_reviews_by_course(db, course_id, limit, offset)
+
+def _get_own_review(db: Session, review_id: int, user_id: int):
+    # Locked: a concurrent edit must not change the rating the aggregates are adjusted from
+    db_review = get_review(db, review_id, for_update=True)
+    if db_review is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Review not found")
+    if db_review.user_id != user_id:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="You can only modify your own reviews")
+    return db_review
+
+def modify_review(db: Session, review_id: int, user_id: int, review: ReviewUpdate):
+    """
+    Service function to update one of the user's reviews.
+
+    Raises:
+        HTTPException (404): If the review does not exist.
+        HTTPException (403): If the review belongs to another user.
+    """
+    db_review = _get_own_review(db, review_id, user_id)
+    return update_review(db, db_review, review.rating, review.comment)
+
+def remove_review(db: Session, review_id: int, user_id: int):
+    """
+    Service function to delete one of the user's reviews.
+
+    Raises:
+        HTTPException (404): If the review does not exist.
+        HTTPException (403): If the review belongs to another user.
+    """
+    delete_review(db, _get_own_review(db, review_id, user_id))
+
+def list_top_rated_courses(db: Session, limit: int, offset: int):
+    """
+    Service function to get a page of the top rated courses.
+
+    Args:
+        db (Session): The database session for database operations.
+        limit (int): The page size.
+        offset (int): The number of courses to skip.
+
+    Returns:
+        List[dict]: The ranked courses with their rating figures.
+    """
+    return [
+        {
+            "id": course.id,
+            "title": course.title,
+            "description": course.description,
+            "average_rating": round(rating.rating_sum / rating.rating_count, 2),
+            "review_count": rating.rating_count,
+            "score": round(rating.score, 4),
+        }
+        for course, rating in get_top_rated_courses(db, limit, offset)
+    ]
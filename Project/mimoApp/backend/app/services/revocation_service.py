@@ -0,0 +1,66 @@
+import json
+from datetime import datetime, timezone
+from sqlalchemy.orm import Session
+from db.database import db_instance, pg_listener
+from repositories.revocation_repo import revoke_token, is_token_revoked, get_active_revocations
+from core.config import settings
+from core.metrics import register_metrics
+from core.revocation import RevocationCache
+
+def _load_revocations():
+    db = db_instance.SessionLocal()
+    try:
+        return [(jti, expires_at.timestamp()) for jti, expires_at in get_active_revocations(db)]
+    finally:
+        db.close()
+
+def _confirm_revocation(jti: str):
+    # Runs while authenticating a request: reuse its session rather than a second connection
+    with db_instance.session_scope() as db:
+        return is_token_revoked(db, jti)
+
+def _on_revocation_notify(payload: str):
+    message = json.loads(payload)
+    revocation_cache.add(message["jti"], message["exp"])
+
+# Per-worker view of the revoked tokens, kept in sync through LISTEN/NOTIFY and periodic rebuilds
+revocation_cache = RevocationCache(
+    load=_load_revocations,
+    confirm=_confirm_revocation,
+    sync_seconds=settings.REVOCATION_SYNC_SECONDS,
+    capacity=settings.REVOCATION_BLOOM_CAPACITY,
+    error_rate=settings.REVOCATION_BLOOM_ERROR_RATE,
+    cache_size=settings.REVOCATION_CACHE_SIZE,
+)
+pg_listener.subscribe(settings.REVOCATION_CHANNEL, _on_revocation_notify)
+register_metrics("revocations", revocation_cache.stats)
+
+def revoke_access_token(db: Session, claims: dict):
+    """
+    Service function to revoke an access token until it expires.
+
+    Args:
+        db (Session): The database session for database operations.
+        claims (dict): The decoded claims of the token (`jti`, `sub` and `exp`).
+    """
+    expires_at = datetime.fromtimestamp(claims["exp"], tz=timezone.utc)
+    revoke_token(db, claims["jti"], int(claims["sub"]), expires_at)
+    revocation_cache.add(claims["jti"], claims["exp"])  # Effective right away in this worker
+
+def is_access_token_revoked(claims: dict):
+    """
+    Service function telling whether an access token was revoked.
+
+    Costs one Bloom filter lookup in the common case; tokens issued without a `jti`
+    cannot be revoked.
+
+    Args:
+        claims (dict): The decoded claims of the token.
+
+    Returns:
+        bool: True if the token was revoked.
+    """
+    jti = claims.get("jti")
+    if jti is None:
+        return False
+    return revocation_cache.is_revoked(jti, claims["exp"])
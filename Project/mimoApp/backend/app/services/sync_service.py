@@ -0,0 +1,76 @@
+from fastapi import HTTPException, status
+from sqlalchemy.orm import Session
+from repositories.sync_repo import get_changes_since
+from core.config import settings
+
+def _serialize(entity: str, row) -> dict:
+    """
+    Builds the `data` payload of an upsert change.
+    """
+    if entity == "course":
+        return {"id": row.id, "title": row.title, "description": row.description, "category_id": row.category_id}
+    return {"id": row.id, "title": row.title, "content": row.content, "course_id": row.course_id, "rank": row.rank}
+
+def parse_sync_token(token: str | None) -> tuple[int, int]:
+    """
+    Decodes a sync token into the feed position of the last change seen by the client.
+
+    Tokens are `<change_xid>:<change_seq>`. A plain sequence number, the format of the
+    tokens issued before transaction IDs were recorded, is read as `0:<seq>`: the rows
+    stamped back then all carry transaction ID 0.
+
+    Args:
+        token (str | None): The token returned by a previous call, or None for a full sync.
+
+    Returns:
+        tuple[int, int]: The `(change_xid, change_seq)` to continue from, `(0, 0)` for a full sync.
+
+    Raises:
+        HTTPException (400): If the token is malformed.
+    """
+    if not token:
+        return (0, 0)
+    xid, _, seq = token.rpartition(":")
+    try:
+        since = (int(xid or 0), int(seq))
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid sync token")
+    if min(since) < 0:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid sync token")
+    return since
+
+def _format_sync_token(position: tuple[int, int]) -> str:
+    return f"{position[0]}:{position[1]}"
+
+def list_changes(db: Session, token: str | None, limit: int | None = None):
+    """
+    Service function to get a page of catalog changes after the given token.
+
+    Args:
+        db (Session): The database session for database operations.
+        token (str | None): The token returned by the previous call, or None to start over.
+        limit (int | None): The page size, capped at `SYNC_PAGE_SIZE`.
+
+    Returns:
+        dict: The changes, the continuation token and whether more changes are available.
+    """
+    since = parse_sync_token(token)
+    limit = min(limit or settings.SYNC_PAGE_SIZE, settings.SYNC_PAGE_SIZE)
+
+    rows = get_changes_since(db, since, limit)
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    changes = [
+        {
+            "entity": entity,
+            "op": op,
+            "id": row.entity_id if op == "delete" else row.id,
+            "seq": position[1],
+            "data": None if op == "delete" else _serialize(entity, row),
+        }
+        for position, entity, op, row in rows
+    ]
+    # With no new changes the client keeps its current position
+    next_token = _format_sync_token(rows[-1][0] if rows else since)
+    return {"changes": changes, "next_token": next_token, "has_more": has_more}
@@ -1,12 +1,16 @@
+import uuid
 from datetime import datetime, timedelta
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, Depends
 from jose import jwt, JWTError
 from passlib.context import CryptContext
 from db.database import db_instance
-from repositories.user_repo import create_user, get_user_by_email, get_user_by_id
+from repositories.user_repo import create_user, get_user_by_email, get_user_by_id, get_users_by_ids
 from schemas.user import UserCreate
 from core.config import settings
+from core.batch import check_batch_size, order_by_ids
+from core.profiler import attribute_thread
+from services.revocation_service import is_access_token_revoked
 from fastapi.security import OAuth2PasswordBearer
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
@@ -36,16 +40,12 @@ def registrer_user(db: Session, user: UserCreate):
     if existing_user:
         raise HTTPException(status_code=400, detail="User already registered")
 
-    # Hash the password before creating the user
-    hashed_password = hash_password(user.password)
-
-    # Crear un diccionario con los datos de UserCreate y añadir hashed_password
-    user_data = user.dict()
-    user_data.pop("password")  # Eliminar el campo password porque no se almacena en la DB
-    user_data["hashed_password"] = hashed_password
-
-    # Llamar a create_user con los datos corregidos
-    return create_user(db, user_data)
+    # The repository hashes the password and records the registration event
+    try:
+        return create_user(db, user)
+    except ValueError:
+        # Registered concurrently since the check above
+        raise HTTPException(status_code=400, detail="User already registered")
 
 def authenticate_user(db: Session, email: str, password: str):
     """
@@ -58,33 +58,58 @@ def authenticate_user(db: Session, email: str, password: str):
 
 def create_access_token(data: dict, expires_delta: timedelta = None):
     """
-    Creates a JWT access token.
+    Creates a JWT access token with a unique ID (`jti`), so it can be revoked.
     """
     to_encode = data.copy()
     expire = datetime.utcnow() + (expires_delta or timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES))
-    to_encode.update({"exp": expire})
+    to_encode.update({"exp": expire, "jti": uuid.uuid4().hex})
     # Store user ID in the token's sub (subject) field
     to_encode.update({"sub": str(data["user_id"])})
     return jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
 
-def get_db():
+# Dependency for obtaining the request's database session: the same callable as the
+# routes' `db_instance.get_session`, so FastAPI resolves a single session per request
+get_db = db_instance.get_session
+
+
+def decode_access_token_claims(token: str) -> dict:
     """
-    Dependency for obtaining a database session.
+    Validates a JWT access token, including its revocation, and returns its claims.
     """
-    yield from db_instance.get_session()
+    try:
+        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    except JWTError:
+        raise HTTPException(status_code=401, detail="Invalid token")
+    if payload.get("sub") is None:
+        raise HTTPException(status_code=401, detail="Invalid token")
+    if is_access_token_revoked(payload):
+        raise HTTPException(status_code=401, detail="Token has been revoked")
+    return payload
 
 
-def get_current_user(db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)):
-    payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]) 
-    user_id = payload.get("sub")
-    if user_id is None:
-        raise HTTPException(status_code=401, detail="Invalid token")
+def decode_access_token(token: str) -> int:
+    """
+    Validates a JWT access token and returns the ID of the user it was issued to.
+    """
+    user_id = decode_access_token_claims(token)["sub"]
 
-    
     try:
-        user_id = int(user_id)
+        return int(user_id)
     except ValueError:
         raise HTTPException(status_code=401, detail="Invalid user ID in token")
+
+
+@attribute_thread  # Sync dependencies run in the threadpool: profiled requests sample them
+def get_current_token_claims(token: str = Depends(oauth2_scheme)):
+    """
+    Dependency returning the claims of the request's valid access token.
+    """
+    return decode_access_token_claims(token)
+
+
+@attribute_thread
+def get_current_user(db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)):
+    user_id = decode_access_token(token)
     
     user = get_user_by_id(db, user_id)
     if user is None:
@@ -93,8 +118,27 @@ def get_current_user(db: Session = Depends(get_db), token: str = Depends(oauth2_
     return user
 
 
+@attribute_thread
+def get_current_admin(current_user = Depends(get_current_user)):
+    """
+    Dependency restricting an endpoint to administrators.
+    """
+    if not current_user.is_admin:
+        raise HTTPException(status_code=403, detail="Administrator access required")
+    return current_user
+
+
 def get_user_by_id_service(db: Session, user_id: int):
     """
     Retrieves a user by their ID using the repository layer.
     """
     return get_user_by_id(db, user_id)
+
+
+def get_users_batch(db: Session, user_ids: list[int]):
+    """
+    Retrieves several users by their IDs with a single repository query,
+    preserving the order of the requested ids.
+    """
+    user_ids = check_batch_size(user_ids)
+    return order_by_ids(get_users_by_ids(db, user_ids), user_ids)
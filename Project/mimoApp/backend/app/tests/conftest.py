@@ -0,0 +1,61 @@
+"""
+Test suite configuration: runs the application on in-memory SQLite with the fixtures of
+`core.pytest_plugin`.
+
+    cd Project/mimoApp/backend/app && pytest
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DB_BACKEND", "sqlite")
+os.environ.setdefault("SECRET_KEY", "test-secret-key")
+os.environ.setdefault("OUTBOX_DISPATCHER_ENABLED", "false")
+
+import pytest
+
+pytest_plugins = ["core.pytest_plugin"]
+
+
+@pytest.fixture
+def make_user(db_session):
+    """
+    Returns a factory creating users directly in the test's transaction.
+    """
+    from models.user import User
+    from services.user_service import hash_password
+
+    created = []
+
+    def make(email: str | None = None, is_admin: bool = False, password: str = "secret"):
+        number = len(created) + 1
+        user = User(
+            username=f"user{number}",
+            email=email or f"user{number}@example.com",
+            hashed_password=hash_password(password),
+            is_admin=is_admin,
+        )
+        db_session.add(user)
+        db_session.commit()
+        created.append(user)
+        return user
+
+    return make
+
+
+@pytest.fixture
+def auth_headers():
+    """
+    Returns a function building the Authorization header of a user.
+    """
+    from services.user_service import create_access_token
+
+    def headers(user) -> dict:
+        return {"Authorization": f"Bearer {create_access_token(data={'user_id': user.id})}"}
+
+    return headers
+
+
+@pytest.fixture
+def admin_headers(make_user, auth_headers):
+    return auth_headers(make_user(is_admin=True))
@@ -0,0 +1,106 @@
+import asyncio
+import re
+from core.admission import AdmissionController, AdmissionControlMiddleware, RouteClass
+
+
+def _controller(limit=1, max_waiting=1, queue_timeout=0.05):
+    return AdmissionController(
+        classes=[
+            RouteClass("auth", limit=1, queue_timeout=queue_timeout, max_waiting=0, patterns=[re.compile(r"/auth/login$")]),
+            RouteClass("default", limit=limit, queue_timeout=queue_timeout, max_waiting=max_waiting),
+        ],
+        exempt=[r"/notifications/stream$"],
+        retry_after=3,
+    )
+
+
+def test_paths_are_classified_in_order():
+    controller = _controller()
+
+    assert controller.classify("/auth/login").name == "auth"
+    assert controller.classify("/courses/courses/1").name == "default"
+    assert controller.classify("/notifications/stream") is None
+
+
+def _call(middleware, path):
+    """
+    Runs one request through the middleware and returns its status.
+    """
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    async def receive():
+        return {"type": "http.request", "body": b""}
+
+    async def run():
+        await middleware({"type": "http", "path": path}, receive, send)
+        start = sent[0]
+        return start["status"], dict(start["headers"])
+
+    return run()
+
+
+def test_requests_beyond_the_queue_are_shed_with_retry_after():
+    release = asyncio.Event()
+
+    async def app(scope, receive, send):
+        await release.wait()
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    async def scenario():
+        controller = _controller(queue_timeout=5)
+        middleware = AdmissionControlMiddleware(app, controller)
+        running = asyncio.ensure_future(_call(middleware, "/courses/"))
+        queued = asyncio.ensure_future(_call(middleware, "/courses/"))
+        await asyncio.sleep(0.01)
+        shed = await _call(middleware, "/courses/")  # The one queue place is taken
+        stats = controller.stats()["default"]
+        release.set()
+        return shed, await running, await queued, stats, controller.stats()["default"]
+
+    shed, running, queued, during, after = asyncio.run(scenario())
+
+    assert shed[0] == 503 and shed[1][b"retry-after"] == b"3"
+    assert running[0] == queued[0] == 200
+    assert (during["in_flight"], during["waiting"], during["shed"]) == (1, 1, 1)
+    assert (after["in_flight"], after["admitted"]) == (0, 2)
+
+
+def test_a_request_waiting_too_long_is_shed():
+    async def app(scope, receive, send):
+        await asyncio.sleep(1)
+
+    async def scenario():
+        middleware = AdmissionControlMiddleware(app, _controller(queue_timeout=0.05))
+        running = asyncio.ensure_future(middleware({"type": "http", "path": "/courses/"}, None, None))
+        await asyncio.sleep(0.01)
+        status = await _call(middleware, "/courses/")
+        running.cancel()
+        return status
+
+    assert asyncio.run(scenario())[0] == 503
+
+
+def test_a_pool_timeout_answers_503(client, monkeypatch):
+    from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+    def busy(db):
+        raise PoolTimeoutError("QueuePool limit reached")
+
+    monkeypatch.setattr("api.categories.list_categories", busy)
+    response = client.get("/categories/")
+
+    assert response.status_code == 503
+    assert response.headers["retry-after"]
+
+
+def test_exports_have_their_own_budget():
+    from main import admission
+
+    export = admission.classify("/admin/export/courses")
+
+    assert export is not None and export.name == "export"
+    assert admission.classify("/assets/" + "0" * 64) is None
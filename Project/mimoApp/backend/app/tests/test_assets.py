@@ -0,0 +1,54 @@
+import os
+import pytest
+from core.storage import BlobStore
+from services import asset_service
+
+
+@pytest.fixture(autouse=True)
+def blob_store(tmp_path, monkeypatch):
+    store = BlobStore(str(tmp_path), 1024 * 1024)
+    monkeypatch.setattr(asset_service, "blob_store", store)
+    return store
+
+
+@pytest.fixture
+def lesson(client):
+    client.post("/courses/courses/", json={"id": 1, "title": "SQL", "description": "Joins"})
+    client.post("/lesson/lessons/", json={"id": 1, "title": "SELECT", "content": "Rows", "course_id": 1})
+
+
+def _upload(client, headers, filename, content, content_type):
+    response = client.put(
+        f"/assets/lessons/1/{filename}", content=content, headers={**headers, "Content-Type": content_type}
+    )
+    assert response.status_code == 201
+    return response.json()["url"]
+
+
+def test_images_are_displayed_inline(client, lesson, admin_headers):
+    url = _upload(client, admin_headers, "diagram.png", b"\x89PNG", "image/png")
+
+    response = client.get(url)
+    revalidated = client.get(url, headers={"If-None-Match": f'W/{response.headers["etag"]}'})
+
+    assert response.content == b"\x89PNG"
+    assert response.headers["x-content-type-options"] == "nosniff"
+    assert "content-disposition" not in response.headers
+    assert revalidated.status_code == 304
+
+
+@pytest.mark.parametrize("filename, content_type", [("page.html", "text/html"), ("logo.svg", "image/svg+xml")])
+def test_other_types_are_always_downloaded(client, lesson, admin_headers, filename, content_type):
+    url = _upload(client, admin_headers, filename, b"<script>alert(1)</script>", content_type)
+
+    response = client.get(url)
+
+    assert response.headers["content-disposition"].startswith("attachment")
+    assert response.headers["x-content-type-options"] == "nosniff"
+
+
+def test_a_missing_file_is_not_found(client, lesson, admin_headers, blob_store):
+    url = _upload(client, admin_headers, "notes.txt", b"notes", "text/plain")
+    os.remove(blob_store.path_for(url.rsplit("/", 1)[1]))
+
+    assert client.get(url).status_code == 404
@@ -0,0 +1,51 @@
+import pytest
+from core.config import settings
+from models.course import Course
+from models.Lesson import Lesson
+
+
+@pytest.fixture
+def catalog(db_session):
+    db_session.add_all([Course(id=1, title="SQL", description="Joins"), Course(id=2, title="Go", description="Channels")])
+    db_session.flush()
+    db_session.add(Lesson(id=1, title="SELECT", content="...", course_id=1, rank="a0"))
+    db_session.commit()
+
+
+def test_courses_batch_keeps_request_order(client, catalog):
+    response = client.get("/courses/courses/batch", params={"ids": "2,42,1,2"})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert [course["id"] for course in body["items"]] == [2, 1]
+    assert body["missing"] == [42]
+
+
+def test_lessons_batch(client, catalog):
+    response = client.get("/lesson/lessons/batch", params={"ids": "1,9"})
+
+    assert response.status_code == 200
+    assert response.json()["items"][0]["title"] == "SELECT"
+    assert response.json()["missing"] == [9]
+
+
+def test_users_batch(client, make_user):
+    user = make_user()
+
+    response = client.get("/users/users/batch", params={"ids": f"{user.id},999"})
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "items": [{"id": user.id, "username": user.username, "email": user.email}],
+        "missing": [999],
+    }
+
+
+@pytest.mark.parametrize("path", ["/courses/courses/batch", "/lesson/lessons/batch", "/users/users/batch"])
+def test_batch_rejects_bad_lists(client, path):
+    oversized = ",".join(["1"] * (settings.MAX_BATCH_SIZE + 1))
+
+    assert client.get(path, params={"ids": oversized}).status_code == 400
+    assert client.get(path, params={"ids": "1,x"}).status_code == 400
+    assert client.get(path, params={"ids": ""}).status_code == 400
+    assert client.get(path).status_code == 422
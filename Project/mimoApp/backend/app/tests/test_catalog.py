@@ -0,0 +1,70 @@
+from datetime import datetime, timezone
+import pytest
+from repositories.job_repo import has_pending_job
+from core.snapshot import SnapshotStore
+from models.job import Job
+from services import catalog_service
+
+
+@pytest.fixture(autouse=True)
+def catalog_store(tmp_path, monkeypatch):
+    store = SnapshotStore(str(tmp_path), "catalog")
+    monkeypatch.setattr(catalog_service, "catalog_store", store)
+    return store
+
+
+def _finish_rebuild(db_session, status):
+    db_session.query(Job).filter(Job.kind == "catalog.snapshot", Job.status == "queued").update(
+        {"status": status, "finished_at": datetime.now(timezone.utc)}
+    )
+    db_session.flush()
+
+
+def _rebuild(db_session):
+    catalog_service.build_catalog_snapshot(db_session)
+    _finish_rebuild(db_session, "succeeded")
+
+
+def _titles(response):
+    return [course["title"] for course in response.json()]
+
+
+def test_writes_are_visible_until_the_snapshot_is_rebuilt(client, db_session):
+    client.post("/courses/courses/", json={"id": 1, "title": "SQL", "description": "Joins"})
+    _rebuild(db_session)
+    client.post("/courses/courses/", json={"id": 2, "title": "Go", "description": "Channels"})
+
+    pending = client.get("/courses/courses/")
+    _rebuild(db_session)
+    rebuilt = client.get("/courses/courses/")
+
+    assert "etag" not in pending.headers and _titles(pending) == ["SQL", "Go"]
+    assert not has_pending_job(db_session, "catalog.snapshot")
+    assert "etag" in rebuilt.headers and _titles(rebuilt) == ["SQL", "Go"]
+
+
+def test_snapshot_revalidation_accepts_etag_lists(client, db_session):
+    client.post("/courses/courses/", json={"id": 1, "title": "SQL", "description": "Joins"})
+    _rebuild(db_session)
+
+    etag = client.get("/courses/courses/", headers={"Accept-Encoding": "identity"}).headers["etag"]
+    response = client.get(
+        "/courses/courses/", headers={"Accept-Encoding": "identity", "If-None-Match": f'"stale", W/{etag}'}
+    )
+
+    assert response.status_code == 304
+
+
+def test_a_failed_rebuild_serves_the_live_catalog_until_one_succeeds(client, db_session):
+    client.post("/courses/courses/", json={"id": 1, "title": "SQL", "description": "Joins"})
+    _rebuild(db_session)
+    client.post("/courses/courses/", json={"id": 2, "title": "Go", "description": "Channels"})
+    _finish_rebuild(db_session, "failed")
+
+    failed = client.get("/courses/courses/")
+    catalog_service.schedule_catalog_snapshot(db_session)
+    _rebuild(db_session)
+    rebuilt = client.get("/courses/courses/")
+
+    assert "etag" not in failed.headers and _titles(failed) == ["SQL", "Go"]
+    assert "etag" in rebuilt.headers and _titles(rebuilt) == ["SQL", "Go"]
@@ -0,0 +1,48 @@
+from sqlalchemy import update
+from models.category import CourseCategory
+from models.course import Course
+from schemas.course import CourseUpdate
+from services.course_service import update_course_details
+
+
+def _counts(client):
+    return {category["name"]: category["course_count"] for category in client.get("/categories/").json()}
+
+
+def test_unknown_category_is_rejected(client):
+    response = client.post("/courses/courses/", json={"id": 1, "title": "SQL", "description": "Joins", "category_id": 99})
+    assert response.status_code == 404
+
+    client.post("/courses/courses/", json={"id": 1, "title": "SQL", "description": "Joins"})
+    response = client.put("/courses/courses/1", json={"id": 1, "title": "SQL", "description": "Joins", "category_id": 99})
+    assert response.status_code == 404
+
+
+def test_moving_a_course_moves_its_count(client, make_user, auth_headers):
+    headers = auth_headers(make_user())
+    data = client.post("/categories/", json={"name": "Data"}, headers=headers).json()
+    web = client.post("/categories/", json={"name": "Web"}, headers=headers).json()
+    course = client.post(
+        "/courses/courses/", json={"id": 1, "title": "SQL", "description": "Joins", "category_id": data["id"]}
+    ).json()
+    assert _counts(client) == {"Data": 1, "Web": 0}
+
+    client.put(f"/courses/courses/{course['id']}", json={"id": 1, "title": "SQL", "description": "Joins", "category_id": web["id"]})
+
+    assert _counts(client) == {"Data": 0, "Web": 1}
+
+
+def test_move_counts_out_of_the_current_category(db_session):
+    db_session.add_all([CourseCategory(id=1, name="Data", course_count=0), CourseCategory(id=2, name="Web", course_count=1)])
+    db_session.flush()
+    db_session.add(Course(id=1, title="SQL", description="Joins", category_id=1))
+    db_session.commit()
+    db_session.get(Course, 1)  # Loaded in category 1
+
+    # Another transaction moved the course to category 2 in the meantime
+    db_session.execute(update(Course).where(Course.id == 1).values(category_id=2).execution_options(synchronize_session=False))
+
+    update_course_details(db_session, 1, CourseUpdate(id=1, title="SQL", description="Joins", category_id=1))
+
+    counts = dict(db_session.query(CourseCategory.id, CourseCategory.course_count).all())
+    assert counts == {1: 1, 2: 0}
@@ -0,0 +1,81 @@
+from sqlalchemy import func, select
+from core.cache import TTLCache
+from models.course import Course
+from models.user_course import UserCourse
+from repositories.enrollment_repo import create_enrollment
+from services import dashboard_service
+from services.dashboard_service import dashboard_cache, get_dashboard
+
+
+def _live_enrollments(db_session):
+    return db_session.scalar(select(func.count()).select_from(UserCourse).where(UserCourse.deleted_at.is_(None)))
+
+
+def test_enrolling_twice_keeps_one_enrollment(client, make_user, auth_headers):
+    headers = auth_headers(make_user())
+    client.post("/courses/courses/", json={"id": 1, "title": "SQL", "description": "Joins"})
+
+    first = client.post("/courses/courses/1/enrollment", headers=headers)
+    second = client.post("/courses/courses/1/enrollment", headers=headers)
+
+    assert first.status_code == second.status_code == 201
+    assert first.json()["id"] == second.json()["id"]
+
+
+def test_a_concurrent_enrollment_is_not_inserted_again(db_session, make_user):
+    user = make_user()
+    db_session.add(Course(id=1, title="SQL", description="Joins"))
+    db_session.commit()
+
+    # The other request's row is already there when this one inserts
+    assert create_enrollment(db_session, user.id, 1) is not None
+    assert create_enrollment(db_session, user.id, 1) is None
+
+    assert _live_enrollments(db_session) == 1
+
+
+def test_a_user_can_enroll_again_after_leaving(client, db_session, make_user, auth_headers):
+    headers = auth_headers(make_user())
+    client.post("/courses/courses/", json={"id": 1, "title": "SQL", "description": "Joins"})
+    first = client.post("/courses/courses/1/enrollment", headers=headers).json()
+
+    assert client.delete("/courses/courses/1/enrollment", headers=headers).status_code == 204
+    again = client.post("/courses/courses/1/enrollment", headers=headers).json()
+
+    assert again["id"] != first["id"]
+    assert _live_enrollments(db_session) == 1
+
+
+def test_a_value_read_before_an_invalidation_is_not_cached():
+    cache = TTLCache("test", maxsize=2, ttl=60)
+
+    generation = cache.generation()
+    cache.invalidate("ada")  # The data changed while the value was being read
+    cache.set("ada", "stale", generation)
+    assert cache.get("ada") is None
+
+    cache.set("ada", "fresh", cache.generation())
+    assert cache.get("ada") == "fresh"
+
+    # Keys whose invalidation was forgotten are treated as just invalidated
+    generation = cache.generation()
+    for key in ("a", "b", "c"):
+        cache.invalidate(key)
+    cache.set("a", "stale", generation)
+    assert cache.get("a") is None
+
+
+def test_the_dashboard_is_not_cached_when_invalidated_while_it_is_read(db_session, make_user, monkeypatch):
+    user = make_user()
+    dashboard_cache.invalidate(user.id)
+    read_rows = dashboard_service.get_dashboard_rows
+
+    def rows_then_enrollment(*args):
+        rows = read_rows(*args)
+        dashboard_cache.invalidate(user.id)  # An enrollment committed by another request
+        return rows
+
+    monkeypatch.setattr(dashboard_service, "get_dashboard_rows", rows_then_enrollment)
+    get_dashboard(db_session, user.id)
+
+    assert dashboard_cache.get(user.id) is None
@@ -0,0 +1,67 @@
+import io
+from datetime import datetime, timezone
+import pytest
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from db.database import db_instance
+from models.course import Course
+from models.Lesson import Lesson
+from models.user_course import UserCourse
+from services.export_service import _iter_chunks, _stream_parquet, arrow_schema
+
+pq = pytest.importorskip("pyarrow.parquet")
+
+
+def _read(chunks, dataset, columns):
+    return pq.read_table(io.BytesIO(b"".join(_stream_parquet(iter(chunks), arrow_schema(dataset, columns)))))
+
+
+def test_parquet_columns_keep_their_type_when_a_chunk_is_all_null():
+    enrolled_at = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    chunks = [[(1, None, enrolled_at)], [(2, 7, enrolled_at)]]
+
+    table = _read(chunks, "enrollments", ["id", "course_id", "enrolled_at"])
+
+    assert str(table.schema.field("course_id").type) == "int64"
+    assert table.column("course_id").to_pylist() == [None, 7]
+    assert table.num_rows == 2
+
+
+def test_empty_parquet_export_is_a_valid_file():
+    table = _read([], "users", ["id", "is_admin"])
+
+    assert table.num_rows == 0
+    assert table.schema.names == ["id", "is_admin"]
+
+
+def test_export_requires_an_admin(client, make_user, auth_headers):
+    response = client.get("/admin/export/users", headers=auth_headers(make_user()))
+    assert response.status_code == 403
+
+
+def test_soft_deleted_rows_are_not_exported(db_session, make_user, monkeypatch):
+    connection = db_session.connection()
+    monkeypatch.setattr(
+        db_instance, "SessionLocal", lambda: Session(bind=connection, join_transaction_mode="create_savepoint")
+    )
+    user = make_user()
+    db_session.add_all([
+        Course(id=1, title="SQL", description="Joins"),
+        Course(id=2, title="Go", description="Channels", deleted_at=func.now()),
+    ])
+    db_session.flush()
+    db_session.add_all([
+        Lesson(id=1, title="SELECT", content="", course_id=1, rank="i"),
+        Lesson(id=2, title="JOIN", content="", course_id=1, rank="j", deleted_at=func.now()),
+        Lesson(id=3, title="chan", content="", course_id=2, rank="i"),
+        UserCourse(id=1, user_id=user.id, course_id=1, completed=False),
+        UserCourse(id=2, user_id=user.id, course_id=1, completed=False, deleted_at=func.now()),
+        UserCourse(id=3, user_id=user.id, course_id=2, completed=False),
+    ])
+    db_session.flush()
+
+    def exported(dataset):
+        return [row[0] for chunk in _iter_chunks(dataset, ["id"], None) for row in chunk]
+
+    assert exported("lessons") == [1]
+    assert exported("enrollments") == [1]
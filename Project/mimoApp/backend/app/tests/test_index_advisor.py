@@ -0,0 +1,26 @@
+from services.index_advisor import collect_candidates, parse_query
+
+
+def _statement(query, total_ms=10.0):
+    return {"fingerprint": query, "query": query, "calls": 1, "total_ms": total_ms}
+
+
+def test_pattern_filters_are_not_btree_candidates():
+    usage = parse_query("SELECT courses.id FROM courses WHERE courses.title ILIKE ? AND courses.id > ?")
+
+    assert usage["courses"]["range"] == ["id"]
+    assert collect_candidates([_statement("SELECT courses.id FROM courses WHERE courses.title LIKE ?")]) == []
+
+
+def test_a_candidate_is_as_usable_as_its_least_served_statement():
+    # Only the first statement carries the predicate of the partial ix_courses_deleted_at
+    served = (
+        "SELECT courses.id FROM courses WHERE courses.description = ? AND courses.deleted_at < ?"
+        " AND courses.deleted_at IS NOT NULL"
+    )
+    unserved = "SELECT courses.id FROM courses WHERE courses.description = ? AND courses.deleted_at < ?"
+
+    for workload in ([_statement(served), _statement(unserved)], [_statement(unserved), _statement(served)]):
+        [candidate] = collect_candidates(workload)
+        assert candidate.columns == ("description", "deleted_at")
+        assert candidate.usable == 0
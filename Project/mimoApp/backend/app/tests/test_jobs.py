@@ -0,0 +1,81 @@
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime, timedelta, timezone
+import pytest
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+from db.database import db_instance
+from models.job import Job
+from repositories.job_repo import claim_jobs, complete_job, enqueue_job, renew_leases, requeue_expired_jobs
+from worker import JobWorker
+
+
+def _status(db_session, job_id):
+    return db_session.execute(select(Job.status, Job.worker).where(Job.id == job_id)).one()
+
+
+@pytest.fixture
+def worker_sessions(db_session, monkeypatch):
+    """
+    Makes the sessions the worker opens run in the test's transaction.
+    """
+    connection = db_session.connection()
+    monkeypatch.setattr(
+        db_instance, "SessionLocal", lambda: Session(bind=connection, join_transaction_mode="create_savepoint")
+    )
+
+
+def test_only_expired_leases_are_requeued(db_session):
+    alive = enqueue_job(db_session, "catalog.snapshot", {})
+    dead = enqueue_job(db_session, "catalog.snapshot", {})
+    claim_jobs(db_session, 2, "host:1", lease_seconds=60)
+    db_session.execute(
+        update(Job).where(Job.id == dead.id).values(lease_expires_at=datetime.now(timezone.utc) - timedelta(seconds=1))
+    )
+    db_session.commit()
+
+    assert requeue_expired_jobs(db_session) == 1
+    assert _status(db_session, alive.id).status == "running"
+    assert _status(db_session, dead.id).status == "queued"
+
+
+def test_a_requeued_job_belongs_to_its_new_worker(db_session):
+    db_job = enqueue_job(db_session, "catalog.snapshot", {})
+    claim_jobs(db_session, 1, "host:1", lease_seconds=60)
+    db_session.execute(update(Job).values(status="queued"))
+    claim_jobs(db_session, 1, "host:2", lease_seconds=60)
+
+    assert renew_leases(db_session, [db_job.id], "host:1", 60) == 0
+    complete_job(db_session, db_job.id, "host:1", {"late": True})
+
+    assert _status(db_session, db_job.id) == ("running", "host:2")
+
+
+def test_a_broken_pool_fails_its_jobs_and_is_replaced(db_session, worker_sessions):
+    db_job = enqueue_job(db_session, "catalog.snapshot", {})
+    worker = JobWorker(processes=1)
+    worker._slots.acquire()
+    claim_jobs(db_session, 1, worker.name, lease_seconds=60)
+    future = Future()
+    future.set_exception(BrokenProcessPool("A process in the process pool was terminated abruptly"))
+
+    worker._on_done(db_job.id, future)
+
+    assert _status(db_session, db_job.id).status == "queued"
+    assert worker._pool_broken.is_set()
+    assert worker._slots.acquire(blocking=False)
+
+
+def test_jobs_refused_by_a_broken_pool_are_released(db_session, worker_sessions):
+    jobs = [enqueue_job(db_session, "catalog.snapshot", {}) for _ in range(2)]
+    worker = JobWorker(processes=2)
+    claimed = [(db_job.id, db_job.kind, db_job.payload) for db_job in claim_jobs(db_session, 2, worker.name, 60)]
+
+    class BrokenPool:
+        def submit(self, *args):
+            raise BrokenProcessPool("A child process terminated abruptly")
+
+    worker._submit(BrokenPool(), claimed)
+
+    assert [_status(db_session, db_job.id).status for db_job in jobs] == ["queued", "queued"]
+    assert not worker._running
@@ -0,0 +1,173 @@
+"""
+Upgrades a database created with the original schema (before any migration existed)
+and checks that it ends up with the current columns, indexes and data.
+"""
+import os
+import pytest
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import inspect, text
+from core.render import content_hash
+from db.database import create_sqlite_engine
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+BASELINE_SCHEMA = [
+    "CREATE TABLE users (id INTEGER PRIMARY KEY, username VARCHAR, email VARCHAR UNIQUE, hashed_password VARCHAR)",
+    "CREATE TABLE courses (id INTEGER PRIMARY KEY, title VARCHAR NOT NULL, description VARCHAR NOT NULL)",
+    "CREATE UNIQUE INDEX ix_courses_title ON courses (title)",
+    "CREATE TABLE lessons (id INTEGER PRIMARY KEY, title VARCHAR NOT NULL, content VARCHAR NOT NULL,"
+    " course_id INTEGER NOT NULL REFERENCES courses (id))",
+    "CREATE UNIQUE INDEX ix_lessons_title ON lessons (title)",
+    "CREATE TABLE user_courses (id INTEGER PRIMARY KEY, user_id INTEGER REFERENCES users (id),"
+    " course_id INTEGER REFERENCES courses (id), completed BOOLEAN)",
+    # Tables added by the series before the migrations, as they were created then
+    "CREATE TABLE jobs (id INTEGER PRIMARY KEY, kind VARCHAR NOT NULL, payload JSON NOT NULL,"
+    " status VARCHAR NOT NULL DEFAULT 'queued', priority INTEGER NOT NULL DEFAULT 0,"
+    " attempts INTEGER NOT NULL DEFAULT 0, max_attempts INTEGER NOT NULL DEFAULT 3,"
+    " run_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP, result JSON, error VARCHAR, worker VARCHAR,"
+    " created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP, started_at DATETIME, finished_at DATETIME)",
+]
+
+
+@pytest.fixture
+def legacy_database(tmp_path):
+    engine = create_sqlite_engine(str(tmp_path / "legacy.db"))
+    with engine.begin() as connection:
+        for statement in BASELINE_SCHEMA:
+            connection.exec_driver_sql(statement)
+        connection.exec_driver_sql("INSERT INTO users VALUES (1, 'ada', 'Ada@example.com', 'x')")
+        connection.exec_driver_sql("INSERT INTO courses VALUES (1, 'SQL', 'Joins'), (2, 'Go', 'Channels')")
+        connection.exec_driver_sql("INSERT INTO lessons VALUES (1, 'SELECT', '# Select', 1), (2, 'JOIN', 'Join', 1)")
+        connection.exec_driver_sql("INSERT INTO user_courses VALUES (1, 1, 1, 0), (2, 1, 1, 0)")
+        connection.exec_driver_sql("INSERT INTO jobs (id, kind, payload, status) VALUES (1, 'catalog.snapshot', '{}', 'running')")
+    yield engine
+    engine.dispose()
+
+
+def upgrade(engine):
+    config = Config(os.path.join(APP_DIR, "alembic.ini"))
+    config.set_main_option("script_location", os.path.join(APP_DIR, "migrations"))
+    with engine.begin() as connection:
+        config.attributes["connection"] = connection
+        command.upgrade(config, "head")
+
+
+def columns(engine, table):
+    return {column["name"] for column in inspect(engine).get_columns(table)}
+
+
+def indexes(engine, table):
+    # Read from the catalog: SQLite's reflection skips expression indexes
+    with engine.connect() as connection:
+        return set(connection.execute(
+            text("SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = :table"), {"table": table}
+        ).scalars())
+
+
+def test_upgrade_is_idempotent_on_a_new_database(tmp_path):
+    engine = create_sqlite_engine(str(tmp_path / "new.db"))
+    upgrade(engine)
+    upgrade(engine)
+    with engine.connect() as connection:
+        assert connection.execute(text("SELECT count(*) FROM alembic_version")).scalar() == 1
+    engine.dispose()
+
+
+def test_change_feed_columns_are_backfilled(legacy_database):
+    upgrade(legacy_database)
+
+    assert {"updated_at", "change_seq", "change_xid"} <= columns(legacy_database, "courses")
+    assert "ix_lessons_change_xid_seq" in indexes(legacy_database, "lessons")
+    with legacy_database.connect() as connection:
+        positions = connection.execute(
+            text("SELECT change_xid, change_seq FROM courses UNION ALL SELECT change_xid, change_seq FROM lessons")
+        ).all()
+    seqs = [seq for _, seq in positions]
+    assert None not in seqs and len(set(seqs)) == 4
+    assert {xid for xid, _ in positions} == {0}
+
+
+def test_courses_get_a_category_column(legacy_database):
+    upgrade(legacy_database)
+
+    assert "category_id" in columns(legacy_database, "courses")
+    with legacy_database.connect() as connection:
+        assert connection.execute(text("SELECT count(*) FROM courses WHERE category_id IS NULL")).scalar() == 2
+
+
+def test_export_timestamps_are_backfilled(legacy_database):
+    upgrade(legacy_database)
+
+    assert "ix_user_courses_enrolled_at" in indexes(legacy_database, "user_courses")
+    with legacy_database.connect() as connection:
+        user = connection.execute(text("SELECT is_admin, created_at FROM users")).one()
+        enrolled_at = connection.execute(text("SELECT enrolled_at FROM user_courses")).scalar()
+    assert not user.is_admin and user.created_at is not None and enrolled_at is not None
+
+
+def test_running_jobs_get_a_lease(legacy_database):
+    upgrade(legacy_database)
+
+    with legacy_database.connect() as connection:
+        assert connection.execute(text("SELECT lease_expires_at FROM jobs WHERE id = 1")).scalar() is not None
+
+
+def test_titles_are_only_unique_among_live_rows(legacy_database):
+    upgrade(legacy_database)
+
+    assert {"ix_courses_category_id_id", "uq_courses_title_live"} <= indexes(legacy_database, "courses")
+    assert "ix_courses_title" not in indexes(legacy_database, "courses")
+    assert "ix_user_courses_course_id" in indexes(legacy_database, "user_courses")
+    with legacy_database.begin() as connection:
+        connection.execute(text("UPDATE courses SET deleted_at = CURRENT_TIMESTAMP WHERE id = 2"))
+        connection.execute(text("INSERT INTO courses (id, title, description, change_xid) VALUES (3, 'Go', 'Again', 0)"))
+
+
+def test_existing_lessons_are_ranked_in_id_order(legacy_database):
+    upgrade(legacy_database)
+
+    assert "ix_lessons_course_id_rank_live" in indexes(legacy_database, "lessons")
+    with legacy_database.connect() as connection:
+        ranks = connection.execute(text("SELECT rank FROM lessons ORDER BY id")).scalars().all()
+    assert None not in ranks and ranks == sorted(ranks) and len(set(ranks)) == 2
+
+
+def test_duplicate_enrollments_are_retired_before_the_unique_index(legacy_database):
+    upgrade(legacy_database)
+
+    assert "uq_user_courses_user_course_live" in indexes(legacy_database, "user_courses")
+    with legacy_database.connect() as connection:
+        live = connection.execute(text("SELECT id FROM user_courses WHERE deleted_at IS NULL")).scalars().all()
+    assert live == [1]
+
+
+def test_existing_lessons_get_their_content_hash(legacy_database):
+    upgrade(legacy_database)
+
+    with legacy_database.connect() as connection:
+        hashes = connection.execute(text("SELECT content, content_hash FROM lessons")).all()
+    assert all(digest == content_hash(content) for content, digest in hashes)
+
+
+def test_emails_become_unique_ignoring_case(legacy_database):
+    with legacy_database.begin() as connection:
+        connection.exec_driver_sql("CREATE INDEX ix_users_lower_email ON users (lower(email))")
+    upgrade(legacy_database)
+
+    assert "uq_users_lower_email" in indexes(legacy_database, "users")
+    assert "ix_users_lower_email" not in indexes(legacy_database, "users")
+
+
+def test_emails_differing_only_in_case_stop_the_upgrade(legacy_database):
+    with legacy_database.begin() as connection:
+        connection.exec_driver_sql("INSERT INTO users VALUES (2, 'ada2', 'ada@EXAMPLE.com', 'x')")
+
+    with pytest.raises(RuntimeError, match="ada@example.com"):
+        upgrade(legacy_database)
+
+
+def test_jobs_are_indexed_by_kind(legacy_database):
+    upgrade(legacy_database)
+
+    assert "ix_jobs_kind_status_finished" in indexes(legacy_database, "jobs")
@@ -0,0 +1,26 @@
+import asyncio
+import json
+from core.notification_hub import NotificationHub
+
+
+def test_hub_loads_announced_notifications_for_connected_users():
+    loaded = []
+
+    def loader(notification_id):
+        loaded.append(notification_id)
+        return {"id": notification_id, "user_id": 1, "message": "Hello"}
+
+    async def scenario():
+        hub = NotificationHub(queue_size=10, loader=loader)
+        hub.bind(asyncio.get_running_loop())
+        subscription = hub.subscribe(1)
+
+        hub.publish(json.dumps({"id": 7, "user_id": 1}))
+        hub.publish(json.dumps({"id": 8, "user_id": 2}))  # Nobody connected: not loaded
+        hub.publish("not json")
+
+        return await asyncio.wait_for(subscription.get(), 1)
+
+    assert asyncio.run(scenario()) == {"id": 7, "user_id": 1, "message": "Hello"}
+    assert loaded == [7]
+
@@ -0,0 +1,28 @@
+import pytest
+from sqlalchemy.orm import Session
+from starlette.websockets import WebSocketDisconnect
+from db.database import db_instance
+from services.user_service import create_access_token
+
+
+@pytest.fixture
+def socket_client(client, db_session, monkeypatch):
+    """
+    The WebSocket resolves its user in a session of its own: share the test's connection.
+    """
+    connection = db_session.connection()
+    monkeypatch.setattr(
+        db_instance, "SessionLocal", lambda: Session(bind=connection, join_transaction_mode="create_savepoint")
+    )
+    return client
+
+
+def test_sockets_are_only_accepted_for_existing_users(socket_client, make_user):
+    user = make_user()
+    with socket_client.websocket_connect(f"/notifications/ws?token={create_access_token(data={'user_id': user.id})}"):
+        pass
+
+    with pytest.raises(WebSocketDisconnect) as closed:
+        with socket_client.websocket_connect(f"/notifications/ws?token={create_access_token(data={'user_id': 999})}"):
+            pass
+    assert closed.value.code == 1008
@@ -0,0 +1,60 @@
+from datetime import datetime, timedelta, timezone
+import pytest
+from models.course import Course
+from models.notification import Notification
+from models.outbox import OutboxEvent
+from models.user_course import UserCourse
+from repositories.outbox_repo import add_outbox_event, LESSON_PUBLISHED
+from services import event_handlers  # noqa: F401  Registers the handlers
+from services.outbox_service import OutboxDispatcher, _handlers
+
+
+@pytest.fixture
+def published_lesson(db_session, make_user):
+    learner, dropped, _ = make_user(), make_user(), make_user()
+    db_session.add(Course(id=1, title="SQL", description="Joins"))
+    db_session.add_all([
+        UserCourse(user_id=learner.id, course_id=1),
+        UserCourse(user_id=dropped.id, course_id=1, deleted_at=datetime.now(timezone.utc)),
+    ])
+    event = add_outbox_event(db_session, LESSON_PUBLISHED, {"lesson_id": 1, "course_id": 1, "title": "SELECT"})
+    event.available_at = datetime.now(timezone.utc) - timedelta(seconds=1)
+    db_session.commit()
+    return event, learner
+
+
+def _notified_users(db_session):
+    return [user_id for (user_id,) in db_session.query(Notification.user_id).all()]
+
+
+def test_lesson_announcement_skips_deleted_enrollments(db_session, published_lesson):
+    event, learner = published_lesson
+
+    assert OutboxDispatcher().process_batch(db_session) == 1
+
+    assert _notified_users(db_session) == [learner.id]
+    assert db_session.get(OutboxEvent, event.id).status == "done"
+
+
+def test_failed_event_is_retried_without_duplicates(db_session, published_lesson):
+    event, learner = published_lesson
+
+    def fail(db, payload):
+        raise RuntimeError("mail server down")
+
+    _handlers[LESSON_PUBLISHED].append(fail)
+    try:
+        OutboxDispatcher().process_batch(db_session)
+    finally:
+        _handlers[LESSON_PUBLISHED].remove(fail)
+
+    # The announcement ran before the failure, but its notifications were rolled back
+    assert _notified_users(db_session) == []
+    assert (event.status, event.attempts) == ("pending", 1)
+
+    event.available_at = datetime.now(timezone.utc) - timedelta(seconds=1)
+    db_session.commit()
+    OutboxDispatcher().process_batch(db_session)
+
+    assert _notified_users(db_session) == [learner.id]
+    assert event.status == "done"
@@ -0,0 +1,48 @@
+import threading
+import pytest
+from fastapi.testclient import TestClient
+from core import profiler
+from services import profile_service, user_service
+
+
+@pytest.fixture
+def profiled_client(client, monkeypatch):
+    """
+    A client going through the profiler (installed only when configured), profiling the
+    requests sending `X-Profile: test` without storing their profiles.
+    """
+    monkeypatch.setattr(profile_service.request_profiler, "token", b"test")
+    monkeypatch.setattr(profile_service.request_profiler.store, "save", lambda profile: None)
+    return TestClient(profiler.ProfilerMiddleware(client.app, profile_service.request_profiler))
+
+
+def _attributed():
+    session = profiler._current.get()
+    return session is not None and threading.get_ident() in session._threads
+
+
+def test_sync_dependencies_are_sampled_with_their_request(profiled_client, make_user, auth_headers, monkeypatch):
+    user = make_user()
+    seen = []
+    get_user_by_id = user_service.get_user_by_id
+
+    def spy(db, user_id):
+        seen.append(_attributed())
+        return get_user_by_id(db, user_id)
+
+    monkeypatch.setattr(user_service, "get_user_by_id", spy)
+    response = profiled_client.get("/users/users/me", headers={**auth_headers(user), "X-Profile": "test"})
+
+    assert response.status_code == 200 and "x-profile-id" in response.headers
+    assert seen == [True]
+
+
+def test_unprofiled_requests_are_not_attributed(client, make_user, auth_headers, monkeypatch):
+    user = make_user()
+    seen = []
+    get_user_by_id = user_service.get_user_by_id
+    monkeypatch.setattr(user_service, "get_user_by_id", lambda db, user_id: seen.append(_attributed()) or get_user_by_id(db, user_id))
+
+    client.get("/users/users/me", headers=auth_headers(user))
+
+    assert seen == [False]
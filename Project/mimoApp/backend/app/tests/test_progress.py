@@ -0,0 +1,71 @@
+from datetime import date, datetime, timedelta, timezone
+import pytest
+from models.outbox import OutboxEvent
+from services.partition_service import _add_months, archive_partitions, ensure_partitions, partition_name
+
+
+@pytest.fixture
+def lesson(client):
+    client.post("/courses/courses/", json={"id": 1, "title": "SQL", "description": "Joins"})
+    for lesson_id in (1, 2):
+        client.post(
+            "/lesson/lessons/", json={"id": lesson_id, "title": f"Lesson {lesson_id}", "content": "", "course_id": 1}
+        )
+
+
+def test_latest_keeps_one_report_per_lesson(client, lesson, make_user, auth_headers):
+    headers = auth_headers(make_user())
+    for lesson_id, percentage in ((1, 20), (1, 60), (2, 10)):
+        client.post("/progress/", json={"lesson_id": lesson_id, "completion_percentage": percentage}, headers=headers)
+
+    history = client.get("/progress/", headers=headers).json()
+    latest = client.get("/progress/", params={"latest": True}, headers=headers).json()
+
+    assert len(history) == 3
+    assert sorted((row["lesson_id"], row["completion_percentage"]) for row in latest) == [(1, 60), (2, 10)]
+    assert len(client.get("/progress/activity", headers=headers).json()) == 3
+
+
+def test_reads_are_bounded_by_a_window(client, make_user, auth_headers):
+    headers = auth_headers(make_user())
+    now = datetime.now(timezone.utc)
+
+    too_long = client.get("/progress/", params={"since": (now - timedelta(days=3650)).isoformat()}, headers=headers)
+    reversed_window = client.get(
+        "/progress/", params={"since": now.isoformat(), "until": (now - timedelta(days=1)).isoformat()}, headers=headers
+    )
+
+    assert too_long.status_code == 400
+    assert reversed_window.status_code == 400
+
+
+def test_progress_on_an_unknown_lesson_is_rejected(client, make_user, auth_headers):
+    response = client.post("/progress/", json={"lesson_id": 9, "completion_percentage": 5}, headers=auth_headers(make_user()))
+    assert response.status_code == 404
+
+
+def test_completing_the_last_lesson_completes_the_course(client, db_session, lesson, make_user, auth_headers):
+    headers = auth_headers(make_user())
+    client.post("/courses/courses/1/enrollment", headers=headers)
+
+    def report(lesson_id, percentage):
+        client.post("/progress/", json={"lesson_id": lesson_id, "completion_percentage": percentage}, headers=headers)
+        return client.get("/users/users/me/dashboard", headers=headers).json()["courses"][0]["completed"]
+
+    assert report(1, 100) is False
+    assert report(2, 50) is False
+    assert report(2, 100) is True
+    assert report(2, 100) is True
+    events = db_session.query(OutboxEvent).filter(OutboxEvent.event_type == "course.completed").all()
+    assert [event.payload["course_id"] for event in events] == [1]
+
+
+def test_partition_months_roll_over_the_year():
+    assert _add_months(date(2026, 11, 1), 2) == date(2027, 1, 1)
+    assert _add_months(date(2026, 1, 1), -1) == date(2025, 12, 1)
+    assert partition_name("lesson_progress", date(2026, 10, 1)) == "lesson_progress_p202610"
+
+
+def test_partition_maintenance_is_a_noop_without_postgresql(db_session, tmp_path):
+    assert ensure_partitions(db_session) == []
+    assert archive_partitions(db_session, retention_months=0, archive_dir=str(tmp_path)) == []
@@ -0,0 +1,45 @@
+import pytest
+from sqlalchemy import text
+from core.query_budget import QueryBudgetExceeded, QueryBudgetGuard, QueryCounter, query_budget
+from models.course import Course
+
+
+def test_transaction_control_is_not_counted(db_session, query_budget_of):
+    with query_budget_of(1) as counter:
+        db_session.add(Course(id=1, title="SQL", description="Joins"))
+        db_session.commit()  # SAVEPOINT / RELEASE under the rollback fixture
+    assert counter.count == 1
+    assert counter.statements[0].startswith("INSERT INTO courses")
+
+
+def test_block_over_its_budget_fails(db_session, query_budget_of):
+    with pytest.raises(QueryBudgetExceeded, match="2 SQL statements, budget is 1"):
+        with query_budget_of(1):
+            db_session.execute(text("SELECT 1"))
+            db_session.execute(text("SELECT 2"))
+
+
+def test_lesson_creation_fits_its_budget(client, make_user, auth_headers, enforce_query_budgets):
+    headers = auth_headers(make_user())
+    client.post("/courses/courses/", json={"id": 1, "title": "SQL", "description": "Joins"}, headers=headers)
+    checked = enforce_query_budgets.stats()["checked"]
+
+    response = client.post(
+        "/lesson/lessons/", json={"id": 1, "title": "SELECT", "content": "...", "course_id": 1}, headers=headers
+    )
+
+    assert response.status_code == 201
+    assert enforce_query_budgets.stats()["checked"] == checked + 1
+
+
+def test_strict_guard_raises_on_violation():
+    @query_budget(1)
+    def endpoint():
+        pass
+
+    counter = QueryCounter()
+    counter.record("SELECT 1")
+    counter.record("SELECT 2")
+
+    with pytest.raises(QueryBudgetExceeded, match="ran 2 SQL statements, budget is 1"):
+        QueryBudgetGuard(sample_rate=0, strict=True).check("GET", "/x", endpoint, counter)
@@ -0,0 +1,88 @@
+import pytest
+from core.ranking import rank_between, spaced_ranks
+from models.course import Course
+from models.Lesson import Lesson
+from services.Lesson_services import rebalance_lesson_ranks
+
+
+def test_a_key_always_fits_between_neighbours():
+    before, after = "i", "j"
+    for _ in range(50):
+        key = rank_between(before, after)
+        assert before < key < after and not key.endswith("0")
+        after = key
+
+    assert rank_between(None, None) == "i"
+    assert rank_between(None, "1") < "1"
+    with pytest.raises(ValueError):
+        rank_between("b", "a")
+
+
+def test_spaced_ranks_are_short_and_ordered():
+    ranks = spaced_ranks(100)
+
+    assert ranks == sorted(ranks) and len(set(ranks)) == 100
+    assert max(map(len, ranks)) <= 3
+
+
+def _outline(client, course_id=1):
+    return [lesson["id"] for lesson in client.get(f"/courses/courses/{course_id}/lessons").json()]
+
+
+@pytest.fixture
+def course_with_lessons(client):
+    client.post("/courses/courses/", json={"id": 1, "title": "SQL", "description": "Joins"})
+    for lesson_id in (1, 2, 3):
+        client.post(
+            "/lesson/lessons/", json={"id": lesson_id, "title": f"Lesson {lesson_id}", "content": "", "course_id": 1}
+        )
+
+
+def test_moves_are_applied_in_order(client, course_with_lessons):
+    assert _outline(client) == [1, 2, 3]
+
+    response = client.patch(
+        "/courses/courses/1/lessons/order",
+        json={"moves": [{"lesson_id": 3, "after_id": None}, {"lesson_id": 1, "after_id": 2}]},
+    )
+
+    assert [lesson["id"] for lesson in response.json()] == [3, 2, 1]
+    assert _outline(client) == [3, 2, 1]
+
+
+def test_moves_must_stay_in_the_course(client, course_with_lessons):
+    response = client.patch("/courses/courses/1/lessons/order", json={"moves": [{"lesson_id": 9, "after_id": 1}]})
+    assert response.status_code == 400
+    response = client.patch("/courses/courses/1/lessons/order", json={"moves": [{"lesson_id": 1, "after_id": 1}]})
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize("course_id", [2, 999])
+def test_lessons_only_go_to_live_courses(client, course_with_lessons, course_id):
+    client.post("/courses/courses/", json={"id": 2, "title": "Go", "description": "Channels"})
+    client.delete("/courses/courses/2")
+
+    created = client.post("/lesson/lessons/", json={"id": 4, "title": "Lesson 4", "content": "", "course_id": course_id})
+    moved = client.put("/lesson/lessons/1", json={"id": 1, "title": "Lesson 1", "content": "", "course_id": course_id})
+
+    assert created.status_code == moved.status_code == 404
+    assert created.json()["detail"] == moved.json()["detail"] == "Course not found"
+    assert _outline(client) == [1, 2, 3]
+
+
+def test_rebalance_shortens_long_keys_and_keeps_the_order(db_session):
+    db_session.add(Course(id=1, title="SQL", description="Joins"))
+    db_session.flush()
+    ranks = ["j"]
+    for _ in range(12):  # Inserting at the same spot again and again makes the keys grow
+        ranks.insert(0, rank_between("i", ranks[0]))
+    db_session.add_all(
+        [Lesson(id=n, title=f"Lesson {n}", content="", course_id=1, rank=rank) for n, rank in enumerate(ranks, 1)]
+    )
+    db_session.commit()
+
+    assert rebalance_lesson_ranks(db_session, max_length=3) == 1
+
+    rows = db_session.query(Lesson.id, Lesson.rank).order_by(Lesson.rank).all()
+    assert [lesson_id for lesson_id, _ in rows] == list(range(1, 14))
+    assert max(len(rank) for _, rank in rows) <= 2
@@ -0,0 +1,58 @@
+from datetime import datetime, timezone
+import pytest
+from models.course import Course
+from models.recommendation import CourseRecommendation
+from models.user import User
+from models.user_course import UserCourse
+from services.recommendation_service import rebuild_recommendations, refresh_recommendations
+
+pytest.importorskip("scipy")
+
+
+def _stored(db_session):
+    rows = db_session.query(CourseRecommendation.course_id, CourseRecommendation.recommended_course_id).all()
+    return sorted(rows)
+
+
+@pytest.fixture
+def catalog(db_session):
+    db_session.add_all([User(id=n, username=f"u{n}", email=f"u{n}@example.com", hashed_password="x") for n in (1, 2)])
+    db_session.add_all([Course(id=n, title=f"Course {n}", description="") for n in (1, 2, 3, 4)])
+    db_session.flush()
+    db_session.add_all(
+        [UserCourse(user_id=user_id, course_id=course_id) for user_id, course_id in ((1, 1), (1, 2), (2, 2), (2, 4))]
+    )
+    db_session.commit()
+
+
+def test_enrollments_missing_an_id_are_ignored(db_session, catalog):
+    db_session.add_all([UserCourse(user_id=None, course_id=1), UserCourse(user_id=1, course_id=None)])
+    db_session.commit()
+
+    rebuild_recommendations(db_session)
+
+    assert _stored(db_session) == [(1, 2), (2, 1), (2, 4), (4, 2)]
+
+
+def test_refresh_skips_courses_missing_from_the_matrix(db_session, catalog):
+    rebuild_recommendations(db_session)
+    # Course 3 gets an enrollment that is gone again before the refresh: searchsorted
+    # places it on course 4's column, whose neighbours must not be stored for course 3
+    db_session.add(UserCourse(user_id=1, course_id=3, deleted_at=datetime.now(timezone.utc)))
+    db_session.commit()
+
+    refresh_recommendations(db_session)
+
+    assert [row for row in _stored(db_session) if row[0] == 3] == []
+
+
+def test_rebuild_drops_courses_without_enrollments(db_session, catalog):
+    rebuild_recommendations(db_session)
+    db_session.query(UserCourse).filter(UserCourse.course_id == 4).update(
+        {UserCourse.deleted_at: datetime.now(timezone.utc)}, synchronize_session=False
+    )
+    db_session.commit()
+
+    rebuild_recommendations(db_session)
+
+    assert _stored(db_session) == [(1, 2), (2, 1)]
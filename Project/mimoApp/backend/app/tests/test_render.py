@@ -0,0 +1,50 @@
+import pytest
+from core.etag import etag_matches
+from services import render_service
+
+pytest.importorskip("bleach")
+pytest.importorskip("markdown")
+
+
+def test_if_none_match_is_a_list_compared_weakly():
+    assert etag_matches('"a"', '"a"')
+    assert etag_matches('"x", W/"a"', '"a"')
+    assert etag_matches('"a"', 'W/"a"')
+    assert etag_matches("*", '"a"')
+    assert not etag_matches('"ab", "b"', '"a"')
+    assert not etag_matches(None, '"a"')
+
+
+@pytest.fixture
+def course(client):
+    client.post("/courses/courses/", json={"id": 1, "title": "SQL", "description": "Joins"})
+
+
+def _create_lesson(client, content):
+    return client.post("/lesson/lessons/", json={"id": 1, "title": "SELECT", "content": content, "course_id": 1})
+
+
+def test_html_is_sanitized_and_revalidated(client, course):
+    _create_lesson(client, "# Select\n\n<script>alert(1)</script>\n\n```sql\nSELECT 1;\n```")
+
+    response = client.get("/lesson/lessons/1", params={"format": "html"})
+    etag = response.headers["etag"]
+    revalidated = client.get("/lesson/lessons/1", params={"format": "html"}, headers={"If-None-Match": f'"old", W/{etag}'})
+
+    assert "<h1>Select</h1>" in response.text and "<script" not in response.text
+    assert revalidated.status_code == 304
+
+
+def test_a_failed_prerender_falls_back_to_rendering_on_read(client, course, monkeypatch):
+    render = render_service.render_content
+
+    def broken(content):
+        raise RuntimeError("renderer crashed")
+
+    monkeypatch.setattr(render_service, "render_content", broken)
+    created = _create_lesson(client, "*Joins*")
+    monkeypatch.setattr(render_service, "render_content", render)
+
+    assert created.status_code == 201
+    response = client.get("/lesson/lessons/1", params={"format": "html"})
+    assert response.status_code == 200 and "<em>Joins</em>" in response.text
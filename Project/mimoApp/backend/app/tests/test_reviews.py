@@ -0,0 +1,42 @@
+from sqlalchemy import select, update
+from models.course import Course
+from models.review import Review, CourseRating
+from schemas.review import ReviewUpdate
+from services.review_service import modify_review
+
+
+def test_review_lifecycle_keeps_the_aggregates(client, db_session, make_user, auth_headers):
+    db_session.add(Course(id=1, title="SQL", description="Joins"))
+    db_session.commit()
+    headers = auth_headers(make_user())
+
+    review = client.post("/courses/courses/1/reviews", json={"rating": 2}, headers=headers).json()
+    assert client.put(f"/reviews/{review['id']}", json={"rating": 5}, headers=headers).status_code == 200
+
+    rating = db_session.get(CourseRating, 1)
+    assert (rating.rating_sum, rating.rating_count) == (5, 1)
+
+    assert client.delete(f"/reviews/{review['id']}", headers=headers).status_code == 204
+    db_session.refresh(rating)
+    assert (rating.rating_sum, rating.rating_count) == (0, 0)
+
+
+def test_update_uses_the_current_rating(client, db_session, make_user, auth_headers):
+    db_session.add(Course(id=1, title="SQL", description="Joins"))
+    db_session.commit()
+    user = make_user()
+    review_id = client.post("/courses/courses/1/reviews", json={"rating": 2}, headers=auth_headers(user)).json()["id"]
+    db_session.get(Review, review_id)  # Loaded with rating 2
+
+    # Another transaction changed the rating (and the aggregates) in the meantime
+    db_session.execute(
+        update(Review).where(Review.id == review_id).values(rating=4).execution_options(synchronize_session=False)
+    )
+    db_session.execute(
+        update(CourseRating).where(CourseRating.course_id == 1).values(rating_sum=4)
+        .execution_options(synchronize_session=False)
+    )
+
+    modify_review(db_session, review_id, user.id, ReviewUpdate(rating=5))
+
+    assert db_session.scalar(select(CourseRating.rating_sum).where(CourseRating.course_id == 1)) == 5
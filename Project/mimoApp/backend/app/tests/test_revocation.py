@@ -0,0 +1,70 @@
+import time
+import uuid
+from core.revocation import BloomFilter, RevocationCache
+
+
+def _cache(revoked=(), confirmed=None):
+    confirmed = [] if confirmed is None else confirmed
+    stored = dict(revoked)
+
+    def confirm(jti):
+        confirmed.append(jti)
+        return jti in stored
+
+    return RevocationCache(
+        load=lambda: list(stored.items()), confirm=confirm,
+        sync_seconds=60, capacity=1000, error_rate=0.01, cache_size=100,
+    )
+
+
+def test_the_filter_has_no_false_negatives():
+    bloom = BloomFilter(1000, 0.01)
+    keys = [uuid.uuid4().hex for _ in range(1000)]
+    for key in keys:
+        bloom.add(key)
+
+    assert all(key in bloom for key in keys)
+    assert sum(uuid.uuid4().hex in bloom for _ in range(1000)) < 50
+
+
+def test_only_filter_hits_reach_the_database():
+    expires = time.time() + 600
+    confirmed = []
+    cache = _cache({"revoked": expires}, confirmed)
+    cache.rebuild()
+
+    assert cache.is_revoked("revoked", expires)
+    assert cache.is_revoked("revoked", expires)  # Answered from the cache
+    misses = [cache.is_revoked(uuid.uuid4().hex, expires) for _ in range(200)]
+
+    assert not any(misses)
+    assert confirmed.count("revoked") == 1
+    assert len(confirmed) < 20
+
+
+def test_a_rebuild_forgets_expired_revocations_but_keeps_concurrent_ones():
+    now = time.time()
+    stored = {"expired": now - 1}
+    cache = RevocationCache(
+        load=lambda: [(jti, exp) for jti, exp in stored.items() if exp > time.time()],
+        confirm=lambda jti: False, sync_seconds=60, capacity=1000, error_rate=0.001, cache_size=100,
+    )
+    cache.rebuild()
+    original_load = cache.load
+
+    def load_while_revoking():
+        cache.add("during", now + 600)  # A NOTIFY arriving while the rows are read
+        return original_load()
+
+    cache.load = load_while_revoking
+    cache.rebuild()
+
+    assert cache.is_revoked("during", now + 600)
+    assert not cache.is_revoked("expired", now - 1)
+
+
+def test_a_logged_out_token_is_rejected(client, make_user, auth_headers):
+    headers = auth_headers(make_user())
+
+    assert client.post("/auth/auth/logout", headers=headers).status_code == 204
+    assert client.post("/auth/auth/logout", headers=headers).status_code == 401
@@ -0,0 +1,48 @@
+import os
+import runpy
+import pytest
+from sqlalchemy import text
+from core.config import settings
+from db.database import create_sqlite_engine, db_instance, pool_limits
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_default_budget_gives_the_historical_pool():
+    assert pool_limits(31, 1) == (20, 10)
+
+
+@pytest.mark.parametrize("max_connections, workers", [(31, 1), (31, 4), (100, 8), (50, 3)])
+def test_workers_stay_within_the_connection_budget(max_connections, workers):
+    pool_size, max_overflow = pool_limits(max_connections, workers)
+
+    assert pool_size >= 1 and max_overflow >= 1
+    # Each worker also keeps one connection for its LISTEN thread
+    assert workers * (pool_size + max_overflow + 1) <= max_connections
+
+
+def test_a_forked_worker_does_not_close_the_inherited_connections(tmp_path, monkeypatch):
+    engine = create_sqlite_engine(str(tmp_path / "fork.db"))
+    monkeypatch.setattr(db_instance, "engine", engine)
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+        inherited = connection.connection.dbapi_connection
+
+    db_instance.reset_after_fork()
+
+    assert engine.pool.checkedin() == 0
+    assert inherited.execute("SELECT 1").fetchone() == (1,)  # Still open for the parent
+    inherited.close()
+    engine.dispose()
+
+
+def test_gunicorn_resets_the_pool_in_every_worker(monkeypatch):
+    config = runpy.run_path(os.path.join(APP_DIR, "gunicorn.conf.py"))
+    resets = []
+    monkeypatch.setattr(db_instance, "reset_after_fork", lambda: resets.append(True))
+
+    config["post_fork"](None, None)
+
+    assert resets == [True]
+    assert config["preload_app"] and config["workers"] == settings.WEB_CONCURRENCY
+    assert config["graceful_timeout"] == settings.GRACEFUL_TIMEOUT_SECONDS
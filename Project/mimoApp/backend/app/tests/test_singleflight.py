@@ -0,0 +1,69 @@
+import threading
+import time
+from sqlalchemy import inspect
+from sqlalchemy.orm import Session
+from core.singleflight import SingleFlight
+from db.shared_rows import adopt_row, row_values
+from models.course import Course
+from services.course_service import get_course
+from services.Lesson_services import lesson_flight
+
+
+def test_concurrent_calls_share_one_execution():
+    flight = SingleFlight("test")
+    release = threading.Event()
+    results = []
+
+    def slow_read():
+        release.wait(timeout=5)
+        return {"id": 1}
+
+    threads = [threading.Thread(target=lambda: results.append(flight.do("key", slow_read))) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    while flight.stats()["requests"] < 5:
+        time.sleep(0.01)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert results == [{"id": 1}] * 5
+    assert flight.stats()["executions"] == 1
+
+
+def test_adopted_row_belongs_to_the_follower_session(db_session):
+    db_session.add(Course(id=1, title="SQL", description="Joins"))
+    db_session.commit()
+    leader_course = db_session.get(Course, 1)
+    follower = Session()  # Unbound: adopting a row must not query
+
+    course = adopt_row(follower, Course, row_values(leader_course))
+
+    assert course is not leader_course
+    assert inspect(course).session is follower
+    assert inspect(course).persistent
+    assert (course.id, course.title) == (1, "SQL")
+    follower.close()
+
+
+def test_get_course_returns_an_instance_of_the_caller_session(db_session):
+    db_session.add(Course(id=1, title="SQL", description="Joins"))
+    db_session.commit()
+
+    course = get_course(db_session, 1)
+
+    assert course is db_session.get(Course, 1)
+    assert get_course(db_session, 2) is None
+
+
+def test_course_outline_reads_go_through_the_lesson_flight(client):
+    client.post("/courses/courses/", json={"id": 1, "title": "SQL", "description": "Joins"})
+    client.post("/lesson/lessons/", json={"id": 1, "title": "SELECT", "content": "", "course_id": 1})
+    before = lesson_flight.stats()["requests"]
+
+    response = client.get("/courses/courses/1/lessons")
+    missing = client.get("/courses/courses/2/lessons")
+
+    assert [lesson["id"] for lesson in response.json()] == [1]
+    assert missing.status_code == 404
+    assert lesson_flight.stats()["requests"] == before + 2
@@ -0,0 +1,52 @@
+from sqlalchemy import func, select
+from models.course import Course
+from models.Lesson import Lesson
+from models.review import CourseRating, Review
+from models.user_course import UserCourse
+from repositories.enrollment_repo import create_enrollment
+from repositories.review_repo import create_review
+from repositories.user_repo import delete_user
+from services.purge_service import purge_soft_deleted
+
+
+def _count(db_session, model):
+    return db_session.scalar(select(func.count()).select_from(model))
+
+
+def test_a_deleted_course_is_hidden_and_frees_its_title(client):
+    client.post("/courses/courses/", json={"id": 1, "title": "SQL", "description": "Joins"})
+
+    assert client.delete("/courses/courses/1").status_code == 204
+
+    assert client.get("/courses/courses/1").status_code == 404
+    assert client.delete("/courses/courses/1").status_code == 404
+    assert client.post("/courses/courses/", json={"id": 2, "title": "SQL", "description": "Again"}).status_code == 201
+
+
+def test_purge_removes_a_deleted_course_with_its_children(client, db_session, make_user):
+    user = make_user()
+    client.post("/courses/courses/", json={"id": 1, "title": "SQL", "description": "Joins"})
+    client.post("/lesson/lessons/", json={"id": 1, "title": "SELECT", "content": "# Select", "course_id": 1})
+    create_enrollment(db_session, user.id, 1)
+    db_session.commit()
+    client.delete("/courses/courses/1")
+
+    assert purge_soft_deleted(db_session, retention_days=1)["courses"] == 0  # Still within retention
+    counts = purge_soft_deleted(db_session, retention_days=-1)
+
+    assert (counts["courses"], counts["lessons"], counts["enrollments"]) == (1, 1, 1)
+    assert [_count(db_session, model) for model in (Course, Lesson, UserCourse)] == [0, 0, 0]
+
+
+def test_deleting_a_user_removes_their_reviews_from_the_ratings(db_session, make_user):
+    author, other = make_user(), make_user()
+    db_session.add(Course(id=1, title="SQL", description="Joins"))
+    db_session.commit()
+    create_review(db_session, author.id, 1, 1, None)
+    create_review(db_session, other.id, 1, 5, None)
+
+    assert delete_user(db_session, author.id)
+
+    rating = db_session.execute(select(CourseRating.rating_sum, CourseRating.rating_count)).one()
+    assert tuple(rating) == (5, 1)
+    assert _count(db_session, Review) == 1
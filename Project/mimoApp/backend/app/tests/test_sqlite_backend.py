@@ -0,0 +1,87 @@
+import threading
+import time
+from sqlalchemy import Column, Integer, MetaData, String, Table, func, select
+from sqlalchemy.orm import Session
+from db.database import create_sqlite_engine
+from models.course import Course
+
+
+def _create_probe_table(engine):
+    metadata = MetaData()
+    table = Table("probe", metadata, Column("id", Integer, primary_key=True), Column("name", String))
+    metadata.create_all(engine)
+    return table
+
+
+def _write_concurrently(engine, table, writers: int = 4):
+    errors = []
+
+    def write(number: int):
+        try:
+            with Session(engine) as session:
+                session.execute(table.insert().values(name=f"writer{number}"))
+                time.sleep(0.05)  # Keep the transaction open while the others start theirs
+                session.commit()
+        except Exception as exc:  # pragma: no cover - reported by the assertion below
+            errors.append(exc)
+
+    threads = [threading.Thread(target=write, args=(number,)) for number in range(writers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return errors
+
+
+def test_in_memory_sessions_take_turns_on_the_connection():
+    engine = create_sqlite_engine(":memory:")
+    table = _create_probe_table(engine)
+
+    assert _write_concurrently(engine, table) == []
+    with engine.connect() as connection:
+        assert connection.execute(select(func.count()).select_from(table)).scalar() == 4
+    engine.dispose()
+
+
+def test_file_database_serves_concurrent_sessions(tmp_path):
+    engine = create_sqlite_engine(str(tmp_path / "mimo.db"))
+    table = _create_probe_table(engine)
+
+    assert _write_concurrently(engine, table) == []
+    with engine.connect() as connection:
+        assert connection.execute(select(func.count()).select_from(table)).scalar() == 4
+        assert connection.exec_driver_sql("PRAGMA journal_mode").scalar() == "wal"
+    engine.dispose()
+
+
+def test_db_session_commits_are_rolled_back_first(db_session):
+    db_session.add(Course(id=9001, title="Rollback probe", description="Created by a test"))
+    db_session.commit()
+    assert db_session.get(Course, 9001) is not None
+
+
+def test_db_session_commits_are_rolled_back_second(db_session):
+    # Runs after the test above: its committed course did not survive it
+    assert db_session.get(Course, 9001) is None
+
+
+def test_client_requests_share_the_test_transaction(client, db_session, make_user, auth_headers):
+    headers = auth_headers(make_user())
+    response = client.post(
+        "/courses/courses/", json={"id": 1, "title": "SQL basics", "description": "Joins"}, headers=headers
+    )
+    assert response.status_code == 201
+    assert db_session.get(Course, 1).title == "SQL basics"
+
+
+def test_record_progress_returns_the_partitioned_row(client, make_user, auth_headers):
+    headers = auth_headers(make_user())
+    client.post("/courses/courses/", json={"id": 1, "title": "SQL", "description": "Joins"}, headers=headers)
+    client.post(
+        "/lesson/lessons/", json={"id": 1, "title": "SELECT", "content": "...", "course_id": 1}, headers=headers
+    )
+
+    response = client.post("/progress/", json={"lesson_id": 1, "completion_percentage": 40}, headers=headers)
+
+    assert response.status_code == 201
+    assert response.json()["recorded_at"]
@@ -0,0 +1,52 @@
+from models.course import Course
+from models.Lesson import Lesson
+from services.sync_service import parse_sync_token
+
+
+def test_feed_pages_through_changes_in_order(client, db_session, make_user, auth_headers):
+    db_session.add(Course(id=1, title="SQL", description="Joins"))
+    db_session.flush()
+    db_session.add(Lesson(id=1, title="SELECT", content="...", course_id=1, rank="a0"))
+    db_session.commit()
+
+    first = client.get("/sync/changes", params={"limit": 1}).json()
+    assert [(c["entity"], c["op"], c["id"]) for c in first["changes"]] == [("course", "upsert", 1)]
+    assert first["has_more"]
+
+    second = client.get("/sync/changes", params={"since": first["next_token"]}).json()
+    assert [(c["entity"], c["id"]) for c in second["changes"]] == [("lesson", 1)]
+    assert not second["has_more"]
+
+    headers = auth_headers(make_user())
+    assert client.delete("/lesson/lessons/1", headers=headers).status_code == 204
+
+    third = client.get("/sync/changes", params={"since": second["next_token"]}).json()
+    assert [(c["entity"], c["op"], c["id"]) for c in third["changes"]] == [("lesson", "delete", 1)]
+
+    idle = client.get("/sync/changes", params={"since": third["next_token"]}).json()
+    assert idle == {"changes": [], "next_token": third["next_token"], "has_more": False}
+
+
+def test_sync_tokens():
+    assert parse_sync_token(None) == (0, 0)
+    assert parse_sync_token("48213:1042") == (48213, 1042)
+    assert parse_sync_token("1042") == (0, 1042)  # Issued before transaction IDs were recorded
+
+
+def test_malformed_token_is_rejected(client):
+    assert client.get("/sync/changes", params={"since": "abc"}).status_code == 400
+    assert client.get("/sync/changes", params={"since": "-1:3"}).status_code == 400
+
+
+def test_moving_a_course_sends_its_new_category(client, db_session, make_user, auth_headers):
+    headers = auth_headers(make_user())
+    data = client.post("/categories/", json={"name": "Data"}, headers=headers).json()
+    client.post("/courses/courses/", json={"id": 1, "title": "SQL", "description": "Joins"})
+    token = client.get("/sync/changes").json()["next_token"]
+
+    client.put("/courses/courses/1", json={"id": 1, "title": "SQL", "description": "Joins", "category_id": data["id"]})
+    changes = client.get("/sync/changes", params={"since": token}).json()["changes"]
+
+    assert [change["data"] for change in changes] == [
+        {"id": 1, "title": "SQL", "description": "Joins", "category_id": data["id"]}
+    ]
@@ -0,0 +1,46 @@
+import pytest
+from sqlalchemy import select
+from db.database import _request_session, db_instance
+from models.course import Course
+
+
+@pytest.fixture
+def request_session(db_session):
+    session = db_instance.RequestSessionLocal(bind=db_session.connection(), join_transaction_mode="create_savepoint")
+    token = _request_session.set(session)
+    yield session
+    _request_session.reset(token)
+    session.close()
+
+
+def _course_exists(db_session):
+    return db_session.scalar(select(Course.id).where(Course.id == 1)) is not None
+
+
+def test_a_read_only_transaction_is_committed(request_session):
+    request_session.scalar(select(Course.id))
+
+    db_instance.release_request_session()
+
+    assert not request_session.in_transaction()
+
+
+def test_flushed_writes_left_uncommitted_are_rolled_back(request_session, db_session):
+    request_session.add(Course(id=1, title="SQL", description="Joins"))
+    request_session.flush()
+
+    db_instance.release_request_session()
+
+    assert not request_session.in_transaction()
+    assert not _course_exists(db_session)
+
+
+def test_committed_writes_do_not_count_as_pending(request_session, db_session):
+    request_session.add(Course(id=1, title="SQL", description="Joins"))
+    request_session.commit()
+    request_session.scalar(select(Course.id))
+
+    db_instance.release_request_session()
+
+    assert "flushed" not in request_session.info
+    assert _course_exists(db_session)
@@ -0,0 +1,228 @@
+"""
+Background job worker for MimoApp.
+
+Claims jobs from the 'jobs' table and runs them in a process pool, so heavy work
+(recommendations, reports, maintenance) scales across cores independently of the
+API workers. Several workers can run against the same database: jobs are claimed
+with `FOR UPDATE SKIP LOCKED`, and each worker holds a lease on its running jobs that it
+renews while they run (`JOB_LEASE_SECONDS`). The jobs of a worker that died stop being
+renewed and are requeued by the other workers, or by this one when it restarts.
+
+Usage:
+
+    python worker.py --processes 4
+"""
+import argparse
+import logging
+import os
+import signal
+import socket
+import threading
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from db.database import db_instance
+from repositories.job_repo import (
+    claim_jobs, complete_job, fail_job, renew_leases, requeue_expired_jobs, enqueue_job, has_pending_job,
+)
+from services.job_service import execute_job, registered_jobs
+from core.config import settings
+
+logger = logging.getLogger("worker")
+
+# Maintenance jobs enqueued periodically by the worker: (job type, interval setting)
+PERIODIC_JOBS = [
+    ("purge.soft_deleted", "PURGE_INTERVAL_SECONDS"),
+    ("lessons.rebalance_ranks", "LESSON_RANK_REBALANCE_SECONDS"),
+    ("auth.purge_revocations", "REVOCATION_PURGE_SECONDS"),
+    ("partitions.maintain", "PARTITION_MAINTENANCE_SECONDS"),
+    ("assets.collect_orphans", "ASSET_GC_INTERVAL_SECONDS"),
+    ("catalog.snapshot", "CATALOG_SNAPSHOT_INTERVAL_SECONDS"),
+]
+
+def _init_process():
+    """
+    Initializer of the pool processes: forget the pooled connections inherited from the
+    parent, so each process opens its own instead of sharing sockets across processes.
+    """
+    db_instance.reset_after_fork()
+
+class JobWorker:
+    """
+    Feeds the process pool with claimed jobs and records their outcome.
+
+    Attributes:
+        processes (int): The size of the process pool.
+        name (str): The worker name stored on the jobs it runs.
+    """
+
+    def __init__(self, processes: int):
+        self.processes = processes
+        self.name = f"{socket.gethostname()}:{os.getpid()}"
+        self._stop = threading.Event()
+        self._slots = threading.Semaphore(processes)
+        self._next_run = {kind: 0.0 for kind, _ in PERIODIC_JOBS}
+        self._running = set()  # IDs of the jobs in the pool, whose leases are renewed
+        self._running_lock = threading.Lock()
+        self._next_heartbeat = 0.0
+        self._pool_broken = threading.Event()
+
+    def stop(self, *_):
+        logger.info("Stopping: no new jobs will be claimed, waiting for the running ones")
+        self._stop.set()
+
+    def _on_done(self, job_id: int, future):
+        try:
+            result = future.result()
+        except Exception as exc:
+            self._finish(job_id, error=exc)
+        else:
+            self._finish(job_id, result=result)
+
+    def _finish(self, job_id: int, result=None, error: Exception | None = None):
+        """
+        Records the outcome of a claimed job and frees its slot.
+
+        A `BrokenProcessPool` error means a pool process died abruptly (killed, out of
+        memory...), failing every job the pool held: each of them is recorded as a failed
+        attempt, and the pool is replaced before the next jobs are submitted.
+        """
+        with self._running_lock:
+            self._running.discard(job_id)
+        db = db_instance.SessionLocal()
+        try:
+            if error is None:
+                complete_job(db, job_id, self.name, result)
+                logger.info("Job %s succeeded", job_id)
+            else:
+                if isinstance(error, BrokenProcessPool):
+                    self._pool_broken.set()
+                retried = fail_job(
+                    db, job_id, self.name, "".join(traceback.format_exception(error)), settings.JOB_RETRY_BACKOFF_SECONDS
+                )
+                logger.warning("Job %s failed (%s): %s", job_id, "will retry" if retried else "giving up", error)
+        finally:
+            db.close()
+            self._slots.release()
+
+    def _heartbeat(self):
+        """
+        Renews the leases of the jobs running in the pool and requeues the jobs whose
+        lease expired, three times per `JOB_LEASE_SECONDS`.
+        """
+        now = time.monotonic()
+        if now < self._next_heartbeat:
+            return
+        self._next_heartbeat = now + settings.JOB_LEASE_SECONDS / 3
+        with self._running_lock:
+            running = list(self._running)
+        db = db_instance.SessionLocal()
+        try:
+            renew_leases(db, running, self.name, settings.JOB_LEASE_SECONDS)
+            requeued = requeue_expired_jobs(db)
+            if requeued:
+                logger.warning("Requeued %d jobs whose worker stopped renewing their lease", requeued)
+        finally:
+            db.close()
+
+    def _new_pool(self):
+        return ProcessPoolExecutor(max_workers=self.processes, initializer=_init_process)
+
+    def _submit(self, pool, claimed):
+        """
+        Submits the claimed jobs to the pool. If the pool broke in the meantime, the jobs
+        it refused are recorded as failed attempts instead of staying 'running'.
+        """
+        for index, (job_id, kind, payload) in enumerate(claimed):
+            with self._running_lock:
+                self._running.add(job_id)
+            try:
+                future = pool.submit(execute_job, kind, payload)
+            except BrokenProcessPool as exc:
+                for refused_id, _, _ in claimed[index:]:
+                    self._finish(refused_id, error=exc)
+                return
+            future.add_done_callback(lambda done, job_id=job_id: self._on_done(job_id, done))
+
+    def _schedule_periodic(self):
+        """
+        Enqueues the periodic jobs that are due, unless one is already pending (which
+        also keeps several workers from scheduling the same job twice in a row).
+        """
+        now = time.monotonic()
+        due = [
+            (kind, getattr(settings, interval)) for kind, interval in PERIODIC_JOBS
+            if getattr(settings, interval) > 0 and self._next_run[kind] <= now
+        ]
+        if not due:
+            return
+        db = db_instance.SessionLocal()
+        try:
+            for kind, interval in due:
+                if not has_pending_job(db, kind):
+                    enqueue_job(db, kind, {})
+                    logger.info("Scheduled periodic job %s", kind)
+                self._next_run[kind] = now + interval
+        finally:
+            db.close()
+
+    def run(self):
+        logger.info("Worker %s started with %d processes, jobs: %s", self.name, self.processes, ", ".join(registered_jobs()))
+        pool = self._new_pool()
+        try:
+            while not self._stop.is_set():
+                self._heartbeat()
+                if self._pool_broken.is_set():
+                    logger.error("A process of the pool died, starting a new pool")
+                    pool.shutdown(wait=False, cancel_futures=True)
+                    pool = self._new_pool()
+                    self._pool_broken.clear()
+                self._schedule_periodic()
+
+                # Only claim as many jobs as there are idle processes
+                free = 0
+                while self._slots.acquire(blocking=False):
+                    free += 1
+                if free == 0:
+                    self._stop.wait(settings.JOB_POLL_SECONDS)
+                    continue
+
+                db = db_instance.SessionLocal()
+                try:
+                    jobs = claim_jobs(db, free, self.name, settings.JOB_LEASE_SECONDS)
+                    claimed = [(db_job.id, db_job.kind, db_job.payload) for db_job in jobs]
+                finally:
+                    db.close()
+
+                for _ in range(free - len(claimed)):
+                    self._slots.release()
+                self._submit(pool, claimed)
+
+                if not claimed:
+                    self._stop.wait(settings.JOB_POLL_SECONDS)
+
+            # The leases of the jobs still running are renewed until they finish
+            while True:
+                with self._running_lock:
+                    if not self._running:
+                        break
+                self._heartbeat()
+                time.sleep(min(1.0, settings.JOB_POLL_SECONDS))
+        finally:
+            pool.shutdown(wait=True)
+        logger.info("Worker %s stopped", self.name)
+
+def main():
+    parser = argparse.ArgumentParser(description="Run MimoApp background jobs.")
+    parser.add_argument("--processes", type=int, default=settings.JOB_WORKER_PROCESSES, help="size of the process pool")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(levelname)s %(message)s")
+    worker = JobWorker(args.processes)
+    signal.signal(signal.SIGTERM, worker.stop)
+    signal.signal(signal.SIGINT, worker.stop)
+    worker.run()
+
+if __name__ == "__main__":
+    main()